@@ -5,7 +5,7 @@ from django.contrib.auth.models import Permission
 
 from apps.i18n.models import Locale
 
-from .rbac import ScopedLocale, ScopedSection
+from .rbac import get_user_scope, object_locale_id
 
 
 class ScopedPermissionBackend(BaseBackend):
@@ -112,31 +112,27 @@ class ScopedPermissionBackend(BaseBackend):
 
         # Check locale scope if object has a locale
 
-        if hasattr(obj, "locale"):
+        scope = get_user_scope(user_obj)
 
-            locale_access = ScopedLocale.objects.filter(
-                group__in=user_obj.groups.all(), locale=obj.locale
-            ).exists()
+        if scope is None:
 
-            if not locale_access:
+            return False
 
-                return False
+        # Compare ids so the locale row is never loaded
 
-        # Check section scope if object has a path
+        locale_id = object_locale_id(obj)
 
-        if hasattr(obj, "path"):
+        has_locale = locale_id is not None or hasattr(obj, "locale")
 
-            scoped_sections = ScopedSection.objects.filter(
-                group__in=user_obj.groups.all()
-            ).select_related("group")
+        if has_locale and not scope.allows_locale(locale_id):
 
-            section_access = any(
-                section.matches_path(obj.path) for section in scoped_sections
-            )
+            return False
 
-            if not section_access:
+        # Check section scope if object has a path
 
-                return False
+        if hasattr(obj, "path") and not scope.allows_path(obj.path):
+
+            return False
 
         return True
 
@@ -151,13 +147,13 @@ class ScopedPermissionBackend(BaseBackend):
 
             return Locale.objects.filter(is_active=True)
 
-        user_groups = user_obj.groups.all()
+        scope = get_user_scope(user_obj)
+
+        if scope is None:
 
-        locale_ids = ScopedLocale.objects.filter(group__in=user_groups).values_list(
-            "locale_id", flat=True
-        )
+            return Locale.objects.none()
 
-        return Locale.objects.filter(id__in=locale_ids, is_active=True)
+        return Locale.objects.filter(id__in=scope.locale_ids, is_active=True)
 
     def get_user_scoped_sections(self, user_obj):
         """Get all section scopes this user has access to."""
@@ -170,13 +166,9 @@ class ScopedPermissionBackend(BaseBackend):
 
             return ["/"]  # Root access for superusers
 
-        user_groups = user_obj.groups.all()
+        scope = get_user_scope(user_obj)
 
-        return list(
-            ScopedSection.objects.filter(group__in=user_groups).values_list(
-                "path_prefix", flat=True
-            )
-        )
+        return list(scope.sections.prefixes) if scope else []
 
     def user_can_access_locale(self, user_obj, locale):
         """Check if user can access a specific locale."""
@@ -189,11 +181,9 @@ class ScopedPermissionBackend(BaseBackend):
 
             return True
 
-        user_groups = user_obj.groups.all()
+        scope = get_user_scope(user_obj)
 
-        return ScopedLocale.objects.filter(
-            group__in=user_groups, locale=locale
-        ).exists()
+        return scope is not None and scope.allows_locale(locale)
 
     def user_can_access_path(self, user_obj, path):
         """Check if user can access a specific path."""
@@ -206,8 +196,6 @@ class ScopedPermissionBackend(BaseBackend):
 
             return True
 
-        user_groups = user_obj.groups.all()
-
-        scoped_sections = ScopedSection.objects.filter(group__in=user_groups)
+        scope = get_user_scope(user_obj)
 
-        return any(section.matches_path(path) for section in scoped_sections)
+        return scope is not None and scope.allows_path(path)
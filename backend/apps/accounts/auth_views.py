@@ -12,9 +12,10 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 from rest_framework.views import APIView
 
+from apps.core.throttling import AnonRateThrottle
+
 from .serializers import UserSerializer
 
 User = get_user_model()
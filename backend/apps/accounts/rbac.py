@@ -1,7 +1,10 @@
+from typing import Dict, FrozenSet, Iterable, Optional
+
 from django.contrib.auth.models import Group
-from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db import models
-from django.db.models import CharField, DateTimeField, ForeignKey, TextField
+from django.db.models import CharField, DateTimeField, ForeignKey, Q, TextField
 
 from apps.i18n.models import Locale
 
@@ -9,9 +12,20 @@ from apps.i18n.models import Locale
 
 This module provides scoped permissions that allow users to be granted
 permissions only for specific locales and/or path sections.
+
+A user's scopes are compiled once into a ``UserScope`` (allowed locale ids
+plus a prefix trie of section paths) and cached until any group membership,
+``ScopedLocale`` or ``ScopedSection`` changes.
 """
 
 
+# Scope cache keys; bumping the version invalidates every compiled scope
+
+SCOPE_CACHE_VERSION_KEY = "rbac:scope:version"
+
+SCOPE_CACHE_TIMEOUT = 60 * 60
+
+
 class ScopedLocale(models.Model):
     """Scopes a Django Group to specific locales.
 
@@ -129,6 +143,289 @@ class ScopedSection(models.Model):
         return f"{self.group.name} → {self.name} ({self.path_prefix})"
 
 
+class SectionTrie:
+    """Prefix trie of section paths, keyed by path segment.
+
+    Matching follows ``ScopedSection.matches_path``: a prefix matches itself
+    and anything below it, and ``/`` matches every path.
+    """
+
+    __slots__ = ("root", "prefixes")
+
+    def __init__(self, prefixes: Iterable[str] = ()):
+
+        self.root: Dict = {}
+
+        self.prefixes = tuple(sorted(set(prefixes)))
+
+        for prefix in self.prefixes:
+
+            self.insert(prefix)
+
+    @staticmethod
+    def _segments(path):
+
+        return [segment for segment in path.split("/") if segment]
+
+    def insert(self, prefix):
+
+        node = self.root
+
+        for segment in self._segments(prefix):
+
+            node = node.setdefault(segment, {})
+
+        node[None] = True  # Terminal marker
+
+    @property
+    def allows_all(self):
+
+        return None in self.root
+
+    def matches(self, path):
+        """Check whether any stored prefix covers ``path``."""
+
+        if not path:
+
+            return False
+
+        if self.allows_all:
+
+            return True
+
+        if not path.startswith("/"):
+
+            return False
+
+        node = self.root
+
+        for segment in self._segments(path):
+
+            node = node.get(segment)
+
+            if node is None:
+
+                return False
+
+            if None in node:
+
+                return True
+
+        return False
+
+
+class UserScope:
+    """Compiled locale and section scopes of a single user."""
+
+    __slots__ = ("locale_ids", "sections")
+
+    def __init__(self, locale_ids: Iterable[int] = (), section_prefixes=()):
+
+        self.locale_ids: FrozenSet[int] = frozenset(locale_ids)
+
+        self.sections = SectionTrie(section_prefixes)
+
+    @property
+    def has_scopes(self):
+        """Whether any locale or section scope applies to the user."""
+
+        return bool(self.locale_ids or self.sections.prefixes)
+
+    def allows_locale(self, locale):
+
+        locale_id = getattr(locale, "pk", locale)
+
+        return locale_id is not None and locale_id in self.locale_ids
+
+    def allows_path(self, path):
+
+        return self.sections.matches(path)
+
+    def get_filter(self, locale_field="locale", path_field="path"):
+        """Build a ``Q`` expressing this scope for querysets.
+
+        Returns ``None`` when nothing can match.
+        """
+
+        if not self.locale_ids or not self.sections.prefixes:
+
+            return None
+
+        condition = Q(**{f"{locale_field}_id__in": sorted(self.locale_ids)})
+
+        if self.sections.allows_all:
+
+            return condition
+
+        paths = Q()
+
+        for prefix in self.sections.prefixes:
+
+            paths |= Q(**{path_field: prefix}) | Q(
+                **{f"{path_field}__startswith": prefix + "/"}
+            )
+
+        return condition & paths
+
+    def __getstate__(self):
+
+        return {"locale_ids": self.locale_ids, "sections": self.sections.prefixes}
+
+    def __setstate__(self, state):
+
+        self.locale_ids = frozenset(state["locale_ids"])
+
+        self.sections = SectionTrie(state["sections"])
+
+
+def _scope_version():
+
+    version = cache.get(SCOPE_CACHE_VERSION_KEY)
+
+    if version is None:
+
+        cache.add(SCOPE_CACHE_VERSION_KEY, 1, timeout=None)
+
+        version = cache.get(SCOPE_CACHE_VERSION_KEY, 1)
+
+    return version
+
+
+def _scope_cache_key(user_pk, version):
+
+    return f"rbac:scope:{version}:{user_pk}"
+
+
+def invalidate_scope_cache(user=None):
+    """Drop compiled scopes, for one user or (by default) everyone."""
+
+    if user is not None:
+
+        cache.delete(_scope_cache_key(user.pk, _scope_version()))
+
+        if hasattr(user, "_rbac_scope"):
+
+            del user._rbac_scope
+
+        return
+
+    try:
+
+        cache.incr(SCOPE_CACHE_VERSION_KEY)
+
+    except ValueError:
+
+        cache.set(SCOPE_CACHE_VERSION_KEY, 2, timeout=None)
+
+
+def compile_user_scope(user) -> UserScope:
+    """Load a user's scopes from the database (two queries)."""
+
+    group_ids = user.groups.values("pk")
+
+    return UserScope(
+        locale_ids=ScopedLocale.objects.filter(group__in=group_ids).values_list(
+            "locale_id", flat=True
+        ),
+        section_prefixes=ScopedSection.objects.filter(group__in=group_ids).values_list(
+            "path_prefix", flat=True
+        ),
+    )
+
+
+def get_user_scope(user) -> Optional[UserScope]:
+    """Return the compiled scope of a saved, active user.
+
+    The scope is memoized on the user instance and in the cache; both are
+    keyed by the global scope version so changes apply immediately.
+    Returns ``None`` for anonymous, inactive or unsaved users.
+    """
+
+    if not user or not user.is_authenticated or not user.is_active or not user.pk:
+
+        return None
+
+    version = _scope_version()
+
+    memo = getattr(user, "_rbac_scope", None)
+
+    if memo is not None and memo[0] == version:
+
+        return memo[1]
+
+    key = _scope_cache_key(user.pk, version)
+
+    scope = cache.get(key)
+
+    if scope is None:
+
+        scope = compile_user_scope(user)
+
+        cache.set(key, scope, timeout=SCOPE_CACHE_TIMEOUT)
+
+    user._rbac_scope = (version, scope)
+
+    return scope
+
+
+def object_locale_id(obj):
+    """Return the locale id of ``obj`` without loading its locale row.
+
+    Models read the ``locale_id`` column; other objects fall back to their
+    ``locale`` attribute. Returns ``None`` when there is no locale.
+    """
+
+    if isinstance(obj, models.Model):
+
+        try:
+
+            field = obj._meta.get_field("locale")
+
+        except FieldDoesNotExist:
+
+            return None
+
+        return getattr(obj, field.attname, None)
+
+    locale = getattr(obj, "locale", None)
+
+    return getattr(locale, "pk", locale)
+
+
+def filter_by_scope(queryset, user, locale_field="locale", path_field="path"):
+    """Restrict a queryset to rows within the user's locale and section scopes.
+
+    Applies the same rules as ``RBACMixin.user_has_scope_access`` in SQL, so
+    a whole list is authorized in one query.
+    """
+
+    if not user or not getattr(user, "is_authenticated", False):
+
+        return queryset.none()
+
+    if user.is_active and user.pk and user.is_superuser:
+
+        return queryset
+
+    scope = get_user_scope(user)
+
+    condition = scope.get_filter(locale_field, path_field) if scope else None
+
+    if condition is None:
+
+        return queryset.none()
+
+    return queryset.filter(condition)
+
+
+class RBACQuerySet(models.QuerySet):
+    """QuerySet for models using ``RBACMixin``."""
+
+    def filter_by_scope(self, user):
+
+        return filter_by_scope(self, user)
+
+
 class RBACMixin:
     """Mixin to add RBAC scope checking methods to models.
 
@@ -141,8 +438,10 @@ class RBACMixin:
     def user_has_locale_access(self, user):
         """Check if user has access to this object's locale."""
 
+        locale_id = object_locale_id(self)
+
         if (
-            not hasattr(self, "locale")
+            locale_id is None
             or not user
             or not user.is_authenticated
             or not user.is_active
@@ -160,13 +459,9 @@ class RBACMixin:
 
             return True
 
-        # Check if any of the user's groups have access to this locale
+        # Check against the user's compiled scope (cached, no per-object queries)
 
-        # Use exists() with direct join to avoid N+1
-
-        return ScopedLocale.objects.filter(
-            group__in=user.groups.all(), locale=self.locale
-        ).exists()
+        return get_user_scope(user).allows_locale(locale_id)
 
     def user_has_section_access(self, user):
         """Check if user has access to this object's path section."""
@@ -191,23 +486,9 @@ class RBACMixin:
 
             return True
 
-        # Check if any of the user's groups have access to this path
-
-        # Prefetch groups to avoid N+1 queries
-
-        scoped_sections = ScopedSection.objects.filter(
-            group__in=user.groups.all()
-        ).select_related("group")
-
-        # Use database filtering where possible
-
-        for section in scoped_sections:
+        # Check against the user's compiled section trie
 
-            if section.matches_path(self.path):
-
-                return True
-
-        return False
+        return get_user_scope(user).allows_path(self.path)
 
     def user_has_scope_access(self, user):
         """Check if user has both locale and section access."""
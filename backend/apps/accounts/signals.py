@@ -1,8 +1,10 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 from .models import UserProfile
+from .rbac import ScopedLocale, ScopedSection, invalidate_scope_cache
 
 User = get_user_model()
 
@@ -23,3 +25,52 @@ def save_user_profile(sender, instance, **kwargs):
     if hasattr(instance, "profile"):
 
         instance.profile.save()
+
+
+def _invalidate_rbac_scopes(sender, **kwargs):
+    """Drop compiled RBAC scopes when groups or their scopes change"""
+
+    try:
+
+        invalidate_scope_cache()
+
+    except Exception:
+
+        pass
+
+
+def _reset_new_user_scope(sender, instance, created, **kwargs):
+    """Forget any scope cached under a reused primary key"""
+
+    if created:
+
+        try:
+
+            invalidate_scope_cache(instance)
+
+        except Exception:
+
+            pass
+
+
+post_save.connect(_reset_new_user_scope, sender=User, dispatch_uid="rbac_new_user")
+
+for _model in (ScopedLocale, ScopedSection, Group):
+
+    post_save.connect(
+        _invalidate_rbac_scopes,
+        sender=_model,
+        dispatch_uid=f"rbac_scope_save_{_model.__name__}",
+    )
+
+    post_delete.connect(
+        _invalidate_rbac_scopes,
+        sender=_model,
+        dispatch_uid=f"rbac_scope_delete_{_model.__name__}",
+    )
+
+m2m_changed.connect(
+    _invalidate_rbac_scopes,
+    sender=User.groups.through,
+    dispatch_uid="rbac_scope_user_groups",
+)
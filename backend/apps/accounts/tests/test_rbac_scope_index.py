@@ -0,0 +1,215 @@
+"""Tests for the compiled per-user RBAC scope index."""
+
+import os
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from apps.accounts.auth_backends import ScopedPermissionBackend
+from apps.accounts.rbac import (
+    ScopedLocale,
+    ScopedSection,
+    SectionTrie,
+    filter_by_scope,
+    get_user_scope,
+)
+from apps.cms.models import Page
+from apps.i18n.models import Locale
+
+User = get_user_model()
+
+
+class SectionTrieTest(TestCase):
+    def test_matches_prefix_and_descendants(self):
+        trie = SectionTrie(["/blog", "/shop/products"])
+
+        self.assertTrue(trie.matches("/blog"))
+        self.assertTrue(trie.matches("/blog/"))
+        self.assertTrue(trie.matches("/blog/2024/post"))
+        self.assertTrue(trie.matches("/shop/products/item"))
+
+        self.assertFalse(trie.matches("/blogger"))
+        self.assertFalse(trie.matches("/shop"))
+        self.assertFalse(trie.matches("/shop/orders"))
+        self.assertFalse(trie.matches(""))
+
+    def test_root_matches_everything(self):
+        trie = SectionTrie(["/"])
+
+        self.assertTrue(trie.allows_all)
+        self.assertTrue(trie.matches("/anything/at/all"))
+
+
+class UserScopeIndexTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.en, _ = Locale.objects.get_or_create(
+            code="en", defaults={"name": "English", "native_name": "English"}
+        )
+        self.fr, _ = Locale.objects.get_or_create(
+            code="fr", defaults={"name": "French", "native_name": "Français"}
+        )
+
+        self.group = Group.objects.create(name="Blog Editors")
+
+        self.user = User.objects.create_user(email="editor@example.com")
+        self.user.groups.add(self.group)
+
+        ScopedLocale.objects.create(group=self.group, locale=self.en)
+        ScopedSection.objects.create(group=self.group, path_prefix="/blog", name="Blog")
+
+        self.pages = [
+            Page.objects.create(title="Blog", slug="blog", locale=self.en),
+            Page.objects.create(title="Shop", slug="shop", locale=self.en),
+            Page.objects.create(title="Blog FR", slug="blog", locale=self.fr),
+        ]
+
+        self.posts = [
+            Page.objects.create(
+                title=f"Post {i}",
+                slug=f"post-{i}",
+                locale=self.en,
+                parent=self.pages[0],
+            )
+            for i in range(5)
+        ]
+
+    def test_object_checks_do_not_query_per_row(self):
+        get_user_scope(self.user)
+
+        with self.assertNumQueries(0):
+            allowed = [
+                page.pk
+                for page in self.pages + self.posts
+                if page.user_has_scope_access(self.user)
+            ]
+
+        self.assertEqual(allowed, [self.pages[0].pk] + [p.pk for p in self.posts])
+
+    def test_fetched_rows_are_checked_without_loading_locales(self):
+        get_user_scope(self.user)
+
+        pages = list(Page.objects.filter(pk__in=[p.pk for p in self.pages]))
+
+        backend = ScopedPermissionBackend()
+
+        with self.assertNumQueries(0):
+            allowed = [
+                page.pk for page in pages if page.user_has_scope_access(self.user)
+            ]
+
+            checked = [
+                page.pk
+                for page in pages
+                if backend._check_object_scopes(self.user, page)
+            ]
+
+        self.assertEqual(allowed, [self.pages[0].pk])
+        self.assertEqual(checked, allowed)
+
+    def test_page_list_hides_drafts_outside_scope(self):
+        self.group.permissions.add(
+            Permission.objects.get(content_type__app_label="cms", codename="view_page")
+        )
+
+        published = Page.objects.create(
+            title="Contact", slug="contact", locale=self.fr, status="published"
+        )
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.get("/api/v1/cms/pages/", {"page_size": 100})
+
+        ids = {page["id"] for page in response.data["results"]}
+
+        self.assertIn(self.pages[0].pk, ids)
+        self.assertIn(published.pk, ids)
+        self.assertNotIn(self.pages[1].pk, ids)
+        self.assertNotIn(self.pages[2].pk, ids)
+
+    def test_scope_is_shared_through_the_cache(self):
+        get_user_scope(self.user)
+
+        fresh = User.objects.get(pk=self.user.pk)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.pages[0].user_has_scope_access(fresh))
+
+    def test_filter_by_scope_matches_object_checks(self):
+        expected = [
+            page.pk
+            for page in Page.objects.order_by("pk")
+            if page.user_has_scope_access(self.user)
+        ]
+
+        with self.assertNumQueries(1):
+            scoped = list(
+                Page.objects.filter_by_scope(self.user)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+
+        self.assertEqual(scoped, expected)
+
+    def test_filter_by_scope_without_scopes_is_empty(self):
+        outsider = User.objects.create_user(email="outsider@example.com")
+
+        self.assertFalse(Page.objects.filter_by_scope(outsider).exists())
+
+    def test_filter_by_scope_superuser_sees_everything(self):
+        admin = User.objects.create_user(email="admin@example.com", is_superuser=True)
+
+        queryset = filter_by_scope(Page.objects.all(), admin)
+
+        self.assertEqual(queryset.count(), Page.objects.count())
+
+    def test_scope_changes_invalidate_compiled_scope(self):
+        shop = self.pages[1]
+
+        self.assertFalse(shop.user_has_scope_access(self.user))
+
+        section = ScopedSection.objects.create(
+            group=self.group, path_prefix="/shop", name="Shop"
+        )
+
+        self.assertTrue(shop.user_has_scope_access(self.user))
+
+        section.delete()
+
+        self.assertFalse(shop.user_has_scope_access(self.user))
+
+    def test_locale_scope_changes_invalidate_compiled_scope(self):
+        blog_fr = self.pages[2]
+
+        self.assertFalse(blog_fr.user_has_scope_access(self.user))
+
+        ScopedLocale.objects.create(group=self.group, locale=self.fr)
+
+        self.assertTrue(blog_fr.user_has_scope_access(self.user))
+
+    def test_group_membership_changes_invalidate_compiled_scope(self):
+        blog = self.pages[0]
+
+        self.assertTrue(blog.user_has_scope_access(self.user))
+
+        self.user.groups.remove(self.group)
+
+        self.assertFalse(blog.user_has_scope_access(self.user))
+
+        self.group.custom_user_set.add(self.user)
+
+        self.assertTrue(blog.user_has_scope_access(self.user))
@@ -8,9 +8,10 @@ from rest_framework import permissions, status
 from rest_framework.decorators import action
 from rest_framework.mixins import RetrieveModelMixin, UpdateModelMixin
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from rest_framework.viewsets import GenericViewSet
 
+from apps.core.throttling import AnonRateThrottle, UserRateThrottle
+
 from .serializers import (
     PasswordChangeSerializer,
     UserRegistrationSerializer,
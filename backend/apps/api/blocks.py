@@ -1,13 +1,208 @@
+import hashlib
+
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.conditional import make_etag, rendered_response
+
 """
 Standalone blocks API endpoint.
+
+The block types and schemas are static, so their JSON and ETags are
+rendered once at import.
 """
 
 
-# Force reload
+# Block types with metadata (matching backend BLOCK_MODELS)
+
+BLOCK_TYPES = [
+    {
+        "type": "hero",
+        "label": "Hero Section",
+        "description": "Large header with title and CTA",
+        "category": "Layout",
+        "icon": "layout",
+    },
+    {
+        "type": "richtext",  # Match frontend expectation
+        "label": "Rich Text",
+        "description": "Formatted text content",
+        "category": "Content",
+        "icon": "type",
+    },
+    {
+        "type": "image",
+        "label": "Image",
+        "description": "Single image with caption",
+        "category": "Media",
+        "icon": "image",
+    },
+    {
+        "type": "gallery",
+        "label": "Image Gallery",
+        "description": "Multiple images in a grid",
+        "category": "Media",
+        "icon": "grid",
+    },
+    {
+        "type": "columns",
+        "label": "Columns",
+        "description": "Multi-column layout",
+        "category": "Layout",
+        "icon": "columns",
+    },
+    {
+        "type": "cta",  # Match frontend expectation
+        "label": "Call to Action",
+        "description": "Button with compelling text",
+        "category": "Marketing",
+        "icon": "megaphone",
+    },
+    {
+        "type": "faq",
+        "label": "FAQ",
+        "description": "Accordion of questions",
+        "category": "Content",
+        "icon": "help-circle",
+    },
+    {
+        "type": "content_detail",
+        "label": "Content Detail",
+        "description": "Dynamic content display",
+        "category": "Dynamic",
+        "icon": "layout-grid",
+    },
+    {
+        "type": "collection_list",
+        "label": "Collection List",
+        "description": "Display list of posts or content",
+        "category": "Dynamic",
+        "icon": "grid",
+    },
+]
+
+
+# Basic schemas for each block type
+
+BLOCK_SCHEMAS = {
+    "hero": {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string"},
+            "subtitle": {"type": "string"},
+            "cta_text": {"type": "string"},
+            "cta_url": {"type": "string"},
+            "background_image": {"type": "string"},
+        },
+    },
+    "richtext": {
+        "type": "object",
+        "properties": {"content": {"type": "string"}},
+    },
+    "image": {
+        "type": "object",
+        "properties": {
+            "src": {"type": "string"},
+            "alt": {"type": "string"},
+            "caption": {"type": "string"},
+        },
+    },
+    "gallery": {
+        "type": "object",
+        "properties": {
+            "images": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "src": {"type": "string"},
+                        "alt": {"type": "string"},
+                        "caption": {"type": "string"},
+                    },
+                },
+            }
+        },
+    },
+    "columns": {
+        "type": "object",
+        "properties": {
+            "columns": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"content": {"type": "string"}},
+                },
+            },
+            "gap": {"type": "string", "enum": ["sm", "md", "lg"]},
+        },
+    },
+    "cta": {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string"},
+            "subtitle": {"type": "string"},
+            "cta_text": {"type": "string"},
+            "cta_url": {"type": "string"},
+            "background_color": {"type": "string"},
+        },
+    },
+    "faq": {
+        "type": "object",
+        "properties": {
+            "items": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "question": {"type": "string"},
+                        "answer": {"type": "string"},
+                    },
+                },
+            }
+        },
+    },
+    "content_detail": {
+        "type": "object",
+        "properties": {
+            "label": {"type": "string"},
+            "source": {"type": "string"},
+            "options": {"type": "object"},
+        },
+    },
+    "collection_list": {
+        "type": "object",
+        "properties": {
+            "collection": {"type": "string"},
+            "limit": {"type": "number"},
+            "template": {"type": "string"},
+        },
+    },
+}
+
+
+def render(name, data):
+    """ETag and JSON body of ``data``."""
+
+    body = JSONRenderer().render(data)
+
+    digest = hashlib.sha1(body, usedforsecurity=False).hexdigest()
+
+    return make_etag(name, digest), body
+
+
+# Sort by category then by label
+
+RENDERED_BLOCK_TYPES = render(
+    "api_block_types",
+    {"block_types": sorted(BLOCK_TYPES, key=lambda x: (x["category"], x["label"]))},
+)
+
+RENDERED_BLOCK_SCHEMAS = {
+    block_type: render(f"api_block_schema:{block_type}", schema)
+    for block_type, schema in BLOCK_SCHEMAS.items()
+}
 
 
 class BlockTypesAPIView(APIView):
@@ -18,79 +213,9 @@ class BlockTypesAPIView(APIView):
     def get(self, request):
         """Get all available block types with their metadata."""
 
-        # Define block types with metadata (matching backend BLOCK_MODELS)
-
-        block_types = [
-            {
-                "type": "hero",
-                "label": "Hero Section",
-                "description": "Large header with title and CTA",
-                "category": "Layout",
-                "icon": "layout",
-            },
-            {
-                "type": "richtext",  # Match frontend expectation
-                "label": "Rich Text",
-                "description": "Formatted text content",
-                "category": "Content",
-                "icon": "type",
-            },
-            {
-                "type": "image",
-                "label": "Image",
-                "description": "Single image with caption",
-                "category": "Media",
-                "icon": "image",
-            },
-            {
-                "type": "gallery",
-                "label": "Image Gallery",
-                "description": "Multiple images in a grid",
-                "category": "Media",
-                "icon": "grid",
-            },
-            {
-                "type": "columns",
-                "label": "Columns",
-                "description": "Multi-column layout",
-                "category": "Layout",
-                "icon": "columns",
-            },
-            {
-                "type": "cta",  # Match frontend expectation
-                "label": "Call to Action",
-                "description": "Button with compelling text",
-                "category": "Marketing",
-                "icon": "megaphone",
-            },
-            {
-                "type": "faq",
-                "label": "FAQ",
-                "description": "Accordion of questions",
-                "category": "Content",
-                "icon": "help-circle",
-            },
-            {
-                "type": "content_detail",
-                "label": "Content Detail",
-                "description": "Dynamic content display",
-                "category": "Dynamic",
-                "icon": "layout-grid",
-            },
-            {
-                "type": "collection_list",
-                "label": "Collection List",
-                "description": "Display list of posts or content",
-                "category": "Dynamic",
-                "icon": "grid",
-            },
-        ]
-
-        # Sort by category then by label
+        etag, body = RENDERED_BLOCK_TYPES
 
-        block_types.sort(key=lambda x: (x["category"], x["label"]))
-
-        return Response({"block_types": block_types})
+        return rendered_response(request, etag, body)
 
 
 class BlockSchemaAPIView(APIView):
@@ -101,107 +226,12 @@ class BlockSchemaAPIView(APIView):
     def get(self, request, block_type):
         """Get the schema for a specific block type."""
 
-        # Basic schemas for each block type
-
-        schemas = {
-            "hero": {
-                "type": "object",
-                "properties": {
-                    "title": {"type": "string"},
-                    "subtitle": {"type": "string"},
-                    "cta_text": {"type": "string"},
-                    "cta_url": {"type": "string"},
-                    "background_image": {"type": "string"},
-                },
-            },
-            "richtext": {
-                "type": "object",
-                "properties": {"content": {"type": "string"}},
-            },
-            "image": {
-                "type": "object",
-                "properties": {
-                    "src": {"type": "string"},
-                    "alt": {"type": "string"},
-                    "caption": {"type": "string"},
-                },
-            },
-            "gallery": {
-                "type": "object",
-                "properties": {
-                    "images": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "src": {"type": "string"},
-                                "alt": {"type": "string"},
-                                "caption": {"type": "string"},
-                            },
-                        },
-                    }
-                },
-            },
-            "columns": {
-                "type": "object",
-                "properties": {
-                    "columns": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {"content": {"type": "string"}},
-                        },
-                    },
-                    "gap": {"type": "string", "enum": ["sm", "md", "lg"]},
-                },
-            },
-            "cta": {
-                "type": "object",
-                "properties": {
-                    "title": {"type": "string"},
-                    "subtitle": {"type": "string"},
-                    "cta_text": {"type": "string"},
-                    "cta_url": {"type": "string"},
-                    "background_color": {"type": "string"},
-                },
-            },
-            "faq": {
-                "type": "object",
-                "properties": {
-                    "items": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "question": {"type": "string"},
-                                "answer": {"type": "string"},
-                            },
-                        },
-                    }
-                },
-            },
-            "content_detail": {
-                "type": "object",
-                "properties": {
-                    "label": {"type": "string"},
-                    "source": {"type": "string"},
-                    "options": {"type": "object"},
-                },
-            },
-            "collection_list": {
-                "type": "object",
-                "properties": {
-                    "collection": {"type": "string"},
-                    "limit": {"type": "number"},
-                    "template": {"type": "string"},
-                },
-            },
-        }
-
-        if block_type not in schemas:
+        if block_type not in RENDERED_BLOCK_SCHEMAS:
 
             return Response(
                 {"error": f"Block type '{block_type}' not found"}, status=404
             )
 
-        return Response(schemas[block_type])
+        etag, body = RENDERED_BLOCK_SCHEMAS[block_type]
+
+        return rendered_response(request, etag, body)
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:40
+
+from django.db import migrations, models
+
+HELP_TEXT = "Snapshot in stored form: fields, block manifest and blob digests"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_remove_blogpost_blog_post_featured_idx_and_more"),
+        ("cms", "0026_revision_blob"),
+    ]
+
+    operations = [
+        # The column keeps its name; only the attribute changes
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveField(model_name="blogpostrevision", name="snapshot"),
+                migrations.AddField(
+                    model_name="blogpostrevision",
+                    name="data",
+                    field=models.JSONField(
+                        db_column="snapshot", default=dict, help_text=HELP_TEXT
+                    ),
+                    preserve_default=False,
+                ),
+            ],
+        ),
+    ]
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser as User
@@ -19,6 +19,9 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from apps.cms.autosave import flush_autosaves
+from apps.cms.revision_store import SnapshotStorageMixin
+
 if TYPE_CHECKING:
     from apps.blog.models import BlogPost
 
@@ -30,8 +33,16 @@ else:
     User = get_user_model()
 
 
-class BlogPostRevision(models.Model):
-    """Store snapshots of blog post content for versioning and autosave."""
+class BlogPostRevision(SnapshotStorageMixin):
+    """Store snapshots of blog post content for versioning and autosave.
+
+    Snapshots are stored delta-compressed, the content HTML as a shared blob
+    (see ``apps.cms.revision_store``).
+    """
+
+    OWNER_FIELD = "blog_post"
+
+    SHARED_FIELDS = ("content",)
 
     id: UUIDField = models.UUIDField(
         primary_key=True, default=uuid.uuid4, editable=False
@@ -44,10 +55,6 @@ class BlogPostRevision(models.Model):
         help_text="Blog post this revision belongs to",
     )
 
-    snapshot = models.JSONField(
-        help_text="Complete blog post data snapshot including content, blocks, and metadata"
-    )
-
     created_by: ForeignKey = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -117,34 +124,18 @@ class BlogPostRevision(models.Model):
         Returns:
             Created BlogPostRevision instance
         """
+        # Buffered autosaves predate this revision: write them first
+
+        flush_autosaves(
+            cls,
+            owner_id=blog_post.pk,
+            force=True,
+            user_id=user.pk if user else None,
+        )
+
         # Create complete snapshot of blog post data
 
-        snapshot_data = {
-            "title": blog_post.title,
-            "slug": blog_post.slug,
-            "excerpt": blog_post.excerpt,
-            "content": blog_post.content,
-            "blocks": blog_post.blocks,
-            "seo": blog_post.seo,
-            "status": blog_post.status,
-            "featured": blog_post.featured,
-            "allow_comments": blog_post.allow_comments,
-            "published_at": (
-                blog_post.published_at.isoformat() if blog_post.published_at else None
-            ),
-            "scheduled_publish_at": (
-                blog_post.scheduled_publish_at.isoformat()
-                if blog_post.scheduled_publish_at
-                else None
-            ),
-            "category_id": blog_post.category.id if blog_post.category else None,
-            "tag_ids": list(blog_post.tags.values_list("id", flat=True)),
-            "social_image_id": (
-                blog_post.social_image.id if blog_post.social_image else None
-            ),
-            "locale_id": blog_post.locale.id if blog_post.locale else None,
-            "author_id": blog_post.author.id if blog_post.author else None,
-        }
+        snapshot_data = cls.snapshot_data(blog_post)
 
         # Create revision
 
@@ -165,6 +156,39 @@ class BlogPostRevision(models.Model):
 
         return revision
 
+    @staticmethod
+    def snapshot_data(blog_post: "BlogPost") -> Dict[str, Any]:
+        """Serialize the versioned fields of a blog post into a snapshot dict.
+
+        Tags are read through ``tags.all()`` so a ``prefetch_related("tags")``
+        on the source queryset is honoured.
+        """
+
+        return {
+            "title": blog_post.title,
+            "slug": blog_post.slug,
+            "excerpt": blog_post.excerpt,
+            "content": blog_post.content,
+            "blocks": blog_post.blocks,
+            "seo": blog_post.seo,
+            "status": blog_post.status,
+            "featured": blog_post.featured,
+            "allow_comments": blog_post.allow_comments,
+            "published_at": (
+                blog_post.published_at.isoformat() if blog_post.published_at else None
+            ),
+            "scheduled_publish_at": (
+                blog_post.scheduled_publish_at.isoformat()
+                if blog_post.scheduled_publish_at
+                else None
+            ),
+            "category_id": blog_post.category_id,
+            "tag_ids": [tag.id for tag in blog_post.tags.all()],
+            "social_image_id": blog_post.social_image_id,
+            "locale_id": blog_post.locale_id,
+            "author_id": blog_post.author_id,
+        }
+
     @classmethod
     def cleanup_old_autosave_revisions(cls, blog_post: "BlogPost", keep_count: int = 5):
         """Clean up old autosave revisions for a blog post.
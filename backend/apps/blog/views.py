@@ -10,14 +10,15 @@ from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle
 
+from apps.cms.autosave import buffer_autosave
 from apps.core.decorators import cache_method_response, invalidate_cache
 from apps.core.pagination import StandardResultsSetPagination
 from apps.core.tasks import track_view_async
 from apps.core.throttling import (
     BurstWriteThrottle,
     PublishOperationThrottle,
+    UserRateThrottle,
     WriteOperationThrottle,
 )
 from apps.i18n.models import Locale
@@ -458,13 +459,13 @@ class BlogPostViewSet(viewsets.ModelViewSet):
 
                 blog_post.save(update_fields=updated_fields + ["updated_at"])
 
-                # Create autosave revision
+                # Buffer the revision; it is written once the editor pauses
 
-                BlogPostRevision.create_snapshot(
-                    blog_post=blog_post,
-                    user=request.user,
-                    is_autosave=True,
-                    comment="Autosave",
+                buffer_autosave(
+                    BlogPostRevision,
+                    blog_post,
+                    request.user,
+                    BlogPostRevision.snapshot_data(blog_post),
                 )
 
             return Response({"success": True})
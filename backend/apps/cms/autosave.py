@@ -0,0 +1,334 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Set
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+"""
+Write-behind buffer for editor autosaves.
+
+An autosave used to write a revision snapshot (after an existence query
+throttling them) on every edit. Edits now only replace the latest draft of
+the (object, user) pair in the cache and return; ``flush_autosaves``
+persists each draft as one coalesced autosave revision once the editor has
+been idle for ``CMS_AUTOSAVE_IDLE_SECONDS``, or once the draft is
+``CMS_AUTOSAVE_MAX_AGE`` seconds old for editors who never pause. It runs
+periodically from Celery beat, and for a single object whenever an explicit
+revision of it is created (save, publish, revert), so drafts are written
+before the revision superseding them.
+
+Drafts live in the shared cache, not in worker memory, so a restarted
+worker loses none. Each object has an index of its pending draft keys, and
+a global index lists the objects with pending drafts. Explicit revisions
+flush through the object's own index, the periodic flush through the global
+one. Index updates happen only when a draft is first buffered or flushed,
+each under a short cache lock, so concurrent edits and flushes lose no
+keys. A draft whose key fell out of an index is re-added on its next edit.
+"""
+
+
+logger = logging.getLogger(__name__)
+
+AUTOSAVE_PREFIX = "autosave"
+
+AUTOSAVE_INDEX_KEY = f"{AUTOSAVE_PREFIX}:pending"
+
+# Index updates wait up to INDEX_LOCK_ATTEMPTS * INDEX_LOCK_WAIT seconds
+
+INDEX_LOCK_TIMEOUT = 5
+
+INDEX_LOCK_ATTEMPTS = 50
+
+INDEX_LOCK_WAIT = 0.01
+
+# Drafts are flushed long before; this only bounds abandoned keys
+
+AUTOSAVE_TIMEOUT = 60 * 60 * 24
+
+AUTOSAVE_LOCK_TIMEOUT = 60
+
+AUTOSAVE_COMMENT = "Autosave"
+
+
+def get_idle_seconds() -> float:
+    return getattr(settings, "CMS_AUTOSAVE_IDLE_SECONDS", 30)
+
+
+def get_max_age() -> float:
+    return getattr(settings, "CMS_AUTOSAVE_MAX_AGE", 300)
+
+
+def draft_key(revision_model, owner_id: Any, user_id: Any) -> str:
+
+    return f"{AUTOSAVE_PREFIX}:{revision_model._meta.label_lower}:{owner_id}:{user_id}"
+
+
+def owner_index_key(revision_model, owner_id: Any) -> str:
+
+    return f"{AUTOSAVE_INDEX_KEY}:{revision_model._meta.label_lower}:{owner_id}"
+
+
+@contextmanager
+def index_lock(index_key: str):
+    """Serialize read-modify-write updates of one index across processes."""
+
+    lock_key = f"{index_key}:lock"
+
+    for _ in range(INDEX_LOCK_ATTEMPTS):
+
+        if cache.add(lock_key, True, INDEX_LOCK_TIMEOUT):
+            break
+
+        time.sleep(INDEX_LOCK_WAIT)
+
+    else:
+        # A crashed holder's lock expires; don't drop the update meanwhile
+        logger.warning("Updating autosave index %s without its lock", index_key)
+
+        yield
+
+        return
+
+    try:
+        yield
+
+    finally:
+        cache.delete(lock_key)
+
+
+def index_draft(owner_index: str, key: str) -> None:
+    """Add a draft key to its object's index and the object to the global one."""
+
+    with index_lock(owner_index):
+
+        index = cache.get(owner_index, set())
+
+        cache.set(owner_index, index | {key}, AUTOSAVE_TIMEOUT)
+
+        with index_lock(AUTOSAVE_INDEX_KEY):
+
+            owners = cache.get(AUTOSAVE_INDEX_KEY, set())
+
+            if owner_index not in owners:
+                cache.set(AUTOSAVE_INDEX_KEY, owners | {owner_index}, AUTOSAVE_TIMEOUT)
+
+
+def buffer_autosave(
+    revision_model, owner: Any, user: Any, snapshot: Dict[str, Any]
+) -> None:
+    """Keep ``snapshot`` as the latest autosave draft of ``owner`` by ``user``."""
+
+    key = draft_key(revision_model, owner.pk, user.pk)
+
+    owner_index = owner_index_key(revision_model, owner.pk)
+
+    found = cache.get_many([key, owner_index])
+
+    now = time.time()
+
+    previous = found.get(key)
+
+    cache.set(
+        key,
+        {
+            "snapshot": snapshot,
+            "first_at": previous["first_at"] if previous else now,
+            "last_at": now,
+        },
+        AUTOSAVE_TIMEOUT,
+    )
+
+    # A new draft is always re-indexed: a flush may be dropping its key from
+    # the index right after the lookup above
+
+    if previous is None or key not in found.get(owner_index, set()):
+
+        index_draft(owner_index, key)
+
+
+def get_draft(revision_model, owner_id: Any, user_id: Any) -> Optional[Dict]:
+    """The buffered draft of ``owner_id`` by ``user_id``, if any."""
+
+    return cache.get(draft_key(revision_model, owner_id, user_id))
+
+
+def is_due(draft: Dict[str, Any], now: float) -> bool:
+
+    return (
+        now - draft["last_at"] >= get_idle_seconds()
+        or now - draft["first_at"] >= get_max_age()
+    )
+
+
+def pending_drafts(revision_model=None, owner_id: Any = None) -> Dict[str, Set[str]]:
+    """Indexed draft keys by object index, optionally for one model or object."""
+
+    if revision_model is not None and owner_id is not None:
+
+        # A single object's drafts are found without the global index
+        owner_indexes = [owner_index_key(revision_model, owner_id)]
+
+    else:
+
+        prefix = AUTOSAVE_INDEX_KEY + ":"
+
+        if revision_model is not None:
+            prefix += revision_model._meta.label_lower + ":"
+
+        owner_indexes = [
+            owner_index
+            for owner_index in cache.get(AUTOSAVE_INDEX_KEY, set())
+            if owner_index.startswith(prefix)
+        ]
+
+    return cache.get_many(owner_indexes)
+
+
+def flush_autosaves(
+    revision_model=None,
+    owner_id: Any = None,
+    force: bool = False,
+    user_id: Any = None,
+) -> int:
+    """Persist buffered drafts as autosave revisions.
+
+    Args:
+        revision_model: Only flush drafts of this revision model
+        owner_id: Only flush drafts of this object (requires ``revision_model``)
+        force: Flush drafts that are not due yet
+        user_id: Also flush this user's draft of the object, even if unindexed
+
+    Returns:
+        Number of revisions created
+    """
+
+    indexes = pending_drafts(revision_model, owner_id)
+
+    keys = set().union(*indexes.values())
+
+    if user_id is not None and owner_id is not None:
+        keys.add(draft_key(revision_model, owner_id, user_id))
+
+    if not keys:
+
+        return 0
+
+    now = time.time()
+
+    drafts = cache.get_many(list(keys))
+
+    created = 0
+
+    for key, draft in drafts.items():
+
+        if not force and not is_due(draft, now):
+
+            continue
+
+        # An explicit save and the periodic flush may race for a draft
+        lock_key = f"{key}:flushing"
+
+        if not cache.add(lock_key, True, AUTOSAVE_LOCK_TIMEOUT):
+
+            continue
+
+        try:
+            created += persist_draft(key, draft)
+
+            # Keep a draft edited again while being written
+            current = cache.get(key)
+
+            if current and current["last_at"] == draft["last_at"]:
+
+                cache.delete(key)
+
+        finally:
+            cache.delete(lock_key)
+
+    forget_flushed(indexes)
+
+    return created
+
+
+def persist_draft(key: str, draft: Dict[str, Any]) -> int:
+    """Write one draft as an autosave revision; 0 if its object is gone."""
+
+    _, label, owner_id, user_id = key.split(":")
+
+    revision_model = apps.get_model(label)
+
+    owner_field = revision_model._meta.get_field(revision_model.OWNER_FIELD)
+
+    owner = owner_field.related_model.objects.filter(pk=owner_id).first()
+
+    if owner is None:
+
+        logger.info("Dropping autosave draft %s of a deleted object", key)
+
+        return 0
+
+    user_exists = get_user_model().objects.filter(pk=user_id).exists()
+
+    revision = revision_model(
+        **{revision_model.OWNER_FIELD: owner},
+        created_by_id=user_id if user_exists else None,
+        is_autosave=True,
+        comment=AUTOSAVE_COMMENT,
+    )
+
+    revision.snapshot = draft["snapshot"]
+
+    revision.save()
+
+    cleanup = getattr(revision_model, "cleanup_old_autosave_revisions", None)
+
+    if cleanup is not None:
+
+        cleanup(owner, keep_count=5)
+
+    return 1
+
+
+def forget_flushed(indexes: Dict[str, Iterable[str]]) -> None:
+    """Drop the keys of drafts no longer in the cache from their indexes.
+
+    Objects left without pending drafts are dropped from the global index.
+    """
+
+    keys = set().union(*indexes.values()) if indexes else set()
+
+    remaining = set(cache.get_many(list(keys)))
+
+    for owner_index, index_keys in indexes.items():
+
+        gone = set(index_keys) - remaining
+
+        if not gone:
+            continue
+
+        with index_lock(owner_index):
+
+            # Drafts buffered again since the check above stay indexed
+
+            gone -= set(cache.get_many(list(gone)))
+
+            if not gone:
+                continue
+
+            index = cache.get(owner_index, set()) - gone
+
+            if index:
+                cache.set(owner_index, index, AUTOSAVE_TIMEOUT)
+                continue
+
+            cache.delete(owner_index)
+
+            with index_lock(AUTOSAVE_INDEX_KEY):
+
+                owners = cache.get(AUTOSAVE_INDEX_KEY, set())
+
+                cache.set(AUTOSAVE_INDEX_KEY, owners - {owner_index}, AUTOSAVE_TIMEOUT)
@@ -0,0 +1,392 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .revision_store import blob_digest
+
+"""
+Identity-aware diff of block lists.
+
+Blocks are identified by their ``id`` when they have one and by the hash
+of their content otherwise. A longest common subsequence of the
+identities (Myers' O(ND) algorithm, linear space) anchors the blocks that
+kept their relative order; of the rest:
+
+- a block whose identity appears on both sides has moved;
+- between two anchors, an old and a new block without ids and of the same
+  type are taken to be one block, modified;
+- anything left was removed or added.
+
+Blocks matched by id whose content differs are modified as well, with a
+field-level diff of what changed. Indices are those of the old blocks for
+removals and of the new blocks otherwise, so inserting a block at the top
+of a page reports one addition instead of a modification of every block.
+"""
+
+
+Point = Tuple[int, int]
+
+
+def block_key(block: Any) -> str:
+    """Identity of a block: its id, or the hash of its content."""
+
+    if isinstance(block, dict) and block.get("id"):
+
+        return f"id:{block['id']}"
+
+    return f"hash:{blob_digest(block)}"
+
+
+def lcs_pairs(old: Sequence, new: Sequence) -> List[Point]:
+    """Index pairs of a longest common subsequence of ``old`` and ``new``."""
+
+    start = 0
+
+    while start < len(old) and start < len(new) and old[start] == new[start]:
+
+        start += 1
+
+    old_end, new_end = len(old), len(new)
+
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+
+        old_end -= 1
+
+        new_end -= 1
+
+    pairs = [(i, i) for i in range(start)]
+
+    path = _find_path(old, new, start, start, old_end, new_end)
+
+    if path:
+
+        pairs.extend(_walk_snakes(old, new, path))
+
+    pairs.extend((old_end + i, new_end + i) for i in range(len(old) - old_end))
+
+    return pairs
+
+
+def _find_path(old, new, left, top, right, bottom) -> Optional[List[Point]]:
+    """Points of a shortest edit path through the box, split at middle snakes."""
+
+    snake = _midpoint(old, new, left, top, right, bottom)
+
+    if snake is None:
+
+        return None
+
+    start, finish = snake
+
+    head = _find_path(old, new, left, top, *start) or [start]
+
+    tail = _find_path(old, new, *finish, right, bottom) or [finish]
+
+    return head + tail
+
+
+def _midpoint(old, new, left, top, right, bottom) -> Optional[Tuple[Point, Point]]:
+    """The middle snake of the box, searching from both corners at once."""
+
+    width, height = right - left, bottom - top
+
+    size = width + height
+
+    if size == 0:
+
+        return None
+
+    delta = width - height
+
+    limit = (size + 1) // 2
+
+    # Furthest x (forward) / y (backward) reached on each diagonal
+    forward = [0] * (2 * limit + 2)
+
+    backward = [0] * (2 * limit + 2)
+
+    forward[1] = left
+
+    backward[1] = bottom
+
+    for d in range(limit + 1):
+
+        for k in range(d, -d - 1, -2):
+
+            c = k - delta
+
+            if k == -d or (k != d and forward[k - 1] < forward[k + 1]):
+
+                px = x = forward[k + 1]
+
+            else:
+
+                px = forward[k - 1]
+
+                x = px + 1
+
+            y = top + (x - left) - k
+
+            py = y if d == 0 or x != px else y - 1
+
+            while x < right and y < bottom and old[x] == new[y]:
+
+                x += 1
+
+                y += 1
+
+            forward[k] = x
+
+            if size % 2 and -(d - 1) <= c <= d - 1 and y >= backward[c]:
+
+                return (px, py), (x, y)
+
+        for c in range(d, -d - 1, -2):
+
+            k = c + delta
+
+            if c == -d or (c != d and backward[c - 1] > backward[c + 1]):
+
+                py = y = backward[c + 1]
+
+            else:
+
+                py = backward[c - 1]
+
+                y = py - 1
+
+            x = left + (y - top) + k
+
+            px = x if d == 0 or y != py else x + 1
+
+            while x > left and y > top and old[x - 1] == new[y - 1]:
+
+                x -= 1
+
+                y -= 1
+
+            backward[c] = y
+
+            if not size % 2 and -d <= k <= d and x <= forward[k]:
+
+                return (x, y), (px, py)
+
+    return None
+
+
+def _walk_snakes(old, new, path: List[Point]) -> List[Point]:
+    """Matched index pairs along an edit path."""
+
+    pairs = []
+
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+
+        while x1 < x2 and y1 < y2 and old[x1] == new[y1]:
+
+            pairs.append((x1, y1))
+
+            x1, y1 = x1 + 1, y1 + 1
+
+        # At most one insertion or deletion between two snakes
+        if x2 - x1 < y2 - y1:
+
+            y1 += 1
+
+        elif x2 - x1 > y2 - y1:
+
+            x1 += 1
+
+        while x1 < x2 and y1 < y2 and old[x1] == new[y1]:
+
+            pairs.append((x1, y1))
+
+            x1, y1 = x1 + 1, y1 + 1
+
+    return pairs
+
+
+def field_changes(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Leaf-level changes between two JSON values, by dotted path."""
+
+    if isinstance(old, dict) and isinstance(new, dict):
+
+        changes = []
+
+        for key in [*old, *(key for key in new if key not in old)]:
+
+            sub_path = f"{path}.{key}" if path else str(key)
+
+            if key not in new:
+
+                changes.append({"path": sub_path, "old": old[key]})
+
+            elif key not in old:
+
+                changes.append({"path": sub_path, "new": new[key]})
+
+            elif old[key] != new[key]:
+
+                changes.extend(field_changes(old[key], new[key], sub_path))
+
+        return changes
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+
+        changes = []
+
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+
+            if old_item != new_item:
+
+                changes.extend(field_changes(old_item, new_item, f"{path}[{index}]"))
+
+        return changes
+
+    return [{"path": path, "old": old, "new": new}]
+
+
+def _block_type(block: Any) -> Any:
+
+    return block.get("type") if isinstance(block, dict) else None
+
+
+def _has_id(block: Any) -> bool:
+
+    return isinstance(block, dict) and bool(block.get("id"))
+
+
+def diff_blocks(old_blocks: List[Any], new_blocks: List[Any]) -> Dict[str, Any]:
+    """Additions, removals, moves and modifications between two block lists."""
+
+    old_keys = [block_key(block) for block in old_blocks]
+
+    new_keys = [block_key(block) for block in new_blocks]
+
+    anchors = lcs_pairs(old_keys, new_keys)
+
+    old_anchored = {i for i, _ in anchors}
+
+    new_anchored = {j for _, j in anchors}
+
+    old_left = [i for i in range(len(old_blocks)) if i not in old_anchored]
+
+    new_left = [j for j in range(len(new_blocks)) if j not in new_anchored]
+
+    # Same identity out of order: moved
+    unmatched_new = {}
+
+    for j in new_left:
+
+        unmatched_new.setdefault(new_keys[j], []).append(j)
+
+    moves = []
+
+    for i in old_left:
+
+        candidates = unmatched_new.get(old_keys[i])
+
+        if candidates:
+
+            moves.append((i, candidates.pop(0)))
+
+    moved_old = {i for i, _ in moves}
+
+    moved_new = {j for _, j in moves}
+
+    old_left = [i for i in old_left if i not in moved_old]
+
+    new_left = [j for j in new_left if j not in moved_new]
+
+    # Blocks without ids edited in place: same gap between anchors, same type
+    gap_of_old = _gaps(anchors, len(old_blocks), side=0)
+
+    gap_of_new = _gaps(anchors, len(new_blocks), side=1)
+
+    edited = []
+
+    remaining_new = list(new_left)
+
+    for i in old_left:
+
+        if _has_id(old_blocks[i]):
+
+            continue
+
+        for j in remaining_new:
+
+            if (
+                gap_of_new[j] == gap_of_old[i]
+                and not _has_id(new_blocks[j])
+                and _block_type(new_blocks[j]) == _block_type(old_blocks[i])
+            ):
+
+                edited.append((i, j))
+
+                remaining_new.remove(j)
+
+                break
+
+    edited_old = {i for i, _ in edited}
+
+    diff = {
+        "has_changes": False,
+        "added": [{"index": j, "block": new_blocks[j]} for j in remaining_new],
+        "removed": [
+            {"index": i, "block": old_blocks[i]}
+            for i in old_left
+            if i not in edited_old
+        ],
+        "modified": [],
+        "moved": [
+            {
+                "old_index": i,
+                "index": j,
+                "type": _block_type(new_blocks[j]),
+                "key": new_keys[j],
+            }
+            for i, j in moves
+        ],
+        "reordered": bool(moves),
+    }
+
+    for i, j in sorted([*anchors, *moves, *edited], key=lambda pair: pair[1]):
+
+        if old_blocks[i] != new_blocks[j]:
+
+            diff["modified"].append(
+                {
+                    "index": j,
+                    "old_index": i,
+                    "old": old_blocks[i],
+                    "new": new_blocks[j],
+                    "fields": field_changes(old_blocks[i], new_blocks[j]),
+                }
+            )
+
+    diff["has_changes"] = bool(
+        diff["added"] or diff["removed"] or diff["modified"] or diff["moved"]
+    )
+
+    return diff
+
+
+def _gaps(anchors: List[Point], length: int, side: int) -> List[int]:
+    """For each index on one side, the number of anchors before it."""
+
+    gaps = []
+
+    anchor_indices = iter(pair[side] for pair in anchors)
+
+    next_anchor = next(anchor_indices, None)
+
+    count = 0
+
+    for index in range(length):
+
+        if index == next_anchor:
+
+            count += 1
+
+            next_anchor = next(anchor_indices, None)
+
+        gaps.append(count)
+
+    return gaps
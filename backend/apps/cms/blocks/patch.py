@@ -0,0 +1,323 @@
+import copy
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.parsers import JSONParser
+
+from apps.core.conditional import make_etag
+
+from .validation import validate_blocks
+
+"""JSON Patch (RFC 6902) editing of page blocks.
+
+Operations address blocks by JSON Pointer under ``/blocks``, e.g.
+``/blocks/2/props/title`` or ``/blocks/-`` to append. Untouched blocks are
+shared with the page rather than copied: a block is deep-copied the first
+time an operation writes inside it, so after the patch the copies (and
+blocks added by it) are exactly the blocks that need validating. Moving a
+whole block does not change it and does not revalidate it.
+
+The revision token is derived from the page's ``updated_at``; the patched
+blocks are written with a single ``UPDATE`` conditional on it, so a
+concurrent save between reading and writing the page fails the patch
+instead of being overwritten.
+"""
+
+
+OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+ARRAY_INDEX = re.compile(r"0|[1-9][0-9]*")
+
+ERROR_INDEX = re.compile(r"^blocks\[(\d+)\]")
+
+
+class JSONPatchParser(JSONParser):
+    """Parses ``application/json-patch+json`` request bodies."""
+
+    media_type = "application/json-patch+json"
+
+
+class BlockPatchError(Exception):
+    """An operation that cannot be applied."""
+
+    def __init__(self, message: str, op: Optional[int] = None):
+
+        super().__init__(message)
+
+        self.op = op
+
+
+class BlockPatchTestFailed(BlockPatchError):
+    """A ``test`` operation did not match: the client's view is out of date."""
+
+
+def block_revision(page) -> str:
+    """Revision token (a quoted ETag) of the page's blocks."""
+
+    return make_etag("blocks", page.pk, page.updated_at.isoformat())
+
+
+def parse_pointer(pointer: Any) -> List[str]:
+    """Reference tokens of a JSON Pointer into ``/blocks``, without ``blocks``."""
+
+    if not isinstance(pointer, str) or not pointer.startswith("/blocks/"):
+
+        raise BlockPatchError(f"Path must point into /blocks: {pointer!r}")
+
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer.split("/")[2:]
+    ]
+
+
+class BlockPatch:
+    """Applies operations to a page's blocks, copying only what they touch."""
+
+    def __init__(self, blocks: List[Dict[str, Any]]):
+
+        self.blocks = list(blocks)
+
+        # Blocks owned by this patch, by id (values keep them alive)
+        self._fresh: Dict[int, Dict[str, Any]] = {}
+
+    def apply(self, operations: Any) -> "BlockPatch":
+
+        if not isinstance(operations, list):
+
+            raise BlockPatchError("Patch must be a list of operations")
+
+        for index, operation in enumerate(operations):
+
+            try:
+                self._apply(operation)
+
+            except BlockPatchError as e:
+
+                e.op = index
+
+                raise
+
+        return self
+
+    def changed(self) -> List[int]:
+        """Indices of the blocks added or modified by the patch."""
+
+        return [
+            index for index, block in enumerate(self.blocks) if id(block) in self._fresh
+        ]
+
+    def validate(self) -> List[int]:
+        """Validate the changed blocks; returns their indices."""
+
+        changed = self.changed()
+
+        try:
+            validate_blocks([self.blocks[index] for index in changed])
+
+        except DRFValidationError as e:
+
+            # Errors are reported against the position in the page
+            for error in e.detail.get("errors", []):
+
+                error["path"] = ERROR_INDEX.sub(
+                    lambda match: f"blocks[{changed[int(match.group(1))]}]",
+                    str(error["path"]),
+                )
+
+            raise
+
+        return changed
+
+    def _apply(self, operation: Any) -> None:
+
+        if not isinstance(operation, dict) or operation.get("op") not in OPERATIONS:
+
+            raise BlockPatchError(f"Operation must be one of {', '.join(OPERATIONS)}")
+
+        op = operation["op"]
+
+        path = parse_pointer(operation.get("path"))
+
+        if op in ("add", "replace", "test") and "value" not in operation:
+
+            raise BlockPatchError(f"'{op}' requires a value")
+
+        if op == "add":
+
+            self._add(path, copy.deepcopy(operation["value"]))
+
+        elif op == "remove":
+
+            self._remove(path)
+
+        elif op == "replace":
+
+            self._remove(path)
+
+            self._add(path, copy.deepcopy(operation["value"]))
+
+        elif op == "test":
+
+            if self._get(path) != operation["value"]:
+
+                raise BlockPatchTestFailed(f"Test failed at {operation['path']}")
+
+        else:
+
+            source = parse_pointer(operation.get("from"))
+
+            if op == "copy":
+
+                self._add(path, copy.deepcopy(self._get(source)))
+
+            elif source != path:
+
+                if path[: len(source)] == source:
+
+                    raise BlockPatchError("Cannot move a value into itself")
+
+                # A whole block keeps its content and is not revalidated
+                self._add(path, self._remove(source), fresh=len(source) > 1)
+
+    def _own(self, index: int) -> Dict[str, Any]:
+        """The block at ``index``, copied first if still shared."""
+
+        block = self.blocks[index]
+
+        if id(block) not in self._fresh:
+
+            block = copy.deepcopy(block)
+
+            self.blocks[index] = block
+
+            self._fresh[id(block)] = block
+
+        return block
+
+    def _parent(self, path: List[str], writing: bool) -> Tuple[Any, str]:
+        """Container of the value at ``path`` and its key in it."""
+
+        if len(path) == 1:
+
+            return self.blocks, path[0]
+
+        index = _index(path[0], self.blocks)
+
+        container = self._own(index) if writing else self.blocks[index]
+
+        for token in path[1:-1]:
+
+            container = _child(container, token)
+
+        return container, path[-1]
+
+    def _get(self, path: List[str]) -> Any:
+
+        container, key = self._parent(path, writing=False)
+
+        return _child(container, key)
+
+    def _add(self, path: List[str], value: Any, fresh: bool = True) -> None:
+
+        container, key = self._parent(path, writing=True)
+
+        if isinstance(container, list):
+
+            container.insert(_index(key, container, end=True), value)
+
+        elif isinstance(container, dict):
+
+            container[key] = value
+
+        else:
+
+            raise BlockPatchError(f"Cannot add to a {type(container).__name__}")
+
+        if container is self.blocks and fresh:
+
+            self._fresh[id(value)] = value
+
+    def _remove(self, path: List[str]) -> Any:
+
+        container, key = self._parent(path, writing=True)
+
+        if isinstance(container, list):
+
+            return container.pop(_index(key, container))
+
+        if isinstance(container, dict) and key in container:
+
+            return container.pop(key)
+
+        raise BlockPatchError(f"No value at /blocks/{'/'.join(path)}")
+
+
+def _index(token: str, array: list, end: bool = False) -> int:
+    """Array index of ``token``; ``end`` allows inserting past the last item."""
+
+    if end and token == "-":
+
+        return len(array)
+
+    if not ARRAY_INDEX.fullmatch(token):
+
+        raise BlockPatchError(f"Invalid array index: {token!r}")
+
+    index = int(token)
+
+    if index > len(array) or (index == len(array) and not end):
+
+        raise BlockPatchError(f"Array index out of range: {index}")
+
+    return index
+
+
+def _child(container: Any, token: str) -> Any:
+
+    if isinstance(container, list):
+
+        return container[_index(token, container)]
+
+    if isinstance(container, dict) and token in container:
+
+        return container[token]
+
+    raise BlockPatchError(f"No value at {token!r}")
+
+
+def save_blocks(page, blocks: List[Dict[str, Any]]) -> bool:
+    """Store ``blocks`` unless the page changed since it was read.
+
+    One conditional ``UPDATE``; ``post_save`` is then sent as by ``save()``
+    (revisions, translation units, caches and public documents follow it).
+    """
+
+    updated_at = timezone.now()
+
+    saved = (
+        type(page)
+        .objects.filter(pk=page.pk, updated_at=page.updated_at)
+        .update(blocks=blocks, updated_at=updated_at)
+    )
+
+    if not saved:
+
+        return False
+
+    page.blocks = blocks
+
+    page.updated_at = updated_at
+
+    post_save.send(
+        sender=type(page),
+        instance=page,
+        created=False,
+        update_fields=frozenset({"blocks", "updated_at"}),
+        raw=False,
+        using=page._state.db,
+    )
+
+    return True
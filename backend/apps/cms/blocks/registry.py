@@ -1,12 +1,121 @@
+from typing import Any, Callable, Dict, Tuple
+
+from rest_framework.renderers import JSONRenderer
+
 from apps.cms.models import BlockType
+from apps.core.conditional import get_content_versions, make_etag
+
+from .validation import BLOCK_TYPES_VERSION
 
 """
 Block registry utilities for the CMS.
 
 Provides helper functions to work with block types and metadata.
+
+Active block types are loaded into ``block_type_registry`` once per process
+and reloaded when the ``block_types`` content version changes, which saving
+or deleting a ``BlockType`` (and the bulk update endpoint) bumps; checking
+it is one cache read. JSON rendered from the registry is kept with it, so
+the block type endpoints serve a stored body and ETag.
 """
 
 
+# BlockType fields held in the registry
+
+REGISTRY_FIELDS = (
+    "type",
+    "component",
+    "label",
+    "description",
+    "category",
+    "icon",
+    "preload",
+    "editing_mode",
+    "schema",
+    "default_props",
+    "model_name",
+    "data_source",
+    "api_endpoint",
+    "query_schema",
+)
+
+
+class RegistrySnapshot:
+    """The active block types at one content version."""
+
+    def __init__(self, version: int, block_types: Dict[str, Dict[str, Any]]):
+
+        self.version = version
+
+        self.block_types = block_types
+
+        self.rendered: Dict[str, Tuple[str, bytes]] = {}
+
+
+class BlockTypeRegistry:
+    """
+    Active block types, loaded lazily once per process.
+
+    Readers get the snapshot of the current content version; a stale one is
+    replaced in one assignment, so concurrent readers keep the old one.
+    """
+
+    def __init__(self):
+
+        self._snapshot = None
+
+    def snapshot(self) -> RegistrySnapshot:
+
+        version = get_content_versions(BLOCK_TYPES_VERSION)[BLOCK_TYPES_VERSION]
+
+        snapshot = self._snapshot
+
+        if snapshot is None or snapshot.version != version:
+
+            snapshot = RegistrySnapshot(version, self._load())
+
+            self._snapshot = snapshot
+
+        return snapshot
+
+    def block_types(self) -> Dict[str, Dict[str, Any]]:
+        """Active block types by type; shared, so not to be modified."""
+
+        return self.snapshot().block_types
+
+    def rendered(
+        self, name: str, build: Callable[[Dict[str, Dict[str, Any]]], Any]
+    ) -> Tuple[str, bytes]:
+        """ETag and JSON body of ``build(block_types)``, rendered once per version."""
+
+        snapshot = self.snapshot()
+
+        entry = snapshot.rendered.get(name)
+
+        if entry is None:
+
+            body = JSONRenderer().render(build(snapshot.block_types))
+
+            entry = (make_etag(name, snapshot.version), body)
+
+            snapshot.rendered[name] = entry
+
+        return entry
+
+    def clear(self) -> None:
+
+        self._snapshot = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+
+        block_types = BlockType.objects.filter(is_active=True).values(*REGISTRY_FIELDS)
+
+        return {block_type["type"]: block_type for block_type in block_types}
+
+
+block_type_registry = BlockTypeRegistry()
+
+
 def get_block_metadata():
     """
     Get metadata for all active block types for API responses.
@@ -15,7 +124,7 @@ def get_block_metadata():
     to maintain consistency and avoid code duplication.
 
     Returns:
-        QuerySet: Block type metadata for active blocks
+        list: Block type metadata for active blocks
     """
 
     return BlockType.get_block_metadata()
@@ -26,10 +135,10 @@ def get_block_registry():
     Get the full block registry for all active block types.
 
     Returns:
-        QuerySet: Full block registry data
+        dict: Full block registry data, keyed by block type
     """
 
-    return BlockType.get_registry()
+    return BlockType.get_registry_dict()
 
 
 def get_block_by_type(block_type):
@@ -1,14 +1,33 @@
 # mypy: ignore-errors
 
-from typing import Any, Dict, List, Literal, Optional
-
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import connection
 
+import jsonschema
 from pydantic import BaseModel, Field, ValidationError
 from rest_framework.exceptions import ValidationError as DRFValidationError
 
-from ..security import sanitize_blocks
+from apps.core.conditional import get_content_versions
+
+from ..security import get_sanitization_config, sanitize_block_content
+
+logger = logging.getLogger(__name__)
+
+# Content version bumped whenever a BlockType changes
+
+BLOCK_TYPES_VERSION = "block_types"
+
+# Validates one block: returns the validated block and errors relative to it
+
+BlockValidator = Callable[[Dict[str, Any]], Tuple[Dict[str, Any], List[Dict[str, str]]]]
 
 
 class BaseBlockModel(BaseModel):
@@ -165,149 +184,320 @@ BLOCK_MODELS: Dict[str, type[BaseBlockModel]] = {
 }
 
 
-def validate_blocks(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _model_validator(model_class: type[BaseBlockModel]) -> BlockValidator:
+    """Validator of a block with a Pydantic model."""
+
+    def validate(block_data):
+
+        try:
+
+            return model_class.model_validate(block_data).model_dump(), []
+
+        except ValidationError as e:
+
+            # Convert Pydantic errors to DRF format
+
+            return block_data, [
+                {
+                    "path": ".".join([str(loc) for loc in error["loc"]]),
+                    "msg": error["msg"],
+                }
+                for error in e.errors()
+            ]
+
+    return validate
+
+
+def _schema_validator(block_type: str, schema: Dict[str, Any]) -> BlockValidator:
+    """Validator of a database-only block type, checking props against its schema."""
+
+    checker = None
+
+    if schema:
+
+        try:
+
+            checker_class = jsonschema.validators.validator_for(schema)
+
+            checker_class.check_schema(schema)
+
+            checker = checker_class(schema)
+
+        except jsonschema.SchemaError as e:
+
+            logger.warning(
+                "Ignoring invalid schema of block type %s: %s", block_type, e
+            )
+
+    def validate(block_data):
+
+        validated = block_data.copy()
+
+        # Ensure required fields exist
+
+        validated.setdefault("props", {})
+
+        if checker is None:
+
+            return validated, []
+
+        return validated, [
+            {
+                "path": ".".join(["props", *[str(p) for p in error.absolute_path]]),
+                "msg": error.message,
+            }
+            for error in checker.iter_errors(validated["props"])
+        ]
+
+    return validate
+
+
+class CompiledBlockRegistry:
     """
-    Validate a list of blocks using database-driven block types and Pydantic models.
+    Validators of all known block types, compiled once per process.
 
-    Returns validated and sanitized blocks or raises DRF ValidationError.
+    Recompiled when the ``block_types`` content version changes, which
+    saving or deleting a ``BlockType`` bumps; checking it is one cache read.
     """
-    if not isinstance(blocks, list):
 
-        raise DRFValidationError(
-            {"errors": [{"path": "blocks", "msg": "Must be a list"}]}
-        )
+    def __init__(self):
 
-    # Import here to avoid circular imports
-    # Check if database is available and BlockType table exists
-    db_block_types = {}
+        self._version = None
 
-    try:
-        if (
-            connection.introspection.table_names()
-            and "cms_blocktype" in connection.introspection.table_names()
-        ):
-            # Import BlockType here to avoid circular import
-            from ..models import BlockType
+        self._validators: Dict[str, BlockValidator] = {}
 
-            # Get active block types from database
-            db_block_types = {
-                bt.type: bt for bt in BlockType.objects.filter(is_active=True)
-            }
+    def validators(self) -> Dict[str, BlockValidator]:
 
-    except Exception:  # nosec B110
-        # Database not ready or table doesn't exist, continue with static validation
-        # This is intentional - we fall back to static validation when DB is unavailable
-        pass
+        version = get_content_versions(BLOCK_TYPES_VERSION)[BLOCK_TYPES_VERSION]
 
-    # First pass: Sanitize HTML content in blocks
+        if version != self._version:
 
-    sanitized_blocks = sanitize_blocks(blocks)
+            validators = self._compile()
 
-    validated_blocks = []
+            # Swapped in one assignment; concurrent readers keep the old dict
+            self._validators, self._version = validators, version
 
-    errors = []
+            block_memo.clear()
 
-    for index, block_data in enumerate(sanitized_blocks):
+        return self._validators
 
-        if not isinstance(block_data, dict):
-            errors.append(
-                {"path": f"blocks[{index}]", "msg": "Block must be an object"}
-            )
-            continue
+    @property
+    def version(self):
 
-        block_type = block_data.get("type")
+        return self._version
 
-        if not block_type:
-            errors.append(
-                {"path": f"blocks[{index}].type", "msg": "Block type is required"}
+    def clear(self) -> None:
+
+        self._version = None
+
+    def _compile(self) -> Dict[str, BlockValidator]:
+
+        # Static models take precedence over database block types
+        validators = {
+            block_type: _model_validator(model_class)
+            for block_type, model_class in BLOCK_MODELS.items()
+        }
+
+        for block_type, schema in self._load_db_block_types():
+
+            if block_type not in validators:
+
+                validators[block_type] = _schema_validator(block_type, schema)
+
+        return validators
+
+    def _load_db_block_types(self):
+
+        try:
+            from ..models import BlockType
+
+            if BlockType._meta.db_table not in connection.introspection.table_names():
+                return []
+
+            return list(
+                BlockType.objects.filter(is_active=True).values_list("type", "schema")
             )
-            continue
 
-        # Check if block type exists in database (primary validation)
+        except Exception:  # nosec B110
+            # Database not ready or table doesn't exist, continue with static validation
+            # This is intentional - we fall back to static validation when DB is unavailable
+            return []
+
+
+block_registry = CompiledBlockRegistry()
+
+
+class BlockMemo:
+    """
+    Validated blocks by content hash.
+
+    Pages are saved whole, but an edit usually touches a block or two: a block
+    whose canonical JSON already passed sanitization and validation with the
+    same validators and sanitizer configuration is taken from here. Entries
+    are kept encoded, so every hit is a fresh copy the caller may mutate.
+    """
+
+    def __init__(self):
+
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+        self._lock = threading.Lock()
+
+    def key(self, block_data: Dict[str, Any], salt: str) -> Optional[str]:
+
+        try:
+            canonical = json.dumps(block_data, sort_keys=True, separators=(",", ":"))
 
-        if block_type not in db_block_types:
+        except (TypeError, ValueError):
+            return None
 
-            # Fallback to hardcoded models for backwards compatibility
+        return hashlib.blake2b(
+            f"{salt}\0{canonical}".encode(), digest_size=16
+        ).hexdigest()
 
-            if block_type not in BLOCK_MODELS:
-                errors.append(
-                    {
-                        "path": f"blocks[{index}].type",
-                        "msg": f"Unknown block type: {block_type}",
-                    }
-                )
-                continue
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
 
-        # Validate block using appropriate Pydantic model (if available)
+        with self._lock:
 
-        validated_block_dict = block_data.copy()
+            encoded = self._entries.get(key)
 
-        if block_type in BLOCK_MODELS:
+            if encoded is None:
+                return None
 
-            try:
+            self._entries.move_to_end(key)
 
-                model_class = BLOCK_MODELS[block_type]
+        return json.loads(encoded)
 
-                validated_block = model_class(**block_data)
+    def set(self, key: str, block_data: Dict[str, Any]) -> None:
 
-                validated_block_dict = validated_block.dict()
+        try:
+            encoded = json.dumps(block_data)
 
-                # Handle nested blocks (for columns)
+        except (TypeError, ValueError):
+            return
 
-                if block_type == "columns" and "blocks" in block_data:
+        size = getattr(settings, "CMS_BLOCK_MEMO_SIZE", 4096)
 
-                    try:
+        with self._lock:
 
-                        validated_nested = validate_blocks(block_data["blocks"])
+            self._entries[key] = encoded
 
-                        validated_block_dict["blocks"] = validated_nested
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
 
-                    except DRFValidationError as nested_error:
+    def clear(self) -> None:
 
-                        # Re-path nested errors
+        with self._lock:
+            self._entries.clear()
 
-                        for error in nested_error.detail.get("errors", []):
-                            errors.append(
-                                {
-                                    "path": f"blocks[{index}].{error['path']}",
-                                    "msg": error["msg"],
-                                }
-                            )
 
-            except ValidationError as e:
+block_memo = BlockMemo()
 
-                # Convert Pydantic errors to DRF format
 
-                for error in e.errors():
+def validate_blocks(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Validate a list of blocks using database-driven block types and Pydantic models.
 
-                    field_path = ".".join([str(loc) for loc in error["loc"]])
-                    errors.append(
-                        {"path": f"blocks[{index}].{field_path}", "msg": error["msg"]}
-                    )
+    Returns validated and sanitized blocks or raises DRF ValidationError.
+    """
+    if not isinstance(blocks, list):
 
-        # Basic validation for database-only block types
+        raise DRFValidationError(
+            {"errors": [{"path": "blocks", "msg": "Must be a list"}]}
+        )
+
+    validators = block_registry.validators()
 
-        elif block_type in db_block_types:
+    salt = f"{block_registry.version}:{get_sanitization_config()!r}"
 
-            # Ensure required fields exist
+    validated_blocks = []
 
-            if "props" not in validated_block_dict:
+    errors = []
 
-                validated_block_dict["props"] = {}
+    for index, block_data in enumerate(blocks):
 
-            # Validate against database schema if available
+        key = block_memo.key(block_data, salt) if isinstance(block_data, dict) else None
 
-            db_block_type = db_block_types[block_type]
+        cached = block_memo.get(key) if key else None
 
-            if db_block_type.schema:
-                # TODO: Add JSON schema validation here if needed
-                # For now, we trust the frontend to send valid data
-                pass
+        if cached is not None:
+
+            validated_blocks.append(cached)
+
+            continue
 
-        validated_blocks.append(validated_block_dict)
+        # Sanitize HTML content, then validate
+
+        validated_block, block_errors = _validate_block(
+            sanitize_block_content(block_data), validators, f"blocks[{index}]"
+        )
+
+        if block_errors:
+
+            errors.extend(block_errors)
+
+            continue
+
+        if key:
+            block_memo.set(key, validated_block)
+
+        validated_blocks.append(validated_block)
 
     if errors:
 
         raise DRFValidationError({"errors": errors})
 
     return validated_blocks
+
+
+def _validate_block(block_data, validators, path):
+    """Validate one sanitized block; returns the block and errors under ``path``."""
+
+    if not isinstance(block_data, dict):
+        return None, [{"path": path, "msg": "Block must be an object"}]
+
+    block_type = block_data.get("type")
+
+    if not block_type:
+        return None, [{"path": f"{path}.type", "msg": "Block type is required"}]
+
+    validate = validators.get(block_type)
+
+    if validate is None:
+        return None, [
+            {"path": f"{path}.type", "msg": f"Unknown block type: {block_type}"}
+        ]
+
+    validated_block_dict, block_errors = validate(block_data)
+
+    errors = [
+        {"path": f"{path}.{error['path']}", "msg": error["msg"]}
+        for error in block_errors
+    ]
+
+    # Handle nested blocks (for columns); sanitized along with their parent
+
+    if not errors and block_type == "columns" and "blocks" in block_data:
+
+        nested = block_data["blocks"]
+
+        if not isinstance(nested, list):
+            return validated_block_dict, [
+                {"path": f"{path}.blocks", "msg": "Must be a list"}
+            ]
+
+        validated_nested = []
+
+        for index, nested_block in enumerate(nested):
+
+            validated_nested_block, nested_errors = _validate_block(
+                nested_block, validators, f"{path}.blocks[{index}]"
+            )
+
+            validated_nested.append(validated_nested_block)
+
+            errors.extend(nested_errors)
+
+        validated_block_dict["blocks"] = validated_nested
+
+    return validated_block_dict, errors
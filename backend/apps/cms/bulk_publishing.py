@@ -0,0 +1,294 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.blog.models import BlogPost
+from apps.core.cache import cache_manager
+from apps.registry.registry import content_registry
+
+from . import documents, menus, sitemaps
+from .models import Page
+
+"""
+Bulk state transitions for scheduled publishing.
+
+Due rows are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` and flipped
+to ``published`` with a single ``UPDATE`` per batch, so several beat workers
+can run concurrently without publishing the same row twice. Because the
+``UPDATE`` bypasses ``save()`` and its signals, the work those signals do
+(search indexing, dashboard search documents, cache invalidation, public
+page documents, menus, sitemap refresh and revision snapshots) runs afterwards
+as batched post-steps.
+"""
+
+
+logger = logging.getLogger(__name__)
+
+
+PUBLISH_BATCH_SIZE = 500
+
+
+@dataclass
+class BulkPublishResult:
+    published: Dict[str, List[int]] = field(default_factory=dict)
+
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def published_count(self) -> int:
+        return sum(len(ids) for ids in self.published.values())
+
+
+def due_queryset(model, now):
+    """Rows of ``model`` scheduled to be published at or before ``now``."""
+
+    return model.objects.filter(
+        status="scheduled", published_at__lte=now, published_at__isnull=False
+    )
+
+
+def claim_and_publish_batch(model, now, batch_size: int = PUBLISH_BATCH_SIZE):
+    """Lock up to ``batch_size`` due rows and publish them in one ``UPDATE``.
+
+    Must run inside a transaction; rows locked by another worker are skipped.
+    Returns the published primary keys.
+    """
+
+    ids = list(
+        due_queryset(model, now)
+        .select_for_update(skip_locked=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+
+    if ids:
+        model.objects.filter(pk__in=ids, status="scheduled").update(
+            status="published", updated_at=now
+        )
+
+    return ids
+
+
+# Post-steps replacing the per-row post_save signal handlers
+
+
+def reindex_published(model, objects: List[Any]) -> None:
+    """Index freshly published objects in one bulk pass."""
+
+    if not objects or not content_registry.is_model_registered(model):
+        return
+
+    from apps.search.services import get_search_service
+
+    get_search_service().index_objects(objects)
+
+
+def refresh_admin_search(objects: List[Any]) -> None:
+    """Update the status shown by the dashboard search bar."""
+
+    from apps.search import admin_search
+
+    admin_search.index_objects(objects)
+
+
+def invalidate_page_caches(pages: List[Page]) -> None:
+
+    parent_ids = {page.parent_id for page in pages if page.parent_id}
+
+    parents = Page.objects.filter(pk__in=parent_ids).values_list("locale__code", "path")
+
+    for page in pages:
+        cache_manager.invalidate_page(locale=page.locale.code, path=page.path)
+
+    for locale_code, path in parents:
+        cache_manager.invalidate_page(locale=locale_code, path=path)
+
+    documents.discard_pages(pages)
+
+    in_menus = [page for page in pages if menus.menu_state(page) is not None]
+
+    if in_menus:
+        menus.schedule_rebuild({page.locale.code for page in in_menus})
+
+
+def invalidate_blog_caches(posts: List[BlogPost]) -> None:
+
+    for post in posts:
+        cache_manager.invalidate_blog_post(locale=post.locale.code, slug=post.slug)
+
+    for category_id in {post.category_id for post in posts if post.category_id}:
+        cache_manager.delete_pattern(f"api:blog:category:{category_id}:*")
+
+
+def refresh_sitemaps_for(objects: List[Any]) -> None:
+
+    for locale_code in {obj.locale.code for obj in objects}:
+
+        cache_manager.invalidate_sitemap(locale_code)
+
+        sitemaps.schedule_refresh(locale_code)
+
+
+def create_page_revisions(pages: List[Page]) -> None:
+
+    from .versioning import PageRevision
+
+    PageRevision.objects.bulk_create(
+        [
+            PageRevision(
+                page=page,
+                snapshot=PageRevision.snapshot_data(page),
+                is_published_snapshot=True,
+                comment="Scheduled publish",
+            )
+            for page in pages
+        ]
+    )
+
+
+def create_blog_revisions(posts: List[BlogPost]) -> None:
+    """Snapshot posts that do not have a published revision yet."""
+
+    from apps.blog.versioning import BlogPostRevision
+
+    snapshotted = set(
+        BlogPostRevision.objects.filter(
+            blog_post__in=posts, is_published_snapshot=True
+        ).values_list("blog_post_id", flat=True)
+    )
+
+    BlogPostRevision.objects.bulk_create(
+        [
+            BlogPostRevision(
+                blog_post=post,
+                snapshot=BlogPostRevision.snapshot_data(post),
+                is_published_snapshot=True,
+                comment="Automatic snapshot on publish",
+            )
+            for post in posts
+            if post.pk not in snapshotted
+        ]
+    )
+
+
+@dataclass(frozen=True)
+class PublishTarget:
+    """A schedulable model and the batched post-steps run after publishing."""
+
+    label: str
+
+    model: Any
+
+    load: Callable[[List[int]], List[Any]]
+
+    invalidate_caches: Callable[[List[Any]], None]
+
+    create_revisions: Callable[[List[Any]], None]
+
+
+def _load_pages(ids):
+    return list(Page.objects.filter(pk__in=ids).select_related("locale"))
+
+
+def _load_posts(ids):
+    return list(
+        BlogPost.objects.filter(pk__in=ids)
+        .select_related("locale", "category", "author")
+        .prefetch_related("tags")
+    )
+
+
+PUBLISH_TARGETS = [
+    PublishTarget(
+        "page", Page, _load_pages, invalidate_page_caches, create_page_revisions
+    ),
+    PublishTarget(
+        "blog_post",
+        BlogPost,
+        _load_posts,
+        invalidate_blog_caches,
+        create_blog_revisions,
+    ),
+]
+
+
+def run_post_publish_steps(target: PublishTarget, ids: List[int]) -> List[str]:
+    """Run the batched post-steps for one published batch.
+
+    Each step is isolated so a failing step doesn't prevent the others;
+    failures are returned as error messages.
+    """
+
+    errors = []
+
+    objects = target.load(ids)
+
+    steps = [
+        ("search reindex", lambda: reindex_published(target.model, objects)),
+        ("admin search", lambda: refresh_admin_search(objects)),
+        ("cache invalidation", lambda: target.invalidate_caches(objects)),
+        ("sitemap refresh", lambda: refresh_sitemaps_for(objects)),
+        ("revisions", lambda: target.create_revisions(objects)),
+    ]
+
+    for name, step in steps:
+
+        try:
+            step()
+        except Exception as e:
+            error_msg = (
+                f"Post-publish {name} failed for {len(ids)} {target.label}(s): {e}"
+            )
+
+            logger.error(error_msg)
+
+            errors.append(error_msg)
+
+    return errors
+
+
+def publish_due_content(
+    now=None,
+    batch_size: int = PUBLISH_BATCH_SIZE,
+    targets: Optional[List[PublishTarget]] = None,
+) -> BulkPublishResult:
+    """Publish all scheduled content due at ``now``, batch by batch."""
+
+    now = now or timezone.now()
+
+    result = BulkPublishResult()
+
+    for target in targets or PUBLISH_TARGETS:
+
+        published = result.published.setdefault(target.label, [])
+
+        while True:
+
+            try:
+                with transaction.atomic():
+                    ids = claim_and_publish_batch(target.model, now, batch_size)
+            except Exception as e:
+                error_msg = f"Failed to publish {target.label} batch: {e}"
+
+                logger.error(error_msg)
+
+                result.errors.append(error_msg)
+
+                break
+
+            if not ids:
+                break
+
+            published.extend(ids)
+
+            result.errors.extend(run_post_publish_steps(target, ids))
+
+            logger.info("Published %s scheduled %s(s)", len(ids), target.label)
+
+            if len(ids) < batch_size:
+                break
+
+    return result
@@ -0,0 +1,188 @@
+import hashlib
+import logging
+from typing import Iterable, Optional
+
+from django.db import IntegrityError, transaction
+
+from rest_framework.renderers import JSONRenderer
+
+from .models import Page, PublicPageDocument
+
+"""
+Materialized public page documents.
+
+The ``get_by_path`` response of a published page depends on the page, its
+locale's SEO settings and the pages sharing its ``group_id`` (hreflang
+alternates). Rather than resolving those on every request, the document is
+rendered when one of them changes and stored keyed by ``(locale, path)``.
+
+Documents are rendered against a marker base URL which is replaced by the
+requesting host when served, so one document serves every host the API is
+reached through. Pages are rebuilt synchronously when saved; SEO settings
+and locale changes drop the affected documents at once and queue
+``apps.cms.tasks.rebuild_page_documents`` to render them again. A published
+page without a document (e.g. after bulk publishing) is rendered by its
+first request.
+"""
+
+
+logger = logging.getLogger(__name__)
+
+
+# Reserved TLD: never part of real content
+
+BASE_URL_MARKER = "https://public-document.invalid"
+
+
+class MarkerRequest:
+    """Stands in for the request PublicPageSerializer builds URLs from."""
+
+    def build_absolute_uri(self, location: str = "/") -> str:
+
+        return f"{BASE_URL_MARKER}{location}"
+
+
+def render_document(page: Page) -> PublicPageDocument:
+    """Render an unsaved document of ``page``."""
+
+    from .serializers import PublicPageSerializer
+
+    data = PublicPageSerializer(page, context={"request": MarkerRequest()}).data
+
+    body = JSONRenderer().render(data)
+
+    return PublicPageDocument(
+        page=page,
+        locale_code=page.locale.code,
+        path=page.path,
+        body=body,
+        digest=hashlib.sha1(body, usedforsecurity=False).hexdigest(),
+        last_modified=page.updated_at,
+    )
+
+
+def is_public(page: Page) -> bool:
+
+    return page.status == "published" and page.locale.is_active
+
+
+def rebuild(page: Page) -> None:
+    """Render and store the document of ``page``, or drop it if not public."""
+
+    if not is_public(page):
+
+        PublicPageDocument.objects.filter(page=page).delete()
+
+        return
+
+    document = render_document(page)
+
+    # A document left at this path by a page since moved away
+    PublicPageDocument.objects.filter(
+        locale_code=document.locale_code, path=document.path
+    ).exclude(page=page).delete()
+
+    PublicPageDocument.objects.update_or_create(
+        page=page,
+        defaults={
+            field: getattr(document, field)
+            for field in ("locale_code", "path", "body", "digest", "last_modified")
+        },
+    )
+
+
+def rebuild_pages(pages: Iterable[Page]) -> None:
+    """Rebuild ``pages`` and the documents listing them as alternates."""
+
+    pages = list(pages)
+
+    group_ids = {page.group_id for page in pages}
+
+    siblings = (
+        Page.objects.filter(group_id__in=group_ids, public_document__isnull=False)
+        .exclude(pk__in=[page.pk for page in pages])
+        .select_related("locale")
+    )
+
+    for page in [*pages, *siblings]:
+
+        try:
+            rebuild(page)
+
+        except Exception as e:
+
+            # Never leave a stale document behind: fall back to live rendering
+            logger.warning("Failed to render public document of %s: %s", page.pk, e)
+
+            PublicPageDocument.objects.filter(page=page).delete()
+
+
+def materialize(page: Page) -> PublicPageDocument:
+    """Document of a published page that has none yet, stored if possible."""
+
+    document = render_document(page)
+
+    try:
+        with transaction.atomic():
+            document.save()
+
+    except IntegrityError:
+
+        # Built concurrently by a save of the page; this copy is still current
+        pass
+
+    return document
+
+
+def discard(documents) -> None:
+    """Drop ``documents`` and queue rendering them again."""
+
+    documents.delete()
+
+    def enqueue():
+        from .tasks import rebuild_page_documents
+
+        rebuild_page_documents.delay()
+
+    transaction.on_commit(enqueue)
+
+
+def discard_locales(locale_codes: Optional[Iterable[str]] = None) -> None:
+    """Drop the documents of ``locale_codes`` (all if None)."""
+
+    documents = PublicPageDocument.objects.all()
+
+    if locale_codes is not None:
+
+        documents = documents.filter(locale_code__in=list(locale_codes))
+
+    discard(documents)
+
+
+def discard_pages(pages: Iterable[Page]) -> None:
+    """Drop the documents of ``pages`` and of their alternates.
+
+    For batches, where rendering each page inline would cost queries per row;
+    the pages are rendered again by their next request.
+    """
+
+    group_ids = {page.group_id for page in pages}
+
+    PublicPageDocument.objects.filter(page__group_id__in=group_ids).delete()
+
+
+def get_document(locale_code: str, path: str) -> Optional[PublicPageDocument]:
+
+    return (
+        PublicPageDocument.objects.filter(locale_code=locale_code, path=path)
+        .only("body", "digest", "last_modified")
+        .first()
+    )
+
+
+def render_body(document: PublicPageDocument, base_url: str) -> bytes:
+    """Document body with absolute URLs on ``base_url``."""
+
+    return bytes(document.body).replace(
+        BASE_URL_MARKER.encode(), base_url.rstrip("/").encode()
+    )
@@ -0,0 +1,431 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+
+import requests
+
+from apps.core.cache import cache_manager
+from apps.i18n.models import Locale
+
+from .sitemaps import get_sources
+
+"""
+Link checking engine.
+
+Links are collected up front, deduplicated by normalized URL and checked
+once each. Internal links are resolved offline against the index of
+published content paths (pages, then registry routes such as blog posts),
+media storage and the Django URLconf. External links are probed
+concurrently from an asyncio loop, limited globally and per host, and their
+results are cached for ``CMS_LINK_CHECK_CACHE_TTL`` so repeated runs only
+re-probe stale URLs.
+"""
+
+
+logger = logging.getLogger(__name__)
+
+
+USER_AGENT = "Bedrock-CMS-LinkChecker/1.0"
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str, base_url: str) -> str:
+    """Return a canonical absolute form of ``url`` used for deduplication.
+
+    Relative URLs are resolved against ``base_url``; scheme and host are
+    lower-cased, default ports, fragments and trailing slashes dropped.
+    """
+
+    parts = urlsplit(urljoin(base_url.rstrip("/") + "/", url.strip()))
+
+    scheme = parts.scheme.lower()
+
+    host = (parts.hostname or "").lower()
+
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+@dataclass
+class LinkResult:
+    """Outcome of checking one normalized URL."""
+
+    url: str
+
+    status_code: Optional[int] = None
+
+    is_broken: bool = True
+
+    error: Optional[str] = None
+
+    checked_at: datetime = field(default_factory=timezone.now)
+
+    internal: bool = False
+
+    cached: bool = False
+
+    @property
+    def cacheable(self) -> bool:
+        # Timeouts, connection errors and server errors are re-probed next run
+        return self.status_code is not None and self.status_code < 500
+
+    def to_cache(self) -> Dict[str, Any]:
+        return {
+            "status_code": self.status_code,
+            "is_broken": self.is_broken,
+            "error": self.error,
+            "checked_at": self.checked_at,
+        }
+
+    @classmethod
+    def from_cache(cls, url: str, data: Dict[str, Any]) -> "LinkResult":
+        return cls(url=url, cached=True, **data)
+
+
+class InternalLinkResolver:
+    """Resolve site-relative paths without making HTTP requests."""
+
+    def __init__(self):
+
+        self._paths: Optional[Set[str]] = None
+
+        self._localized: Set[str] = set()
+
+        self._locale_codes: Set[str] = set()
+
+    def _load(self) -> None:
+
+        self._paths = set()
+
+        for source in get_sources():
+
+            rows = source.model.objects.filter(status="published").values_list(
+                f"{source.locale_field}__code", source.location_field
+            )
+
+            for code, value in rows:
+
+                if not value:
+                    continue
+
+                location = source.location(value)
+
+                self._paths.add(location)
+
+                self._localized.add(f"/{code}{location}")
+
+        self._locale_codes = set(
+            Locale.objects.filter(is_active=True).values_list("code", flat=True)
+        )
+
+    def _is_published(self, path: str) -> bool:
+
+        if self._paths is None:
+            self._load()
+
+        if path in self._paths or path in self._localized:
+            return True
+
+        # A bare locale prefix ("/fr") links to that locale's home page
+        return path.strip("/") in self._locale_codes
+
+    def _is_asset(self, path: str) -> Optional[bool]:
+
+        media_url = settings.MEDIA_URL or ""
+
+        if media_url.startswith("/") and path.startswith(media_url):
+            return default_storage.exists(path[len(media_url) :])
+
+        static_url = settings.STATIC_URL or ""
+
+        if static_url.startswith("/") and path.startswith(static_url):
+            return finders.find(path[len(static_url) :]) is not None
+
+        return None
+
+    def resolve(self, url: str) -> LinkResult:
+        """Check an internal (normalized, absolute) URL."""
+
+        path = urlsplit(url).path or "/"
+
+        result = LinkResult(url=url, internal=True)
+
+        found = self._is_published(path)
+
+        if not found:
+
+            asset = self._is_asset(path)
+
+            if asset is not None:
+                found = asset
+
+            else:
+
+                try:
+                    resolve(path)
+                    found = True
+                except Resolver404:
+                    found = False
+
+        result.status_code = 200 if found else 404
+
+        result.is_broken = not found
+
+        if not found:
+            result.error = f"No published content at {path}"
+
+        return result
+
+
+class HostLimiter:
+    """Bound concurrency and request spacing for a single host."""
+
+    def __init__(self, concurrency: int, interval: float):
+
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        self.interval = max(0.0, interval)
+
+        self._lock = asyncio.Lock()
+
+        self._next_slot = 0.0
+
+    async def wait_turn(self) -> None:
+
+        async with self._lock:
+
+            now = time.monotonic()
+
+            delay = self._next_slot - now
+
+            self._next_slot = max(now, self._next_slot) + self.interval
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class LinkChecker:
+    """Check many links at once, each normalized URL exactly once."""
+
+    CACHE_NAMESPACE = "linkcheck"
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        per_host: Optional[int] = None,
+        host_interval: Optional[float] = None,
+        cache_ttl: Optional[int] = None,
+        timeout: int = 10,
+    ):
+
+        self.base_url = (
+            base_url
+            or getattr(settings, "CMS_LINK_CHECK_BASE_URL", None)
+            or "http://localhost:8000"
+        ).rstrip("/")
+
+        self.host = urlsplit(normalize_url("/", self.base_url)).netloc
+
+        self.concurrency: int = int(
+            concurrency or getattr(settings, "CMS_LINK_CHECK_CONCURRENCY", 16)
+        )
+
+        self.per_host: int = int(
+            per_host or getattr(settings, "CMS_LINK_CHECK_PER_HOST", 2)
+        )
+
+        self.host_interval = (
+            host_interval
+            if host_interval is not None
+            else getattr(settings, "CMS_LINK_CHECK_HOST_INTERVAL", 0.25)
+        )
+
+        self.cache_ttl = (
+            cache_ttl
+            if cache_ttl is not None
+            else getattr(settings, "CMS_LINK_CHECK_CACHE_TTL", 60 * 60 * 24 * 3)
+        )
+
+        self.timeout = timeout
+
+        self.resolver = InternalLinkResolver()
+
+        self._local = threading.local()
+
+        self.stats = {"unique": 0, "internal": 0, "cached": 0, "probed": 0}
+
+    def normalize(self, url: str) -> str:
+        return normalize_url(url, self.base_url)
+
+    def is_internal(self, normalized_url: str) -> bool:
+        return urlsplit(normalized_url).netloc == self.host
+
+    def cache_key(self, normalized_url: str) -> str:
+
+        digest = hashlib.sha1(normalized_url.encode("utf-8")).hexdigest()
+
+        return cache_manager.key_builder.build_key(self.CACHE_NAMESPACE, digest)
+
+    def check(self, urls: Iterable[str]) -> Dict[str, LinkResult]:
+        """Check links, returning results keyed by normalized URL."""
+
+        unique: List[str] = list(dict.fromkeys(self.normalize(url) for url in urls))
+
+        results: Dict[str, LinkResult] = {}
+
+        external = []
+
+        for url in unique:
+
+            if self.is_internal(url):
+                results[url] = self.resolver.resolve(url)
+            else:
+                external.append(url)
+
+        stale = external
+
+        if external and self.cache_ttl:
+
+            keys = {self.cache_key(url): url for url in external}
+
+            for key, data in cache.get_many(list(keys)).items():
+                results[keys[key]] = LinkResult.from_cache(keys[key], data)
+
+            stale = [url for url in external if url not in results]
+
+        if stale:
+
+            probed = asyncio.run(self._probe_all(stale))
+
+            results.update(probed)
+
+            if self.cache_ttl:
+                cache.set_many(
+                    {
+                        self.cache_key(url): result.to_cache()
+                        for url, result in probed.items()
+                        if result.cacheable
+                    },
+                    timeout=self.cache_ttl,
+                )
+
+        self.stats = {
+            "unique": len(unique),
+            "internal": len(unique) - len(external),
+            "cached": len(external) - len(stale),
+            "probed": len(stale),
+        }
+
+        return results
+
+    async def _probe_all(self, urls: List[str]) -> Dict[str, LinkResult]:
+
+        limiter = asyncio.Semaphore(max(1, self.concurrency))
+
+        hosts: Dict[str, HostLimiter] = {}
+
+        loop = asyncio.get_running_loop()
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.concurrency), thread_name_prefix="linkcheck"
+        ) as executor:
+
+            async def probe(url: str) -> LinkResult:
+
+                host = urlsplit(url).netloc
+
+                if host not in hosts:
+                    hosts[host] = HostLimiter(self.per_host, self.host_interval)
+
+                async with limiter, hosts[host].semaphore:
+
+                    await hosts[host].wait_turn()
+
+                    return await loop.run_in_executor(executor, self._request, url)
+
+            results = await asyncio.gather(*(probe(url) for url in urls))
+
+        return {result.url: result for result in results}
+
+    def _session(self) -> requests.Session:
+
+        session = getattr(self._local, "session", None)
+
+        if session is None:
+
+            session = requests.Session()
+
+            session.headers.update({"User-Agent": USER_AGENT})
+
+            self._local.session = session
+
+        return session
+
+    def _request(self, url: str) -> LinkResult:
+        """Blocking HEAD (falling back to GET) for one URL."""
+
+        result = LinkResult(url=url)
+
+        session = self._session()
+
+        try:
+
+            response = session.head(url, timeout=self.timeout, allow_redirects=True)
+
+            if response.status_code in (403, 405, 501):
+
+                response = session.get(
+                    url, timeout=self.timeout, allow_redirects=True, stream=True
+                )
+
+                response.close()
+
+            result.status_code = response.status_code
+
+            result.is_broken = response.status_code >= 400
+
+            if result.is_broken:
+                result.error = f"HTTP {response.status_code}: {response.reason}"
+
+        except requests.exceptions.Timeout:
+
+            result.error = "Request timeout"
+
+        except requests.exceptions.ConnectionError:
+
+            result.error = "Connection error"
+
+        except requests.exceptions.RequestException as e:
+
+            result.error = str(e)
+
+        except Exception as e:
+
+            result.error = f"Unexpected error: {str(e)}"
+
+        result.checked_at = timezone.now()
+
+        return result
@@ -0,0 +1,121 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.cms.blocks.validation import block_memo, block_registry, validate_blocks
+
+"""Throughput benchmark for validate_blocks.
+
+Validates a synthetic page:
+
+- recompiled: the block registry rebuilt on every call, which costs what
+  loading block types did before validators were compiled (introspection
+  and a BlockType query per call);
+- compiled: compiled validators, every block sanitized and validated;
+- memoized: the same page saved again, every block a memo hit;
+- one edit: one block changed between saves, as in an editor session.
+
+Usage:
+    python manage.py benchmark_blocks
+    python manage.py benchmark_blocks --blocks 200 --iterations 200
+"""
+
+
+def sample_block(rng, depth=0):
+
+    kind = rng.choice(["hero", "richtext", "image", "cta", "faq", "columns"])
+
+    if kind == "richtext":
+        return {"type": kind, "props": {"content": "<p>Lorem <b>ipsum</b></p>"}}
+
+    if kind == "image":
+        return {"type": kind, "props": {"src": "/media/a.jpg", "alt": "A"}}
+
+    if kind == "faq":
+        return {"type": kind, "props": {"items": [{"q": "Why?", "a": "Because."}]}}
+
+    if kind == "columns" and depth == 0:
+        return {
+            "type": kind,
+            "props": {"gap": "md"},
+            "blocks": [sample_block(rng, depth + 1) for _ in range(2)],
+        }
+
+    return {"type": "hero", "props": {"title": "Welcome", "subtitle": "Hello"}}
+
+
+class Command(BaseCommand):
+
+    help = "Benchmark block validation with and without the compiled registry"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            "--blocks",
+            type=int,
+            default=200,
+            help="Blocks per page (default: 200)",
+        )
+
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=100,
+            help="Validations per run (default: 100)",
+        )
+
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+
+        rng = random.Random(options["seed"])
+
+        blocks = [sample_block(rng) for _ in range(options["blocks"])]
+
+        iterations = options["iterations"]
+
+        self.stdout.write(f"{len(blocks)} blocks per page, {iterations} validations")
+
+        runs = (
+            ("recompiled", block_registry.clear),
+            ("compiled", block_memo.clear),
+            ("memoized", lambda: None),
+            ("one edit", lambda: self.edit(blocks, rng)),
+        )
+
+        for label, prepare in runs:
+
+            elapsed, queries = self.run(blocks, iterations, prepare)
+
+            self.stdout.write(
+                f"  {label:<11} {elapsed / iterations * 1000:8.2f} ms/page"
+                f"   {queries / iterations:5.1f} queries/page"
+            )
+
+    def edit(self, blocks, rng):
+
+        blocks[rng.randrange(len(blocks))] = {
+            "type": "hero",
+            "props": {"title": f"Edited {rng.random()}", "subtitle": "Hello"},
+        }
+
+    def run(self, blocks, iterations, prepare):
+
+        validate_blocks(blocks)
+
+        with CaptureQueriesContext(connection) as queries:
+
+            start = time.perf_counter()
+
+            for _ in range(iterations):
+
+                prepare()
+
+                validate_blocks(blocks)
+
+            elapsed = time.perf_counter() - start
+
+        return elapsed, len(queries.captured_queries)
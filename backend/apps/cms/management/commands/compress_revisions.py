@@ -0,0 +1,165 @@
+import json
+from itertools import groupby
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.blog.versioning import BlogPostRevision
+from apps.cms.revision_store import BlobBatch, RevisionBlob, prune_blobs
+from apps.cms.versioning import PageRevision
+
+"""Convert stored revision snapshots to the delta-compressed format.
+
+Revisions written whole (before the revision store) are re-encoded per page
+or post in creation order, so consecutive revisions share their keyframe
+and blocks. Rows already compressed are left alone; running the command
+again is a no-op. Reports the storage of revisions and blobs before and
+after.
+
+Usage:
+    python manage.py compress_revisions
+    python manage.py compress_revisions --dry-run
+    python manage.py compress_revisions --prune
+"""
+
+
+REVISION_MODELS = (PageRevision, BlogPostRevision)
+
+
+def stored_size(values) -> int:
+
+    return sum(len(json.dumps(value)) for value in values)
+
+
+class Command(BaseCommand):
+
+    help = "Store revision snapshots delta-compressed in the revision store"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Revisions updated per query (default: 500)",
+        )
+
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the savings without keeping the changes",
+        )
+
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Also delete blobs no revision references any more",
+        )
+
+    def handle(self, *args, **options):
+
+        before = self.measure()
+
+        with transaction.atomic():
+
+            for model in REVISION_MODELS:
+
+                converted = self.compress(model, options["batch_size"])
+
+                self.stdout.write(
+                    f"{model._meta.verbose_name_plural}: {converted} compressed"
+                )
+
+            if options["prune"]:
+
+                self.stdout.write(f"Blobs pruned: {prune_blobs(REVISION_MODELS)}")
+
+            after = self.measure()
+
+            if options["dry_run"]:
+
+                transaction.set_rollback(True)
+
+        self.report(before, after)
+
+    def compress(self, model, batch_size):
+
+        owner_field = f"{model.OWNER_FIELD}_id"
+
+        revisions = model.objects.order_by(owner_field, "created_at").iterator()
+
+        pending = []
+
+        converted = 0
+
+        for _, owned in groupby(revisions, key=lambda r: getattr(r, owner_field)):
+
+            batch = BlobBatch()
+
+            previous = None
+
+            for revision in owned:
+
+                if "manifest" not in revision.data:
+
+                    revision.snapshot = revision.data
+
+                    revision.encode_pending_snapshot(batch, previous)
+
+                    pending.append(revision)
+
+                previous = revision.data
+
+            # Keyframes of this owner must be stored before the next lookups
+            batch.save()
+
+            if len(pending) >= batch_size:
+
+                converted += self.flush(model, pending)
+
+        return converted + self.flush(model, pending)
+
+    def flush(self, model, pending):
+
+        model.objects.bulk_update(pending, ["data"])
+
+        count = len(pending)
+
+        pending.clear()
+
+        return count
+
+    def measure(self):
+
+        sizes = {
+            model: stored_size(model.objects.values_list("data", flat=True).iterator())
+            for model in REVISION_MODELS
+        }
+
+        sizes[RevisionBlob] = stored_size(
+            RevisionBlob.objects.values_list("data", flat=True).iterator()
+        )
+
+        return sizes
+
+    def report(self, before, after):
+
+        for model in before:
+
+            self.stdout.write(
+                f"  {model._meta.verbose_name_plural:<22}"
+                f" {before[model]:>12,} -> {after[model]:>12,} bytes"
+            )
+
+        total_before = sum(before.values())
+
+        total_after = sum(after.values())
+
+        saved = 1 - total_after / total_before if total_before else 0
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"  {'total':<22} {total_before:>12,} -> {total_after:>12,} bytes"
+                f" ({saved:.0%} saved)"
+            )
+        )
@@ -0,0 +1,260 @@
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.conditional import make_etag
+from apps.i18n.models import Locale
+
+from .models import Page
+
+"""
+Materialized navigation, footer and site settings menus.
+
+The menus of a locale are rendered to JSON once and stored in the cache
+without a timeout, each with the ETag of its body, so serving one is a
+single cache read. They are rendered again when a change shows in them:
+a page entering, leaving or changing within a menu (``menu_state``), a
+reorder, or bulk publishing. The stored entries are discarded at once and
+rendered after the transaction commits; a request finding none renders
+them itself.
+
+A requested locale code that matches no locale is served the menus of all
+locales, stored under ``ALL_LOCALES``. Entries carry ``MENU_FORMAT``:
+entries of another format, left by an earlier release, are rendered again.
+"""
+
+
+MENU_PREFIX = "menus"
+
+# Bump when the shape of the stored menus changes
+
+MENU_FORMAT = 1
+
+MENU_NAMES = ("navigation", "footer", "site_settings")
+
+ALL_LOCALES = "*"
+
+# Page fields the menus show or are selected and ordered by
+
+MENU_FIELDS = (
+    "title",
+    "slug",
+    "path",
+    "position",
+    "parent_id",
+    "locale_id",
+    "in_main_menu",
+    "in_footer",
+    "is_homepage",
+)
+
+
+def menu_key(name: str, locale_code: str) -> str:
+
+    return f"{MENU_PREFIX}:{name}:{locale_code}"
+
+
+def menu_state(page: Page) -> Optional[Dict[str, Any]]:
+    """What the menus show of ``page``; None if it is in none of them."""
+
+    if page.status != "published":
+
+        return None
+
+    if not (page.in_main_menu or page.in_footer or page.is_homepage):
+
+        return None
+
+    return {field: getattr(page, field) for field in MENU_FIELDS}
+
+
+def menu_pages(locale_code: str) -> List[Page]:
+
+    pages = Page.objects.filter(
+        Q(in_main_menu=True) | Q(in_footer=True) | Q(is_homepage=True),
+        status="published",
+    )
+
+    if locale_code != ALL_LOCALES:
+
+        pages = pages.filter(locale__code=locale_code)
+
+    return list(pages.only(*MENU_FIELDS, "status").order_by("position", "title"))
+
+
+def build_navigation(pages: List[Page]) -> List[Dict[str, Any]]:
+    """Main menu tree; items whose parent is not in the menu are left out."""
+
+    items = {
+        page.id: {
+            "id": page.id,
+            "title": page.title,
+            "slug": page.slug,
+            "path": page.path,
+            "position": page.position,
+            "parent": page.parent_id,
+            "children": [],
+        }
+        for page in pages
+        if page.in_main_menu
+    }
+
+    roots = []
+
+    for item in items.values():
+
+        if not item["parent"]:
+
+            roots.append(item)
+
+        elif item["parent"] in items:
+
+            items[item["parent"]]["children"].append(item)
+
+    return roots
+
+
+def build_footer(pages: List[Page]) -> List[Dict[str, Any]]:
+
+    return [
+        {
+            "id": page.id,
+            "title": page.title,
+            "slug": page.slug,
+            "path": page.path,
+            "position": page.position,
+        }
+        for page in pages
+        if page.in_footer
+    ]
+
+
+def build_menus(locale_code: str) -> Dict[str, Dict[str, Any]]:
+    """The data of every menu of a locale, from one query."""
+
+    pages = menu_pages(locale_code)
+
+    navigation = build_navigation(pages)
+
+    footer = build_footer(pages)
+
+    homepage = next((page for page in pages if page.is_homepage), None)
+
+    return {
+        "navigation": {"menu_items": navigation},
+        "footer": {"footer_items": footer},
+        "site_settings": {
+            "homepage": (
+                {
+                    "id": homepage.id,
+                    "title": homepage.title,
+                    "slug": homepage.slug,
+                    "path": homepage.path,
+                }
+                if homepage
+                else None
+            ),
+            "navigation": navigation,
+            "footer": footer,
+        },
+    }
+
+
+def render_entry(name: str, data: Dict[str, Any]) -> Tuple:
+
+    body = JSONRenderer().render(data)
+
+    digest = hashlib.sha1(body, usedforsecurity=False).hexdigest()
+
+    return (MENU_FORMAT, make_etag(name, digest), body)
+
+
+def rebuild(
+    locale_codes: Iterable[str], replace: bool = True
+) -> Dict[str, Dict[str, Tuple]]:
+    """Render and store the menus of ``locale_codes``.
+
+    Requests only ``add`` the menus they render: one read before a change
+    committed must not overwrite the menus rendered after it.
+    """
+
+    rendered = {}
+
+    for locale_code in set(locale_codes):
+
+        menus = build_menus(locale_code)
+
+        rendered[locale_code] = {
+            name: render_entry(name, menus[name]) for name in MENU_NAMES
+        }
+
+    entries = {
+        menu_key(name, locale_code): entry
+        for locale_code, menus in rendered.items()
+        for name, entry in menus.items()
+    }
+
+    if replace:
+
+        cache.set_many(entries, timeout=None)
+
+    else:
+
+        for key, entry in entries.items():
+
+            cache.add(key, entry, timeout=None)
+
+    return rendered
+
+
+def discard(locale_codes: Iterable[str]) -> None:
+
+    cache.delete_many(
+        [
+            menu_key(name, locale_code)
+            for locale_code in locale_codes
+            for name in MENU_NAMES
+        ]
+    )
+
+
+def schedule_rebuild(locale_codes: Iterable[str]) -> None:
+    """Discard the menus of ``locale_codes`` now; render them after commit.
+
+    The menus of all locales list the same pages and are rebuilt too.
+    Requests in between render the menus themselves.
+    """
+
+    locale_codes = {*locale_codes, ALL_LOCALES}
+
+    discard(locale_codes)
+
+    transaction.on_commit(lambda: rebuild(locale_codes))
+
+
+def get_menu(name: str, locale_code: str) -> Tuple[str, bytes]:
+    """ETag and JSON body of a menu, rendered if not stored."""
+
+    entry = cache.get(menu_key(name, locale_code)) if locale_code else None
+
+    if entry is None and not (
+        locale_code and Locale.objects.filter(code=locale_code).exists()
+    ):
+
+        locale_code = ALL_LOCALES
+
+        entry = cache.get(menu_key(name, locale_code))
+
+    if entry is None or entry[0] != MENU_FORMAT:
+
+        # Entries of another format are replaced, missing ones only added
+        menus = rebuild([locale_code], replace=entry is not None)
+
+        entry = menus[locale_code][name]
+
+    return entry[1], entry[2]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0024_add_unique_path_constraint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PublicPageDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("locale_code", models.CharField(max_length=10)),
+                ("path", models.CharField(max_length=512)),
+                (
+                    "body",
+                    models.BinaryField(
+                        help_text="Encoded PublicPageSerializer output, base URL left as a marker"
+                    ),
+                ),
+                ("digest", models.CharField(max_length=40)),
+                ("last_modified", models.DateTimeField(blank=True, null=True)),
+                ("built_at", models.DateTimeField(auto_now=True)),
+                (
+                    "page",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="public_document",
+                        to="cms.page",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="publicpagedocument",
+            constraint=models.UniqueConstraint(
+                fields=("locale_code", "path"), name="uq_public_document_path"
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:40
+
+from django.db import migrations, models
+
+HELP_TEXT = "Snapshot in stored form: fields, block manifest and blob digests"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0025_public_page_document"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RevisionBlob",
+            fields=[
+                (
+                    "digest",
+                    models.CharField(max_length=32, primary_key=True, serialize=False),
+                ),
+                ("data", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Revision Blob",
+                "verbose_name_plural": "Revision Blobs",
+            },
+        ),
+        # The column keeps its name; only the attribute changes
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveField(model_name="pagerevision", name="snapshot"),
+                migrations.AddField(
+                    model_name="pagerevision",
+                    name="data",
+                    field=models.JSONField(
+                        db_column="snapshot", default=dict, help_text=HELP_TEXT
+                    ),
+                    preserve_default=False,
+                ),
+            ],
+        ),
+    ]
@@ -1,11 +1,10 @@
 import uuid
 from typing import TYPE_CHECKING
 
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 
 # validate_json_structure doesn't exist in Django - removed
-from django.db import models
+from django.db import models, transaction
 from django.db.models import (
     AutoField,
     BooleanField,
@@ -39,10 +38,11 @@ except ImportError:
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from apps.accounts.rbac import RBACMixin
+from apps.accounts.rbac import RBACMixin, RBACQuerySet
+from apps.core.conditional import bump_content_version
 from apps.core.validators import JSONSizeValidator
 
-from .blocks.validation import validate_blocks
+from .blocks.validation import BLOCK_TYPES_VERSION, validate_blocks
 
 # Import SEO models
 from .seo import SeoSettings  # noqa: F401
@@ -157,6 +157,8 @@ class Page(models.Model, RBACMixin):
         help_text=_("Categories for organizing this page"),
     )
 
+    objects = RBACQuerySet.as_manager()
+
     class Meta:
 
         constraints = [
@@ -571,6 +573,44 @@ class Page(models.Model, RBACMixin):
         return self.status == "pending_review"
 
 
+class PublicPageDocument(models.Model):
+    """
+    Public JSON document of a published page, rendered when the page changes.
+
+    Served by ``get_by_path`` in one indexed lookup; see ``apps.cms.documents``.
+    """
+
+    page: models.OneToOneField = models.OneToOneField(
+        Page, on_delete=models.CASCADE, related_name="public_document"
+    )
+
+    locale_code: CharField = models.CharField(max_length=10)
+
+    path: CharField = models.CharField(max_length=512)
+
+    body = models.BinaryField(
+        help_text=_("Encoded PublicPageSerializer output, base URL left as a marker")
+    )
+
+    digest: CharField = models.CharField(max_length=40)
+
+    last_modified: DateTimeField = models.DateTimeField(null=True, blank=True)
+
+    built_at: DateTimeField = models.DateTimeField(auto_now=True)
+
+    class Meta:
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["locale_code", "path"], name="uq_public_document_path"
+            ),
+        ]
+
+    def __str__(self):
+
+        return f"{self.locale_code}:{self.path}"
+
+
 class Redirect(models.Model):
 
     STATUS_CHOICES = [
@@ -860,9 +900,26 @@ class BlockType(models.Model):
 
         super().save(*args, **kwargs)
 
-        # Clear any cached block registry data
+        self.bump_registry_version()
+
+    def delete(self, *args, **kwargs):
+
+        result = super().delete(*args, **kwargs)
+
+        self.bump_registry_version()
 
-        cache.delete("block_types_registry")
+        return result
+
+    @staticmethod
+    def bump_registry_version():
+        """Reload the block type registry of every process after commit.
+
+        The cache invalidation signals bump the version at once; a process
+        reloading before the commit would keep the old rows until the next
+        change.
+        """
+
+        transaction.on_commit(lambda: bump_content_version(BLOCK_TYPES_VERSION))
 
     @classmethod
     def get_registry_dict(cls):  # noqa: C901
@@ -870,55 +927,19 @@ class BlockType(models.Model):
         Get all active block types as a dictionary for the dynamic registry.
 
         Returns format compatible with existing BLOCK_MODELS structure.
+        Served from the per-process registry; the dictionary is shared, so
+        callers must not modify it.
         """
 
-        registry = cache.get("block_types_registry")
-
-        if registry is None:
-
-            block_types = cls.objects.filter(is_active=True).values(
-                "type",
-                "component",
-                "label",
-                "description",
-                "category",
-                "icon",
-                "preload",
-                "editing_mode",
-                "schema",
-                "default_props",
-                "model_name",
-                "data_source",
-                "api_endpoint",
-                "query_schema",
-            )
-
-            registry = {bt["type"]: bt for bt in block_types}
+        from .blocks.registry import block_type_registry
 
-            cache.set("block_types_registry", registry, timeout=300)  # 5 minutes
-
-        return registry
+        return block_type_registry.block_types()
 
     @classmethod
     def get_block_metadata(cls):  # noqa: C901
         """Get metadata for all active block types for API responses."""
 
-        return cls.objects.filter(is_active=True).values(
-            "type",
-            "component",
-            "label",
-            "description",
-            "category",
-            "icon",
-            "preload",
-            "editing_mode",
-            "schema",
-            "default_props",
-            "model_name",
-            "data_source",
-            "api_endpoint",
-            "query_schema",
-        )
+        return list(cls.get_registry_dict().values())
 
     def get_model_class(self):  # noqa: C901
         """Get the actual model class for this block type."""
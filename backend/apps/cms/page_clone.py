@@ -0,0 +1,628 @@
+import copy
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from apps.core.cache import cache_manager
+from apps.i18n.models import Locale, TranslationUnit
+from apps.i18n.translation import TranslationManager
+
+from .bulk_publishing import (
+    invalidate_page_caches,
+    refresh_admin_search,
+    reindex_published,
+)
+from .models import Page
+
+# Try to import optional dependencies
+try:
+    from apps.media.usage import update_usage_for_instance
+except ImportError:
+    update_usage_for_instance = None
+
+"""
+Bulk duplication of page trees and locales.
+
+A page tree, or every page of a locale, is copied with ``bulk_create`` in
+topological batches: the tree is walked breadth first from its ids alone,
+so each batch only holds pages whose parents were created before it.
+Parent ids are remapped and paths computed in memory, the way
+``Page.compute_path`` would, rather than by ``save()`` walking the
+ancestors of every row. Because ``bulk_create`` bypasses ``save()`` and
+its signals, search indexing, cache invalidation, revision snapshots,
+translation units and asset usage run afterwards as batched post-steps.
+
+Copies within a locale are new pages: the root is renamed like a
+duplicated page and every copy gets a new ``group_id``. Copies into
+another locale keep the ``group_id`` of their source, linking them as its
+translations; a page already translated in the target locale is not
+copied again, and its copied children are placed under the translation.
+Copies are always drafts.
+"""
+
+
+logger = logging.getLogger(__name__)
+
+
+CLONE_BATCH_SIZE = 500
+
+# Reports pages processed out of the pages found
+CloneProgress = Callable[[int, int], None]
+
+
+@dataclass
+class CloneResult:
+    # Source page id -> id of its copy (or existing translation)
+    pages: Dict[int, int] = field(default_factory=dict)
+
+    created: List[int] = field(default_factory=list)
+
+    skipped: Dict[int, str] = field(default_factory=dict)
+
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def created_count(self) -> int:
+        return len(self.created)
+
+
+def tree_levels(root_ids: List[int], locale_id: int) -> List[List[Tuple[int, int]]]:
+    """``(id, parent_id)`` of ``root_ids`` and their descendants, level by level.
+
+    Descendants in other locales, and pages reached twice through a cycle,
+    are left out.
+    """
+
+    seen = set(root_ids)
+
+    levels = [
+        list(
+            Page.objects.filter(pk__in=root_ids)
+            .order_by("pk")
+            .values_list("id", "parent_id")
+        )
+    ]
+
+    while levels[-1]:
+
+        children = [
+            row
+            for row in Page.objects.filter(
+                parent_id__in=[page_id for page_id, _ in levels[-1]],
+                locale_id=locale_id,
+            )
+            .order_by("pk")
+            .values_list("id", "parent_id")
+            if row[0] not in seen
+        ]
+
+        seen.update(page_id for page_id, _ in children)
+
+        levels.append(children)
+
+    return levels[:-1]
+
+
+def locale_levels(locale_id: int) -> List[List[Tuple[int, int]]]:
+    """``(id, parent_id)`` of every page of a locale, level by level.
+
+    Pages whose parent is in another locale, or missing, are roots.
+    """
+
+    rows = list(
+        Page.objects.filter(locale_id=locale_id)
+        .order_by("pk")
+        .values_list("id", "parent_id")
+    )
+
+    ids = {page_id for page_id, _ in rows}
+
+    children: Dict[int, List[Tuple[int, int]]] = {}
+
+    roots = []
+
+    for page_id, parent_id in rows:
+
+        if parent_id in ids:
+
+            children.setdefault(parent_id, []).append((page_id, parent_id))
+
+        else:
+
+            roots.append((page_id, parent_id))
+
+    levels = []
+
+    level = roots
+
+    while level:
+
+        levels.append(level)
+
+        level = [row for page_id, _ in level for row in children.get(page_id, [])]
+
+    return levels
+
+
+def path_parts(page: Page) -> List[str]:
+    """Slugs ``compute_path`` joins for the children of ``page``."""
+
+    parts = []
+
+    current = page
+
+    visited_ids = set()
+
+    while current is not None and current.id not in visited_ids:
+
+        visited_ids.add(current.id)
+
+        if current.locale_id == page.locale_id:
+
+            parts.append(current.slug)
+
+        current = current.parent
+
+    return list(reversed(parts))
+
+
+def build_path(parent_parts: Optional[List[str]], slug: str) -> str:
+    """``Page.compute_path`` from the path parts of the parent."""
+
+    if parent_parts is None:
+
+        return f"/{slug}"
+
+    parts = [*parent_parts, slug] if slug else list(parent_parts)
+
+    if not parts:
+
+        return "/"
+
+    return "/" + "/".join(parts)
+
+
+def copy_blocks(blocks: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Deep copy of ``blocks`` with new block ids."""
+
+    blocks = copy.deepcopy(blocks) if blocks else []
+
+    for block in blocks:
+
+        if "id" in block:
+
+            block["id"] = str(uuid.uuid4())
+
+    return blocks
+
+
+class PageCloner:
+    """Copies the pages of topological levels into ``target_locale``."""
+
+    def __init__(
+        self,
+        target_locale: Locale,
+        same_locale: bool,
+        user=None,
+        batch_size: int = CLONE_BATCH_SIZE,
+        progress: Optional[CloneProgress] = None,
+    ):
+
+        self.target_locale = target_locale
+
+        self.same_locale = same_locale
+
+        self.user = user
+
+        self.batch_size = batch_size
+
+        self.progress = progress
+
+        self.result = CloneResult()
+
+        # Path parts of the children of each copy (or existing parent)
+        self.parts: Dict[int, List[str]] = {}
+
+        self.group_ids: Dict[uuid.UUID, uuid.UUID] = {}
+
+        # Copy id -> source id
+        self.sources: Dict[int, int] = {}
+
+    def run(
+        self,
+        levels: List[List[Tuple[int, int]]],
+        rename_roots: bool = False,
+    ) -> CloneResult:
+
+        total = sum(len(level) for level in levels)
+
+        processed = 0
+
+        with transaction.atomic():
+
+            for depth, level in enumerate(levels):
+
+                for start in range(0, len(level), self.batch_size):
+
+                    batch = level[start : start + self.batch_size]
+
+                    self.clone_batch(batch, rename=rename_roots and depth == 0)
+
+                    processed += len(batch)
+
+                    if self.progress:
+
+                        self.progress(processed, total)
+
+        self.result.errors.extend(
+            run_post_clone_steps(self.result.created, self.sources, self.user)
+        )
+
+        return self.result
+
+    def target_parent(self, source: Page) -> Tuple[Optional[int], bool]:
+        """Parent id of the copy of ``source``; False if it must not be copied."""
+
+        if source.parent_id is None:
+
+            return None, True
+
+        if source.parent_id in self.result.pages:
+
+            return self.result.pages[source.parent_id], True
+
+        if source.parent_id in self.result.skipped:
+
+            return None, False
+
+        # The root of the copy stays under the parent of its source
+        if self.same_locale:
+
+            return source.parent_id, True
+
+        # Under the translation of its parent, if any; else at the top level
+        translation = (
+            Page.objects.filter(
+                locale=self.target_locale, group_id=source.parent.group_id
+            )
+            .values_list("id", flat=True)
+            .first()
+        )
+
+        return translation, True
+
+    def parent_parts(self, parent_id: Optional[int]) -> Optional[List[str]]:
+
+        if parent_id is None:
+
+            return None
+
+        if parent_id not in self.parts:
+
+            self.parts[parent_id] = path_parts(
+                Page.objects.select_related("parent").get(pk=parent_id)
+            )
+
+        return self.parts[parent_id]
+
+    def clone_batch(self, batch: List[Tuple[int, int]], rename: bool = False) -> None:
+
+        sources = list(
+            Page.objects.filter(pk__in=[page_id for page_id, _ in batch])
+            .select_related("parent")
+            .order_by("pk")
+        )
+
+        translations = {}
+
+        if not self.same_locale:
+
+            translations = dict(
+                Page.objects.filter(
+                    locale=self.target_locale,
+                    group_id__in=[source.group_id for source in sources],
+                ).values_list("group_id", "id")
+            )
+
+        copies = []
+
+        for source in sources:
+
+            if source.group_id in translations:
+
+                # Already translated: its copied children go under it
+                self.result.pages[source.id] = translations[source.group_id]
+
+                continue
+
+            parent_id, placed = self.target_parent(source)
+
+            if not placed:
+
+                self.result.skipped[source.id] = "parent was not copied"
+
+                continue
+
+            copies.append(self.build_copy(source, parent_id, rename))
+
+        taken = set(
+            Page.objects.filter(
+                locale=self.target_locale,
+                path__in=[page.path for _, page in copies],
+            ).values_list("path", flat=True)
+        )
+
+        accepted = []
+
+        for source, page in copies:
+
+            if page.path in taken:
+
+                self.result.skipped[source.id] = f"path {page.path} is taken"
+
+                continue
+
+            taken.add(page.path)
+
+            accepted.append((source, page))
+
+        Page.objects.bulk_create([page for _, page in accepted])
+
+        for source, page in accepted:
+
+            self.result.pages[source.id] = page.id
+
+            self.result.created.append(page.id)
+
+            self.sources[page.id] = source.id
+
+            self.parts[page.id] = [
+                *(self.parent_parts(page.parent_id) or []),
+                page.slug,
+            ]
+
+        self.copy_categories(accepted)
+
+    def build_copy(
+        self, source: Page, parent_id: Optional[int], rename: bool
+    ) -> Tuple[Page, Page]:
+
+        title, slug = source.title, source.slug
+
+        position = source.position
+
+        if rename:
+
+            # Named like a duplicated page, at the end of its siblings
+            base_slug = (source.slug or "page")[:100]
+
+            title, slug = (
+                f"{source.title} (Copy)",
+                f"{base_slug}-copy-{uuid.uuid4().hex[:6]}",
+            )
+
+            position = Page.objects.filter(parent_id=parent_id).count()
+
+        if self.same_locale:
+
+            group_id = self.group_ids.setdefault(source.group_id, uuid.uuid4())
+
+        else:
+
+            group_id = source.group_id
+
+        keep_navigation = not self.same_locale
+
+        page = Page(
+            group_id=group_id,
+            parent_id=parent_id,
+            position=position,
+            locale=self.target_locale,
+            title=title,
+            slug=slug,
+            path=build_path(self.parent_parts(parent_id), slug),
+            blocks=copy_blocks(source.blocks),
+            seo=copy.deepcopy(source.seo) if source.seo else {},
+            status="draft",
+            in_main_menu=keep_navigation and source.in_main_menu,
+            in_footer=keep_navigation and source.in_footer,
+            is_homepage=keep_navigation and source.is_homepage,
+        )
+
+        return source, page
+
+    def copy_categories(self, accepted: List[Tuple[Page, Page]]) -> None:
+
+        through = Page.categories.through
+
+        copies = {source.id: page.id for source, page in accepted}
+
+        through.objects.bulk_create(
+            [
+                through(page_id=copies[page_id], category_id=category_id)
+                for page_id, category_id in through.objects.filter(
+                    page_id__in=list(copies)
+                ).values_list("page_id", "category_id")
+            ]
+        )
+
+
+# Post-steps replacing the per-row post_save signal handlers
+
+
+def create_clone_revisions(pages: List[Page], sources: Dict[int, int], user) -> None:
+
+    from .versioning import PageRevision
+
+    PageRevision.objects.bulk_create(
+        [
+            PageRevision(
+                page=page,
+                snapshot=PageRevision.snapshot_data(page),
+                created_by=user,
+                comment=f"Copied from page {sources[page.id]}",
+            )
+            for page in pages
+        ]
+    )
+
+
+def invalidate_clone_caches(pages: List[Page]) -> None:
+
+    invalidate_page_caches(pages)
+
+    cache_manager.invalidate_search()
+
+
+def create_clone_translation_units(pages: List[Page], user=None) -> None:
+    """Missing translation units of the copies, for every other active locale.
+
+    Creates what saving each page would, in one ``bulk_create``.
+    """
+
+    fields = TranslationManager.get_translatable_fields(Page)
+
+    if not fields:
+
+        return
+
+    content_type = ContentType.objects.get_for_model(Page)
+
+    locales = list(Locale.objects.filter(is_active=True))
+
+    units = []
+
+    for page in pages:
+
+        for field_name in fields:
+
+            source_text = TranslationManager._extract_field_text(page, field_name)
+
+            if not source_text:
+                continue
+
+            units.extend(
+                TranslationUnit(
+                    content_type=content_type,
+                    object_id=page.pk,
+                    field=field_name,
+                    source_locale_id=page.locale_id,
+                    target_locale=target_locale,
+                    source_text=source_text,
+                    updated_by=user,
+                    status="missing",
+                )
+                for target_locale in locales
+                if target_locale.pk != page.locale_id
+            )
+
+    TranslationUnit.objects.bulk_create(
+        units, batch_size=CLONE_BATCH_SIZE, ignore_conflicts=True
+    )
+
+
+def update_clone_asset_usage(pages: List[Page]) -> None:
+    """Record the assets referenced by the copies' blocks."""
+
+    for page in pages:
+
+        update_usage_for_instance(page)
+
+
+def run_post_clone_steps(
+    ids: List[int],
+    sources: Dict[int, int],
+    user=None,
+    batch_size: int = CLONE_BATCH_SIZE,
+) -> List[str]:
+    """Run the batched post-steps for the created copies ``ids``.
+
+    Each step is isolated so a failing step doesn't prevent the others;
+    failures are returned as error messages.
+    """
+
+    errors = []
+
+    for start in range(0, len(ids), batch_size):
+
+        pages = list(
+            Page.objects.filter(pk__in=ids[start : start + batch_size]).select_related(
+                "locale"
+            )
+        )
+
+        steps = [
+            ("search reindex", reindex_published, (Page, pages)),
+            ("admin search", refresh_admin_search, (pages,)),
+            ("cache invalidation", invalidate_clone_caches, (pages,)),
+            ("revisions", create_clone_revisions, (pages, sources, user)),
+            ("translation units", create_clone_translation_units, (pages, user)),
+        ]
+
+        if update_usage_for_instance is not None:
+
+            steps.append(("asset usage", update_clone_asset_usage, (pages,)))
+
+        for name, step, args in steps:
+
+            try:
+                step(*args)
+            except Exception as e:
+                error_msg = f"Post-clone {name} failed for {len(pages)} page(s): {e}"
+
+                logger.error(error_msg)
+
+                errors.append(error_msg)
+
+    return errors
+
+
+def clone_page_tree(
+    page: Page,
+    target_locale: Optional[Locale] = None,
+    include_descendants: bool = True,
+    user=None,
+    batch_size: int = CLONE_BATCH_SIZE,
+    progress: Optional[CloneProgress] = None,
+) -> CloneResult:
+    """Copy ``page``, and its descendants, within its locale or into another.
+
+    Within its locale the copy is placed next to ``page`` and renamed like
+    a duplicated page.
+    """
+
+    target_locale = target_locale or page.locale
+
+    same_locale = target_locale.pk == page.locale_id
+
+    levels = tree_levels([page.pk], page.locale_id)
+
+    if not include_descendants:
+
+        levels = levels[:1]
+
+    cloner = PageCloner(target_locale, same_locale, user, batch_size, progress)
+
+    return cloner.run(levels, rename_roots=same_locale)
+
+
+def clone_locale(
+    source_locale: Locale,
+    target_locale: Locale,
+    user=None,
+    batch_size: int = CLONE_BATCH_SIZE,
+    progress: Optional[CloneProgress] = None,
+) -> CloneResult:
+    """Copy every page of ``source_locale`` not translated in ``target_locale`` yet."""
+
+    if source_locale.pk == target_locale.pk:
+
+        raise ValueError("Source and target locale must differ")
+
+    cloner = PageCloner(target_locale, False, user, batch_size, progress)
+
+    return cloner.run(locale_levels(source_locale.pk))
@@ -0,0 +1,450 @@
+import copy
+import hashlib
+import json
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+"""
+Delta-compressed, content-addressed storage of revision snapshots.
+
+A revision snapshot used to be stored whole, so every autosave of a page
+repeated all of its blocks. Snapshots are now split up:
+
+- every block (and every large text field listed in ``SHARED_FIELDS``) is
+  a ``RevisionBlob`` keyed by the hash of its JSON, stored once however
+  many revisions, pages or posts contain it;
+- a keyframe stores the list of its block digests as a blob of its own;
+- the other revisions store the edits turning the digests of their
+  keyframe into their own, so an autosave touching one block stores one
+  splice and that block.
+
+A new keyframe is started every ``CMS_REVISION_KEYFRAME_INTERVAL``
+revisions, or earlier when the edits grow past half the page. Revisions
+depend on blobs only, never on other revisions, so pruning revisions cannot
+break the ones left (``prune_blobs`` drops the blobs no longer referenced).
+
+The stored form lives in the ``snapshot`` column (``data`` attribute);
+``snapshot`` itself is a property returning the reconstructed dict, so
+callers read and assign snapshots as before. Rows written before this
+format have no ``manifest`` and are read as they are.
+"""
+
+
+class RevisionStorageError(Exception):
+    """A snapshot references blobs that are missing."""
+
+
+def blob_digest(value: Any) -> str:
+    """Content hash of a JSON value."""
+
+    canonical = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder
+    )
+
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+class RevisionBlob(models.Model):
+    """An immutable JSON value shared by the revisions containing it."""
+
+    digest = models.CharField(max_length=32, primary_key=True)
+
+    data = models.JSONField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+
+        verbose_name = "Revision Blob"
+
+        verbose_name_plural = "Revision Blobs"
+
+    def __str__(self):
+
+        return self.digest
+
+
+class BlobBatch:
+    """Blobs collected while encoding, written in one INSERT."""
+
+    def __init__(self):
+
+        self.blobs: Dict[str, Any] = {}
+
+    def put(self, value: Any, digest: Optional[str] = None) -> str:
+
+        digest = digest or blob_digest(value)
+
+        self.blobs.setdefault(digest, value)
+
+        return digest
+
+    def get(self, digest: str) -> Any:
+        """A blob of this batch or, failing that, of the store."""
+
+        if digest in self.blobs:
+
+            return self.blobs[digest]
+
+        return load_blobs([digest])[digest]
+
+    def save(self) -> None:
+
+        if self.blobs:
+
+            RevisionBlob.objects.bulk_create(
+                [
+                    RevisionBlob(digest=digest, data=value)
+                    for digest, value in self.blobs.items()
+                ],
+                ignore_conflicts=True,
+            )
+
+        self.blobs = {}
+
+
+def load_blobs(digests: Iterable[str]) -> Dict[str, Any]:
+
+    digests = set(digests)
+
+    blobs = dict(
+        RevisionBlob.objects.filter(digest__in=digests).values_list("digest", "data")
+    )
+
+    missing = digests - set(blobs)
+
+    if missing:
+
+        raise RevisionStorageError(f"Missing revision blobs: {sorted(missing)}")
+
+    return blobs
+
+
+def apply_edits(digests: List[str], edits: List[list]) -> List[str]:
+    """Block digests of a revision from those of its keyframe."""
+
+    digests = list(digests)
+
+    # Edits index the keyframe: apply from the end so earlier ones hold
+    for start, stop, replacement in reversed(edits):
+
+        digests[start:stop] = replacement
+
+    return digests
+
+
+def diff_digests(base: List[str], digests: List[str]) -> List[list]:
+    """Edits turning ``base`` into ``digests``."""
+
+    matcher = SequenceMatcher(None, base, digests, autojunk=False)
+
+    return [
+        [base_start, base_stop, digests[start:stop]]
+        for tag, base_start, base_stop, start, stop in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def encode_snapshot(
+    snapshot: Dict[str, Any],
+    batch: BlobBatch,
+    shared_fields: Iterable[str] = (),
+    previous: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Stored form of ``snapshot``; new blobs are added to ``batch``.
+
+    ``previous`` is the stored form of the owner's latest revision, whose
+    keyframe the snapshot is encoded against if still suitable.
+    """
+
+    blocks = snapshot.get("blocks")
+
+    if not isinstance(blocks, list):
+
+        return snapshot
+
+    # Placeholders keep the key order of the snapshot
+    data = {**snapshot, "blocks": None}
+
+    digests = [blob_digest(block) for block in blocks]
+
+    manifest = None
+
+    keyframe = (previous or {}).get("manifest")
+
+    interval = getattr(settings, "CMS_REVISION_KEYFRAME_INTERVAL", 20)
+
+    if keyframe is not None and keyframe["depth"] + 1 < interval:
+
+        try:
+            base = batch.get(keyframe["base"])
+
+        except RevisionStorageError:
+
+            # Unreadable keyframe: start a new one rather than depend on it
+            base = []
+
+        edits = diff_digests(base, digests)
+
+        if (
+            base
+            and sum(len(replacement) for _, _, replacement in edits)
+            <= len(digests) // 2
+        ):
+
+            manifest = {
+                "base": keyframe["base"],
+                "edits": edits,
+                "depth": keyframe["depth"] + 1,
+            }
+
+            new_digests = {
+                digest for _, _, replacement in edits for digest in replacement
+            }
+
+    if manifest is None:
+
+        manifest = {"base": batch.put(digests), "edits": [], "depth": 0}
+
+        new_digests = set(digests)
+
+    for block, digest in zip(blocks, digests):
+
+        if digest in new_digests:
+
+            batch.put(block, digest)
+
+    manifest["count"] = len(digests)
+
+    data["manifest"] = manifest
+
+    shared = {}
+
+    for field in shared_fields:
+
+        if isinstance(snapshot.get(field), str):
+
+            shared[field] = batch.put(snapshot[field])
+
+            data[field] = None
+
+    if shared:
+
+        data["shared"] = shared
+
+    return data
+
+
+def decode_snapshot(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Snapshot from its stored form."""
+
+    manifest = data.get("manifest") if isinstance(data, dict) else None
+
+    if manifest is None:
+
+        return data
+
+    snapshot = {
+        key: value for key, value in data.items() if key not in ("manifest", "shared")
+    }
+
+    base = load_blobs([manifest["base"]])[manifest["base"]]
+
+    digests = apply_edits(base, manifest["edits"])
+
+    shared = data.get("shared", {})
+
+    blobs = load_blobs([*digests, *shared.values()])
+
+    seen = set()
+
+    blocks = []
+
+    for digest in digests:
+
+        # A block repeated in the page must not be the same object twice
+        blocks.append(copy.deepcopy(blobs[digest]) if digest in seen else blobs[digest])
+
+        seen.add(digest)
+
+    snapshot["blocks"] = blocks
+
+    for field, digest in shared.items():
+
+        snapshot[field] = blobs[digest]
+
+    return snapshot
+
+
+def referenced_digests(data: Dict[str, Any]) -> set:
+    """Blobs a stored snapshot references directly (its keyframe list included)."""
+
+    manifest = data.get("manifest")
+
+    if manifest is None:
+
+        return set()
+
+    digests = {manifest["base"], *data.get("shared", {}).values()}
+
+    for _, _, replacement in manifest["edits"]:
+
+        digests.update(replacement)
+
+    return digests
+
+
+class SnapshotQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+
+        objs = list(objs)
+
+        batch = BlobBatch()
+
+        # Each becomes a keyframe: no per-row lookup of the owner's history
+        for obj in objs:
+
+            obj.encode_pending_snapshot(batch, previous=None)
+
+        batch.save()
+
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class SnapshotStorageMixin(models.Model):
+    """Revision model whose ``snapshot`` is stored delta-compressed.
+
+    Subclasses name the foreign key to the versioned object in
+    ``OWNER_FIELD`` and may list large text fields to store as blobs in
+    ``SHARED_FIELDS``.
+    """
+
+    OWNER_FIELD = ""
+
+    SHARED_FIELDS: tuple = ()
+
+    data = models.JSONField(
+        db_column="snapshot",
+        help_text="Snapshot in stored form: fields, block manifest and blob digests",
+    )
+
+    objects = SnapshotQuerySet.as_manager()
+
+    class Meta:
+
+        abstract = True
+
+    @property
+    def snapshot(self) -> Dict[str, Any]:
+
+        if getattr(self, "_snapshot", None) is None:
+
+            self._snapshot = decode_snapshot(self.data)
+
+        return self._snapshot
+
+    @snapshot.setter
+    def snapshot(self, value: Dict[str, Any]) -> None:
+
+        self._snapshot = value
+
+        # Stored whole until saved, as rows written before compression
+        self.data = value
+
+        self._snapshot_pending = True
+
+    def encode_pending_snapshot(
+        self, batch: BlobBatch, previous: Optional[Dict[str, Any]]
+    ) -> None:
+
+        if getattr(self, "_snapshot_pending", False):
+
+            self.data = encode_snapshot(
+                self._snapshot, batch, self.SHARED_FIELDS, previous
+            )
+
+            self._snapshot_pending = False
+
+    def previous_data(self) -> Optional[Dict[str, Any]]:
+        """Stored form of the owner's latest other revision."""
+
+        return (
+            type(self)
+            .objects.filter(
+                **{f"{self.OWNER_FIELD}_id": getattr(self, f"{self.OWNER_FIELD}_id")}
+            )
+            .exclude(pk=self.pk)
+            .order_by("-created_at")
+            .values_list("data", flat=True)
+            .first()
+        )
+
+    def save(self, *args, **kwargs):
+
+        if getattr(self, "_snapshot_pending", False):
+
+            batch = BlobBatch()
+
+            self.encode_pending_snapshot(batch, self.previous_data())
+
+            batch.save()
+
+        super().save(*args, **kwargs)
+
+    def get_block_count(self) -> int:
+        """Get the number of blocks in this revision."""
+
+        manifest = (self.data or {}).get("manifest")
+
+        if manifest is not None:
+
+            return manifest["count"]
+
+        return len(self.snapshot.get("blocks", []))
+
+
+def prune_blobs(revision_models: Iterable[type]) -> int:
+    """Delete the blobs no revision of ``revision_models`` references.
+
+    Meant for maintenance windows: a revision saved while the references
+    are collected may reuse a blob deemed unreferenced.
+    """
+
+    referenced = set()
+
+    bases = set()
+
+    for model in revision_models:
+
+        for data in model.objects.values_list("data", flat=True).iterator():
+
+            if isinstance(data, dict) and "manifest" in data:
+
+                referenced.update(referenced_digests(data))
+
+                bases.add(data["manifest"]["base"])
+
+    # Keyframe lists reference the blocks their revisions leave unedited
+    for digests in load_blobs(bases).values():
+
+        referenced.update(digests)
+
+    stale = [
+        digest
+        for digest in RevisionBlob.objects.values_list("digest", flat=True).iterator()
+        if digest not in referenced
+    ]
+
+    deleted = 0
+
+    for start in range(0, len(stale), 500):
+
+        deleted += RevisionBlob.objects.filter(
+            digest__in=stale[start : start + 500]
+        ).delete()[0]
+
+    return deleted
@@ -1,3 +1,4 @@
+import threading
 from typing import Any
 
 from django.conf import settings
@@ -117,15 +118,46 @@ def sanitize_html(
 
     config = get_sanitization_config()
 
-    return bleach.clean(
-        html_content,
-        tags=allowed_tags or config["allowed_tags"],
-        attributes=allowed_attributes or config["allowed_attributes"],
-        protocols=allowed_protocols or config["allowed_protocols"],
-        strip=True,  # Remove disallowed tags completely
-        strip_comments=True,  # Remove HTML comments
+    cleaner = get_cleaner(
+        allowed_tags or config["allowed_tags"],
+        allowed_attributes or config["allowed_attributes"],
+        allowed_protocols or config["allowed_protocols"],
     )
 
+    return cleaner.clean(html_content)
+
+
+# Building a Cleaner sets up an html5lib parser and serializer; they hold
+# parsing state, so each thread keeps its own cleaner per configuration
+
+_local = threading.local()
+
+
+def get_cleaner(tags, attributes, protocols) -> bleach.Cleaner:
+    """Reusable cleaner for a tag/attribute/protocol allowlist."""
+
+    cleaners = getattr(_local, "cleaners", None)
+
+    if cleaners is None:
+
+        cleaners = _local.cleaners = {}
+
+    key = repr((tags, attributes, protocols))
+
+    cleaner = cleaners.get(key)
+
+    if cleaner is None:
+
+        cleaner = cleaners[key] = bleach.Cleaner(
+            tags=tags,
+            attributes=attributes,
+            protocols=protocols,
+            strip=True,  # Remove disallowed tags completely
+            strip_comments=True,  # Remove HTML comments
+        )
+
+    return cleaner
+
 
 def sanitize_rich_text_block(block_data: dict[str, Any]) -> dict[str, Any]:
     """
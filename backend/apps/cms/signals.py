@@ -2,7 +2,12 @@ from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from apps.blog.models import BlogPost
+from apps.i18n.models import Locale
+
+from . import documents, menus, sitemaps
 from .models import Page
+from .seo import SeoSettings
 
 # Try to import optional dependencies
 try:
@@ -12,6 +17,7 @@ except ImportError:
     update_usage_for_instance = None
 
 try:
+    from .autosave import buffer_autosave
     from .versioning import AuditEntry, PageRevision
 except ImportError:
     AuditEntry = None
@@ -55,10 +61,16 @@ def store_old_path(sender, instance, **kwargs):
 
             instance._old_path = old_instance.path
 
+            instance._old_menu_state = menus.menu_state(old_instance)
+
+            instance._old_sitemap_entry = sitemaps.sitemap_entry(old_instance)
+
         except Page.DoesNotExist:
 
             instance._old_path = None
 
+            instance._old_sitemap_entry = None
+
 
 @receiver(post_save, sender=Page)
 def update_asset_usage(sender, instance, created, **kwargs):
@@ -109,16 +121,20 @@ def create_page_revision(sender, instance, created, **kwargs):
             and instance.published_at <= timezone.now()
         )
 
-        # Always create revision for published snapshots
+        # Always create revision for published snapshots and explicit saves
 
-        # For drafts, check if we should create an autosave
+        # Other draft edits are autosaves, buffered and written once idle
 
         should_create = (
-            is_published
-            or created
-            or (user and PageRevision.should_create_autosave(instance, user))
+            is_published or created or bool(getattr(instance, "_revision_comment", ""))
         )
 
+        if not should_create and user:
+
+            buffer_autosave(
+                PageRevision, instance, user, PageRevision.snapshot_data(instance)
+            )
+
         if should_create:
 
             revision = PageRevision.create_snapshot(
@@ -201,3 +217,151 @@ def detect_publish_status_change(sender, instance, **kwargs):
 
         except Page.DoesNotExist:
             pass
+
+
+def schedule_sitemap_refresh(*locale_ids):
+    """Queue a sitemap re-render of the locales of ``locale_ids``."""
+
+    try:
+        for code in Locale.objects.filter(pk__in=locale_ids).values_list(
+            "code", flat=True
+        ):
+            sitemaps.schedule_refresh(code)
+    except Exception:
+        # Sitemap refresh is best-effort - the shards stream live meanwhile
+        pass
+
+
+@receiver(pre_save, sender=BlogPost)
+def store_old_sitemap_entry(sender, instance, **kwargs):
+    """Store what the sitemap shows of a post to compare after save."""
+
+    old_instance = None
+
+    if instance.pk:
+
+        old_instance = (
+            BlogPost.objects.filter(pk=instance.pk)
+            .only("status", "slug", "locale_id", "updated_at")
+            .first()
+        )
+
+    instance._old_sitemap_entry = (
+        sitemaps.sitemap_entry(old_instance) if old_instance else None
+    )
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_save, sender=BlogPost)
+def refresh_sitemap_on_publish(sender, instance, created, **kwargs):
+    """Queue a sitemap re-render when the entry of saved content changes.
+
+    Only the location, listing and lastmod day of an entry show in the
+    shards; other edits leave them as they are.
+    """
+
+    old_entry = getattr(instance, "_old_sitemap_entry", None)
+
+    new_entry = sitemaps.sitemap_entry(instance)
+
+    if old_entry == new_entry:
+        return
+
+    schedule_sitemap_refresh(
+        *{entry[1] for entry in (old_entry, new_entry) if entry is not None}
+    )
+
+
+@receiver(post_delete, sender=Page)
+@receiver(post_delete, sender=BlogPost)
+def refresh_sitemap_on_delete(sender, instance, **kwargs):
+    """Queue a sitemap re-render when published content is deleted."""
+
+    if instance.status != "published":
+        return
+
+    schedule_sitemap_refresh(instance.locale_id)
+
+
+@receiver(post_save, sender=Page)
+def rebuild_public_document(sender, instance, created, **kwargs):
+    """Re-render the public documents of a saved page and its alternates."""
+
+    documents.rebuild_pages([instance])
+
+
+@receiver(post_delete, sender=Page)
+def rebuild_alternate_documents(sender, instance, **kwargs):
+    """Re-render the documents listing a deleted page as an alternate."""
+
+    documents.rebuild_pages(
+        Page.objects.filter(
+            group_id=instance.group_id, public_document__isnull=False
+        ).select_related("locale")
+    )
+
+
+@receiver(post_save, sender=SeoSettings)
+@receiver(post_delete, sender=SeoSettings)
+def discard_documents_on_seo_change(sender, instance, **kwargs):
+    """Resolved SEO of every page in the locale changes."""
+
+    documents.discard_locales([instance.locale.code])
+
+
+@receiver(post_save, sender=Locale)
+@receiver(post_delete, sender=Locale)
+def discard_documents_on_locale_change(sender, instance, **kwargs):
+    """Locale names and hreflang alternates appear in every locale's documents."""
+
+    documents.discard_locales()
+
+
+@receiver(post_save, sender=Page)
+def rebuild_menus_on_change(sender, instance, created, **kwargs):
+    """Re-render the menus a saved page enters, leaves or changes in."""
+
+    old_state = getattr(instance, "_old_menu_state", None)
+
+    new_state = menus.menu_state(instance)
+
+    if old_state == new_state:
+        return
+
+    locale_ids = {
+        state["locale_id"] for state in (old_state, new_state) if state is not None
+    }
+
+    menus.schedule_rebuild(
+        Locale.objects.filter(pk__in=locale_ids).values_list("code", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Page)
+def rebuild_menus_on_delete(sender, instance, **kwargs):
+    """Re-render the menus listing a deleted page."""
+
+    if menus.menu_state(instance) is not None:
+
+        menus.schedule_rebuild([instance.locale.code])
+
+
+@receiver(pre_save, sender=Locale)
+def store_old_locale_code(sender, instance, **kwargs):
+    """Store the old code, under which the locale's menus are stored."""
+
+    if instance.pk:
+
+        instance._old_code = (
+            Locale.objects.filter(pk=instance.pk).values_list("code", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Locale)
+@receiver(post_delete, sender=Locale)
+def discard_menus_on_locale_change(sender, instance, **kwargs):
+    """A renamed or deleted locale code must not keep serving its menus."""
+
+    codes = {instance.code, getattr(instance, "_old_code", None)}
+
+    menus.discard(code for code in codes if code)
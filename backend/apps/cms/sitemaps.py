@@ -0,0 +1,470 @@
+import logging
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from apps.core.cache import CACHE_TIMEOUTS, cache_manager
+from apps.i18n.models import Locale
+from apps.registry.registry import content_registry
+
+from .models import Page
+
+"""
+Sharded XML sitemaps.
+
+Published pages and publishable registry content (blog posts, ...) are split
+per locale into numbered shards of at most ``CMS_SITEMAP_SHARD_SIZE`` URLs,
+referenced from a single ``sitemap.xml`` index. Shards are streamed from the
+database, or served from copies pre-rendered into storage by
+``apps.cms.tasks.refresh_sitemaps`` whenever content is published.
+"""
+
+
+logger = logging.getLogger(__name__)
+
+
+# Hard limit imposed by the sitemap protocol
+
+SITEMAP_MAX_URLS = 50000
+
+SITEMAP_STORAGE_PREFIX = "sitemaps"
+
+# Rows fetched per query while streaming; alternates are resolved per batch
+
+SITEMAP_BATCH_SIZE = 1000
+
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+
+URLSET_OPEN_XHTML = (
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+    'xmlns:xhtml="http://www.w3.org/1999/xhtml">'
+)
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>'
+
+
+def get_base_url() -> str:
+    """Return the absolute base URL used for sitemap locations."""
+
+    return getattr(settings, "CMS_SITEMAP_BASE_URL", "http://localhost:8000").rstrip(
+        "/"
+    )
+
+
+def get_shard_size() -> int:
+    """Return the configured number of URLs per shard, capped by the protocol."""
+
+    size = getattr(settings, "CMS_SITEMAP_SHARD_SIZE", SITEMAP_MAX_URLS)
+
+    return max(1, min(int(size), SITEMAP_MAX_URLS))
+
+
+def alternates_by_default() -> bool:
+    """Whether shards include hreflang alternates unless asked otherwise."""
+
+    return bool(getattr(settings, "CMS_SITEMAP_INCLUDE_ALTERNATES", False))
+
+
+def format_lastmod(value) -> str:
+    """``<lastmod>`` of a modification time, to the day.
+
+    Edits later on the same day leave the rendered shards unchanged, so
+    they need no refresh.
+    """
+
+    return value.date().isoformat()
+
+
+def sitemap_entry(instance) -> Optional[Tuple[str, Any, str]]:
+    """What the sitemap shows of a page or post; None if it is not listed."""
+
+    if instance.status != "published" or not instance.updated_at:
+        return None
+
+    location = instance.path if isinstance(instance, Page) else instance.slug
+
+    return (location, instance.locale_id, format_lastmod(instance.updated_at))
+
+
+def shard_storage_path(locale_code: str, shard: int) -> str:
+    """Storage path of a pre-rendered shard."""
+
+    return f"{SITEMAP_STORAGE_PREFIX}/{locale_code}/sitemap-{locale_code}-{shard}.xml"
+
+
+@dataclass(frozen=True)
+class SitemapSource:
+    """A publishable content type contributing URLs to the sitemap.
+
+    Pages are located through their materialized ``path``; registry content
+    is located by formatting its ``route_pattern`` with the slug.
+    """
+
+    model: Any
+
+    locale_field: str
+
+    slug_field: str = "slug"
+
+    route_pattern: Optional[str] = None
+
+    @property
+    def has_group(self) -> bool:
+        return any(f.name == "group_id" for f in self.model._meta.get_fields())
+
+    @property
+    def location_field(self) -> str:
+        return self.slug_field if self.route_pattern else "path"
+
+    def queryset(self, locale):
+        return self.model.objects.filter(
+            **{self.locale_field: locale, "status": "published"}
+        ).order_by("pk")
+
+    def rows(self, locale, offset: int, limit: int) -> Iterator[Dict[str, Any]]:
+        """Yield lightweight rows for a slice of this source."""
+
+        fields = ["pk", self.location_field, "updated_at"]
+
+        if self.has_group:
+            fields.append("group_id")
+
+        queryset = self.queryset(locale).values(*fields)[offset : offset + limit]
+
+        return queryset.iterator(chunk_size=SITEMAP_BATCH_SIZE)
+
+    def location(self, value: str) -> str:
+        if self.route_pattern:
+            return self.route_pattern.format(slug=value)
+
+        return value
+
+    def alternates(self, group_ids: Iterable) -> Dict[Any, List[Tuple[str, str]]]:
+        """Resolve hreflang alternates for many groups with one grouped query."""
+
+        grouped: Dict[Any, List[Tuple[str, str]]] = defaultdict(list)
+
+        group_ids = [group_id for group_id in set(group_ids) if group_id]
+
+        if not group_ids or not self.has_group:
+            return grouped
+
+        rows = (
+            self.model.objects.filter(
+                group_id__in=group_ids,
+                status="published",
+                **{f"{self.locale_field}__is_active": True},
+            )
+            .order_by("group_id", f"{self.locale_field}__code")
+            .values_list("group_id", f"{self.locale_field}__code", self.location_field)
+        )
+
+        for group_id, code, value in rows:
+            grouped[group_id].append((code, self.location(value)))
+
+        return grouped
+
+
+def get_sources() -> List[SitemapSource]:
+    """Return sitemap sources: pages first, then publishable registry content."""
+
+    sources = [SitemapSource(model=Page, locale_field="locale")]
+
+    for config in content_registry.get_all_configs():
+
+        if config.model is Page:
+            continue
+
+        if not (config.can_publish and config.locale_field and config.route_pattern):
+            continue
+
+        field_names = {f.name for f in config.model._meta.get_fields()}
+
+        if not {"status", "updated_at"}.issubset(field_names):
+            continue
+
+        sources.append(
+            SitemapSource(
+                model=config.model,
+                locale_field=config.locale_field,
+                slug_field=config.slug_field or "slug",
+                route_pattern=config.route_pattern,
+            )
+        )
+
+    return sources
+
+
+def build_manifest(locale: Locale) -> Dict[str, Any]:
+    """Count URLs per source for a locale and derive its shard layout."""
+
+    counts = []
+
+    lastmod = None
+
+    for source in get_sources():
+
+        stats = source.queryset(locale).aggregate(
+            total=Count("pk"), lastmod=Max("updated_at")
+        )
+
+        counts.append(stats["total"])
+
+        if stats["lastmod"] and (lastmod is None or stats["lastmod"] > lastmod):
+            lastmod = stats["lastmod"]
+
+    total = sum(counts)
+
+    return {
+        "locale": locale.code,
+        "counts": counts,
+        "total": total,
+        "shards": max(1, math.ceil(total / get_shard_size())),
+        "lastmod": format_lastmod(lastmod) if lastmod else None,
+        "prerendered": False,
+    }
+
+
+def _is_current_manifest(manifest: Any) -> bool:
+    """Check a cached manifest still matches the registered sources."""
+
+    if not isinstance(manifest, dict):
+        return False
+
+    return len(manifest.get("counts") or []) == len(get_sources())
+
+
+def get_manifest(locale: Locale) -> Dict[str, Any]:
+    """Return the cached shard manifest for a locale, computing it on a miss.
+
+    The manifest lives under ``sitemap_key(locale)`` so the existing content
+    invalidation signals drop it whenever pages or posts change.
+    """
+
+    key = cache_manager.key_builder.sitemap_key(locale.code)
+
+    manifest = cache_manager.get(key)
+
+    if not _is_current_manifest(manifest):
+
+        manifest = build_manifest(locale)
+
+        manifest["prerendered"] = default_storage.exists(
+            shard_storage_path(locale.code, 1)
+        )
+
+        cache_manager.set(key, manifest, timeout=CACHE_TIMEOUTS["sitemap"])
+
+    return manifest
+
+
+def _shard_ranges(
+    manifest: Dict[str, Any], shard: int
+) -> Iterator[Tuple[SitemapSource, int, int]]:
+    """Map a 1-based shard number onto (source, offset, limit) slices."""
+
+    size = get_shard_size()
+
+    start = (shard - 1) * size
+
+    end = start + size
+
+    source_start = 0
+
+    for source, count in zip(get_sources(), manifest["counts"]):
+
+        source_end = source_start + count
+
+        if source_end > start and source_start < end:
+
+            offset = max(start, source_start) - source_start
+
+            limit = min(end, source_end) - source_start - offset
+
+            yield source, offset, limit
+
+        source_start = source_end
+
+
+def _batched(iterator: Iterator, size: int) -> Iterator[list]:
+    while True:
+
+        batch = list(islice(iterator, size))
+
+        if not batch:
+            return
+
+        yield batch
+
+
+def iter_shard_xml(
+    locale: Locale,
+    shard: int,
+    include_alternates: bool = False,
+    manifest: Optional[Dict[str, Any]] = None,
+) -> Iterator[str]:
+    """Stream the XML of one shard in chunks of ``SITEMAP_BATCH_SIZE`` URLs."""
+
+    manifest = manifest or get_manifest(locale)
+
+    base_url = get_base_url()
+
+    yield XML_DECLARATION + "\n"
+
+    yield (URLSET_OPEN_XHTML if include_alternates else URLSET_OPEN) + "\n"
+
+    for source, offset, limit in _shard_ranges(manifest, shard):
+
+        rows = source.rows(locale, offset, limit)
+
+        for batch in _batched(rows, SITEMAP_BATCH_SIZE):
+
+            alternates = {}
+
+            if include_alternates:
+                alternates = source.alternates(row.get("group_id") for row in batch)
+
+            lines = []
+
+            for row in batch:
+
+                loc = escape(f"{base_url}{source.location(row[source.location_field])}")
+
+                lines.append("  <url>")
+                lines.append(f"    <loc>{loc}</loc>")
+
+                if row["updated_at"]:
+                    lines.append(
+                        f"    <lastmod>{format_lastmod(row['updated_at'])}</lastmod>"
+                    )
+
+                for code, location in alternates.get(row.get("group_id"), []):
+                    lines.append(
+                        f'    <xhtml:link rel="alternate" hreflang={quoteattr(code)}'
+                        f" href={quoteattr(base_url + location)} />"
+                    )
+
+                lines.append("  </url>")
+
+            yield "\n".join(lines) + "\n"
+
+    yield "</urlset>\n"
+
+
+def iter_index_xml(locales: Iterable[Locale]) -> Iterator[str]:
+    """Stream the sitemap index referencing every shard of every locale."""
+
+    base_url = get_base_url()
+
+    yield XML_DECLARATION + "\n"
+
+    yield '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+
+    for locale in locales:
+
+        manifest = get_manifest(locale)
+
+        for shard in range(1, manifest["shards"] + 1):
+
+            lines = [
+                "  <sitemap>",
+                f"    <loc>{escape(f'{base_url}/sitemap-{locale.code}-{shard}.xml')}</loc>",
+            ]
+
+            if manifest["lastmod"]:
+                lines.append(f"    <lastmod>{manifest['lastmod']}</lastmod>")
+
+            lines.append("  </sitemap>")
+
+            yield "\n".join(lines) + "\n"
+
+    yield "</sitemapindex>\n"
+
+
+def prerender_locale(locale: Locale) -> Dict[str, Any]:
+    """Render every shard of a locale into storage and cache its manifest.
+
+    Shards left over from a previously larger sitemap are removed.
+    """
+
+    manifest = build_manifest(locale)
+
+    include_alternates = alternates_by_default()
+
+    for shard in range(1, manifest["shards"] + 1):
+
+        content = "".join(
+            iter_shard_xml(locale, shard, include_alternates, manifest=manifest)
+        )
+
+        path = shard_storage_path(locale.code, shard)
+
+        if default_storage.exists(path):
+            default_storage.delete(path)
+
+        default_storage.save(path, ContentFile(content.encode("utf-8")))
+
+    stale = manifest["shards"] + 1
+
+    while default_storage.exists(shard_storage_path(locale.code, stale)):
+
+        default_storage.delete(shard_storage_path(locale.code, stale))
+
+        stale += 1
+
+    manifest["prerendered"] = True
+
+    manifest["generated_at"] = timezone.now().isoformat()
+
+    cache_manager.set(
+        cache_manager.key_builder.sitemap_key(locale.code),
+        manifest,
+        timeout=CACHE_TIMEOUTS["sitemap"],
+    )
+
+    logger.info(
+        "Pre-rendered %s sitemap shard(s) for locale %s",
+        manifest["shards"],
+        locale.code,
+    )
+
+    return manifest
+
+
+def refresh_pending_key(locale_code: str) -> str:
+    """Cache key marking a queued-but-not-started refresh for a locale."""
+
+    return cache_manager.key_builder.build_key(
+        "sitemap", locale_code, "refresh-pending"
+    )
+
+
+def schedule_refresh(locale_code: str) -> None:
+    """Queue a debounced background re-render of a locale's sitemap shards.
+
+    Publishing a batch of pages enqueues a single refresh per locale; the
+    task runs after the surrounding transaction commits.
+    """
+
+    delay = int(getattr(settings, "CMS_SITEMAP_REFRESH_DELAY", 30))
+
+    if not cache.add(refresh_pending_key(locale_code), True, timeout=delay + 60):
+        return
+
+    def enqueue():
+        from .tasks import refresh_sitemaps
+
+        refresh_sitemaps.apply_async(args=[[locale_code]], countdown=delay)
+
+    transaction.on_commit(enqueue)
@@ -3,14 +3,12 @@ import re
 from typing import Any
 from urllib.parse import urljoin
 
-from django.db import transaction
+from django.core.cache import cache
 from django.utils import timezone
 
 import requests
 from celery import shared_task
 
-from apps.blog.models import BlogPost
-
 from .models import Page
 from .scheduling import ScheduledTask
 
@@ -33,10 +31,14 @@ class LinkExtractor:
         r'"href":\s*["\']([^"\']+)["\']',  # JSON href properties
     ]
 
-    def __init__(self, base_url: str = "http://localhost:8000"):  # noqa: C901
+    def __init__(
+        self, base_url: str = "http://localhost:8000", include_external: bool = False
+    ):  # noqa: C901
 
         self.base_url = base_url.rstrip("/")
 
+        self.include_external = include_external
+
         self.session = requests.Session()
 
         self.session.headers.update({"User-Agent": "Bedrock-CMS-LinkChecker/1.0"})
@@ -87,7 +89,9 @@ class LinkExtractor:
 
         for url in found_urls:
 
-            if self._is_internal_link(url):
+            if self._is_internal_link(url) or (
+                self.include_external and url.startswith(("http://", "https://"))
+            ):
 
                 links.append(
                     {
@@ -244,33 +248,49 @@ from typing import Any, Dict, List, Optional
 
 @shared_task(bind=True)
 def check_internal_links(
-    self, page_ids: Optional[List[int]] = None
+    self,
+    page_ids: Optional[List[int]] = None,
+    include_external: Optional[bool] = None,
 ) -> Dict[str, Any]:  # noqa: C901
     """
-    Check internal links in pages and report broken ones.
+    Check links in pages and report broken ones.
+
+    Links from every page are collected first and each distinct URL is
+    checked once by the ``LinkChecker`` engine.
 
     Args:
         page_ids: Optional list of page IDs to check. If None, checks all published pages.
+        include_external: Also probe external links. Defaults to ``CMS_LINK_CHECK_EXTERNAL``.
 
     Returns:
         Dict with broken links report
     """
 
+    from django.conf import settings
+
+    from .link_checker import LinkChecker
+
     try:
 
-        # Initialize link extractor
+        if include_external is None:
+
+            include_external = getattr(settings, "CMS_LINK_CHECK_EXTERNAL", False)
 
-        extractor = LinkExtractor()
+        checker = LinkChecker()
+
+        extractor = LinkExtractor(
+            base_url=checker.base_url, include_external=include_external
+        )
 
         # Get pages to check
 
-        if page_ids:
+        pages = Page.objects.filter(status="published").select_related("locale")
 
-            pages = Page.objects.filter(id__in=page_ids, status="published")
+        if page_ids:
 
-        else:
+            pages = pages.filter(id__in=page_ids)
 
-            pages = Page.objects.filter(status="published")
+        pages = pages.only("id", "title", "path", "blocks", "locale__code")
 
         total_pages = pages.count()
 
@@ -278,85 +298,96 @@ def check_internal_links(
             "total_pages_checked": 0,
             "total_links_found": 0,
             "total_links_checked": 0,
+            "unique_links_checked": 0,
+            "cached_links": 0,
             "broken_links": [],
             "errors": [],
         }
 
-        # Update progress
-
         self.update_state(
             state="PROGRESS",
             meta={
                 "current": 0,
                 "total": total_pages,
-                "status": f"Starting link check for {total_pages} pages",
+                "status": f"Extracting links from {total_pages} pages",
             },
         )
 
-        for page_index, page in enumerate(pages):
+        # Extract links from every page first
 
-            try:
+        occurrences = []
+
+        for page_index, page in enumerate(pages.iterator(chunk_size=200)):
 
-                # Extract links from page blocks
+            try:
 
                 links = extractor.extract_links_from_blocks(page.blocks or [])
 
                 results["total_links_found"] += len(links)
 
-                # Check each link
+                occurrences.extend((page, link_info) for link_info in links)
 
-                for link_info in links:
+                results["total_pages_checked"] += 1
 
-                    link_status = extractor.check_link_status(link_info["url"])
+            except Exception as e:
 
-                    results["total_links_checked"] += 1
+                error_msg = f"Error checking page {page.id}: {str(e)}"
 
-                    if link_status["is_broken"]:
+                logger.warning(error_msg)
 
-                        broken_link = {
-                            "page_id": page.id,
-                            "page_title": page.title,
-                            "page_path": page.path,
-                            "page_locale": (
-                                page.locale.code
-                                if hasattr(page.locale, "code")
-                                else str(page.locale)
-                            ),
-                            "url": link_info["url"],
-                            "block_path": link_info["block_path"],
-                            "block_type": link_info["block_type"],
-                            "context": link_info["context"],
-                            "status_code": link_status["status_code"],
-                            "error": link_status["error"],
-                            "checked_at": link_status["checked_at"],
-                        }
+                results["errors"].append(error_msg)
 
-                        results["broken_links"].append(broken_link)
+            if page_index % 100 == 0:
 
-                results["total_pages_checked"] += 1
+                self.update_state(
+                    state="PROGRESS",
+                    meta={
+                        "current": page_index + 1,
+                        "total": total_pages,
+                        "status": f"Extracted links from {page_index + 1} pages",
+                    },
+                )
 
-                # Update progress
+        # Check each distinct URL once
 
-                if page_index % 10 == 0 or page_index == total_pages - 1:
+        self.update_state(
+            state="PROGRESS",
+            meta={
+                "current": total_pages,
+                "total": total_pages,
+                "status": f"Checking {len(occurrences)} links",
+            },
+        )
 
-                    int((page_index + 1) / total_pages * 100)
+        link_statuses = checker.check(link_info["url"] for _, link_info in occurrences)
 
-                    self.update_state(
-                        state="PROGRESS",
-                        meta={
-                            "current": page_index + 1,
-                            "total": total_pages,
-                            "status": f"Checked {page_index + 1} pages, found {len(results['broken_links'])} broken links",
-                        },
-                    )
+        results["total_links_checked"] = len(occurrences)
 
-            except Exception as e:
+        results["unique_links_checked"] = checker.stats["unique"]
 
-                error_msg = f"Error checking page {page.id}: {str(e)}"
+        results["cached_links"] = checker.stats["cached"]
 
-                logger.warning(error_msg)
+        for page, link_info in occurrences:
 
-                results["errors"].append(error_msg)
+            link_status = link_statuses[checker.normalize(link_info["url"])]
+
+            if link_status.is_broken:
+
+                results["broken_links"].append(
+                    {
+                        "page_id": page.id,
+                        "page_title": page.title,
+                        "page_path": page.path,
+                        "page_locale": page.locale.code,
+                        "url": link_info["url"],
+                        "block_path": link_info["block_path"],
+                        "block_type": link_info["block_type"],
+                        "context": link_info["context"],
+                        "status_code": link_status.status_code,
+                        "error": link_status.error,
+                        "checked_at": link_status.checked_at,
+                    }
+                )
 
         # Final summary
 
@@ -370,8 +401,11 @@ def check_internal_links(
         )
 
         logger.info(
-            "Link check completed: %s links checked, {len(results['broken_links'])} broken",
+            "Link check completed: %s links (%s unique, %s cached), %s broken",
             results["total_links_checked"],
+            results["unique_links_checked"],
+            results["cached_links"],
+            len(results["broken_links"]),
         )
 
         return results
@@ -406,94 +440,277 @@ def nightly_link_check():  # noqa: C901
 def check_single_page_links(self, page_id: int) -> dict[str, Any]:  # noqa: C901
     """Check links for a single page."""
 
-    return check_internal_links(self, page_ids=[page_id])
+    return check_internal_links(page_ids=[page_id])
+
+
+@shared_task(bind=True)
+def refresh_sitemaps(self, locale_codes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Pre-render sitemap shards into storage.
+
+    Args:
+        locale_codes: Optional list of locale codes. If None, all active locales.
+
+    Returns:
+        Dict mapping locale codes to their shard counts
+    """
+
+    from apps.i18n.models import Locale
+
+    from . import sitemaps
+
+    locales = Locale.objects.filter(is_active=True)
+
+    if locale_codes:
+
+        locales = locales.filter(code__in=locale_codes)
+
+    results: Dict[str, Any] = {}
+
+    for locale in locales:
+
+        # Allow the next publish in this locale to queue another refresh
+
+        cache.delete(sitemaps.refresh_pending_key(locale.code))
+
+        try:
+
+            manifest = sitemaps.prerender_locale(locale)
+
+            results[locale.code] = manifest["shards"]
+
+        except Exception as e:
+
+            logger.error("Failed to pre-render sitemap for %s: %s", locale.code, e)
+
+            results[locale.code] = {"error": str(e)}
+
+    return results
 
 
 @shared_task
-def publish_scheduled_content():  # noqa: C901
+def rebuild_page_documents(locale_codes: Optional[List[str]] = None) -> int:
     """
-    Publish scheduled content that's ready to be published.
+    Render the public documents of published pages that have none.
 
-    This task should run every minute to check for content ready to publish.
+    Args:
+        locale_codes: Optional list of locale codes. If None, all active locales.
+
+    Returns:
+        Number of documents rendered
     """
 
-    now = timezone.now()
+    from . import documents
 
-    published_count = 0
+    pages = Page.objects.filter(
+        status="published", locale__is_active=True, public_document__isnull=True
+    ).select_related("locale")
 
-    unpublished_count = 0
+    if locale_codes:
 
-    errors = []
+        pages = pages.filter(locale__code__in=locale_codes)
+
+    rendered = 0
+
+    for page in pages.iterator(chunk_size=200):
+
+        try:
+
+            documents.rebuild(page)
+
+            rendered += 1
+
+        except Exception as e:
+
+            logger.error("Failed to render public document of %s: %s", page.pk, e)
+
+    return rendered
+
+
+@shared_task
+def flush_autosave_buffer() -> int:
+    """
+    Write the buffered autosave drafts that are idle or too old as revisions.
+
+    Returns:
+        Number of revisions created
+    """
+
+    from .autosave import flush_autosaves
+
+    return flush_autosaves()
+
+
+def _clone_progress(task, label: str):
+    """Report clone progress as the state of ``task``."""
+
+    def report(processed: int, total: int) -> None:
+
+        task.update_state(
+            state="PROGRESS",
+            meta={
+                "current": processed,
+                "total": total,
+                "status": f"Copying {label}: {processed}/{total} pages",
+            },
+        )
+
+    return report
+
+
+def _clone_summary(result) -> Dict[str, Any]:
+
+    return {
+        "created_count": result.created_count,
+        "pages": result.pages,
+        "skipped": result.skipped,
+        "errors": result.errors,
+    }
+
+
+def _get_user(user_id: Optional[int]):
+
+    from django.contrib.auth import get_user_model
+
+    if user_id is None:
+
+        return None
+
+    return get_user_model().objects.filter(pk=user_id).first()
+
+
+@shared_task(bind=True)
+def clone_page_tree(
+    self,
+    page_id: int,
+    target_locale_code: Optional[str] = None,
+    include_descendants: bool = True,
+    user_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Copy a page and its descendants, within its locale or into another.
+
+    Args:
+        page_id: ID of the root page of the tree
+        target_locale_code: Locale to copy into. Defaults to the page's locale.
+        include_descendants: Also copy the descendants of the page
+        user_id: ID of the user the revisions of the copies are attributed to
+
+    Returns:
+        Dict with the copied page ids, skipped pages and errors
+    """
+
+    from apps.i18n.models import Locale
+
+    from .page_clone import clone_page_tree as clone_tree
 
     try:
 
-        # Publish scheduled pages
+        page = Page.objects.select_related("locale").get(pk=page_id)
 
-        scheduled_pages = Page.objects.filter(
-            status="scheduled", published_at__lte=now, published_at__isnull=False
+        target_locale = (
+            Locale.objects.get(code=target_locale_code) if target_locale_code else None
         )
 
-        for page in scheduled_pages:
+        result = clone_tree(
+            page,
+            target_locale,
+            include_descendants=include_descendants,
+            user=_get_user(user_id),
+            progress=_clone_progress(self, page.title),
+        )
 
-            try:
+        logger.info(
+            "Copied %s pages of the tree of page %s", result.created_count, page_id
+        )
 
-                with transaction.atomic():
+        return _clone_summary(result)
 
-                    page.status = "published"
+    except Exception as e:
 
-                    page.save(update_fields=["status"])
+        error_msg = f"Failed to copy page tree {page_id}: {str(e)}"
 
-                    published_count += 1
+        logger.error(error_msg)
 
-                    logger.info(
-                        f"Published scheduled page: {page.title} (ID: {page.id})"
-                    )
+        return {"error": error_msg}
 
-            except Exception as e:
 
-                error_msg = f"Failed to publish page {page.id}: {str(e)}"
+@shared_task(bind=True)
+def clone_locale_pages(
+    self,
+    source_locale_code: str,
+    target_locale_code: str,
+    user_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Copy every page of a locale not yet translated into another locale.
 
-                logger.error(error_msg)
+    Args:
+        source_locale_code: Locale to copy the pages of
+        target_locale_code: Locale to copy the pages into
+        user_id: ID of the user the revisions of the copies are attributed to
 
-                errors.append(error_msg)
+    Returns:
+        Dict with the copied page ids, skipped pages and errors
+    """
 
-        # Publish scheduled blog posts (if they exist and have scheduled status)
+    from apps.i18n.models import Locale
 
-        try:
+    from .page_clone import clone_locale
 
-            scheduled_posts = BlogPost.objects.filter(
-                status="scheduled", published_at__lte=now, published_at__isnull=False
-            )
+    try:
+
+        result = clone_locale(
+            Locale.objects.get(code=source_locale_code),
+            Locale.objects.get(code=target_locale_code),
+            user=_get_user(user_id),
+            progress=_clone_progress(self, source_locale_code),
+        )
+
+        logger.info(
+            "Copied %s pages from %s to %s",
+            result.created_count,
+            source_locale_code,
+            target_locale_code,
+        )
+
+        return _clone_summary(result)
 
-            for post in scheduled_posts:
+    except Exception as e:
 
-                try:
+        error_msg = (
+            f"Failed to copy pages from {source_locale_code} "
+            f"to {target_locale_code}: {str(e)}"
+        )
 
-                    with transaction.atomic():
+        logger.error(error_msg)
+
+        return {"error": error_msg}
 
-                        post.status = "published"
 
-                        post.save(update_fields=["status"])
+@shared_task
+def publish_scheduled_content():  # noqa: C901
+    """
+    Publish scheduled content that's ready to be published.
 
-                        published_count += 1
+    This task should run every minute to check for content ready to publish.
+    """
 
-                        logger.info(
-                            f"Published scheduled blog post: {post.title} (ID: {post.id})"
-                        )
+    from .bulk_publishing import publish_due_content
 
-                except Exception as e:
+    now = timezone.now()
 
-                    error_msg = f"Failed to publish blog post {post.id}: {str(e)}"
+    unpublished_count = 0
 
-                    logger.error(error_msg)
+    try:
 
-                    errors.append(error_msg)
+        # Lock due pages and posts (SKIP LOCKED) and publish them in batches
 
-        except Exception as e:
+        result = publish_due_content(now=now)
 
-            # Blog app might not be installed or have different structure
+        published_count = result.published_count
 
-            logger.warning(f"Could not check scheduled blog posts: {str(e)}")
+        errors = result.errors
 
         # Log summary
 
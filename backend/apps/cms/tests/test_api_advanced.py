@@ -687,8 +687,9 @@ class SEOMetadataAPITests(BaseAPITestCase):
 
         if response.status_code == status.HTTP_200_OK:
             self.assertIn("xml", response.get("Content-Type", "").lower())
-            self.assertIn(b"<urlset", response.content)
-            self.assertIn(b"<url>", response.content)
+            content = response.getvalue()
+            self.assertIn(b"<urlset", content)
+            self.assertIn(b"<url>", content)
         else:
             # Test alternative sitemap endpoint
             response = self.client.get("/sitemap.xml")
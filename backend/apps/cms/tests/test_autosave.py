@@ -0,0 +1,269 @@
+"""Tests for the write-behind autosave buffer."""
+
+import os
+from unittest.mock import patch
+
+import django
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.blog.models import BlogPost
+from apps.blog.versioning import BlogPostRevision
+from apps.cms.autosave import (
+    AUTOSAVE_INDEX_KEY,
+    draft_key,
+    flush_autosaves,
+    forget_flushed,
+    get_draft,
+    index_draft,
+    owner_index_key,
+)
+from apps.cms.models import Page
+from apps.cms.tasks import flush_autosave_buffer
+from apps.cms.versioning import PageRevision
+from apps.i18n.models import Locale
+
+User = get_user_model()
+
+
+class PageAutosaveTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            email="editor@example.com", password="testpass123"
+        )
+
+        locale, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={
+                "name": "English",
+                "native_name": "English",
+                "is_default": True,
+                "is_active": True,
+            },
+        )
+
+        self.page = Page.objects.create(title="Draft", slug="draft", locale=locale)
+
+    def edit(self, title):
+        self.page.title = title
+        self.page._current_user = self.user
+        self.page.save()
+
+    def revisions(self):
+        return PageRevision.objects.filter(page=self.page)
+
+    def test_edits_are_buffered_not_written(self):
+        count = self.revisions().count()
+
+        for i in range(10):
+            self.edit(f"Edit {i}")
+
+        self.assertEqual(self.revisions().count(), count)
+
+        draft = get_draft(PageRevision, self.page.pk, self.user.pk)
+
+        self.assertEqual(draft["snapshot"]["title"], "Edit 9")
+
+    def test_drafts_are_flushed_once_idle(self):
+        self.edit("Edit 1")
+        self.edit("Edit 2")
+
+        # Not idle yet
+        self.assertEqual(flush_autosave_buffer.delay().get(), 0)
+
+        with override_settings(CMS_AUTOSAVE_IDLE_SECONDS=0):
+            self.assertEqual(flush_autosave_buffer.delay().get(), 1)
+
+        revision = self.revisions().latest("created_at")
+
+        self.assertTrue(revision.is_autosave)
+        self.assertEqual(revision.created_by, self.user)
+        self.assertEqual(revision.snapshot["title"], "Edit 2")
+
+        self.assertIsNone(get_draft(PageRevision, self.page.pk, self.user.pk))
+        self.assertIsNone(cache.get(owner_index_key(PageRevision, self.page.pk)))
+        self.assertNotIn(
+            owner_index_key(PageRevision, self.page.pk),
+            cache.get(AUTOSAVE_INDEX_KEY, set()),
+        )
+
+    @override_settings(CMS_AUTOSAVE_IDLE_SECONDS=3600, CMS_AUTOSAVE_MAX_AGE=0)
+    def test_drafts_are_flushed_at_max_age(self):
+        self.edit("Edit 1")
+
+        self.assertEqual(flush_autosaves(), 1)
+
+    def test_publish_writes_draft_first(self):
+        self.edit("Unpublished edit")
+
+        self.page.status = "published"
+        self.page.published_at = timezone.now()
+        self.page.title = "Published"
+        self.page.save()
+
+        latest, previous = self.revisions().order_by("-created_at")[:2]
+
+        self.assertTrue(latest.is_published_snapshot)
+        self.assertTrue(previous.is_autosave)
+        self.assertEqual(previous.snapshot["title"], "Unpublished edit")
+
+    def test_draft_of_deleted_page_is_dropped(self):
+        self.edit("Edit 1")
+
+        self.page.delete()
+
+        self.assertEqual(flush_autosaves(force=True), 0)
+        self.assertIsNone(cache.get(owner_index_key(PageRevision, self.page.pk)))
+
+    def test_flushing_one_page_keeps_other_drafts_indexed(self):
+        other = Page.objects.create(
+            title="Other", slug="other", locale=self.page.locale
+        )
+
+        other._current_user = self.user
+        other.save()
+
+        self.edit("Edit 1")
+
+        self.assertEqual(
+            flush_autosaves(PageRevision, owner_id=self.page.pk, force=True), 1
+        )
+
+        owners = cache.get(AUTOSAVE_INDEX_KEY)
+
+        self.assertIn(owner_index_key(PageRevision, other.pk), owners)
+        self.assertNotIn(owner_index_key(PageRevision, self.page.pk), owners)
+        self.assertEqual(
+            cache.get(owner_index_key(PageRevision, other.pk)),
+            {draft_key(PageRevision, other.pk, self.user.pk)},
+        )
+
+    def test_index_updates_wait_for_the_lock(self):
+        owner_index = owner_index_key(PageRevision, self.page.pk)
+
+        cache.add(f"{owner_index}:lock", True)
+
+        # The holder finishes while the edit waits
+        def release(seconds):
+            cache.set(owner_index, {"autosave:other"})
+            cache.delete(f"{owner_index}:lock")
+
+        with patch("apps.cms.autosave.time.sleep", side_effect=release) as sleep:
+            self.edit("Edit 1")
+
+        sleep.assert_called_once()
+
+        self.assertEqual(
+            cache.get(owner_index),
+            {"autosave:other", draft_key(PageRevision, self.page.pk, self.user.pk)},
+        )
+
+    def test_new_drafts_are_always_indexed(self):
+        key = draft_key(PageRevision, self.page.pk, self.user.pk)
+
+        owner_index = owner_index_key(PageRevision, self.page.pk)
+
+        # A flush has dropped the draft but not yet its index entry
+        cache.set(owner_index, {key})
+
+        with patch("apps.cms.autosave.index_draft", wraps=index_draft) as indexed:
+            self.edit("Edit 1")
+            self.edit("Edit 2")
+
+        indexed.assert_called_once_with(owner_index, key)
+
+    def test_flush_keeps_drafts_buffered_again_indexed(self):
+        key = draft_key(PageRevision, self.page.pk, self.user.pk)
+
+        owner_index = owner_index_key(PageRevision, self.page.pk)
+
+        cache.set(owner_index, {key})
+
+        cache.add(f"{owner_index}:lock", True)
+
+        # The draft is buffered again while the flush waits for the lock
+        def rebuffer(seconds):
+            cache.set(key, {"snapshot": {}, "first_at": 0, "last_at": 0})
+            cache.delete(f"{owner_index}:lock")
+
+        with patch("apps.cms.autosave.time.sleep", side_effect=rebuffer):
+            forget_flushed({owner_index: {key}})
+
+        self.assertEqual(cache.get(owner_index), {key})
+
+    def test_explicit_save_flushes_drafts_missing_from_the_index(self):
+        self.edit("Unsaved edit")
+
+        cache.delete_many(
+            [AUTOSAVE_INDEX_KEY, owner_index_key(PageRevision, self.page.pk)]
+        )
+
+        PageRevision.create_snapshot(page=self.page, user=self.user, comment="Saved")
+
+        autosave = self.revisions().filter(is_autosave=True).latest("created_at")
+
+        self.assertEqual(autosave.snapshot["title"], "Unsaved edit")
+
+
+class BlogAutosaveTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="author@example.com", password="testpass123"
+        )
+
+        self.user.user_permissions.add(
+            *Permission.objects.filter(content_type__app_label="blog")
+        )
+
+        locale, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={
+                "name": "English",
+                "native_name": "English",
+                "is_default": True,
+                "is_active": True,
+            },
+        )
+
+        self.post = BlogPost.objects.create(
+            title="Post", content="Initial", author=self.user, locale=locale
+        )
+
+        self.client = APIClient()
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_autosave_is_written_on_explicit_save(self):
+        url = reverse("blog:blogpost-autosave", kwargs={"pk": self.post.pk})
+
+        for content in ("First", "Second"):
+            response = self.client.post(url, {"content": content}, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertFalse(BlogPostRevision.objects.filter(is_autosave=True).exists())
+
+        BlogPostRevision.create_snapshot(
+            blog_post=self.post, user=self.user, comment="Manual update"
+        )
+
+        autosave = BlogPostRevision.objects.get(is_autosave=True)
+
+        self.assertEqual(autosave.snapshot["content"], "Second")
+        self.assertEqual(
+            BlogPostRevision.objects.latest("created_at").comment, "Manual update"
+        )
@@ -0,0 +1,144 @@
+"""Tests for the identity-aware block diff."""
+
+import os
+
+import django
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+django.setup()
+
+import random
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from apps.cms.block_diff import diff_blocks, lcs_pairs
+from apps.cms.models import Page
+from apps.cms.versioning import PageRevision, RevisionDiffer
+from apps.i18n.models import Locale
+
+
+def text(content, **extra):
+    return {"type": "text", "props": {"content": content}, **extra}
+
+
+def lcs_length(old, new):
+    lengths = [[0] * (len(new) + 1) for _ in range(len(old) + 1)]
+
+    for i, old_item in enumerate(old):
+        for j, new_item in enumerate(new):
+            lengths[i + 1][j + 1] = (
+                lengths[i][j] + 1
+                if old_item == new_item
+                else max(lengths[i][j + 1], lengths[i + 1][j])
+            )
+
+    return lengths[-1][-1]
+
+
+class LCSTest(SimpleTestCase):
+    def test_matches_dynamic_programming(self):
+        rng = random.Random(3)
+
+        for _ in range(500):
+            old = [rng.choice("abcd") for _ in range(rng.randrange(12))]
+            new = [rng.choice("abcd") for _ in range(rng.randrange(12))]
+
+            pairs = lcs_pairs(old, new)
+
+            self.assertEqual(len(pairs), lcs_length(old, new))
+            self.assertTrue(all(old[i] == new[j] for i, j in pairs))
+            self.assertEqual(pairs, sorted(pairs))
+            self.assertEqual(len({j for _, j in pairs}), len(pairs))
+
+
+class DiffBlocksTest(SimpleTestCase):
+    def test_insert_at_top_is_one_addition(self):
+        old = [text(f"Block {i}") for i in range(50)]
+
+        diff = diff_blocks(old, [text("New"), *old])
+
+        self.assertEqual(diff["added"], [{"index": 0, "block": text("New")}])
+        self.assertEqual(diff["modified"], [])
+        self.assertEqual(diff["removed"], [])
+        self.assertFalse(diff["reordered"])
+
+    def test_moved_block_with_id_is_matched_and_sub_diffed(self):
+        old = [text("A", id="a"), text("B", id="b"), text("C", id="c")]
+        new = [text("C, edited", id="c"), text("A", id="a"), text("B", id="b")]
+
+        diff = diff_blocks(old, new)
+
+        self.assertEqual(
+            [(move["old_index"], move["index"]) for move in diff["moved"]], [(2, 0)]
+        )
+        self.assertEqual(len(diff["modified"]), 1)
+        self.assertEqual(
+            diff["modified"][0]["fields"],
+            [{"path": "props.content", "old": "C", "new": "C, edited"}],
+        )
+
+    def test_blocks_without_ids_edited_in_place(self):
+        old = [text("A"), {"type": "image", "props": {"src": "/a.jpg"}}, text("C")]
+        new = [text("A"), {"type": "image", "props": {"src": "/b.jpg"}}, text("C")]
+
+        diff = diff_blocks(old, new)
+
+        self.assertEqual(
+            [(mod["old_index"], mod["index"]) for mod in diff["modified"]], [(1, 1)]
+        )
+        self.assertEqual(diff["added"], [])
+        self.assertEqual(diff["removed"], [])
+
+    def test_replaced_block_of_other_type(self):
+        diff = diff_blocks([text("A"), text("B")], [text("A"), {"type": "hero"}])
+
+        self.assertEqual(diff["removed"], [{"index": 1, "block": text("B")}])
+        self.assertEqual(diff["added"], [{"index": 1, "block": {"type": "hero"}}])
+
+
+class RevisionDiffCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        locale, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={
+                "name": "English",
+                "native_name": "English",
+                "is_default": True,
+                "is_active": True,
+            },
+        )
+
+        self.page = Page.objects.create(
+            title="Diffs", slug="diffs", locale=locale, blocks=[text("A")]
+        )
+
+        self.old = PageRevision.create_snapshot(self.page)
+
+        self.page.blocks = [text("A"), text("B")]
+
+        self.new = PageRevision.create_snapshot(self.page)
+
+    def test_stored_revision_diffs_are_cached(self):
+        diff = RevisionDiffer.diff_revisions(self.old, self.new)
+
+        old = PageRevision.objects.get(pk=self.old.pk)
+        new = PageRevision.objects.get(pk=self.new.pk)
+
+        # Snapshots are not even reconstructed
+        with self.assertNumQueries(0):
+            self.assertEqual(RevisionDiffer.diff_revisions(old, new), diff)
+
+        self.assertEqual(len(diff["changes"]["blocks"]["added"]), 1)
+
+    def test_current_page_diff_is_not_cached(self):
+        RevisionDiffer.diff_current_page(self.page, self.new)
+
+        self.page.blocks = []
+
+        diff = RevisionDiffer.diff_current_page(self.page, self.new)
+
+        self.assertEqual(len(diff["changes"]["blocks"]["removed"]), 2)
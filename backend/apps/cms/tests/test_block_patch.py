@@ -0,0 +1,283 @@
+"""Tests for JSON Patch editing of page blocks."""
+
+import os
+
+import django
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+django.setup()
+
+import json
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cms.autosave import flush_autosaves
+from apps.cms.blocks.patch import BlockPatch, BlockPatchError
+from apps.cms.models import Page
+from apps.cms.security import sanitize_block_content
+from apps.cms.versioning import PageRevision
+from apps.i18n.models import Locale
+
+User = get_user_model()
+
+
+def sample_blocks():
+    return [
+        {"type": "richtext", "props": {"content": "First"}},
+        {"type": "hero", "props": {"title": "Hero", "subtitle": "Sub"}},
+        {
+            "type": "columns",
+            "props": {"gap": "md"},
+            "blocks": [{"type": "richtext", "props": {"content": "Left"}}],
+        },
+    ]
+
+
+class BlockPatchTest(TestCase):
+    """Applying operations without the API."""
+
+    def test_operations(self):
+        blocks = sample_blocks()
+
+        result = BlockPatch(blocks).apply(
+            [
+                {"op": "replace", "path": "/blocks/1/props/title", "value": "New"},
+                {"op": "move", "from": "/blocks/0", "path": "/blocks/-"},
+                {"op": "copy", "from": "/blocks/1/blocks/0", "path": "/blocks/0"},
+                {"op": "remove", "path": "/blocks/1/props/subtitle"},
+                {"op": "test", "path": "/blocks/0/props/content", "value": "Left"},
+            ]
+        )
+
+        self.assertEqual(
+            [block["type"] for block in result.blocks],
+            ["richtext", "hero", "columns", "richtext"],
+        )
+        self.assertEqual(result.blocks[1]["props"], {"title": "New"})
+
+        # Touched blocks are copies; moved and untouched blocks are shared
+        self.assertEqual(result.changed(), [0, 1])
+        self.assertIs(result.blocks[2], blocks[2])
+        self.assertIs(result.blocks[3], blocks[0])
+        self.assertEqual(blocks[1]["props"]["title"], "Hero")
+
+    def test_invalid_operations(self):
+        for operation in [
+            {"op": "replace", "path": "/blocks/3", "value": {}},
+            {"op": "remove", "path": "/blocks/01"},
+            {"op": "add", "path": "/title", "value": "x"},
+            {"op": "add", "path": "/blocks/0/props/content/x", "value": "x"},
+            {"op": "move", "from": "/blocks/2", "path": "/blocks/2/blocks/0"},
+            {"op": "merge", "path": "/blocks/0"},
+        ]:
+            with self.subTest(operation=operation):
+                with self.assertRaises(BlockPatchError) as ctx:
+                    BlockPatch(sample_blocks()).apply(
+                        [{"op": "test", "path": "/blocks/0/type", "value": "richtext"}]
+                        + [operation]
+                    )
+
+                self.assertEqual(ctx.exception.op, 1)
+
+
+class BlockPatchAPITest(TestCase):
+    """The blocks/patch endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.locale, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={
+                "name": "English",
+                "native_name": "English",
+                "is_default": True,
+                "is_active": True,
+            },
+        )
+
+        self.user = User.objects.create_user(
+            email="editor@example.com", password="testpass123", is_staff=True
+        )
+        self.user.user_permissions.add(
+            *Permission.objects.filter(
+                content_type__app_label="cms",
+                codename__in=["change_page", "view_page"],
+            )
+        )
+
+        self.client.force_authenticate(user=self.user)
+
+        self.page = Page.objects.create(
+            title="Editing",
+            slug="editing",
+            locale=self.locale,
+            blocks=sample_blocks(),
+        )
+
+        self.url = f"/api/v1/cms/pages/{self.page.id}/blocks/patch/"
+
+    def get_revision(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], response.json()["revision"])
+
+        return response.json()["revision"]
+
+    def send(self, operations, revision=None):
+        headers = {"HTTP_IF_MATCH": revision} if revision else {}
+
+        return self.client.patch(
+            self.url,
+            json.dumps(operations),
+            content_type="application/json-patch+json",
+            **headers,
+        )
+
+    def test_patch_returns_delta_and_new_revision(self):
+        revision = self.get_revision()
+
+        response = self.send(
+            [
+                {"op": "replace", "path": "/blocks/1/props/title", "value": "New"},
+                {"op": "move", "from": "/blocks/2", "path": "/blocks/0"},
+            ],
+            revision,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(list(data["blocks"]), ["2"])
+        self.assertEqual(data["blocks"]["2"]["props"]["title"], "New")
+        self.assertNotEqual(data["revision"], revision)
+        self.assertEqual(data["revision"], self.get_revision())
+
+        self.page.refresh_from_db()
+
+        self.assertEqual(
+            [block["type"] for block in self.page.blocks],
+            ["columns", "richtext", "hero"],
+        )
+
+    def test_only_touched_blocks_are_validated(self):
+        revision = self.get_revision()
+
+        with patch(
+            "apps.cms.blocks.validation.sanitize_block_content",
+            wraps=sanitize_block_content,
+        ) as sanitize:
+            response = self.send(
+                [{"op": "add", "path": "/blocks/0/props/content", "value": "x"}],
+                revision,
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(sanitize.call_count, 1)
+
+    def test_patch_is_one_update(self):
+        revision = self.get_revision()
+
+        with patch("apps.cms.blocks.patch.post_save.send"):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.send([{"op": "remove", "path": "/blocks/0"}], revision)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        page_queries = [
+            query["sql"].split()[0]
+            for query in queries.captured_queries
+            if '"cms_page"' in query["sql"]
+        ]
+
+        # Loading the page (no re-read by save()), then the conditional write
+        self.assertEqual(page_queries, ["SELECT", "UPDATE"])
+
+    def test_if_match_is_required(self):
+        response = self.send([{"op": "remove", "path": "/blocks/0"}])
+
+        self.assertEqual(response.status_code, status.HTTP_428_PRECONDITION_REQUIRED)
+
+    def test_stale_revision_is_rejected(self):
+        revision = self.get_revision()
+
+        self.assertEqual(
+            self.send([{"op": "remove", "path": "/blocks/0"}], revision).status_code,
+            status.HTTP_200_OK,
+        )
+
+        response = self.send([{"op": "remove", "path": "/blocks/0"}], revision)
+
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(response.json()["revision"], self.get_revision())
+
+        self.page.refresh_from_db()
+
+        self.assertEqual(len(self.page.blocks), 2)
+
+    def test_concurrent_save_is_rejected(self):
+        revision = self.get_revision()
+
+        def save_concurrently():
+            # Saved between the patch reading and writing the page
+            Page.objects.filter(pk=self.page.pk).update(
+                title="Renamed", updated_at=timezone.now()
+            )
+
+            return []
+
+        with patch(
+            "apps.cms.blocks.patch.BlockPatch.validate", side_effect=save_concurrently
+        ):
+            response = self.send([{"op": "remove", "path": "/blocks/0"}], revision)
+
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+        self.page.refresh_from_db()
+
+        self.assertEqual(len(self.page.blocks), 3)
+
+    def test_failed_test_operation_conflicts(self):
+        response = self.send(
+            [{"op": "test", "path": "/blocks/0/type", "value": "hero"}],
+            self.get_revision(),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.json()["op"], 0)
+
+    def test_invalid_block_errors_use_page_index(self):
+        response = self.send(
+            [{"op": "replace", "path": "/blocks/2/type", "value": "nope"}],
+            self.get_revision(),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["errors"][0]["path"], "blocks[2].type")
+
+    def test_saving_buffers_autosave_revision(self):
+        revisions = self.page.revisions.count()
+
+        self.send(
+            [{"op": "replace", "path": "/blocks/0/props/content", "value": "Hi"}],
+            self.get_revision(),
+        )
+
+        self.assertEqual(self.page.revisions.count(), revisions)
+
+        flush_autosaves(PageRevision, owner_id=self.page.pk, force=True)
+
+        self.assertEqual(self.page.revisions.count(), revisions + 1)
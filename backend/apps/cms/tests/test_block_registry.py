@@ -0,0 +1,140 @@
+"""Tests for the compiled block validator registry and block memo."""
+
+import os
+
+import django
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+django.setup()
+
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from rest_framework.exceptions import ValidationError as DRFValidationError
+
+from apps.cms.blocks.validation import block_memo, block_registry, validate_blocks
+from apps.cms.models import BlockType
+from apps.cms.security import get_cleaner, sanitize_block_content
+
+
+class CompiledBlockRegistryTest(TestCase):
+    def setUp(self):
+        block_registry.clear()
+
+    def create_block_type(self, **kwargs):
+        defaults = {
+            "type": "quote",
+            "component": "QuoteBlock",
+            "label": "Quote",
+            "default_props": {"text": ""},
+            "schema": {
+                "type": "object",
+                "properties": {"text": {"type": "string"}},
+                "required": ["text"],
+            },
+        }
+
+        defaults.update(kwargs)
+
+        return BlockType.objects.create(**defaults)
+
+    def test_warm_registry_does_not_query(self):
+        validate_blocks([{"type": "hero", "props": {}}])
+
+        with self.assertNumQueries(0):
+            validate_blocks([{"type": "hero", "props": {}}] * 50)
+
+    def test_block_type_changes_recompile(self):
+        with self.assertRaises(DRFValidationError):
+            validate_blocks([{"type": "quote", "props": {"text": "Hi"}}])
+
+        block_type = self.create_block_type()
+
+        blocks = validate_blocks([{"type": "quote", "props": {"text": "Hi"}}])
+
+        self.assertEqual(blocks[0]["props"], {"text": "Hi"})
+
+        block_type.is_active = False
+        block_type.save()
+
+        with self.assertRaises(DRFValidationError):
+            validate_blocks([{"type": "quote", "props": {"text": "Hi"}}])
+
+    def test_database_schema_is_enforced(self):
+        self.create_block_type()
+
+        with self.assertRaises(DRFValidationError) as ctx:
+            validate_blocks([{"type": "quote", "props": {"text": 3}}])
+
+        self.assertEqual(
+            ctx.exception.detail["errors"][0]["path"], "blocks[0].props.text"
+        )
+
+    def test_invalid_database_schema_is_ignored(self):
+        self.create_block_type(schema={"type": "not-a-type"})
+
+        blocks = validate_blocks([{"type": "quote"}])
+
+        self.assertEqual(blocks[0]["props"], {})
+
+    def test_nested_errors_are_repathed(self):
+        with self.assertRaises(DRFValidationError) as ctx:
+            validate_blocks(
+                [{"type": "columns", "props": {}, "blocks": [{"type": "nope"}]}]
+            )
+
+        self.assertEqual(
+            ctx.exception.detail["errors"][0]["path"], "blocks[0].blocks[0].type"
+        )
+
+
+class BlockMemoTest(TestCase):
+    def setUp(self):
+        block_registry.clear()
+
+        block_memo.clear()
+
+    def test_unchanged_blocks_are_not_sanitized_again(self):
+        blocks = [{"type": "hero", "props": {"title": f"<b>{i}</b>"}} for i in range(5)]
+
+        validate_blocks(blocks)
+
+        blocks[2] = {"type": "hero", "props": {"title": "<i>edited</i>"}}
+
+        with patch(
+            "apps.cms.blocks.validation.sanitize_block_content",
+            wraps=sanitize_block_content,
+        ) as sanitize:
+            validated = validate_blocks(blocks)
+
+        self.assertEqual(sanitize.call_count, 1)
+
+        self.assertEqual(validated[2]["props"]["title"], "<i>edited</i>")
+
+    def test_hits_are_copies(self):
+        validate_blocks([{"type": "hero", "props": {"title": "Hi"}}])
+
+        first = validate_blocks([{"type": "hero", "props": {"title": "Hi"}}])
+
+        first[0]["props"]["title"] = "Changed"
+
+        second = validate_blocks([{"type": "hero", "props": {"title": "Hi"}}])
+
+        self.assertEqual(second[0]["props"]["title"], "Hi")
+
+    def test_sanitizer_settings_change_the_key(self):
+        blocks = [{"type": "hero", "props": {"title": "<b>Hi</b>"}}]
+
+        self.assertEqual(validate_blocks(blocks)[0]["props"]["title"], "<b>Hi</b>")
+
+        with override_settings(HTML_SANITIZER_ALLOWED_TAGS=["p"]):
+            self.assertEqual(validate_blocks(blocks)[0]["props"]["title"], "Hi")
+
+    def test_cleaner_is_reused_per_configuration(self):
+        config = (["p"], {"*": ["class"]}, ["https"])
+
+        self.assertIs(get_cleaner(*config), get_cleaner(*config))
+
+        self.assertIsNot(get_cleaner(*config), get_cleaner(["b"], *config[1:]))
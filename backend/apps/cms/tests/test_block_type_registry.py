@@ -0,0 +1,90 @@
+"""Tests for the in-process block type registry."""
+
+import os
+
+import django
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+django.setup()
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cms.blocks.registry import block_type_registry
+from apps.cms.models import BlockType
+
+
+class BlockTypeRegistryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+
+        self.block_type = BlockType.objects.create(
+            type="quote",
+            component="QuoteBlock",
+            label="Quote",
+            description="A pull quote",
+            category="content",
+            icon="quote",
+            schema={"type": "object", "properties": {"text": {"type": "string"}}},
+            default_props={"text": ""},
+        )
+
+    def block_types(self, **headers):
+        return self.client.get("/api/v1/cms/blocks/", **headers)
+
+    def labels(self, response):
+        return {item["type"]: item["label"] for item in response.data["block_types"]}
+
+    def test_block_types_are_served_without_queries(self):
+        first = self.block_types()
+
+        with self.assertNumQueries(0):
+            second = self.block_types()
+            not_modified = self.block_types(HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.labels(first)["quote"], "Quote")
+
+    def test_saving_a_block_type_reloads_the_registry(self):
+        etag = self.block_types()["ETag"]
+
+        self.block_type.label = "Pull quote"
+        self.block_type.save()
+
+        response = self.block_types(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.labels(response)["quote"], "Pull quote")
+
+    def test_deleted_block_type_schema_is_not_found(self):
+        url = "/api/v1/cms/blocks/quote/schema/"
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, self.block_type.schema)
+
+        self.block_type.delete()
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("quote", self.labels(self.block_types()))
+
+    def test_registry_is_shared_within_the_process(self):
+        registry = BlockType.get_registry_dict()
+
+        with self.assertNumQueries(0):
+            self.assertIs(BlockType.get_registry_dict(), registry)
+
+        self.assertIn("quote", registry)
+        self.assertEqual(block_type_registry.block_types(), registry)
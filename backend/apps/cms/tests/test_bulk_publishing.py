@@ -0,0 +1,177 @@
+"""Tests for bulk scheduled publishing."""
+
+import os
+from datetime import timedelta
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.blog import versioning as blog_versioning  # noqa: F401 - registers models
+from apps.blog.models import BlogPost
+from apps.blog.versioning import BlogPostRevision
+from apps.cms.bulk_publishing import publish_due_content
+from apps.cms.models import Page
+from apps.cms.tasks import publish_scheduled_content
+from apps.cms.versioning import PageRevision
+from apps.i18n.models import Locale
+
+User = get_user_model()
+
+
+class BulkPublishTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.locale, _ = Locale.objects.get_or_create(
+            code="en", defaults={"name": "English", "native_name": "English"}
+        )
+
+        self.now = timezone.now()
+
+        self.author = User.objects.create_user(email="author@example.com")
+
+    def schedule_pages(self, count, prefix="page", offset=timedelta(minutes=-1)):
+        pages = [
+            Page.objects.create(
+                title=f"{prefix} {i}",
+                slug=f"{prefix}-{i}",
+                locale=self.locale,
+                status="scheduled",
+                published_at=self.now + offset,
+            )
+            for i in range(count)
+        ]
+
+        # Drop debounce markers set while creating fixtures
+        cache.clear()
+
+        return pages
+
+    def test_publishes_due_pages_in_batches(self):
+        pages = self.schedule_pages(7)
+
+        future = self.schedule_pages(2, prefix="future", offset=timedelta(hours=1))
+
+        result = publish_due_content(now=self.now, batch_size=3)
+
+        self.assertEqual(sorted(result.published["page"]), sorted(p.pk for p in pages))
+
+        self.assertEqual(result.errors, [])
+
+        self.assertEqual(
+            Page.objects.filter(
+                pk__in=[p.pk for p in pages], status="published"
+            ).count(),
+            7,
+        )
+
+        self.assertFalse(
+            Page.objects.filter(
+                pk__in=[p.pk for p in future], status="published"
+            ).exists()
+        )
+
+    def test_one_update_per_batch(self):
+        self.schedule_pages(6)
+
+        with CaptureQueriesContext(connection) as queries:
+            publish_due_content(now=self.now, batch_size=3)
+
+        updates = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith('UPDATE "cms_page"')
+        ]
+
+        self.assertEqual(len(updates), 2)
+
+    def test_query_count_does_not_grow_per_row(self):
+        self.schedule_pages(3, prefix="small")
+
+        with CaptureQueriesContext(connection) as small:
+            publish_due_content(now=self.now)
+
+        self.schedule_pages(30, prefix="large")
+
+        with CaptureQueriesContext(connection) as large:
+            publish_due_content(now=self.now)
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_post_steps_create_revisions_and_index(self):
+        from apps.search.models import SearchIndex
+
+        pages = self.schedule_pages(4)
+
+        publish_due_content(now=self.now)
+
+        self.assertEqual(
+            PageRevision.objects.filter(
+                page__in=pages, is_published_snapshot=True
+            ).count(),
+            4,
+        )
+
+        snapshot = PageRevision.objects.filter(page=pages[0]).latest("created_at")
+
+        self.assertEqual(snapshot.snapshot["status"], "published")
+
+        self.assertEqual(
+            SearchIndex.objects.filter(object_id__in=[p.pk for p in pages]).count(),
+            4,
+        )
+
+    def test_sitemap_refresh_queued_once_per_locale(self):
+        self.schedule_pages(5)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            publish_due_content(now=self.now, batch_size=2)
+
+        self.assertEqual(len(callbacks), 1)
+
+    def test_already_published_rows_are_not_republished(self):
+        pages = self.schedule_pages(2)
+
+        # Another worker published the first page meanwhile
+        Page.objects.filter(pk=pages[0].pk).update(status="published")
+
+        result = publish_due_content(now=self.now)
+
+        self.assertEqual(result.published["page"], [pages[1].pk])
+
+    def test_blog_posts_are_published(self):
+        post = BlogPost.objects.create(
+            title="Launch",
+            slug="launch",
+            content="Body",
+            locale=self.locale,
+            author=self.author,
+            status="scheduled",
+            published_at=self.now - timedelta(minutes=1),
+        )
+
+        result = publish_scheduled_content()
+
+        self.assertEqual(result["published_count"], 1)
+
+        post.refresh_from_db()
+
+        self.assertEqual(post.status, "published")
+
+        self.assertTrue(
+            BlogPostRevision.objects.filter(
+                blog_post=post, is_published_snapshot=True
+            ).exists()
+        )
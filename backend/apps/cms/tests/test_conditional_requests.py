@@ -0,0 +1,153 @@
+"""
+Test cases for conditional GET on public page endpoints.
+
+This module tests that:
+- Public endpoints return an ETag with their response
+- A matching If-None-Match is answered with 304 before serializing
+- Content changes produce a new ETag
+"""
+
+import os
+
+import django
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+django.setup()
+
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cms.models import Page
+from apps.i18n.models import Locale
+
+
+class ConditionalRequestTestCase(TestCase):
+    """Test ETag validation of public page endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for all tests."""
+        cls.locale, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={
+                "name": "English",
+                "native_name": "English",
+                "is_default": True,
+                "is_active": True,
+            },
+        )
+
+    def setUp(self):
+        """Set up test data for each test."""
+        cache.clear()
+
+        self.client = APIClient()
+
+        self.page = Page.objects.create(
+            title="About",
+            slug="about",
+            locale=self.locale,
+            status="published",
+            in_main_menu=True,
+            in_footer=True,
+        )
+
+    def get_etag(self, url, params):
+        response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+
+        return response["ETag"]
+
+    def test_navigation_not_modified(self):
+        """Navigation answers a current ETag without querying pages."""
+        etag = self.get_etag("/api/v1/cms/navigation/", {"locale": "en"})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                "/api/v1/cms/navigation/", {"locale": "en"}, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_footer_not_modified(self):
+        """Footer answers a current ETag with 304."""
+        etag = self.get_etag("/api/v1/cms/footer/", {"locale": "en"})
+
+        response = self.client.get(
+            "/api/v1/cms/footer/", {"locale": "en"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_navigation_etag_changes_with_pages(self):
+        """Saving a page invalidates the navigation ETag."""
+        etag = self.get_etag("/api/v1/cms/navigation/", {"locale": "en"})
+
+        self.page.title = "About us"
+        self.page.save()
+
+        response = self.client.get(
+            "/api/v1/cms/navigation/", {"locale": "en"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        titles = [item["title"] for item in response.data["menu_items"]]
+        self.assertIn("About us", titles)
+
+    def test_get_by_path_not_modified_skips_serializer(self):
+        """get_by_path answers a current ETag before serializing the page."""
+        params = {"path": self.page.path, "locale": "en"}
+
+        etag = self.get_etag("/api/v1/cms/pages/get_by_path/", params)
+
+        with patch("apps.cms.views.pages.PublicPageSerializer") as serializer:
+            response = self.client.get(
+                "/api/v1/cms/pages/get_by_path/", params, HTTP_IF_NONE_MATCH=etag
+            )
+
+        serializer.assert_not_called()
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("public", response["Cache-Control"])
+
+    def test_get_by_path_etag_changes_with_page(self):
+        """Saving the page or a translation of it invalidates its ETag."""
+        params = {"path": self.page.path, "locale": "en"}
+
+        etag = self.get_etag("/api/v1/cms/pages/get_by_path/", params)
+
+        self.page.title = "About us"
+        self.page.save()
+
+        second = self.get_etag("/api/v1/cms/pages/get_by_path/", params)
+
+        self.assertNotEqual(second, etag)
+
+        # Translations are listed as hreflang alternates
+        locale_fr = Locale.objects.create(
+            code="fr", name="French", native_name="Français", is_active=True
+        )
+
+        Page.objects.create(
+            title="À propos",
+            slug="a-propos",
+            locale=locale_fr,
+            group_id=self.page.group_id,
+            status="published",
+        )
+
+        self.assertNotEqual(
+            self.get_etag("/api/v1/cms/pages/get_by_path/", params), second
+        )
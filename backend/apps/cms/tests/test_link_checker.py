@@ -0,0 +1,220 @@
+"""
+Tests for the link checking engine.
+
+External links are probed against a throwaway local HTTP server that
+records every request it receives.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.cms.link_checker import LinkChecker, normalize_url
+from apps.cms.models import Page
+from apps.cms.tasks import check_internal_links
+from apps.i18n.models import Locale
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    def _respond(self):
+        self.server.requests.append((self.command, self.path))
+
+        status = 404 if self.path.startswith("/missing") else 200
+
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_HEAD = _respond
+
+    do_GET = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServerMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+        cls.server.requests = []
+
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever)
+        cls.server_thread.daemon = True
+        cls.server_thread.start()
+
+        cls.server_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+
+        cache.clear()
+
+        self.server.requests.clear()
+
+
+class NormalizeUrlTest(TestCase):
+    def test_normalization(self):
+        base = "https://example.com"
+
+        self.assertEqual(normalize_url("/about/", base), "https://example.com/about")
+        self.assertEqual(
+            normalize_url("HTTPS://Example.com:443/a#top", base),
+            "https://example.com/a",
+        )
+        self.assertEqual(
+            normalize_url("http://other.org:8080/?q=1", base),
+            "http://other.org:8080/?q=1",
+        )
+
+
+class LinkCheckerTest(LocalServerMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.locale, _ = Locale.objects.get_or_create(
+            code="en", defaults={"name": "English", "native_name": "English"}
+        )
+
+        Page.objects.create(
+            title="About", slug="about", locale=self.locale, status="published"
+        )
+        Page.objects.create(
+            title="Draft", slug="draft", locale=self.locale, status="draft"
+        )
+
+        self.checker = LinkChecker(
+            base_url="https://example.com", host_interval=0, per_host=4
+        )
+
+    def test_internal_links_resolve_without_http(self):
+        results = self.checker.check(["/about", "/about/", "/draft", "/en/about"])
+
+        self.assertEqual(len(results), 3)
+
+        self.assertFalse(results["https://example.com/about"].is_broken)
+        self.assertFalse(results["https://example.com/en/about"].is_broken)
+        self.assertTrue(results["https://example.com/draft"].is_broken)
+
+        self.assertEqual(self.server.requests, [])
+
+    def test_external_links_are_probed_once(self):
+        urls = [
+            f"{self.server_url}/ok",
+            f"{self.server_url}/ok#fragment",
+            f"{self.server_url}/ok/",
+            f"{self.server_url}/missing",
+        ] * 3
+
+        results = self.checker.check(urls)
+
+        self.assertEqual(len(results), 2)
+
+        self.assertFalse(results[f"{self.server_url}/ok"].is_broken)
+
+        self.assertEqual(results[f"{self.server_url}/missing"].status_code, 404)
+
+        self.assertEqual(
+            sorted(path for _, path in self.server.requests), ["/missing", "/ok"]
+        )
+
+    def test_results_are_cached_between_runs(self):
+        urls = [f"{self.server_url}/page-{i}" for i in range(4)]
+
+        self.checker.check(urls)
+
+        self.assertEqual(len(self.server.requests), 4)
+
+        results = LinkChecker(base_url="https://example.com").check(
+            urls + [f"{self.server_url}/page-new"]
+        )
+
+        self.assertEqual(len(self.server.requests), 5)
+
+        self.assertTrue(results[f"{self.server_url}/page-0"].cached)
+        self.assertFalse(results[f"{self.server_url}/page-new"].cached)
+
+    def test_connection_errors_are_not_cached(self):
+        url = "http://127.0.0.1:9/unreachable"
+
+        results = self.checker.check([url])
+
+        self.assertTrue(results[url].is_broken)
+
+        self.assertIsNone(cache.get(self.checker.cache_key(url)))
+
+
+class CheckInternalLinksTaskTest(LocalServerMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.locale, _ = Locale.objects.get_or_create(
+            code="en", defaults={"name": "English", "native_name": "English"}
+        )
+
+        blocks = [
+            {
+                "type": "rich_text",
+                "props": {
+                    "content": (
+                        '<a href="/target">ok</a> <a href="/gone">broken</a> '
+                        f'<a href="{self.server_url}/missing">external</a>'
+                    )
+                },
+            }
+        ]
+
+        Page.objects.create(
+            title="Target", slug="target", locale=self.locale, status="published"
+        )
+
+        for i in range(3):
+            Page.objects.create(
+                title=f"Linker {i}",
+                slug=f"linker-{i}",
+                locale=self.locale,
+                status="published",
+                blocks=blocks,
+            )
+
+    def test_task_reports_broken_links_per_occurrence(self):
+        result = check_internal_links.apply(kwargs={"include_external": True}).get()
+
+        self.assertEqual(result["total_links_found"], 9)
+
+        self.assertEqual(result["unique_links_checked"], 3)
+
+        broken = sorted({link["url"] for link in result["broken_links"]})
+
+        self.assertEqual(broken, ["/gone", f"{self.server_url}/missing"])
+
+        self.assertEqual(len(result["broken_links"]), 6)
+
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_external_links_skipped_by_default(self):
+        result = check_internal_links.apply().get()
+
+        self.assertEqual(result["unique_links_checked"], 2)
+
+        self.assertEqual(self.server.requests, [])
@@ -0,0 +1,172 @@
+"""
+Test cases for materialized navigation and footer menus.
+
+This module tests that:
+- Menus are served from the cache without queries
+- Menus are rendered again when a change shows in them, and only then
+- Unknown locales are served the menus of all locales
+"""
+
+import os
+
+import django
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+django.setup()
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cms import menus
+from apps.cms.models import Page
+from apps.i18n.models import Locale
+
+
+class MenuTestCase(TestCase):
+    """Test the materialized menus of the public API."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for all tests."""
+        cls.locale, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={
+                "name": "English",
+                "native_name": "English",
+                "is_default": True,
+                "is_active": True,
+            },
+        )
+
+    def setUp(self):
+        """Set up test data for each test."""
+        cache.clear()
+
+        self.client = APIClient()
+
+        self.parent = Page.objects.create(
+            title="About",
+            slug="about",
+            locale=self.locale,
+            status="published",
+            in_main_menu=True,
+            in_footer=True,
+        )
+
+        self.child = Page.objects.create(
+            title="Team",
+            slug="team",
+            parent=self.parent,
+            locale=self.locale,
+            status="published",
+            in_main_menu=True,
+        )
+
+    def get(self, url, **headers):
+        return self.client.get(url, {"locale": "en"}, **headers)
+
+    def test_navigation_tree(self):
+        """Children are nested under their parent."""
+        response = self.get("/api/v1/cms/navigation/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        items = {item["id"]: item for item in response.json()["menu_items"]}
+
+        item = items[self.parent.id]
+
+        self.assertNotIn(self.child.id, items)
+        self.assertEqual([child["id"] for child in item["children"]], [self.child.id])
+
+    def test_stored_menus_are_served_without_queries(self):
+        """Menus rendered once are one cache read afterwards."""
+        first = self.get("/api/v1/cms/footer/")
+
+        with self.assertNumQueries(0):
+            second = self.get("/api/v1/cms/footer/")
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(second["Content-Type"], "application/json")
+
+    def test_menus_are_rebuilt_after_commit(self):
+        """Renaming a menu page renders its locale's menus after commit."""
+        etag = self.get("/api/v1/cms/navigation/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.child.title = "Our team"
+            self.child.save()
+
+        with self.assertNumQueries(0):
+            response = self.get("/api/v1/cms/navigation/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        (parent,) = [
+            item for item in response.data["menu_items"] if item["id"] == self.parent.id
+        ]
+
+        self.assertEqual(parent["children"][0]["title"], "Our team")
+
+    def test_unrelated_changes_keep_menus(self):
+        """Edits that do not show in the menus leave them stored."""
+        etag = self.get("/api/v1/cms/navigation/")["ETag"]
+
+        self.parent.blocks = [{"type": "text", "props": {"content": "Hi"}}]
+        self.parent.save()
+
+        Page.objects.create(title="Draft", slug="draft", locale=self.locale)
+
+        with self.assertNumQueries(0):
+            response = self.get("/api/v1/cms/navigation/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_unpublished_page_leaves_menus(self):
+        """Unpublishing a page drops it from the menus."""
+        self.get("/api/v1/cms/footer/")
+
+        self.parent.status = "draft"
+        self.parent.save()
+
+        response = self.get("/api/v1/cms/footer/")
+
+        self.assertNotIn(
+            self.parent.id, [item["id"] for item in response.data["footer_items"]]
+        )
+
+    def test_unknown_locale_gets_all_locales(self):
+        """A locale code matching no locale lists the pages of all locales."""
+        response = self.client.get("/api/v1/cms/footer/", {"locale": "xx"})
+
+        self.assertIn(
+            self.parent.id, [item["id"] for item in response.data["footer_items"]]
+        )
+        self.assertIsNotNone(cache.get(menus.menu_key("footer", menus.ALL_LOCALES)))
+        self.assertIsNone(cache.get(menus.menu_key("footer", "xx")))
+
+    def test_renamed_locale_menus_are_discarded(self):
+        """Menus stored under a locale's old code are dropped."""
+        self.get("/api/v1/cms/footer/")
+
+        self.locale.code = "en-gb"
+        self.locale.save()
+
+        self.assertIsNone(cache.get(menus.menu_key("footer", "en")))
+
+    def test_stale_format_is_rendered_again(self):
+        """Entries of another format are replaced."""
+        cache.set(menus.menu_key("footer", "en"), (0, '"old"', b"{}"), None)
+
+        response = self.get("/api/v1/cms/footer/")
+
+        self.assertIn(
+            self.parent.id, [item["id"] for item in response.data["footer_items"]]
+        )
+        self.assertEqual(
+            cache.get(menus.menu_key("footer", "en"))[0], menus.MENU_FORMAT
+        )
@@ -355,7 +355,7 @@ class PagesAPITest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(response.data["title"], "Home")
+        self.assertEqual(response.json()["title"], "Home")
 
     def test_get_page_by_path_draft_unauthorized(self):  # noqa: C901
         """Test getting draft page without authentication fails."""
@@ -598,7 +598,7 @@ class SitemapTest(TestCase):
 
         """self.assertEqual(response["Content-Type"], "application/xml")"""
 
-        content = response.content.decode()
+        content = response.getvalue().decode()
 
         self.assertIn("<loc>http://localhost:8000/home</loc>", content)
 
@@ -899,14 +899,14 @@ class SeoAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # PublicPageSerializer always returns resolved SEO data if page has SEO
-        self.assertIsNotNone(response.data.get("resolved_seo"))
+        self.assertIsNotNone(response.json().get("resolved_seo"))
 
         # Verify the resolved SEO contains expected data
-        resolved_seo = response.data.get("resolved_seo")
+        resolved_seo = response.json().get("resolved_seo")
         self.assertEqual(resolved_seo["title"], "Custom SEO Title - My Site")
         self.assertEqual(resolved_seo["description"], "Default description")
 
-        self.assertIsNotNone(response.data.get("seo_links"))
+        self.assertIsNotNone(response.json().get("seo_links"))
 
     def test_page_api_with_seo(self):  # noqa: C901
         """Test page API with SEO data."""
@@ -921,7 +921,7 @@ class SeoAPITest(APITestCase):
 
         # Check resolved SEO
 
-        resolved_seo = response.data["resolved_seo"]
+        resolved_seo = response.json()["resolved_seo"]
 
         self.assertIsNotNone(resolved_seo)
 
@@ -931,7 +931,7 @@ class SeoAPITest(APITestCase):
 
         # Check SEO links
 
-        seo_links = response.data["seo_links"]
+        seo_links = response.json()["seo_links"]
 
         self.assertIsNotNone(seo_links)
 
@@ -994,7 +994,7 @@ class SitemapEnhancedTest(TestCase):
 
         """self.assertEqual(response["Content-Type"], "application/xml")"""
 
-        content = response.content.decode()
+        content = response.getvalue().decode()
 
         self.assertIn("<loc>http://localhost:8000/home</loc>", content)
 
@@ -1007,7 +1007,7 @@ class SitemapEnhancedTest(TestCase):
 
         self.assertEqual(response.status_code, 200)
 
-        content = response.content.decode()
+        content = response.getvalue().decode()
 
         # Should include xhtml namespace
 
@@ -0,0 +1,258 @@
+"""Tests for bulk page tree and locale cloning."""
+
+import os
+from unittest.mock import Mock, patch
+
+import django
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.rbac import ScopedLocale
+from apps.cms.models import Page
+from apps.cms.page_clone import clone_locale, clone_page_tree
+from apps.cms.tasks import clone_locale_pages
+from apps.cms.versioning import PageRevision
+from apps.i18n.models import Locale, TranslationUnit
+
+User = get_user_model()
+
+
+class PageCloneTest(TestCase):
+    def setUp(self):
+        # Locales no other test creates pages in
+        self.en, _ = Locale.objects.get_or_create(
+            code="en-ie",
+            defaults={"name": "English (Ireland)", "native_name": "English"},
+        )
+
+        self.nl, _ = Locale.objects.get_or_create(
+            code="nl-be",
+            defaults={"name": "Dutch (Belgium)", "native_name": "Nederlands"},
+        )
+
+        self.about = Page.objects.create(
+            title="About",
+            slug="about",
+            locale=self.en,
+            status="published",
+            in_main_menu=True,
+            blocks=[{"id": "b1", "type": "text", "props": {"content": "Hi"}}],
+        )
+
+        self.team = Page.objects.create(
+            title="Team", slug="team", parent=self.about, locale=self.en
+        )
+
+        self.jobs = Page.objects.create(
+            title="Jobs", slug="jobs", parent=self.team, locale=self.en
+        )
+
+    def copy_of(self, result, page):
+        return Page.objects.get(pk=result.pages[page.pk])
+
+    def test_tree_is_copied_in_place(self):
+        result = clone_page_tree(self.about)
+
+        self.assertEqual(result.created_count, 3)
+
+        about = self.copy_of(result, self.about)
+        jobs = self.copy_of(result, self.jobs)
+
+        self.assertEqual(about.title, "About (Copy)")
+        self.assertEqual(about.status, "draft")
+        self.assertFalse(about.in_main_menu)
+        self.assertNotEqual(about.group_id, self.about.group_id)
+        self.assertNotEqual(about.blocks[0]["id"], "b1")
+
+        self.assertEqual(jobs.parent.parent, about)
+        self.assertEqual(jobs.path, f"/{about.slug}/team/jobs")
+        self.assertEqual(jobs.path, jobs.compute_path())
+
+    def test_queries_do_not_grow_with_pages(self):
+        # Translation units are created for every other active locale
+        Locale.objects.exclude(pk__in=[self.en.pk, self.nl.pk]).update(is_active=False)
+
+        with CaptureQueriesContext(connection) as small:
+            clone_page_tree(self.about)
+
+        for i in range(20):
+            Page.objects.create(
+                title=f"Member {i}",
+                slug=f"member-{i}",
+                parent=self.team,
+                locale=self.en,
+            )
+
+        with CaptureQueriesContext(connection) as large:
+            result = clone_page_tree(self.about)
+
+        self.assertEqual(result.created_count, 23)
+        self.assertEqual(len(large), len(small))
+
+    def test_tree_copied_into_locale_keeps_groups(self):
+        progress = []
+
+        result = clone_page_tree(
+            self.team,
+            self.nl,
+            batch_size=1,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+
+        team = self.copy_of(result, self.team)
+        jobs = self.copy_of(result, self.jobs)
+
+        self.assertEqual(team.group_id, self.team.group_id)
+        self.assertEqual(jobs.group_id, self.jobs.group_id)
+        self.assertIsNone(team.parent)
+        self.assertEqual(jobs.path, "/team/jobs")
+        self.assertEqual(progress, [(1, 2), (2, 2)])
+        self.assertEqual(PageRevision.objects.filter(page__in=[team, jobs]).count(), 2)
+
+        self.assertTrue(
+            TranslationUnit.objects.filter(
+                content_type=ContentType.objects.get_for_model(Page),
+                object_id=team.pk,
+                field="title",
+                source_locale=self.nl,
+                target_locale=self.en,
+            ).exists()
+        )
+
+    def test_locale_clone_skips_translated_pages(self):
+        about_nl = Page.objects.create(
+            title="Over ons",
+            slug="over-ons",
+            locale=self.nl,
+            group_id=self.about.group_id,
+        )
+
+        result = clone_locale(self.en, self.nl)
+
+        self.assertEqual(result.pages[self.about.pk], about_nl.pk)
+        self.assertEqual(result.created_count, 2)
+
+        jobs = self.copy_of(result, self.jobs)
+
+        self.assertEqual(jobs.parent.parent, about_nl)
+        self.assertEqual(jobs.path, "/over-ons/team/jobs")
+
+        # Nothing left to copy
+        self.assertEqual(clone_locale(self.en, self.nl).created_count, 0)
+
+    def test_taken_path_skips_subtree(self):
+        Page.objects.create(title="Taken", slug="about", locale=self.nl)
+
+        result = clone_locale(self.en, self.nl, batch_size=1)
+
+        self.assertEqual(result.created_count, 0)
+        self.assertEqual(
+            set(result.skipped), {self.about.pk, self.team.pk, self.jobs.pk}
+        )
+
+    def test_locale_clone_task(self):
+        summary = clone_locale_pages.delay("en-ie", "nl-be").get()
+
+        self.assertEqual(summary["created_count"], 3)
+        self.assertEqual(summary["errors"], [])
+        self.assertEqual(Page.objects.filter(locale=self.nl).count(), 3)
+
+
+class PageCloneAPITest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="editor@example.com", password="testpass123"
+        )
+
+        self.user.user_permissions.add(
+            *Permission.objects.filter(content_type__app_label="cms")
+        )
+
+        self.client = APIClient()
+
+        self.client.force_authenticate(user=self.user)
+
+        self.locale, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={
+                "name": "English",
+                "native_name": "English",
+                "is_default": True,
+                "is_active": True,
+            },
+        )
+
+        self.page = Page.objects.create(title="Docs", slug="docs", locale=self.locale)
+
+        Page.objects.create(
+            title="Guide", slug="guide", parent=self.page, locale=self.locale
+        )
+
+    def test_duplicate_with_children(self):
+        response = self.client.post(
+            f"/api/v1/cms/pages/{self.page.pk}/duplicate/",
+            {"include_children": True},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["title"], "Docs (Copy)")
+        self.assertEqual(Page.objects.filter(parent=response.data["id"]).count(), 1)
+
+    def test_clone_locale_validates_locales(self):
+        response = self.client.post(
+            "/api/v1/cms/pages/clone-locale/",
+            {"source_locale": "en", "target_locale": "xx"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_clone_tree_requires_locale_scope(self):
+        response = self.client.post(
+            f"/api/v1/cms/pages/{self.page.pk}/clone-tree/", {}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @patch("apps.cms.tasks.clone_locale_pages.delay", return_value=Mock(id="task-1"))
+    def test_clone_locale_requires_target_locale_scope(self, delay):
+        target, _ = Locale.objects.get_or_create(
+            code="de", defaults={"name": "German", "native_name": "Deutsch"}
+        )
+
+        data = {"source_locale": "en", "target_locale": "de"}
+
+        response = self.client.post(
+            "/api/v1/cms/pages/clone-locale/", data, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        delay.assert_not_called()
+
+        group = Group.objects.create(name="German editors")
+
+        ScopedLocale.objects.create(group=group, locale=target)
+
+        self.user.groups.add(group)
+
+        response = self.client.post(
+            "/api/v1/cms/pages/clone-locale/", data, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        delay.assert_called_once_with("en", "de", user_id=self.user.pk)
@@ -519,4 +519,4 @@ class PreviewTokenAccessTest(PageVisibilityTestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["id"], self.published_page.id)
+        self.assertEqual(response.json()["id"], self.published_page.id)
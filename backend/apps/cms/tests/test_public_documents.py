@@ -0,0 +1,157 @@
+"""
+Test cases for materialized public page documents.
+
+This module tests that:
+- Published pages are served from their document in one query
+- Documents follow publish, unpublish, moves and translations
+- SEO settings changes drop the documents of their locale
+"""
+
+import os
+
+import django
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+django.setup()
+
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cms import documents
+from apps.cms.models import Page, PublicPageDocument
+from apps.cms.seo import SeoSettings
+from apps.cms.tasks import rebuild_page_documents
+from apps.i18n.models import Locale
+
+URL = "/api/v1/cms/pages/get_by_path/"
+
+
+class PublicPageDocumentTestCase(TestCase):
+    """Test public documents of published pages."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for all tests."""
+        cls.locale, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={
+                "name": "English",
+                "native_name": "English",
+                "is_default": True,
+                "is_active": True,
+            },
+        )
+
+    def setUp(self):
+        """Set up test data for each test."""
+        self.client = APIClient()
+
+        self.page = Page.objects.create(
+            title="About",
+            slug="about",
+            locale=self.locale,
+            status="published",
+        )
+
+    def get_page(self, path, **extra):
+        return self.client.get(URL, {"path": path, "locale": "en"}, **extra)
+
+    def test_published_page_is_served_in_one_query(self):
+        """A materialized page is one indexed lookup."""
+        self.assertTrue(PublicPageDocument.objects.filter(page=self.page).exists())
+
+        with self.assertNumQueries(1):
+            response = self.get_page("/about")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+
+        self.assertEqual(data["id"], self.page.id)
+        self.assertEqual(
+            data["resolved_seo"]["canonical_url"], "http://testserver/about"
+        )
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("Last-Modified", response)
+
+    def test_document_matches_live_serialization(self):
+        """The stored body is what the serializer renders for the request host."""
+        PublicPageDocument.objects.all().delete()
+
+        live = self.get_page("/about").json()
+
+        self.assertEqual(PublicPageDocument.objects.count(), 1)
+
+        self.assertEqual(self.get_page("/about").json(), live)
+
+    def test_base_url_follows_request_host(self):
+        """One document serves every host."""
+        response = self.get_page("/about", HTTP_HOST="localhost")
+
+        data = response.json()
+
+        self.assertEqual(
+            data["resolved_seo"]["canonical_url"], "http://localhost/about"
+        )
+        self.assertNotIn(documents.BASE_URL_MARKER, response.content.decode())
+
+        self.assertNotEqual(response["ETag"], self.get_page("/about")["ETag"])
+
+    def test_unpublish_removes_document(self):
+        """Unpublished pages are no longer served."""
+        self.page.status = "draft"
+        self.page.save()
+
+        self.assertFalse(PublicPageDocument.objects.exists())
+
+        self.assertEqual(self.get_page("/about").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_moved_page_is_served_at_new_path(self):
+        """A page's document follows its path."""
+        self.page.slug = "about-us"
+        self.page.save()
+
+        self.assertEqual(self.get_page("/about").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.get_page("/about-us").json()["slug"], "about-us")
+
+    def test_translations_rebuild_alternates(self):
+        """Adding or removing a translation updates the hreflang alternates."""
+        locale_fr = Locale.objects.create(
+            code="fr", name="French", native_name="Français", is_active=True
+        )
+
+        rebuild_page_documents()
+
+        translation = Page.objects.create(
+            title="À propos",
+            slug="a-propos",
+            locale=locale_fr,
+            group_id=self.page.group_id,
+            status="published",
+        )
+
+        alternates = self.get_page("/about").json()["seo_links"]["alternates"]
+
+        self.assertIn(
+            {"hreflang": "fr", "href": "http://testserver/a-propos"}, alternates
+        )
+
+        translation.delete()
+
+        alternates = self.get_page("/about").json()["seo_links"]["alternates"]
+
+        self.assertEqual([alt["hreflang"] for alt in alternates], ["en"])
+
+    def test_seo_settings_change_drops_locale_documents(self):
+        """SEO settings changes re-render the documents of their locale."""
+        with self.captureOnCommitCallbacks(execute=True):
+            SeoSettings.objects.create(locale=self.locale, title_suffix=" | Site")
+
+        response = self.get_page("/about")
+
+        self.assertEqual(response.json()["resolved_seo"]["title"], "About | Site")
+
+        self.assertTrue(PublicPageDocument.objects.filter(page=self.page).exists())
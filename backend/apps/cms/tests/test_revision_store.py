@@ -0,0 +1,209 @@
+"""Tests for delta-compressed revision storage."""
+
+import os
+
+import django
+
+# Setup Django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+django.setup()
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.blog.models import BlogPost
+from apps.blog.versioning import BlogPostRevision
+from apps.cms.models import Page
+from apps.cms.revision_store import RevisionBlob, blob_digest, prune_blobs
+from apps.cms.versioning import PageRevision, RevisionDiffer
+from apps.i18n.models import Locale
+
+User = get_user_model()
+
+
+def hero(title):
+    return {"type": "hero", "props": {"title": title}}
+
+
+class RevisionStoreTest(TestCase):
+    def setUp(self):
+        self.locale, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={
+                "name": "English",
+                "native_name": "English",
+                "is_default": True,
+                "is_active": True,
+            },
+        )
+
+        self.page = Page.objects.create(
+            title="History",
+            slug="history",
+            locale=self.locale,
+            blocks=[hero(f"Block {i}") for i in range(10)],
+        )
+
+    def snapshot(self, **kwargs):
+        return PageRevision.create_snapshot(self.page, is_autosave=True, **kwargs)
+
+    def reload(self, revision):
+        return PageRevision.objects.get(pk=revision.pk)
+
+    def test_unchanged_blocks_are_shared(self):
+        first = self.snapshot()
+
+        self.page.blocks[3] = hero("Edited")
+
+        blobs = RevisionBlob.objects.count()
+
+        second = self.snapshot()
+
+        # Only the edited block is new; the keyframe list is reused
+        self.assertEqual(RevisionBlob.objects.count(), blobs + 1)
+        self.assertEqual(
+            second.data["manifest"]["edits"], [[3, 4, [blob_digest(hero("Edited"))]]]
+        )
+        self.assertEqual(
+            second.data["manifest"]["base"], first.data["manifest"]["base"]
+        )
+
+        self.assertEqual(self.reload(second).snapshot["blocks"], self.page.blocks)
+        self.assertEqual(self.reload(first).snapshot["blocks"][3], hero("Block 3"))
+
+    def test_snapshot_keeps_fields_and_order(self):
+        revision = self.reload(self.snapshot())
+
+        self.assertEqual(
+            list(revision.snapshot), list(PageRevision.snapshot_data(self.page))
+        )
+        self.assertEqual(revision.snapshot["title"], "History")
+        self.assertEqual(revision.get_block_count(), 10)
+
+    @override_settings(CMS_REVISION_KEYFRAME_INTERVAL=3)
+    def test_keyframes_are_periodic(self):
+        depths = []
+
+        for i in range(5):
+            self.page.blocks[0] = hero(f"Edit {i}")
+
+            depths.append(self.snapshot().data["manifest"]["depth"])
+
+        # After the revision of the page's creation
+        self.assertEqual(depths, [1, 2, 0, 1, 2])
+
+    def test_large_edits_start_a_keyframe(self):
+        self.snapshot()
+
+        self.page.blocks = [hero(f"New {i}") for i in range(10)]
+
+        manifest = self.snapshot().data["manifest"]
+
+        self.assertEqual((manifest["depth"], manifest["edits"]), (0, []))
+
+    def test_pruned_revisions_leave_others_readable(self):
+        keyframe = self.snapshot()
+
+        self.page.blocks.insert(0, hero("Inserted"))
+
+        delta = self.snapshot()
+
+        keyframe.delete()
+
+        self.assertEqual(self.reload(delta).snapshot["blocks"][0], hero("Inserted"))
+
+    def test_restore_and_diff_reconstruct(self):
+        revision = self.snapshot()
+
+        self.page.blocks = self.page.blocks[:2]
+        self.page.save()
+
+        revision = self.reload(revision)
+
+        diff = RevisionDiffer.diff_current_page(self.page, revision)
+
+        self.assertEqual(len(diff["changes"]["blocks"]["removed"]), 8)
+
+        page = revision.restore_to_page()
+
+        self.assertEqual(len(Page.objects.get(pk=page.pk).blocks), 10)
+
+    def test_bulk_created_revisions_are_keyframes(self):
+        PageRevision.objects.bulk_create(
+            [
+                PageRevision(
+                    page=self.page, snapshot=PageRevision.snapshot_data(self.page)
+                )
+            ]
+        )
+
+        revision = PageRevision.objects.filter(page=self.page).latest("created_at")
+
+        self.assertEqual(revision.data["manifest"]["depth"], 0)
+        self.assertEqual(revision.snapshot["blocks"], self.page.blocks)
+
+    def test_legacy_rows_are_compressed_by_command(self):
+        for _ in range(3):
+            self.snapshot()
+
+        revisions = PageRevision.objects.filter(page=self.page).order_by("created_at")
+
+        # Rows written before the revision store held the whole snapshot
+        revisions.update(data=PageRevision.snapshot_data(self.page))
+
+        RevisionBlob.objects.all().delete()
+
+        legacy = revisions.first()
+
+        self.assertNotIn("manifest", legacy.data)
+        self.assertEqual(legacy.snapshot["blocks"], self.page.blocks)
+
+        out = StringIO()
+
+        call_command("compress_revisions", "--prune", stdout=out)
+
+        self.assertIn("Page Revisions: 4 compressed", out.getvalue())
+
+        self.assertEqual(
+            [revision.data["manifest"]["depth"] for revision in revisions], [0, 1, 2, 3]
+        )
+
+        for revision in revisions:
+            self.assertEqual(revision.snapshot["blocks"], self.page.blocks)
+
+        call_command("compress_revisions", stdout=out)
+
+        self.assertIn("Page Revisions: 0 compressed", out.getvalue())
+
+    def test_prune_blobs_keeps_referenced(self):
+        self.snapshot()
+
+        RevisionBlob.objects.create(digest="0" * 32, data={"orphan": True})
+
+        self.assertEqual(prune_blobs([PageRevision, BlogPostRevision]), 1)
+
+        revision = PageRevision.objects.filter(page=self.page).latest("created_at")
+
+        self.assertEqual(self.reload(revision).snapshot["blocks"], self.page.blocks)
+
+    def test_blog_content_is_a_shared_blob(self):
+        user = User.objects.create_user(email="author@example.com", password="pw")
+
+        post = BlogPost.objects.create(
+            title="Post",
+            slug="post",
+            content="<p>Long body</p>",
+            author=user,
+            locale=self.locale,
+        )
+
+        revision = BlogPostRevision.create_snapshot(post)
+
+        self.assertIsNone(revision.data["content"])
+        self.assertEqual(
+            BlogPostRevision.objects.get(pk=revision.pk).snapshot["content"],
+            "<p>Long body</p>",
+        )
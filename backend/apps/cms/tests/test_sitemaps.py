@@ -0,0 +1,256 @@
+"""
+Tests for sharded, streamed sitemaps.
+
+Covers the sitemap index, shard boundaries, hreflang alternates resolved in
+one grouped query, registry content (blog posts) and pre-rendered shards.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+
+from apps.blog import versioning as blog_versioning  # noqa: F401 - registers models
+from apps.blog.models import BlogPost
+from apps.cms import sitemaps
+from apps.cms.models import Page
+from apps.cms.tasks import refresh_sitemaps
+from apps.i18n.models import Locale
+
+User = get_user_model()
+
+
+class SitemapTestBase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.media_root = tempfile.mkdtemp(prefix="test_sitemaps_")
+
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+
+        self.settings_override.enable()
+
+        self.locale_en, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={"name": "English", "native_name": "English", "is_active": True},
+        )
+
+        self.locale_fr, _ = Locale.objects.get_or_create(
+            code="fr",
+            defaults={"name": "French", "native_name": "Français", "is_active": True},
+        )
+
+        self.pages = [
+            Page.objects.create(
+                title=f"Page {i}",
+                slug=f"page-{i}",
+                locale=self.locale_en,
+                status="published",
+            )
+            for i in range(5)
+        ]
+
+        Page.objects.create(
+            title="Draft", slug="draft", locale=self.locale_en, status="draft"
+        )
+
+        # Drop manifests and refresh debounce markers left by the fixtures
+        cache.clear()
+
+    def tearDown(self):
+        self.settings_override.disable()
+
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+        cache.clear()
+
+    def fetch(self, url):
+        response = self.client.get(url)
+
+        content = response.getvalue().decode() if response.status_code == 200 else ""
+
+        return response, content
+
+
+class SitemapIndexTest(SitemapTestBase):
+    def test_index_lists_shards_per_locale(self):
+        response, content = self.fetch("/sitemap.xml")
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertTrue(response.streaming)
+
+        self.assertIn("<sitemapindex", content)
+
+        self.assertIn("<loc>http://localhost:8000/sitemap-en-1.xml</loc>", content)
+
+        self.assertIn("<loc>http://localhost:8000/sitemap-fr-1.xml</loc>", content)
+
+    @override_settings(CMS_SITEMAP_SHARD_SIZE=2)
+    def test_index_splits_large_locales(self):
+        _, content = self.fetch("/sitemap.xml")
+
+        self.assertIn("sitemap-en-3.xml", content)
+
+        self.assertNotIn("sitemap-en-4.xml", content)
+
+    @override_settings(RATELIMIT_ENABLE=True, CMS_SITEMAP_RATE_LIMIT="1/h")
+    def test_rate_limit_follows_setting(self):
+        self.assertEqual(self.client.get("/sitemap.xml").status_code, 200)
+
+        self.assertEqual(self.client.get("/sitemap.xml").status_code, 403)
+
+
+class SitemapShardTest(SitemapTestBase):
+    @override_settings(CMS_SITEMAP_SHARD_SIZE=2)
+    def test_shards_partition_published_urls(self):
+        locations = []
+
+        for shard in (1, 2, 3):
+            response, content = self.fetch(f"/sitemap-en-{shard}.xml")
+
+            self.assertEqual(response.status_code, 200)
+
+            locations.extend(
+                line.strip()
+                for line in content.splitlines()
+                if line.strip().startswith("<loc>")
+            )
+
+        published = Page.objects.filter(
+            locale=self.locale_en, status="published"
+        ).order_by("pk")
+
+        expected = [
+            f"<loc>http://localhost:8000{page.path}</loc>" for page in published
+        ]
+
+        self.assertEqual(locations, expected)
+
+    @override_settings(CMS_SITEMAP_SHARD_SIZE=2)
+    def test_shard_out_of_range(self):
+        response = self.client.get("/sitemap-en-4.xml")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_alternates_use_one_query_per_batch(self):
+        for page in self.pages:
+            Page.objects.create(
+                title=f"{page.title} FR",
+                slug=f"{page.slug}-fr",
+                locale=self.locale_fr,
+                status="published",
+                group_id=page.group_id,
+            )
+
+        locale = Locale.objects.get(code="en")
+
+        manifest = sitemaps.get_manifest(locale)
+
+        # One row query plus one grouped alternates query, however many
+        # pages the shard holds
+        with self.assertNumQueries(2):
+            content = "".join(
+                sitemaps.iter_shard_xml(
+                    locale, 1, include_alternates=True, manifest=manifest
+                )
+            )
+
+        self.assertIn('hreflang="fr" href="http://localhost:8000/page-0-fr"', content)
+
+        self.assertIn('hreflang="en" href="http://localhost:8000/page-4"', content)
+
+    def test_blog_posts_are_included(self):
+        author = User.objects.create_user(email="author@example.com", password="x")
+
+        BlogPost.objects.create(
+            title="Hello",
+            slug="hello",
+            content="Body",
+            locale=self.locale_en,
+            author=author,
+            status="published",
+        )
+
+        _, content = self.fetch("/sitemap-en-1.xml")
+
+        self.assertIn("<loc>http://localhost:8000/blog/hello</loc>", content)
+
+
+class SitemapPrerenderTest(SitemapTestBase):
+    def test_refresh_task_writes_shards_to_storage(self):
+        result = refresh_sitemaps.apply(args=[["en"]]).get()
+
+        self.assertEqual(result, {"en": 1})
+
+        path = sitemaps.shard_storage_path("en", 1)
+
+        self.assertTrue(default_storage.exists(path))
+
+        with default_storage.open(path) as handle:
+            self.assertIn(b"<loc>http://localhost:8000/page-0</loc>", handle.read())
+
+    def test_prerendered_shard_is_served_from_storage(self):
+        refresh_sitemaps.apply(args=[["en"]])
+
+        with default_storage.open(sitemaps.shard_storage_path("en", 1), "wb") as fh:
+            fh.write(b"<urlset>prerendered</urlset>")
+
+        response, content = self.fetch("/sitemap-en-1.xml")
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(content, "<urlset>prerendered</urlset>")
+
+    @override_settings(CMS_SITEMAP_SHARD_SIZE=2)
+    def test_refresh_removes_stale_shards(self):
+        refresh_sitemaps.apply(args=[["en"]])
+
+        self.assertTrue(default_storage.exists(sitemaps.shard_storage_path("en", 3)))
+
+        Page.objects.filter(slug__in=["page-3", "page-4"]).update(status="draft")
+
+        refresh_sitemaps.apply(args=[["en"]])
+
+        self.assertTrue(default_storage.exists(sitemaps.shard_storage_path("en", 2)))
+
+        self.assertFalse(default_storage.exists(sitemaps.shard_storage_path("en", 3)))
+
+    def test_publishing_queues_a_single_refresh(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            for i in range(3):
+                Page.objects.create(
+                    title=f"New {i}",
+                    slug=f"new-{i}",
+                    locale=self.locale_en,
+                    status="published",
+                )
+
+        self.assertEqual(len(callbacks), 1)
+
+    def test_only_listed_changes_queue_a_refresh(self):
+        page = self.pages[0]
+
+        with patch.object(sitemaps, "schedule_refresh") as schedule_refresh:
+            page.blocks = [{"type": "text", "props": {"content": "Edited"}}]
+            page.save()
+
+            schedule_refresh.assert_not_called()
+
+            page.slug = "renamed"
+            page.save()
+
+            schedule_refresh.assert_called_once_with("en")
@@ -24,6 +24,7 @@ from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from apps.cms.autosave import flush_autosaves
 from apps.cms.models import Page
 from apps.cms.versioning import AuditEntry, PageRevision, RevisionDiffer
 from apps.i18n.models import Locale
@@ -707,7 +708,13 @@ class ComprehensiveVersionCreationTests(TestCase):
         self.page._current_user = self.user
         self.page.save()
 
-        # Should create a new revision
+        # The edit is buffered, then written as an autosave revision
+        self.assertEqual(
+            PageRevision.objects.filter(page=self.page).count(), initial_count
+        )
+
+        flush_autosaves(PageRevision, owner_id=self.page.pk, force=True)
+
         new_count = PageRevision.objects.filter(page=self.page).count()
         self.assertEqual(new_count, initial_count + 1)
 
@@ -1433,8 +1433,12 @@ class ComprehensiveBlockLevelVersioningTests(TestCase):
         block_changes = diff["changes"]["blocks"]
         self.assertTrue(block_changes["has_changes"])
 
-        # All blocks should be marked as modified due to position changes
-        self.assertEqual(len(block_changes["modified"]), 4)
+        # Reordered blocks are moves, not modifications
+        self.assertTrue(block_changes["reordered"])
+        self.assertEqual(len(block_changes["moved"]), 3)
+        self.assertEqual(block_changes["modified"], [])
+        self.assertEqual(block_changes["added"], [])
+        self.assertEqual(block_changes["removed"], [])
 
     def test_complex_block_operations(self):
         """Test complex block operations (add, remove, modify, reorder)."""
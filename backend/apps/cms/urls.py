@@ -3,7 +3,7 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .versioning_views import AuditEntryViewSet, PageRevisionViewSet
-from .views import sitemap_view
+from .views import sitemap_shard_view, sitemap_view
 from .views.block_types import BlockTypeViewSet
 from .views.blocks import BlockSchemaView, BlockTypesView
 from .views.category import CategoryViewSet, CollectionViewSet, TagViewSet
@@ -49,5 +49,10 @@ urlpatterns = [
         PublicSeoSettingsView.as_view(),
         name="public-seo-settings",
     ),
+    path(
+        "sitemap-<str:locale_code>-<int:shard>.xml",
+        sitemap_shard_view,
+        name="sitemap-shard",
+    ),
     path("sitemap-<str:locale_code>.xml", sitemap_view, name="sitemap"),
 ]
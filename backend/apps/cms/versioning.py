@@ -5,10 +5,14 @@ from typing import TYPE_CHECKING, Any
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
 
+from .autosave import flush_autosaves
+from .block_diff import diff_blocks
 from .models import Page
+from .revision_store import SnapshotStorageMixin
 
 """
 Versioning and audit models for the CMS.
@@ -25,12 +29,22 @@ if TYPE_CHECKING:
 
 User = get_user_model()
 
+# Diffs of stored revision pairs, keyed by the two revision ids
 
-class PageRevision(models.Model):
+DIFF_CACHE_PREFIX = "revision_diff"
+
+DIFF_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class PageRevision(SnapshotStorageMixin):
     """
     Store snapshots of page content for versioning and autosave.
+
+    Snapshots are stored delta-compressed (see ``revision_store``).
     """
 
+    OWNER_FIELD = "page"
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
     page = models.ForeignKey(
@@ -40,10 +54,6 @@ class PageRevision(models.Model):
         help_text="Page this revision belongs to",
     )
 
-    snapshot = models.JSONField(
-        help_text="Complete page data snapshot including blocks, seo, and metadata"
-    )
-
     created_by = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -124,26 +134,18 @@ class PageRevision(models.Model):
 
             Created PageRevision instance
         """
+        # Buffered autosaves predate this revision: write them first
+
+        flush_autosaves(
+            cls,
+            owner_id=page.pk,
+            force=True,
+            user_id=user.pk if user else None,
+        )
+
         # Create complete snapshot of page data
 
-        snapshot_data = {
-            "title": page.title,
-            "slug": page.slug,
-            "path": page.path,
-            "blocks": page.blocks,
-            "seo": page.seo,
-            "status": page.status,
-            "published_at": (
-                page.published_at.isoformat() if page.published_at else None
-            ),
-            "parent_id": page.parent.id if page.parent else None,
-            "position": page.position,
-            "locale_id": page.locale.id if page.locale else None,
-            "group_id": str(page.group_id),
-            "preview_token": str(page.preview_token),
-            "created_at": page.created_at.isoformat(),
-            "updated_at": page.updated_at.isoformat(),
-        }
+        snapshot_data = cls.snapshot_data(page)
 
         # Create the revision with explicit field values
 
@@ -165,6 +167,29 @@ class PageRevision(models.Model):
 
         return cls.objects.create(**revision_data)
 
+    @staticmethod
+    def snapshot_data(page: "Page") -> dict:
+        """Serialize the versioned fields of a page into a snapshot dict."""
+
+        return {
+            "title": page.title,
+            "slug": page.slug,
+            "path": page.path,
+            "blocks": page.blocks,
+            "seo": page.seo,
+            "status": page.status,
+            "published_at": (
+                page.published_at.isoformat() if page.published_at else None
+            ),
+            "parent_id": page.parent_id,
+            "position": page.position,
+            "locale_id": page.locale_id,
+            "group_id": str(page.group_id),
+            "preview_token": str(page.preview_token),
+            "created_at": page.created_at.isoformat(),
+            "updated_at": page.updated_at.isoformat(),
+        }
+
     @classmethod
     def should_create_autosave(cls, page: "Page", user: User) -> bool:
         """
@@ -236,11 +261,6 @@ class PageRevision(models.Model):
 
         return page
 
-    def get_block_count(self) -> int:
-        """Get the number of blocks in this revision."""
-
-        return len(self.snapshot.get("blocks", []))
-
 
 class AuditEntry(models.Model):
     """
@@ -411,6 +431,19 @@ class RevisionDiffer:
             Dict containing diff information
         """
 
+        # Stored revisions never change: their diff is computed once
+        cacheable = not (old_revision._state.adding or new_revision._state.adding)
+
+        if cacheable:
+
+            cache_key = f"{DIFF_CACHE_PREFIX}:{old_revision.pk}:{new_revision.pk}"
+
+            cached = cache.get(cache_key)
+
+            if cached is not None:
+
+                return cached
+
         old_data = old_revision.snapshot
 
         new_data = new_revision.snapshot
@@ -458,6 +491,10 @@ class RevisionDiffer:
 
         diff["has_changes"] = len(diff["changes"]) > 0
 
+        if cacheable:
+
+            cache.set(cache_key, diff, DIFF_CACHE_TIMEOUT)
+
         return diff
 
     @staticmethod
@@ -465,6 +502,9 @@ class RevisionDiffer:
         """
         Compare block arrays and return detailed diff.
 
+        Blocks are matched by id or content hash (see ``block_diff``), so
+        insertions, removals and moves are reported as such.
+
         Args:
             old_blocks: Original blocks
             new_blocks: Updated blocks
@@ -473,57 +513,7 @@ class RevisionDiffer:
             Dict containing block-level changes
         """
 
-        diff = {
-            "has_changes": False,
-            "added": [],
-            "removed": [],
-            "modified": [],
-            "reordered": False,
-        }
-
-        # Simple length check
-
-        if len(old_blocks) != len(new_blocks):
-
-            diff["has_changes"] = True
-
-        # Compare each block position
-
-        max_len = max(len(old_blocks), len(new_blocks))
-
-        for i in range(max_len):
-
-            old_block = old_blocks[i] if i < len(old_blocks) else None
-
-            new_block = new_blocks[i] if i < len(new_blocks) else None
-
-            if old_block is None and new_block is not None:
-
-                # Block added
-
-                diff["added"].append({"index": i, "block": new_block})
-
-                diff["has_changes"] = True
-
-            elif old_block is not None and new_block is None:
-
-                # Block removed
-
-                diff["removed"].append({"index": i, "block": old_block})
-
-                diff["has_changes"] = True
-
-            elif old_block != new_block:
-
-                # Block modified
-
-                diff["modified"].append(
-                    {"index": i, "old": old_block, "new": new_block}
-                )
-
-                diff["has_changes"] = True
-
-        return diff
+        return diff_blocks(old_blocks, new_blocks)
 
     @staticmethod
     def diff_current_page(page: "Page", revision: PageRevision) -> dict[str, Any]:
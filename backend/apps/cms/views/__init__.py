@@ -1,3 +1,4 @@
-from .pages import PagesViewSet, default_sitemap_view, sitemap_view
+from .pages import PagesViewSet
+from .sitemap import sitemap_index_view, sitemap_shard_view, sitemap_view
 
-__all__ = ["PagesViewSet", "sitemap_view", "default_sitemap_view"]
+__all__ = ["PagesViewSet", "sitemap_view", "sitemap_shard_view", "sitemap_index_view"]
@@ -11,6 +11,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.cms.blocks.validation import BLOCK_TYPES_VERSION
 from apps.cms.models import BlockType, BlockTypeCategory
 from apps.cms.serializers.block_types import (
     BlockTypeCategorySerializer,
@@ -19,6 +20,7 @@ from apps.cms.serializers.block_types import (
     BlockTypeSerializer,
     BlockTypeUpdateSerializer,
 )
+from apps.core.conditional import bump_content_version
 from apps.core.permissions import RBACPermission
 
 
@@ -279,9 +281,9 @@ class BlockTypeViewSet(viewsets.ModelViewSet):
 
         updated_count = BlockType.objects.filter(id__in=ids).update(**filtered_updates)
 
-        # Clear cache
+        # Reload the block type registry
 
-        cache.delete("block_types_registry")
+        bump_content_version(BLOCK_TYPES_VERSION)
 
         return Response(
             {
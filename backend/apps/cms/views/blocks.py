@@ -5,16 +5,75 @@ from rest_framework import status, views
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
+from apps.core.conditional import rendered_response
+
+from ..blocks.registry import block_type_registry
 from ..blocks.validation import BLOCK_MODELS
-from ..models import BlockType
 
 """
 API views for CMS blocks registry.
+
+Responses are rendered once per block types version from the in-process
+registry and served with its ETag.
 """
 
 logger = logging.getLogger(__name__)
 
 
+def model_schema(block_type):
+    """Schema of the Pydantic model of ``block_type``; empty if it has none."""
+
+    if block_type not in BLOCK_MODELS:
+
+        return {}
+
+    try:
+
+        model_class = BLOCK_MODELS[block_type]
+
+        return model_class.schema()
+
+    except Exception as e:
+        logger.warning(f"Failed to get schema for block type {block_type}: {e}")
+
+        return {}
+
+
+def build_block_types(registry):
+    """The block types listing, sorted by category then by label."""
+
+    block_types = []
+
+    for db_block_type in registry.values():
+
+        block_type = db_block_type["type"]
+
+        # Use database schema if available, otherwise fallback to model schema
+
+        schema = db_block_type["schema"] or model_schema(block_type)
+
+        block_types.append(
+            {
+                "type": block_type,
+                "component": db_block_type["component"],
+                "label": db_block_type["label"],
+                "description": db_block_type["description"],
+                "category": db_block_type[
+                    "category"
+                ].title(),  # Capitalize for consistency
+                "icon": db_block_type["icon"],
+                "preload": db_block_type["preload"],
+                "editing_mode": db_block_type["editing_mode"],
+                "schema": schema,
+                "default_props": db_block_type["default_props"] or {},
+            }
+        )
+
+    block_types.sort(key=lambda x: (x["category"], x["label"]))
+
+    return {"block_types": block_types}
+
+
 class BlockTypesView(views.APIView):
     """
     API view for getting available block types and their schemas.
@@ -49,74 +108,11 @@ class BlockTypesView(views.APIView):
         },
     )
     def get(self, request):
-        """Get all available block types with their metadata from database."""
-
-        # Get active block types from database
-
-        db_block_types = BlockType.objects.filter(is_active=True).values(
-            "type",
-            "component",
-            "label",
-            "description",
-            "category",
-            "icon",
-            "preload",
-            "editing_mode",
-            "schema",
-            "default_props",
-        )
-
-        block_types = []
-
-        for db_block_type in db_block_types:
-
-            block_type = db_block_type["type"]
+        """Get all available block types with their metadata from the registry."""
 
-            # Get the Pydantic model schema for validation (fallback to empty schema)
+        etag, body = block_type_registry.rendered("block_types", build_block_types)
 
-            model_schema = {}
-
-            if block_type in BLOCK_MODELS:
-
-                try:
-
-                    model_class = BLOCK_MODELS[block_type]
-
-                    model_schema = model_class.schema()
-
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to get schema for block type {block_type}: {e}"
-                    )
-
-            # Use database schema if available, otherwise fallback to model schema
-
-            schema = (
-                db_block_type["schema"] if db_block_type["schema"] else model_schema
-            )
-
-            block_types.append(
-                {
-                    "type": block_type,
-                    "component": db_block_type["component"],
-                    "label": db_block_type["label"],
-                    "description": db_block_type["description"],
-                    "category": db_block_type[
-                        "category"
-                    ].title(),  # Capitalize for consistency
-                    "icon": db_block_type["icon"],
-                    "preload": db_block_type["preload"],
-                    "editing_mode": db_block_type["editing_mode"],
-                    "schema": schema,
-                    "default_props": db_block_type["default_props"] or {},
-                }
-            )
-
-        # Sort by category then by label
-
-        block_types.sort(key=lambda x: (x["category"], x["label"]))
-
-        return Response({"block_types": block_types})
+        return rendered_response(request, etag, body)
 
 
 class BlockSchemaView(views.APIView):
@@ -139,33 +135,18 @@ class BlockSchemaView(views.APIView):
         },
     )
     def get(self, request, block_type):
-        """Get the schema for a specific block type from database."""
-
-        try:
+        """Get the schema for a specific block type from the registry."""
 
-            db_block_type = BlockType.objects.get(type=block_type, is_active=True)
-
-            # Use database schema if available, otherwise fallback to model schema
-
-            schema = db_block_type.schema
-
-            if not schema and block_type in BLOCK_MODELS:
-
-                try:
-
-                    model_class = BLOCK_MODELS[block_type]
-
-                    schema = model_class.schema()
-
-                except Exception:
-
-                    schema = {}
-
-            return Response(schema or {})
-
-        except BlockType.DoesNotExist:
+        if block_type not in block_type_registry.block_types():
 
             return Response(
                 {"error": f"Block type '{block_type}' not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
+
+        etag, body = block_type_registry.rendered(
+            f"block_schema:{block_type}",
+            lambda registry: registry[block_type]["schema"] or model_schema(block_type),
+        )
+
+        return rendered_response(request, etag, body)
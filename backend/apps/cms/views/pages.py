@@ -1,29 +1,36 @@
 import copy
 import uuid
 
-from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Case, Count, IntegerField, Value, When
+from django.db.models import Case, Count, IntegerField, Q, Value, When
 from django.http import HttpResponse
-from django.shortcuts import redirect
 from django.utils import timezone
-from django.views.decorators.cache import cache_page
+from django.utils.http import http_date, parse_etags
 
-from django_ratelimit.decorators import ratelimit
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle
 
-from apps.cms import models, seo_utils, versioning
+from apps.accounts.rbac import filter_by_scope, get_user_scope
+from apps.cms import documents, menus, models, page_clone, seo_utils, tasks, versioning
+from apps.cms.blocks.patch import (
+    BlockPatch,
+    BlockPatchError,
+    BlockPatchTestFailed,
+    JSONPatchParser,
+    block_revision,
+    save_blocks,
+)
 
 # Optional import for audit functionality
 try:
     from apps.ops.models import AuditEntry
 except ImportError:
     AuditEntry = None  # type: ignore
-from apps.cms.seo_utils import generate_hreflang_alternates
 from apps.cms.serializers import (
     PageReadSerializer,
     PageTreeItemSerializer,
@@ -32,14 +39,21 @@ from apps.cms.serializers import (
 )
 from apps.cms.services.scheduling import SchedulingService
 from apps.cms.versioning_views import VersioningMixin
+from apps.core.conditional import make_etag, not_modified
 from apps.core.pagination import StandardResultsSetPagination
 from apps.core.throttling import (
     BurstWriteThrottle,
     PublishOperationThrottle,
+    UserRateThrottle,
     WriteOperationThrottle,
 )
 from apps.i18n.models import Locale
 
+PUBLISHED_PAGE_CACHE_HEADERS = {
+    "Cache-Control": "public, max-age=300, s-maxage=600",
+    "Vary": "Accept-Language, Accept-Encoding",
+}
+
 
 class PagesViewSet(VersioningMixin, viewsets.ModelViewSet):
     """API endpoints for managing pages."""
@@ -69,9 +83,48 @@ class PagesViewSet(VersioningMixin, viewsets.ModelViewSet):
                 queryset = queryset.filter(status="published")
             elif not self.request.user.has_perm("cms.view_page"):
                 queryset = queryset.filter(status="published")
+            elif self.is_scoped_user():
+                # Scoped editors only see unpublished pages within their scopes
+                scoped = filter_by_scope(models.Page.objects.all(), self.request.user)
+                queryset = queryset.filter(
+                    Q(status="published") | Q(pk__in=scoped.values("pk"))
+                )
 
         return queryset
 
+    def is_scoped_user(self):
+        """Whether RBAC locale or section scopes restrict the request user."""
+
+        user = self.request.user
+
+        if user.is_superuser:
+
+            return False
+
+        scope = get_user_scope(user)
+
+        return scope is not None and scope.has_scopes
+
+    def has_locale_scope(self, locale_id):
+        """Whether the request user's RBAC scopes cover the locale ``locale_id``."""
+
+        user = self.request.user
+
+        if user.is_superuser:
+
+            return True
+
+        scope = get_user_scope(user)
+
+        return scope is not None and scope.allows_locale(locale_id)
+
+    def locale_scope_denied(self, locale_code):
+
+        return Response(
+            {"error": f"You don't have access to locale {locale_code}"},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
     def get_serializer_class(self):
 
         if self.action in ["create", "update", "partial_update"]:
@@ -177,6 +230,14 @@ class PagesViewSet(VersioningMixin, viewsets.ModelViewSet):
 
             path = path.rstrip("/")
 
+        # Published pages are served from their materialized document
+
+        document = documents.get_document(locale_code, path)
+
+        if document is not None:
+
+            return self.document_response(request, document)
+
         try:
 
             # Use select_related to optimize locale lookup
@@ -249,35 +310,55 @@ class PagesViewSet(VersioningMixin, viewsets.ModelViewSet):
                         status=status.HTTP_404_NOT_FOUND,
                     )
 
+        # Published but not materialized yet
+
+        if page.status == "published":
+
+            return self.document_response(request, documents.materialize(page))
+
         # Use optimized public serializer
 
         serializer = PublicPageSerializer(page, context={"request": request})
 
-        response_data = serializer.data
+        response = Response(serializer.data)
 
-        # Add cache headers for published pages
+        # No cache for non-published pages
 
-        response = Response(response_data)
+        response["Cache-Control"] = "no-cache, no-store, must-revalidate"
 
-        if page.status == "published":
+        return response
 
-            # Cache for 5 minutes for published pages
+    def document_response(self, request, document):
+        """Serve a public page document, or 304 if the client's copy is current."""
 
-            response["Cache-Control"] = "public, max-age=300, s-maxage=600"
+        base_url = request.build_absolute_uri("/")
 
-            response["Vary"] = "Accept-Language, Accept-Encoding"
+        etag = make_etag(document.digest, base_url)
 
-            if page.updated_at:
+        not_modified_response = not_modified(
+            request, etag, PUBLISHED_PAGE_CACHE_HEADERS
+        )
 
-                response["Last-Modified"] = page.updated_at.strftime(
-                    "%a, %d %b %Y %H:%M:%S GMT"
-                )
+        if not_modified_response is not None:
 
-        else:
+            return not_modified_response
+
+        response = HttpResponse(
+            documents.render_body(document, base_url),
+            content_type="application/json",
+        )
+
+        # Cache for 5 minutes for published pages
 
-            # No cache for non-published pages
+        for header, value in PUBLISHED_PAGE_CACHE_HEADERS.items():
 
-            response["Cache-Control"] = "no-cache, no-store, must-revalidate"
+            response[header] = value
+
+        response["ETag"] = etag
+
+        if document.last_modified:
+
+            response["Last-Modified"] = http_date(document.last_modified.timestamp())
 
         return response
 
@@ -657,6 +738,14 @@ class PagesViewSet(VersioningMixin, viewsets.ModelViewSet):
 
                     models.Page.objects.filter(pk=page.pk).update(position=position)
 
+            # Queryset updates send no signals; menus are ordered by position
+
+            menus.schedule_rebuild(
+                models.Page.objects.filter(parent_id=parent_id)
+                .values_list("locale__code", flat=True)
+                .distinct()
+            )
+
         return Response(
             {"success": True, "reordered_count": updated_count, "parent_id": parent_id}
         )
@@ -701,6 +790,109 @@ class PagesViewSet(VersioningMixin, viewsets.ModelViewSet):
 
     # Block editing endpoints
 
+    @action(
+        detail=True,
+        methods=["get", "patch"],
+        url_path="blocks/patch",
+        parser_classes=[JSONPatchParser, JSONParser],
+    )
+    def patch_blocks(self, request, pk=None):
+        """
+        Edit blocks with a JSON Patch (RFC 6902) against their revision.
+
+        GET returns the blocks and their revision token (also the ETag).
+        PATCH takes a list of operations on ``/blocks/...`` and the token in
+        ``If-Match``; only the blocks the operations touch are validated, and
+        the response carries those blocks and the new token.
+        """
+
+        page = self.get_object()
+
+        revision = block_revision(page)
+
+        if request.method == "GET":
+
+            return Response(
+                {"blocks": page.blocks, "revision": revision},
+                headers={"ETag": revision},
+            )
+
+        if_match = request.headers.get("If-Match")
+
+        if not if_match:
+
+            return Response(
+                {"error": "If-Match with the blocks revision is required"},
+                status=status.HTTP_428_PRECONDITION_REQUIRED,
+            )
+
+        if if_match.strip() != "*" and revision not in parse_etags(if_match):
+
+            return self.revision_conflict(revision)
+
+        try:
+
+            patch = BlockPatch(page.blocks).apply(request.data)
+
+            changed = patch.validate()
+
+            page.blocks = patch.blocks
+
+            page._validate_presentation_page_blocks()
+
+        except BlockPatchTestFailed as e:
+
+            return Response(
+                {"error": str(e), "op": e.op}, status=status.HTTP_409_CONFLICT
+            )
+
+        except BlockPatchError as e:
+
+            return Response(
+                {"error": str(e), "op": e.op}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        except DRFValidationError as e:
+
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        except ValidationError as e:
+
+            return Response(
+                {"error": " ".join(e.messages)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        page._current_user = self.request.user
+
+        page._current_request = self.request
+
+        if not save_blocks(page, patch.blocks):
+
+            # Saved by someone else since it was read
+            return self.revision_conflict(None)
+
+        revision = block_revision(page)
+
+        return Response(
+            {
+                "revision": revision,
+                "count": len(page.blocks),
+                "blocks": {str(index): page.blocks[index] for index in changed},
+            },
+            headers={"ETag": revision},
+        )
+
+    def revision_conflict(self, revision):
+        """412 for a patch against an outdated revision."""
+
+        data = {"error": "Blocks were changed by another edit"}
+
+        if revision:
+
+            data["revision"] = revision
+
+        return Response(data, status=status.HTTP_412_PRECONDITION_FAILED)
+
     @action(detail=True, methods=["patch"], url_path="update-block")
     def update_block(self, request, pk=None, block_index=None):
         """Update a specific block."""
@@ -979,91 +1171,156 @@ class PagesViewSet(VersioningMixin, viewsets.ModelViewSet):
 
     @action(detail=True, methods=["post"])
     def duplicate(self, request, pk=None):
-        """Duplicate a page with all its content."""
+        """Duplicate a page with all its content, and optionally its children.
+
+        Large trees are better copied in the background with ``clone-tree``.
+        """
 
         page = self.get_object()
 
-        # Generate a unique slug
+        include_children = request.data.get("include_children") in (True, "true", "1")
 
-        base_slug = page.slug if page.slug else "page"
+        try:
 
-        new_slug = f"{base_slug}-copy-{uuid.uuid4().hex[:6]}"
+            result = page_clone.clone_page_tree(
+                page, include_descendants=include_children, user=request.user
+            )
 
-        # Ensure blocks is a list (not None)
+            duplicated_page = models.Page.objects.select_related("locale").get(
+                pk=result.pages[page.pk]
+            )
 
-        blocks_copy = copy.deepcopy(page.blocks) if page.blocks else []
+            # Create audit entry for duplication
 
-        # Generate new IDs for blocks
+            if AuditEntry:
+                AuditEntry.objects.create(
+                    content_object=duplicated_page,
+                    action="duplicate",
+                    actor=request.user,
+                    model_label="cms.Page",
+                    meta={
+                        "original_page_id": page.id,
+                        "original_page_title": page.title,
+                        "pages_copied": result.created_count,
+                    },
+                )
 
-        for block in blocks_copy:
+            return Response(
+                PageReadSerializer(duplicated_page).data, status=status.HTTP_201_CREATED
+            )
 
-            if "id" in block:
+        except Exception as e:
 
-                block["id"] = str(uuid.uuid4())
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Ensure seo is a dict (not None)
+    @action(detail=True, methods=["post"], url_path="clone-tree")
+    def clone_tree(self, request, pk=None):
+        """Copy a page and its descendants in the background.
 
-        seo_copy = copy.deepcopy(page.seo) if page.seo else {}
+        Copies into ``target_locale`` (a locale code) keep the translation
+        group of their source; without it the tree is duplicated in place.
+        """
 
-        # Create a copy of the page
+        page = self.get_object()
 
-        duplicated_page = models.Page(
-            parent=page.parent,
-            locale=page.locale,
-            title=f"{page.title} (Copy)",
-            slug=new_slug,
-            blocks=blocks_copy,
-            seo=seo_copy,
-            status="draft",  # Always create as draft
-            in_main_menu=False,  # Don't duplicate menu settings
-            in_footer=False,
-            is_homepage=False,
-            position=models.Page.objects.filter(parent=page.parent).count(),
-        )
+        target_locale_code = request.data.get("target_locale")
 
-        # Set user context
+        target_locale_id = page.locale_id
 
-        duplicated_page._current_user = request.user
+        if target_locale_code:
 
-        duplicated_page._current_request = request
+            target_locale_id = (
+                Locale.objects.filter(code=target_locale_code)
+                .values_list("id", flat=True)
+                .first()
+            )
 
-        try:
+            if target_locale_id is None:
 
-            # Save will automatically compute the path
+                return Response(
+                    {"error": f"Locale {target_locale_code} not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
-            duplicated_page.save()
+        if not self.has_locale_scope(target_locale_id):
 
-            # Refresh to get all computed fields
+            return self.locale_scope_denied(target_locale_code or page.locale.code)
 
-            duplicated_page.refresh_from_db()
+        task = tasks.clone_page_tree.delay(
+            page.pk, target_locale_code=target_locale_code, user_id=request.user.pk
+        )
 
-            # Create audit entry for duplication
+        return Response(
+            {
+                "task_id": task.id,
+                "status": "running",
+                "message": f"Started copying the page tree of {page.title}",
+                "check_status_url": f"/api/v1/reports/task-status/{task.id}/",
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
-            if AuditEntry:
-                AuditEntry.objects.create(
-                    content_object=duplicated_page,
-                    action="duplicate",
-                    actor=request.user,
-                    model_label="cms.Page",
-                    meta={
-                        "original_page_id": page.id,
-                        "original_page_title": page.title,
-                    },
-                )
+    @action(detail=False, methods=["post"], url_path="clone-locale")
+    def clone_locale(self, request):
+        """Copy the pages of ``source_locale`` into ``target_locale`` in the background.
 
-            # Get with related data for proper serialization
+        Pages already translated in the target locale are not copied again.
+        """
 
-            duplicated_page = models.Page.objects.select_related("locale").get(
-                pk=duplicated_page.pk
+        source_locale_code = request.data.get("source_locale")
+
+        target_locale_code = request.data.get("target_locale")
+
+        if not source_locale_code or not target_locale_code:
+
+            return Response(
+                {"error": "source_locale and target_locale are required"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if source_locale_code == target_locale_code:
+
             return Response(
-                PageReadSerializer(duplicated_page).data, status=status.HTTP_201_CREATED
+                {"error": "source_locale and target_locale must differ"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        except Exception as e:
+        found = dict(
+            Locale.objects.filter(
+                code__in=[source_locale_code, target_locale_code]
+            ).values_list("code", "id")
+        )
 
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        missing = [
+            code
+            for code in (source_locale_code, target_locale_code)
+            if code not in found
+        ]
+
+        if missing:
+
+            return Response(
+                {"error": f"Locale {missing[0]} not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if not self.has_locale_scope(found[target_locale_code]):
+
+            return self.locale_scope_denied(target_locale_code)
+
+        task = tasks.clone_locale_pages.delay(
+            source_locale_code, target_locale_code, user_id=request.user.pk
+        )
+
+        return Response(
+            {
+                "task_id": task.id,
+                "status": "running",
+                "message": f"Started copying pages from {source_locale_code} to {target_locale_code}",
+                "check_status_url": f"/api/v1/reports/task-status/{task.id}/",
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
     def destroy(self, request, *args, **kwargs):
         """Delete a page and optionally its children."""
@@ -1268,108 +1525,3 @@ class PagesViewSet(VersioningMixin, viewsets.ModelViewSet):
 
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-
-def default_sitemap_view(request):
-    """Redirect /sitemap.xml to the default locale's sitemap."""
-
-    try:
-
-        # Get the default locale (first active locale or 'en' as fallback)
-
-        default_locale = Locale.objects.filter(is_active=True).first()
-
-        if not default_locale:
-
-            # Fallback to 'en' if no active locales
-
-            default_locale = Locale.objects.filter(code="en").first()
-
-        if default_locale:
-
-            return redirect(f"/sitemap-{default_locale.code}.xml", permanent=False)
-
-        else:
-
-            return HttpResponse("No active locales found", status=404)
-
-    except Exception:
-
-        return HttpResponse("Service unavailable", status=503)
-
-
-@cache_page(60 * 60)  # Cache for 1 hour
-@ratelimit(key="ip", rate="10/h", method="GET")
-def sitemap_view(request, locale_code):
-    """Generate XML sitemap for a specific locale with optional hreflang alternates."""
-
-    try:
-
-        locale = Locale.objects.get(code=locale_code, is_active=True)
-
-    except Locale.DoesNotExist:
-
-        return HttpResponse("Locale not found", status=404)
-
-    # Limit sitemap to 50,000 URLs as per sitemap protocol
-
-    # Use iterator for memory efficiency
-
-    pages = (
-        models.Page.objects.filter(locale=locale, status="published")
-        .order_by("updated_at")[:50000]
-        .iterator(chunk_size=1000)
-    )
-
-    # Build XML with hreflang namespace if alternates requested
-
-    include_alternates = request.GET.get("alternates") == "1"
-
-    if include_alternates:
-
-        xml_lines = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:xhtml="http://www.w3.org/1999/xhtml">',
-        ]
-
-    else:
-
-        xml_lines = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
-        ]
-
-    base_url = getattr(settings, "CMS_SITEMAP_BASE_URL", "http://localhost:8000")
-
-    for page in pages:
-
-        xml_lines.extend(
-            [
-                "  <url>",
-                f"    <loc>{base_url}{page.path}</loc>",
-                f"    <lastmod>{page.updated_at.isoformat()}</lastmod>",
-            ]
-        )
-
-        # Add hreflang alternates if requested
-
-        if include_alternates:
-
-            alternates = generate_hreflang_alternates(page, base_url)
-
-            for alternate in alternates:
-                xml_lines.append(
-                    f'    <xhtml:link rel="alternate" hreflang="{alternate["hreflang"]}" href="{alternate["href"]}" />'
-                )
-
-        xml_lines.append("  </url>")
-
-    xml_lines.append("</urlset>")
-
-    xml_content = "\n".join(xml_lines)
-
-    response = HttpResponse(xml_content, content_type="application/xml")
-
-    response["Cache-Control"] = "public, max-age=300"  # 5 minutes cache
-
-    return response
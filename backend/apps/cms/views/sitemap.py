@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+
+from django_ratelimit.decorators import ratelimit
+
+from apps.cms import sitemaps
+from apps.i18n.models import Locale
+
+SITEMAP_CONTENT_TYPE = "application/xml; charset=utf-8"
+
+SITEMAP_CACHE_CONTROL = "public, max-age=300"
+
+# A crawl fetches the index plus every shard, so the per-IP limit has to
+# cover many requests per crawl
+
+SITEMAP_RATE_LIMIT = "120/h"
+
+
+def sitemap_rate(group, request) -> str:
+    """Per-IP rate limit of the sitemap views (``CMS_SITEMAP_RATE_LIMIT``)."""
+
+    return getattr(settings, "CMS_SITEMAP_RATE_LIMIT", SITEMAP_RATE_LIMIT)
+
+
+def _wants_alternates(request) -> bool:
+
+    value = request.GET.get("alternates")
+
+    if value is None:
+        return sitemaps.alternates_by_default()
+
+    return value == "1"
+
+
+@ratelimit(key="ip", rate=sitemap_rate, method="GET")
+def sitemap_index_view(request):
+    """Sitemap index pointing at the numbered shards of every active locale."""
+
+    locales = list(Locale.objects.filter(is_active=True))
+
+    if not locales:
+        return HttpResponse("No active locales found", status=404)
+
+    response = StreamingHttpResponse(
+        sitemaps.iter_index_xml(locales), content_type=SITEMAP_CONTENT_TYPE
+    )
+
+    response["Cache-Control"] = SITEMAP_CACHE_CONTROL
+
+    return response
+
+
+@ratelimit(key="ip", rate=sitemap_rate, method="GET")
+def sitemap_shard_view(request, locale_code, shard=1):
+    """Stream one numbered sitemap shard for a locale.
+
+    Shards pre-rendered into storage are served as files; the non-default
+    alternates variant and not-yet-rendered shards are streamed from the DB.
+    """
+
+    try:
+        locale = Locale.objects.get(code=locale_code, is_active=True)
+    except Locale.DoesNotExist:
+        return HttpResponse("Locale not found", status=404)
+
+    manifest = sitemaps.get_manifest(locale)
+
+    if shard < 1 or shard > manifest["shards"]:
+        return HttpResponse("Sitemap shard not found", status=404)
+
+    include_alternates = _wants_alternates(request)
+
+    response = None
+
+    if manifest["prerendered"] and include_alternates == (
+        sitemaps.alternates_by_default()
+    ):
+        try:
+            response = FileResponse(
+                default_storage.open(
+                    sitemaps.shard_storage_path(locale.code, shard), "rb"
+                ),
+                content_type=SITEMAP_CONTENT_TYPE,
+            )
+        except OSError:
+            # Shard is being re-rendered or was removed; fall back to streaming
+            response = None
+
+    if response is None:
+        response = StreamingHttpResponse(
+            sitemaps.iter_shard_xml(
+                locale, shard, include_alternates, manifest=manifest
+            ),
+            content_type=SITEMAP_CONTENT_TYPE,
+        )
+
+    response["Cache-Control"] = SITEMAP_CACHE_CONTROL
+
+    return response
+
+
+def sitemap_view(request, locale_code):
+    """Legacy un-numbered sitemap URL, served as the locale's first shard."""
+
+    return sitemap_shard_view(request, locale_code, shard=1)
@@ -83,8 +83,8 @@ MIDDLEWARE = [
     "apps.core.middleware_performance.PerformanceMonitoringMiddleware",
     # Compression and optimization (early for efficiency)
     "django.middleware.gzip.GZipMiddleware",
-    # Imports that were malformed - commented out
-    #     # "apps.core.middleware_performance.CompressionMiddleware",  # Disabled - requires brotli
+    # Brotli (when installed) and cached gzip variants of shared bodies
+    "apps.core.middleware_performance.CompressionMiddleware",
     # Early exit middleware (prevent unnecessary processing)
     # Imports that were malformed - commented out
     #     """"apps.core.middleware.AdminIPAllowlistMiddleware","""
@@ -327,8 +327,8 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.StandardResultsSetPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "apps.core.throttling.AnonRateThrottle",
+        "apps.core.throttling.UserRateThrottle",
         # Imports that were malformed - commented out
         #         """"apps.core.throttling.SecurityScanThrottle","""
     ],
@@ -526,6 +526,14 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": 60.0 * 60.0 * 24.0 * 7.0,  # Weekly
         "options": {"queue": "maintenance"},
     },
+    "refresh-ops-metrics": {
+        "task": "apps.ops.tasks.refresh_metrics",
+        "schedule": 15.0,  # Each metric family has its own interval
+    },
+    "flush-autosave-buffer": {
+        "task": "apps.cms.tasks.flush_autosave_buffer",
+        "schedule": 10.0,  # Drafts are written once idle or too old
+    },
 }
 
 
@@ -618,6 +626,20 @@ DEMO_MODE = env.bool("DEMO_MODE", default=False)
 
 DEEPL_API_KEY = env("DEEPL_API_KEY", default="")
 
+DEEPL_API_URL = env("DEEPL_API_URL", default="https://api-free.deepl.com/v2")
+
+# Texts and body size per request (the API allows 50 texts and 128 KiB)
+
+DEEPL_BATCH_SIZE = env.int("DEEPL_BATCH_SIZE", default=50)
+
+DEEPL_MAX_REQUEST_BYTES = env.int("DEEPL_MAX_REQUEST_BYTES", default=120 * 1024)
+
+# Concurrent requests and request rate of batched translations
+
+DEEPL_MAX_CONCURRENT_REQUESTS = env.int("DEEPL_MAX_CONCURRENT_REQUESTS", default=4)
+
+DEEPL_REQUESTS_PER_SECOND = env.float("DEEPL_REQUESTS_PER_SECOND", default=5.0)
+
 
 # Admin settings
 
@@ -630,6 +652,96 @@ ADMIN_IP_ALLOWLIST = env.list("ADMIN_IP_ALLOWLIST", default=[])
 
 CMS_SITEMAP_BASE_URL = env("CMS_SITEMAP_BASE_URL", default="http://localhost:8000")
 
+CMS_SITEMAP_SHARD_SIZE = env.int("CMS_SITEMAP_SHARD_SIZE", default=50000)
+
+CMS_SITEMAP_INCLUDE_ALTERNATES = env.bool(
+    "CMS_SITEMAP_INCLUDE_ALTERNATES", default=False
+)
+
+CMS_SITEMAP_REFRESH_DELAY = env.int("CMS_SITEMAP_REFRESH_DELAY", default=30)
+
+# Per-IP limit of the sitemap index and shard views (one crawl = index + shards)
+
+CMS_SITEMAP_RATE_LIMIT = env("CMS_SITEMAP_RATE_LIMIT", default="120/h")
+
+# Validated blocks remembered by content hash (per process)
+
+CMS_BLOCK_MEMO_SIZE = env.int("CMS_BLOCK_MEMO_SIZE", default=4096)
+
+# Revisions between full block manifests of a page or post (revision store)
+
+CMS_REVISION_KEYFRAME_INTERVAL = env.int("CMS_REVISION_KEYFRAME_INTERVAL", default=20)
+
+# Editor autosaves are buffered in the cache and written as one revision
+# after this many idle seconds, or once the draft is this old
+
+CMS_AUTOSAVE_IDLE_SECONDS = env.int("CMS_AUTOSAVE_IDLE_SECONDS", default=30)
+
+CMS_AUTOSAVE_MAX_AGE = env.int("CMS_AUTOSAVE_MAX_AGE", default=300)
+
+# Link checker: internal links are resolved offline, external ones probed
+
+CMS_LINK_CHECK_BASE_URL = env("CMS_LINK_CHECK_BASE_URL", default=CMS_SITEMAP_BASE_URL)
+
+CMS_LINK_CHECK_EXTERNAL = env.bool("CMS_LINK_CHECK_EXTERNAL", default=False)
+
+CMS_LINK_CHECK_CONCURRENCY = env.int("CMS_LINK_CHECK_CONCURRENCY", default=16)
+
+CMS_LINK_CHECK_PER_HOST = env.int("CMS_LINK_CHECK_PER_HOST", default=2)
+
+CMS_LINK_CHECK_HOST_INTERVAL = env.float("CMS_LINK_CHECK_HOST_INTERVAL", default=0.25)
+
+CMS_LINK_CHECK_CACHE_TTL = env.int(
+    "CMS_LINK_CHECK_CACHE_TTL", default=60 * 60 * 24 * 3
+)  # 3 days
+
+# Query instrumentation (recorded via execute_wrapper, independent of DEBUG)
+
+PERFORMANCE_N_PLUS_ONE_THRESHOLD = env.int(
+    "PERFORMANCE_N_PLUS_ONE_THRESHOLD", default=5
+)
+
+PERFORMANCE_SLOW_QUERY_THRESHOLD = env.float(
+    "PERFORMANCE_SLOW_QUERY_THRESHOLD", default=0.1
+)  # seconds
+
+# Request and cache statistics are counted in process and flushed to sharded
+# cache counters every PERFORMANCE_STATS_FLUSH_INTERVAL seconds
+
+PERFORMANCE_STATS_FLUSH_INTERVAL = env.float(
+    "PERFORMANCE_STATS_FLUSH_INTERVAL", default=10.0
+)
+
+PERFORMANCE_STATS_SHARDS = env.int("PERFORMANCE_STATS_SHARDS", default=16)
+
+# Prometheus metric snapshots; tables estimated above this many rows are
+# reported from planner statistics instead of COUNT(*)
+
+OPS_METRICS_CACHE = env("OPS_METRICS_CACHE", default="default")
+
+OPS_METRICS_EXACT_COUNT_LIMIT = env.int(
+    "OPS_METRICS_EXACT_COUNT_LIMIT", default=100_000
+)
+
+# Response compression (CompressionMiddleware); qualities by media type, then
+# "type/*", then "default". Compressed variants of cached bodies are kept for
+# COMPRESSION_CACHE_TIMEOUT seconds
+
+COMPRESSION_QUALITY = {
+    "default": {"br": 4, "gzip": 6},
+    "text/css": {"br": 6},
+    "application/javascript": {"br": 6},
+}
+
+COMPRESSION_CACHE_TIMEOUT = env.int("COMPRESSION_CACHE_TIMEOUT", default=60 * 60)
+
+# Site search backend (dotted path); empty picks PostgreSQL full-text search
+# on PostgreSQL and the built-in BM25 engine elsewhere
+
+SEARCH_BACKEND = env("SEARCH_BACKEND", default="")
+
+SEARCH_BM25_FIELD_BOOSTS = {"title": 3.0, "excerpt": 1.5, "content": 1.0}
+
 
 # HTML Sanitization settings
 
@@ -9,7 +9,7 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
-from apps.cms.views import default_sitemap_view, sitemap_view
+from apps.cms.views import sitemap_index_view, sitemap_shard_view, sitemap_view
 
 urlpatterns = [
     # Admin
@@ -36,7 +36,12 @@ urlpatterns = [
         name="redoc-legacy",
     ),
     # Sitemaps (at root level for SEO)
-    path("sitemap.xml", default_sitemap_view, name="default-sitemap"),
+    path("sitemap.xml", sitemap_index_view, name="default-sitemap"),
+    path(
+        "sitemap-<str:locale_code>-<int:shard>.xml",
+        sitemap_shard_view,
+        name="sitemap-shard",
+    ),
     path("sitemap-<str:locale_code>.xml", sitemap_view, name="sitemap"),
     # API endpoints
     path("api/v1/", include("apps.api.urls")),
@@ -1,6 +1,5 @@
 import logging
 
-from django.core.cache import cache
 from django.core.management.base import BaseCommand
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
@@ -8,6 +7,7 @@ from django.dispatch import receiver
 from apps.blog.models import BlogPost
 from apps.cms.models import Page
 from apps.core.cache import cache_manager
+from apps.core.request_stats import request_stats
 from apps.core.tasks import bulk_warm_cache, warm_cache_async
 from apps.i18n.models import Locale
 
@@ -185,28 +185,13 @@ class CacheWarmer:
 
     @staticmethod
     def warm_sitemaps():
-        """Warm sitemap caches."""
-        configs = []
-
-        for locale in Locale.objects.filter(is_active=True):
-
-            cache_key = cache_manager.key_builder.sitemap_key(locale.code)
-
-            configs.append(
-                {
-                    "key": cache_key,
-                    # Imports that were malformed - commented out
-                    #                     "callable": "apps.cms.utils.generate_sitemap",
-                    "args": [locale.code],
-                    "timeout": 21600,  # 6 hours
-                }
-            )
+        """Pre-render sitemap shards for all active locales in the background."""
 
-        if configs:
+        from apps.cms.tasks import refresh_sitemaps
 
-            bulk_warm_cache.delay(configs)
+        refresh_sitemaps.delay()
 
-            logger.info(f"Warming {len(configs)} sitemap caches")
+        logger.info("Queued sitemap pre-rendering for all active locales")
 
 
 # Signal handlers for cache invalidation
@@ -384,28 +369,24 @@ class Command(BaseCommand):
     def show_stats(self):
         """Show cache statistics."""
 
-        stats = cache.get("cache:stats:global", {})
+        stats = request_stats.cache_hit_stats()
 
         self.stdout.write("Cache Statistics:")
 
-        self.stdout.write(f"  Hits: {stats.get('hits', 0)}")
+        self.stdout.write(f"  Hits: {stats['hits']}")
 
-        self.stdout.write(f"  Misses: {stats.get('misses', 0)}")
+        self.stdout.write(f"  Misses: {stats['misses']}")
 
-        self.stdout.write(f"  Hit Rate: {stats.get('hit_rate', 0):.2%}")
+        self.stdout.write(f"  Hit Rate: {stats['hit_rate']:.2%}")
 
         # Show slow endpoints
 
         self.stdout.write("\nSlow Endpoints:")
 
-        # This is a simplified example - in production you'd query Redis directly
-
-        for key in ["perf:slow:/api/v1/cms/pages/", "perf:slow:/api/v1/blog/posts/"]:
+        slow = request_stats.slow_request_stats()
 
-            data = cache.get(key)
+        for path, data in sorted(
+            slow.items(), key=lambda item: item[1]["avg_time"], reverse=True
+        ):
 
-            if data:
-
-                self.stdout.write(
-                    f"  {key}: {data['avg_time']:.3f}s (n={data['count']})"
-                )
+            self.stdout.write(f"  {path}: {data['avg_time']:.3f}s (n={data['count']})")
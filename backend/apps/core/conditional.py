@@ -0,0 +1,154 @@
+import hashlib
+import json
+import time
+from typing import Any, Dict, Optional
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+"""Validators for conditional GET on public read endpoints.
+
+ETags are built from what a response depends on (row ``updated_at`` values,
+request host, content version counters) rather than from the serialized
+body, so a matching ``If-None-Match`` is answered with ``304 Not Modified``
+before any serializer runs.
+
+Content versions are counters in the cache, bumped by the cache
+invalidation signals whenever a block type changes. A counter starts
+from the current time in microseconds, so one that is evicted and recreated
+never repeats a value an old ETag was built from.
+
+Bodies rendered ahead of time (materialized menus, the block type
+registry) are served as they are by ``rendered_response``.
+"""
+
+
+VERSION_PREFIX = "content_version"
+
+
+def _version_key(scope: str) -> str:
+    return f"{VERSION_PREFIX}:{scope}"
+
+
+def _initial_version() -> int:
+    return time.time_ns() // 1000
+
+
+def get_content_versions(*scopes: str) -> Dict[str, int]:
+    """Current version of each scope, in one cache round trip."""
+
+    keys = {_version_key(scope): scope for scope in scopes}
+
+    found = cache.get_many(list(keys))
+
+    versions = {keys[key]: value for key, value in found.items()}
+
+    for scope in scopes:
+
+        if scope not in versions:
+
+            cache.add(_version_key(scope), _initial_version(), None)
+
+            versions[scope] = cache.get(_version_key(scope))
+
+    return versions
+
+
+def bump_content_version(*scopes: str) -> None:
+    """Invalidate the ETags built from ``scopes``."""
+
+    for scope in scopes:
+
+        try:
+            cache.incr(_version_key(scope))
+
+        except ValueError:
+            cache.add(_version_key(scope), _initial_version(), None)
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag of the values a response is built from."""
+
+    digest = hashlib.sha1(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+    return quote_etag(digest[:24])
+
+
+def not_modified(request, etag: str, headers: Optional[Dict[str, str]] = None):
+    """``304 Not Modified`` if the client's copy is current, else None."""
+
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    response = get_conditional_response(request, etag=etag)
+
+    if response is None:
+        return None
+
+    response["ETag"] = etag
+
+    for header, value in (headers or {}).items():
+        response[header] = value
+
+    return response
+
+
+class RenderedJSONResponse(Response):
+    """Response whose JSON body was rendered ahead of time.
+
+    ``data`` is only parsed from the body when read, e.g. by tests or a
+    renderer other than JSON.
+    """
+
+    _data: Any = None
+
+    def __init__(self, body: bytes, **kwargs):
+
+        self.body_json = body
+
+        super().__init__(**kwargs)
+
+    @property
+    def data(self):
+
+        if self._data is None:
+
+            self._data = json.loads(self.body_json)
+
+        return self._data
+
+    @data.setter
+    def data(self, value):
+
+        self._data = value
+
+    @property
+    def rendered_content(self):
+
+        if type(getattr(self, "accepted_renderer", None)) is not JSONRenderer:
+
+            return super().rendered_content
+
+        self["Content-Type"] = JSONRenderer.media_type
+
+        return self.body_json
+
+
+def rendered_response(request, etag: str, body: bytes):
+    """A JSON body rendered ahead of time, or 304 if the client's copy is current."""
+
+    response = not_modified(request, etag)
+
+    if response is not None:
+
+        return response
+
+    response = RenderedJSONResponse(body)
+
+    response["ETag"] = etag
+
+    return response
@@ -0,0 +1,120 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from apps.core.middleware_performance import (
+    HAS_BROTLI,
+    CompressionMiddleware,
+    compress_bytes,
+    get_compression_quality,
+)
+
+"""Throughput benchmark for CompressionMiddleware.
+
+Serves a synthetic HTML page compressed on every response, as before
+compressed variants were cached (and as GZipMiddleware still does for
+private responses), and as a response-cache hit through the middleware,
+which compresses it once per content hash and then reads the variant from
+the cache. Run against the production cache backend for realistic numbers.
+
+Usage:
+    python manage.py benchmark_compression
+    python manage.py benchmark_compression --size 200 --requests 2000
+"""
+
+
+WORDS = (
+    "page content block hero section article news launch product feature "
+    "customer story event team office guide update release support pricing"
+).split()
+
+
+class Command(BaseCommand):
+
+    help = "Benchmark response compression with and without cached variants"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=100,
+            help="Page size in KB (default: 100)",
+        )
+
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests per run (default: 500)",
+        )
+
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+
+        body = self.page(options["size"] * 1024, random.Random(options["seed"]))
+
+        encodings = ["gzip"] + (["br"] if HAS_BROTLI else [])
+
+        self.stdout.write(
+            f"{len(body) // 1024} KB page, {options['requests']} requests per run"
+        )
+
+        if not HAS_BROTLI:
+            self.stdout.write("brotli is not installed; benchmarking gzip only")
+
+        for encoding in encodings:
+
+            before = self.run(body, encoding, options["requests"], shared=False)
+
+            after = self.run(body, encoding, options["requests"], shared=True)
+
+            self.stdout.write(f"\n{encoding}:")
+
+            self.stdout.write(f"  per response   {before:10.0f} req/s")
+
+            self.stdout.write(
+                f"  cached variant {after:10.0f} req/s   ({after / before:.1f}x)"
+            )
+
+    def page(self, size, rng):
+
+        paragraphs = []
+
+        while sum(map(len, paragraphs)) < size:
+            paragraphs.append(
+                "<p>" + " ".join(rng.choice(WORDS) for _ in range(60)) + "</p>\n"
+            )
+
+        return "<html><body>\n" + "".join(paragraphs) + "</body></html>"
+
+    def run(self, body, encoding, requests, shared):
+
+        quality = get_compression_quality("text/html", encoding)
+
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=encoding)
+
+        middleware = CompressionMiddleware(lambda request: None)
+
+        start = time.perf_counter()
+
+        for _ in range(requests):
+
+            response = HttpResponse(body, content_type="text/html")
+
+            if shared:
+
+                # The first request compresses and stores the variant
+                response["X-Cache"] = "HIT"
+
+                middleware.process_response(request, response)
+
+            else:
+
+                compress_bytes(response.content, encoding, quality)
+
+        return requests / (time.perf_counter() - start)
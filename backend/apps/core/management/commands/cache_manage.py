@@ -7,6 +7,7 @@ from django.core.management.base import BaseCommand
 from apps.blog.models import BlogPost
 from apps.cms.models import Page
 from apps.core.cache import CACHE_PREFIXES, cache_manager
+from apps.core.request_stats import request_stats
 from apps.core.signals import invalidate_all_cache, invalidate_content_type_cache
 from apps.i18n.models import Locale
 
@@ -174,6 +175,34 @@ class Command(BaseCommand):
 
         self.stdout.write("")
 
+        hit_stats = request_stats.cache_hit_stats()
+
+        self.stdout.write("Response Cache:")
+
+        self.stdout.write(f"  Hits: {hit_stats['hits']}")
+
+        self.stdout.write(f"  Misses: {hit_stats['misses']}")
+
+        self.stdout.write(f"  Hit Rate: {hit_stats['hit_rate']:.2%}")
+
+        slow = request_stats.slow_request_stats()
+
+        if slow:
+
+            self.stdout.write("")
+
+            self.stdout.write("Slow Endpoints:")
+
+            for path, data in sorted(
+                slow.items(), key=lambda item: item[1]["avg_time"], reverse=True
+            ):
+
+                self.stdout.write(
+                    f"  {path}: {data['avg_time']:.3f}s (n={data['count']})"
+                )
+
+        self.stdout.write("")
+
         self.stdout.write("Cache Key Prefixes:")
 
         for cache_type, prefix in CACHE_PREFIXES.items():
@@ -1,13 +1,27 @@
+import gzip
+import hashlib
 import json
 import logging
+import math
+import re
 import time
+import zlib
 
 from django.conf import settings
 from django.core.cache import cache
 from django.db import connection
 from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
 
+from .query_instrumentation import (
+    QueryRecorder,
+    finish_request_recording,
+    start_request_recording,
+)
+from .rate_limiting import get_rate_limiter
+from .request_stats import REQUEST_DURATION_BUCKETS, record_slow_request, request_stats
+
 # Optional import for brotli compression
 try:
     import brotli
@@ -16,6 +30,73 @@ try:
 except ImportError:
     HAS_BROTLI = False
 
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript")
+
+ACCEPTS_BROTLI = re.compile(r"\bbr\b")
+
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+DEFAULT_COMPRESSION_QUALITY = {"br": 4, "gzip": 6}
+
+
+def get_compression_quality(content_type: str, encoding: str) -> int:
+    """Quality for ``encoding`` from COMPRESSION_QUALITY, by media type."""
+
+    media_type = content_type.split(";", 1)[0].strip().lower()
+
+    qualities = getattr(settings, "COMPRESSION_QUALITY", {})
+
+    for key in (media_type, media_type.split("/", 1)[0] + "/*", "default"):
+
+        if encoding in qualities.get(key, {}):
+
+            return qualities[key][encoding]
+
+    return DEFAULT_COMPRESSION_QUALITY[encoding]
+
+
+def is_shared_response(response) -> bool:
+    """Whether the body is served to more than one request."""
+
+    if response.has_header("X-Cache"):
+
+        return True
+
+    cache_control = response.get("Cache-Control", "")
+
+    return "public" in cache_control and not any(
+        directive in cache_control for directive in ("private", "no-store")
+    )
+
+
+def compress_bytes(content: bytes, encoding: str, quality: int) -> bytes:
+
+    if encoding == "br":
+
+        return brotli.compress(content, quality=quality)
+
+    return gzip.compress(content, compresslevel=quality, mtime=0)
+
+
+def stream_compressor(encoding: str, quality: int):
+    """``(compress, flush, finish)`` callables of an incremental compressor."""
+
+    if encoding == "br":
+
+        compressor = brotli.Compressor(quality=quality)
+
+        return compressor.process, compressor.flush, compressor.finish
+
+    # wbits 31: zlib stream with a gzip header
+    compressor = zlib.compressobj(quality, zlib.DEFLATED, 31)
+
+    return (
+        compressor.compress,
+        lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
 """Performance monitoring and optimization middleware."""
 
 
@@ -23,14 +104,19 @@ logger = logging.getLogger("performance")
 
 
 class PerformanceMonitoringMiddleware(MiddlewareMixin):
-    """Middleware to monitor and log performance metrics."""
+    """Middleware to monitor and log performance metrics.
+
+    Queries are counted by an ``execute_wrapper`` recorder, so the
+    ``X-Database-Queries`` header and per-view histograms are accurate
+    without ``DEBUG``.
+    """
 
     def process_request(self, request):
         """Start timing the request."""
 
         request._start_time = time.time()
 
-        request._start_queries = len(connection.queries)
+        start_request_recording(request)
 
         return None
 
@@ -46,7 +132,22 @@ class PerformanceMonitoringMiddleware(MiddlewareMixin):
 
             duration = time.time() - request._start_time
 
-            num_queries = len(connection.queries) - request._start_queries
+            recorder = finish_request_recording(request)
+
+            if recorder is None:
+
+                # Recording never started for this request; fall back to the
+                # debug-only query log
+
+                recorder = QueryRecorder()
+
+                recorder.count = len(connection.queries) - getattr(
+                    request, "_start_queries", 0
+                )
+
+            num_queries = recorder.count
+
+            db_time = recorder.duration
         except Exception:
             # If there's an error calculating metrics, just return response
             return response
@@ -57,8 +158,23 @@ class PerformanceMonitoringMiddleware(MiddlewareMixin):
 
         response["X-Database-Queries"] = str(num_queries)
 
+        response["X-Database-Time"] = f"{db_time:.3f}"
+
         response["X-Cache-Status"] = getattr(response, "_cache_status", "MISS")
 
+        # Log repeated statements (likely N+1 query patterns)
+
+        duplicates = recorder.duplicates()
+
+        if duplicates:
+
+            sql, count = duplicates[0]
+
+            logger.warning(
+                f"Possible N+1 queries: {request.method} {request.path} "
+                f"repeated {count}x: {sql[:200]}"
+            )
+
         # Log slow requests
 
         if duration > 1.0:
@@ -68,37 +184,21 @@ class PerformanceMonitoringMiddleware(MiddlewareMixin):
                 f"took {duration:.2f}s with {num_queries} queries"
             )
 
-            # Log slow queries if in debug mode
+            # Log slow queries
 
-            if settings.DEBUG and num_queries > 0:
+            if recorder.slow:
 
-                slow_queries = [
-                    q
-                    for q in connection.queries[request._start_queries :]
-                    if float(q.get("time", 0)) > 0.1
-                ]
+                logger.warning(f"Slow queries: {json.dumps(recorder.slow, indent=2)}")
 
-                if slow_queries:
+        # Track metrics for monitoring (in process memory, flushed periodically)
 
-                    logger.warning(
-                        f"Slow queries: {json.dumps(slow_queries, indent=2)}"
-                    )
-
-        # Track metrics in cache for monitoring
+        request_stats.observe("request_duration", duration, REQUEST_DURATION_BUCKETS)
 
         if duration > 0.5:  # Track requests over 500ms
 
-            cache_key = f"perf:slow:{request.path}"
-
-            current = cache.get(cache_key, {"count": 0, "total_time": 0})
+            record_slow_request(request.path, duration)
 
-            current["count"] += 1
-
-            current["total_time"] += duration
-
-            current["avg_time"] = current["total_time"] / current["count"]
-
-            cache.set(cache_key, current, timeout=3600)
+        request_stats.maybe_flush()
 
         return response
 
@@ -111,10 +211,27 @@ class QueryCountLimitMiddleware(MiddlewareMixin):
     def process_request(self, request):
         """Reset query count."""
 
-        request._query_count_start = len(connection.queries)
+        recorder = start_request_recording(request)
+
+        request._query_count_start = recorder.count
 
         return None
 
+    def _count_queries(self, request):
+
+        recorder = getattr(request, "_query_recorder", None)
+
+        if recorder is None:
+
+            # Recording never started for this request; fall back to the
+            # debug-only query log
+
+            return len(connection.queries) - request._query_count_start, []
+
+        finish_request_recording(request)
+
+        return recorder.count - request._query_count_start, recorder.duplicates()
+
     def process_response(self, request, response):
         """Check query count."""
 
@@ -122,7 +239,7 @@ class QueryCountLimitMiddleware(MiddlewareMixin):
 
             return response
 
-        query_count = len(connection.queries) - request._query_count_start
+        query_count, duplicates = self._count_queries(request)
 
         # Log excessive queries
 
@@ -143,6 +260,9 @@ class QueryCountLimitMiddleware(MiddlewareMixin):
                         "query_count": query_count,
                         "limit": self.MAX_QUERIES,
                         "path": request.path,
+                        "duplicates": [
+                            {"sql": sql, "count": count} for sql, count in duplicates
+                        ],
                     },
                     status=500,
                 )
@@ -167,31 +287,23 @@ class CacheHitRateMiddleware(MiddlewareMixin):
 
             # Update hit rate statistics
 
-            stats_key = "cache:stats:global"
-
-            stats = cache.get(stats_key, {"hits": 0, "misses": 0})
-
             if cache_status == "HIT":
 
-                stats["hits"] += 1
+                request_stats.incr("cache:hits")
 
             else:
 
-                stats["misses"] += 1
-
-            stats["hit_rate"] = (
-                stats["hits"] / (stats["hits"] + stats["misses"])
-                if (stats["hits"] + stats["misses"]) > 0
-                else 0
-            )
-
-            cache.set(stats_key, stats, timeout=86400)  # 24 hours
+                request_stats.incr("cache:misses")
 
             # Add hit rate to response headers in debug mode
 
             if settings.DEBUG:
 
+                stats = request_stats.cache_hit_stats()
+
                 response["X-Cache-Hit-Rate"] = f"{stats['hit_rate']:.2%}"
+
+            request_stats.maybe_flush()
         except Exception:
             # If cache operations fail, just continue without tracking
             pass
@@ -274,12 +386,6 @@ class RequestThrottlingMiddleware(MiddlewareMixin):
 
         ip = self.get_client_ip(request)
 
-        cache_key = f"throttle:{ip}"
-
-        # Get current request count
-
-        request_count = cache.get(cache_key, 0)
-
         # Check limits based on path
 
         if request.path.startswith("/api/"):
@@ -290,26 +396,38 @@ class RequestThrottlingMiddleware(MiddlewareMixin):
 
             limit = 200  # 200 requests per minute for regular pages
 
-        if request_count >= limit:
+        limiter = get_rate_limiter(limit, 60, prefix="throttle")
 
-            logger.warning(f"Rate limit exceeded for IP {ip}: {request_count} requests")
+        result = limiter.hit(ip)
 
-            return JsonResponse(
-                {"error": "Rate limit exceeded", "retry_after": 60}, status=429
-            )
+        if not result.allowed:
 
-        # Increment counter
+            logger.warning(
+                f"Rate limit exceeded for IP {ip}: {result.count:.0f} requests"
+            )
 
-        cache.set(cache_key, request_count + 1, timeout=60)
+            return JsonResponse(
+                {"error": "Rate limit exceeded", "retry_after": limiter.duration},
+                status=429,
+                headers={"Retry-After": str(math.ceil(result.retry_after))},
+            )
 
         return None
 
 
 class CompressionMiddleware(MiddlewareMixin):
-    """Enhanced compression middleware with Brotli support."""
+    """Enhanced compression middleware with Brotli support.
+
+    Bodies that are shared between requests (served from or stored in the
+    response cache, or publicly cacheable) are compressed once per content
+    hash: their br and gzip variants are kept in the cache. Streaming
+    responses are compressed chunk by chunk.
+    """
 
     MIN_SIZE = 1024  # Minimum size to compress (1KB)
 
+    CACHE_PREFIX = "compressed"
+
     def process_response(self, request, response):
         """Compress response if beneficial."""
 
@@ -323,44 +441,146 @@ class CompressionMiddleware(MiddlewareMixin):
 
         content_type = response.get("Content-Type", "")
 
-        if not any(
-            ct in content_type
-            for ct in ["text/", "application/json", "application/javascript"]
-        ):
+        if not any(ct in content_type for ct in COMPRESSIBLE_TYPES):
+
+            return response
+
+        # Check accepted encodings
+
+        shared = is_shared_response(response)
+
+        encoding = self._choose_encoding(request, shared)
+
+        if encoding is None:
+
+            return response
+
+        quality = get_compression_quality(content_type, encoding)
+
+        if response.streaming:
+
+            response.streaming_content = self._compress_stream(
+                response, encoding, quality
+            )
+
+            self._set_encoding_headers(response, encoding)
 
             return response
 
         # Check size
 
-        if len(response.content) < self.MIN_SIZE:
+        content = response.content
+
+        if len(content) < self.MIN_SIZE:
 
             return response
 
-        # Check accepted encodings
+        try:
+
+            compressed = self._compressed_body(content, encoding, quality, shared)
+
+        except Exception:
+
+            return response
+
+        if len(compressed) < len(content):
+
+            response.content = compressed
+
+            self._set_encoding_headers(response, encoding)
+
+        return response
+
+    def _choose_encoding(self, request, shared):
 
         accepted = request.META.get("HTTP_ACCEPT_ENCODING", "")
 
         # Try Brotli first (better compression)
 
-        if "br" in accepted and HAS_BROTLI:
+        if HAS_BROTLI and ACCEPTS_BROTLI.search(accepted):
 
-            try:
+            return "br"
 
-                compressed = brotli.compress(response.content, quality=4)
+        # Other bodies fall back to gzip (handled by GZipMiddleware, which pads
+        # each response against BREACH)
 
-                if len(compressed) < len(response.content):
+        if shared and ACCEPTS_GZIP.search(accepted):
 
-                    response.content = compressed
+            return "gzip"
 
-                    response["Content-Encoding"] = "br"
+        return None
 
-                    response["Vary"] = "Accept-Encoding"
+    def _compressed_body(self, content, encoding, quality, shared):
+        """Compressed ``content``, from the variant cache for shared bodies."""
 
-                    del response["Content-Length"]
+        if not shared:
 
-            except Exception:
-                pass
+            return compress_bytes(content, encoding, quality)
 
-        # Fall back to gzip (handled by GZipMiddleware)
+        digest = hashlib.sha256(content).hexdigest()
 
-        return response
+        cache_key = f"{self.CACHE_PREFIX}:{encoding}:{quality}:{digest}"
+
+        compressed = cache.get(cache_key)
+
+        if compressed is None:
+
+            compressed = compress_bytes(content, encoding, quality)
+
+            # Kept even when no smaller, so the attempt is not repeated
+            cache.set(
+                cache_key,
+                compressed,
+                getattr(settings, "COMPRESSION_CACHE_TIMEOUT", 3600),
+            )
+
+        return compressed
+
+    def _compress_stream(self, response, encoding, quality):
+
+        chunks = response.streaming_content
+
+        if response.is_async:
+
+            async def compress_async():
+
+                compress, flush, finish = stream_compressor(encoding, quality)
+
+                async for chunk in chunks:
+
+                    yield compress(chunk) + flush()
+
+                yield finish()
+
+            return compress_async()
+
+        def compress_sync():
+
+            compress, flush, finish = stream_compressor(encoding, quality)
+
+            for chunk in chunks:
+
+                # Flushed so each chunk reaches the client without delay
+                yield compress(chunk) + flush()
+
+            yield finish()
+
+        return compress_sync()
+
+    def _set_encoding_headers(self, response, encoding):
+
+        response["Content-Encoding"] = encoding
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if response.has_header("Content-Length"):
+
+            del response["Content-Length"]
+
+        # The compressed body is no longer byte-for-byte the tagged one
+
+        etag = response.get("ETag")
+
+        if etag and etag.startswith('"'):
+
+            response["ETag"] = "W/" + etag
@@ -0,0 +1,328 @@
+import re
+import threading
+from collections import Counter
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+"""Production-safe query instrumentation.
+
+``connection.queries`` is only populated when ``DEBUG`` is on, so request
+query counts built on it read 0 in production. ``QueryRecorder`` is installed
+as a ``connection.execute_wrapper`` for the duration of a request instead and
+records the query count, total database time, slow queries and repeated SQL
+fingerprints (N+1 candidates) whatever the ``DEBUG`` setting.
+
+Per-view histograms are aggregated in process memory by ``query_metrics``
+and exported through the ops Prometheus endpoint.
+"""
+
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+DB_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Bound label cardinality; further views are folded into one series
+
+MAX_TRACKED_VIEWS = 500
+
+OTHER_VIEW = "other"
+
+UNRESOLVED_VIEW = "unresolved"
+
+_PLACEHOLDER_LIST = re.compile(r"\bIN\s*\((?:\s*%s\s*,)*\s*%s\s*\)", re.IGNORECASE)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize SQL so repetitions of one statement share a fingerprint.
+
+    Parameters are already separate from the SQL, so only variable-length
+    ``IN (%s, %s, ...)`` lists and whitespace need folding.
+    """
+
+    return _WHITESPACE.sub(" ", _PLACEHOLDER_LIST.sub("IN (...)", sql)).strip()
+
+
+def get_n_plus_one_threshold() -> int:
+    return getattr(settings, "PERFORMANCE_N_PLUS_ONE_THRESHOLD", 5)
+
+
+def get_slow_query_threshold() -> float:
+    return getattr(settings, "PERFORMANCE_SLOW_QUERY_THRESHOLD", 0.1)
+
+
+class QueryRecorder:
+    """``execute_wrapper`` callable recording the queries of one request.
+
+    The hot path only increments counters; fingerprints are normalized
+    once, when duplicates are requested.
+    """
+
+    __slots__ = ("count", "duration", "statements", "slow", "slow_threshold")
+
+    def __init__(self, slow_threshold: Optional[float] = None):
+
+        self.count = 0
+
+        self.duration = 0.0
+
+        self.statements: Counter = Counter()
+
+        self.slow: List[Dict[str, str]] = []
+
+        self.slow_threshold = (
+            get_slow_query_threshold() if slow_threshold is None else slow_threshold
+        )
+
+    def __call__(self, execute, sql, params, many, context):
+
+        start = perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - start
+
+            self.count += 1
+
+            self.duration += elapsed
+
+            self.statements[sql] += 1
+
+            if elapsed > self.slow_threshold:
+                self.slow.append({"sql": sql, "time": f"{elapsed:.3f}"})
+
+    def install(self) -> None:
+        for conn in connections.all():
+            conn.execute_wrappers.append(self)
+
+    def uninstall(self) -> None:
+        for conn in connections.all():
+            if self in conn.execute_wrappers:
+                conn.execute_wrappers.remove(self)
+
+    def duplicates(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Fingerprints executed at least ``threshold`` times, most frequent first."""
+
+        threshold = get_n_plus_one_threshold() if threshold is None else threshold
+
+        merged: Counter = Counter()
+
+        for sql, count in self.statements.items():
+            merged[fingerprint(sql)] += count
+
+        return [
+            (sql, count) for sql, count in merged.most_common() if count >= threshold
+        ]
+
+
+def start_request_recording(request) -> QueryRecorder:
+    """Attach a recorder to ``request``, reusing one installed by an outer middleware."""
+
+    recorder = getattr(request, "_query_recorder", None)
+
+    if recorder is None:
+
+        recorder = QueryRecorder()
+
+        recorder.install()
+
+        request._query_recorder = recorder
+
+        request._query_recorder_installed = True
+
+    return recorder
+
+
+def finish_request_recording(request) -> Optional[QueryRecorder]:
+    """Uninstall the request's recorder and record it in ``query_metrics``.
+
+    Safe to call from several middlewares; only the first call acts.
+    """
+
+    recorder = getattr(request, "_query_recorder", None)
+
+    if recorder is None or not getattr(request, "_query_recorder_installed", False):
+        return recorder
+
+    recorder.uninstall()
+
+    request._query_recorder_installed = False
+
+    query_metrics.observe(view_label(request), recorder)
+
+    return recorder
+
+
+def view_label(request) -> str:
+    match = getattr(request, "resolver_match", None)
+
+    if match is None:
+        return UNRESOLVED_VIEW
+
+    return match.view_name or match._func_path
+
+
+def _observe_bucket(buckets, counts, value) -> None:
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            counts[index] += 1
+            return
+
+    counts[-1] += 1
+
+
+class QueryMetrics:
+    """Thread-safe per-view query histograms held in process memory."""
+
+    def __init__(self):
+
+        self._lock = threading.Lock()
+
+        self._views: Dict[str, Dict] = {}
+
+    def _new_series(self) -> Dict:
+        return {
+            "requests": 0,
+            "queries": [0] * (len(QUERY_COUNT_BUCKETS) + 1),
+            "queries_sum": 0,
+            "db_time": [0] * (len(DB_TIME_BUCKETS) + 1),
+            "db_time_sum": 0.0,
+            "n_plus_one": 0,
+        }
+
+    def observe(self, view: str, recorder: QueryRecorder) -> None:
+
+        has_n_plus_one = bool(recorder.duplicates())
+
+        with self._lock:
+
+            if view not in self._views and len(self._views) >= MAX_TRACKED_VIEWS:
+                view = OTHER_VIEW
+
+            series = self._views.get(view)
+
+            if series is None:
+                series = self._views[view] = self._new_series()
+
+            series["requests"] += 1
+
+            series["queries_sum"] += recorder.count
+
+            series["db_time_sum"] += recorder.duration
+
+            _observe_bucket(QUERY_COUNT_BUCKETS, series["queries"], recorder.count)
+
+            _observe_bucket(DB_TIME_BUCKETS, series["db_time"], recorder.duration)
+
+            if has_n_plus_one:
+                series["n_plus_one"] += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                view: {
+                    **series,
+                    "queries": list(series["queries"]),
+                    "db_time": list(series["db_time"]),
+                }
+                for view, series in self._views.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+    def render_prometheus(self) -> List[str]:
+        """Render the histograms in the Prometheus text exposition format."""
+
+        views = self.snapshot()
+
+        lines = [
+            "# HELP django_view_db_queries Database queries per request",
+            "# TYPE django_view_db_queries histogram",
+        ]
+
+        for view, series in sorted(views.items()):
+            lines.extend(
+                _histogram_lines(
+                    "django_view_db_queries",
+                    view,
+                    QUERY_COUNT_BUCKETS,
+                    series["queries"],
+                    series["queries_sum"],
+                    series["requests"],
+                )
+            )
+
+        lines.extend(
+            [
+                "",
+                "# HELP django_view_db_time_seconds Database time per request",
+                "# TYPE django_view_db_time_seconds histogram",
+            ]
+        )
+
+        for view, series in sorted(views.items()):
+            lines.extend(
+                _histogram_lines(
+                    "django_view_db_time_seconds",
+                    view,
+                    DB_TIME_BUCKETS,
+                    series["db_time"],
+                    series["db_time_sum"],
+                    series["requests"],
+                )
+            )
+
+        lines.extend(
+            [
+                "",
+                "# HELP django_view_n_plus_one_total Requests with repeated SQL (N+1)",
+                "# TYPE django_view_n_plus_one_total counter",
+            ]
+        )
+
+        for view, series in sorted(views.items()):
+            lines.append(
+                f'django_view_n_plus_one_total{{view="{_escape(view)}"}} '
+                f'{series["n_plus_one"]}'
+            )
+
+        lines.append("")
+
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name, view, buckets, counts, total, requests) -> List[str]:
+
+    label = _escape(view)
+
+    lines = []
+
+    cumulative = 0
+
+    for bound, count in zip(buckets, counts):
+
+        cumulative += count
+
+        lines.append(f'{name}_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+
+    lines.append(f'{name}_bucket{{view="{label}",le="+Inf"}} {requests}')
+
+    lines.append(f'{name}_sum{{view="{label}"}} {total:.6g}')
+
+    lines.append(f'{name}_count{{view="{label}"}} {requests}')
+
+    return lines
+
+
+query_metrics = QueryMetrics()
@@ -0,0 +1,266 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from django.core.cache import cache
+
+"""Shared sliding-window rate limiting.
+
+Each client has one counter per fixed window of ``duration`` seconds,
+incremented atomically with ``cache.incr``. The rate over the last
+``duration`` seconds is estimated as the current window's count plus the
+previous window's count weighted by the share of that window still inside
+the sliding window. A check costs one counter per client and window and,
+usually, a single cache round trip.
+
+Clients far below their limit take a fast path: hits are counted in the
+process and added to the shared counter in small batches, so they cost no
+round trip at all. Each process can hold back at most a batch per client,
+and only while the client is under half its limit.
+"""
+
+
+# Clients counted locally by each limiter (least recently seen are dropped)
+
+MAX_LOCAL_CLIENTS = 10_000
+
+# Share of the limit below which hits are counted locally first
+
+FAST_PATH_RATIO = 0.5
+
+# Share of the limit held back locally before adding it to the shared counter
+
+LOCAL_BATCH_RATIO = 0.05
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+
+    count: float
+
+    limit: int
+
+    retry_after: float
+
+    @property
+    def remaining(self) -> int:
+        return max(0, int(self.limit - self.count))
+
+
+class SlidingWindowRateLimiter:
+    """Limits clients to ``limit`` hits per ``duration`` seconds."""
+
+    def __init__(self, limit: int, duration: int, prefix: str = "ratelimit"):
+
+        self.limit = limit
+
+        self.duration = duration
+
+        self.prefix = prefix
+
+        self.local_batch = max(1, int(limit * LOCAL_BATCH_RATIO))
+
+        self._lock = threading.Lock()
+
+        # Bucket key -> [shared count last seen or None, hits not yet shared]
+        self._local: "OrderedDict[str, list]" = OrderedDict()
+
+        # Closed windows' counts, which no longer change
+        self._previous: "OrderedDict[str, int]" = OrderedDict()
+
+    def bucket_key(self, ident: str, window: int) -> str:
+        return f"{self.prefix}:{ident}:{window}"
+
+    def hit(self, ident: str, now: Optional[float] = None) -> RateLimitResult:
+        """Count a hit by ``ident`` unless it is over the limit."""
+
+        key, previous, weight = self._window(ident, now)
+
+        with self._lock:
+
+            state = self._local_state(key)
+
+            # A client's first hit in a window reads the shared counter
+            if state[0] is not None:
+
+                count = previous * weight + state[0] + state[1] + 1
+
+                if (
+                    count < self.limit * FAST_PATH_RATIO
+                    and state[1] + 1 < self.local_batch
+                ):
+
+                    state[1] += 1
+
+                    return RateLimitResult(True, count, self.limit, 0.0)
+
+            delta = state[1] + 1
+
+            state[1] = 0
+
+        shared = self._incr(key, delta)
+
+        count = previous * weight + shared
+
+        if count > self.limit:
+
+            # Rejected hits are not counted
+            shared = cache.decr(key)
+
+            count = previous * weight + shared
+
+            result = RateLimitResult(
+                False, count, self.limit, self._retry_after(previous, weight, shared)
+            )
+
+        else:
+
+            result = RateLimitResult(True, count, self.limit, 0.0)
+
+        with self._lock:
+            self._local_state(key)[0] = shared
+
+        return result
+
+    def status(self, ident: str, now: Optional[float] = None) -> RateLimitResult:
+        """Current usage of ``ident`` without counting a hit."""
+
+        key, previous, weight = self._window(ident, now)
+
+        with self._lock:
+            pending = self._local[key][1] if key in self._local else 0
+
+        shared = cache.get(key, 0) + pending
+
+        count = previous * weight + shared
+
+        return RateLimitResult(
+            count + 1 <= self.limit,
+            count,
+            self.limit,
+            self._retry_after(previous, weight, shared),
+        )
+
+    def reset(self) -> None:
+        """Forget hits counted in this process (not the shared counters)."""
+
+        with self._lock:
+
+            self._local.clear()
+
+            self._previous.clear()
+
+    def _window(self, ident: str, now: Optional[float]) -> Tuple[str, int, float]:
+        """Current bucket key, previous window's count and its weight."""
+
+        window, elapsed = divmod(time.time() if now is None else now, self.duration)
+
+        window = int(window)
+
+        previous_key = self.bucket_key(ident, window - 1)
+
+        with self._lock:
+            previous = self._previous.get(previous_key)
+
+        if previous is None:
+
+            previous = cache.get(previous_key, 0)
+
+            with self._lock:
+
+                self._previous[previous_key] = previous
+
+                if len(self._previous) > MAX_LOCAL_CLIENTS:
+                    self._previous.popitem(last=False)
+
+        return self.bucket_key(ident, window), previous, 1 - elapsed / self.duration
+
+    def _local_state(self, key: str) -> list:
+
+        state = self._local.get(key)
+
+        if state is None:
+
+            state = self._local[key] = [None, 0]
+
+            if len(self._local) > MAX_LOCAL_CLIENTS:
+                self._local.popitem(last=False)
+
+        else:
+
+            self._local.move_to_end(key)
+
+        return state
+
+    def _incr(self, key: str, delta: int) -> int:
+        """Atomically add ``delta`` to a bucket, creating it if needed."""
+
+        try:
+            return cache.incr(key, delta)
+
+        except ValueError:
+
+            # Buckets outlive their window to serve as the previous window
+            if cache.add(key, delta, timeout=self.duration * 2):
+                return delta
+
+            return cache.incr(key, delta)
+
+    def _retry_after(self, previous: int, weight: float, current: int) -> float:
+        """Seconds until one more hit fits under the limit."""
+
+        elapsed = (1 - weight) * self.duration
+
+        if self.limit <= 0:
+            return float(self.duration)
+
+        if current + 1 > self.limit:
+
+            # Wait for the next window, then for the weighted count to drop
+            return self.duration - elapsed + self._retry_after(current, 1.0, 0)
+
+        if previous * weight + current + 1 <= self.limit:
+            return 0.0
+
+        # The previous window's weight falls linearly to zero over the window
+        target_weight = (self.limit - current - 1) / previous
+
+        return max(0.0, math.ceil((weight - target_weight) * self.duration * 10) / 10)
+
+
+_limiters: Dict[Tuple[int, int, str], SlidingWindowRateLimiter] = {}
+
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    limit: int, duration: int, prefix: str = "ratelimit"
+) -> SlidingWindowRateLimiter:
+    """Limiter shared by all callers with the same limit, duration and prefix."""
+
+    key = (limit, duration, prefix)
+
+    with _limiters_lock:
+
+        limiter = _limiters.get(key)
+
+        if limiter is None:
+            limiter = _limiters[key] = SlidingWindowRateLimiter(*key)
+
+    return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Forget all locally counted hits, e.g. after clearing the cache."""
+
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+
+    for limiter in limiters:
+        limiter.reset()
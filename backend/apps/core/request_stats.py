@@ -0,0 +1,330 @@
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .query_instrumentation import _escape
+
+"""Request and cache statistics without a shared hot key.
+
+Middlewares count into process memory (``request_stats``); nothing is
+written to the cache on the request path except a periodic flush, which
+adds the accumulated deltas with atomic ``cache.incr`` calls to counters
+sharded by process. Readers merge all shards, plus the counts of their own
+process not flushed yet.
+
+Counters are integers: durations are kept in milliseconds. Histograms are
+one counter per bucket.
+"""
+
+
+STATS_PREFIX = "stats"
+
+# Counters expire a day after they are created
+
+STATS_TIMEOUT = 60 * 60 * 24
+
+REQUEST_DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Bound the number of per-path series; further paths share one series
+
+MAX_TRACKED_PATHS = 500
+
+OTHER_PATH = "other"
+
+
+def get_flush_interval() -> float:
+    return getattr(settings, "PERFORMANCE_STATS_FLUSH_INTERVAL", 10.0)
+
+
+def get_shard_count() -> int:
+    return getattr(settings, "PERFORMANCE_STATS_SHARDS", 16)
+
+
+class StatsCollector:
+    """Thread-safe counters held in process memory and flushed in batches."""
+
+    def __init__(self, prefix: str = STATS_PREFIX):
+
+        self.prefix = prefix
+
+        self._lock = threading.Lock()
+
+        self._pending: Counter = Counter()
+
+        # Names this process has written, to keep its shard's index complete
+        self._names: set = set()
+
+        self._last_flush = time.monotonic()
+
+    # Writers
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._pending[name] += value
+
+    def observe(self, name: str, value: float, buckets: Iterable[float]) -> None:
+        """Count ``value`` in the histogram ``name`` with upper ``buckets``."""
+
+        for bound in buckets:
+            if value <= bound:
+                break
+        else:
+            bound = "inf"
+
+        with self._lock:
+
+            self._pending[f"{name}:count"] += 1
+
+            self._pending[f"{name}:sum_ms"] += round(value * 1000)
+
+            self._pending[f"{name}:le:{bound}"] += 1
+
+    def maybe_flush(self) -> None:
+        """Flush when the flush interval has passed."""
+
+        if time.monotonic() - self._last_flush >= get_flush_interval():
+            self.flush()
+
+    def flush(self) -> None:
+        """Add the pending counts to this process's shard."""
+
+        with self._lock:
+
+            pending, self._pending = self._pending, Counter()
+
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return
+
+        shard = self.shard()
+
+        for name, delta in pending.items():
+
+            if delta:
+                self._incr(self._key(shard, name), delta)
+
+        new_names = set(pending) - self._names
+
+        if new_names:
+            self._names |= new_names
+
+        # Another process on the same shard may have rewritten the index
+        index_key = self._index_key(shard)
+
+        index = cache.get(index_key, set())
+
+        if not self._names <= index:
+            cache.set(index_key, index | self._names, STATS_TIMEOUT)
+
+    def reset(self) -> None:
+        """Drop the counts not flushed yet and restart the flush interval."""
+
+        with self._lock:
+
+            self._pending.clear()
+
+            self._last_flush = time.monotonic()
+
+    # Readers
+
+    def read(self, prefix: str = "") -> Dict[str, int]:
+        """Totals of all counters starting with ``prefix`` across shards."""
+
+        indexes = cache.get_many(
+            [self._index_key(shard) for shard in range(get_shard_count())]
+        )
+
+        keys: Dict[str, str] = {}
+
+        for index_key, names in indexes.items():
+
+            shard = int(index_key.rsplit(":", 1)[1])
+
+            for name in names:
+                if name.startswith(prefix):
+                    keys[self._key(shard, name)] = name
+
+        totals: Counter = Counter()
+
+        for key, value in cache.get_many(list(keys)).items():
+            totals[keys[key]] += value
+
+        with self._lock:
+            for name, value in self._pending.items():
+                if name.startswith(prefix):
+                    totals[name] += value
+
+        return dict(totals)
+
+    def cache_hit_stats(self) -> Dict[str, float]:
+        """Response cache hits, misses and hit rate."""
+
+        totals = self.read("cache:")
+
+        hits = totals.get("cache:hits", 0)
+
+        misses = totals.get("cache:misses", 0)
+
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0,
+        }
+
+    def slow_request_stats(self) -> Dict[str, Dict[str, float]]:
+        """Count, total and average time of slow requests per path."""
+
+        slow: Dict[str, Dict[str, float]] = {}
+
+        for name, value in self.read("perf:slow:").items():
+
+            path, _, field = name[len("perf:slow:") :].rpartition(":")
+
+            entry = slow.setdefault(path, {"count": 0, "total_time": 0.0})
+
+            if field == "count":
+                entry["count"] = value
+
+            elif field == "total_ms":
+                entry["total_time"] = value / 1000
+
+        for entry in slow.values():
+            entry["avg_time"] = (
+                entry["total_time"] / entry["count"] if entry["count"] else 0.0
+            )
+
+        return slow
+
+    def histogram(self, name: str) -> Optional[Dict]:
+        """Cumulative buckets, count and sum (seconds) of a histogram."""
+
+        totals = self.read(f"{name}:")
+
+        if not totals:
+            return None
+
+        buckets: List = []
+
+        cumulative = 0
+
+        for bound in REQUEST_DURATION_BUCKETS + ("inf",):
+
+            cumulative += totals.get(f"{name}:le:{bound}", 0)
+
+            buckets.append((bound, cumulative))
+
+        return {
+            "buckets": buckets,
+            "count": totals.get(f"{name}:count", 0),
+            "sum": totals.get(f"{name}:sum_ms", 0) / 1000,
+        }
+
+    def render_prometheus(self) -> List[str]:
+        """Render the counters in the Prometheus text exposition format."""
+
+        hits = self.cache_hit_stats()
+
+        lines = [
+            "# HELP django_response_cache_requests_total Responses by cache status",
+            "# TYPE django_response_cache_requests_total counter",
+            f'django_response_cache_requests_total{{status="hit"}} {hits["hits"]}',
+            f'django_response_cache_requests_total{{status="miss"}} {hits["misses"]}',
+            "",
+        ]
+
+        histogram = self.histogram("request_duration")
+
+        if histogram:
+
+            lines.extend(
+                [
+                    "# HELP django_request_duration_seconds Request duration",
+                    "# TYPE django_request_duration_seconds histogram",
+                ]
+            )
+
+            for bound, count in histogram["buckets"]:
+
+                le = "+Inf" if bound == "inf" else bound
+
+                lines.append(
+                    f'django_request_duration_seconds_bucket{{le="{le}"}} {count}'
+                )
+
+            lines.extend(
+                [
+                    f"django_request_duration_seconds_sum {histogram['sum']:.3f}",
+                    f"django_request_duration_seconds_count {histogram['count']}",
+                    "",
+                ]
+            )
+
+        slow = self.slow_request_stats()
+
+        if slow:
+
+            lines.extend(
+                [
+                    "# HELP django_slow_requests_total Requests slower than 500ms",
+                    "# TYPE django_slow_requests_total counter",
+                ]
+            )
+
+            for path, entry in sorted(slow.items()):
+                lines.append(
+                    f'django_slow_requests_total{{path="{_escape(path)}"}} '
+                    f'{entry["count"]}'
+                )
+
+            lines.append("")
+
+        return lines
+
+    # Keys
+
+    def shard(self) -> int:
+        # Resolved per flush: worker processes fork after import
+        return os.getpid() % get_shard_count()
+
+    def _key(self, shard: int, name: str) -> str:
+        return f"{self.prefix}:{shard}:{name}"
+
+    def _index_key(self, shard: int) -> str:
+        return f"{self.prefix}:index:{shard}"
+
+    def _incr(self, key: str, delta: int) -> None:
+
+        try:
+            cache.incr(key, delta)
+
+        except ValueError:
+
+            if not cache.add(key, delta, STATS_TIMEOUT):
+                cache.incr(key, delta)
+
+
+request_stats = StatsCollector()
+
+_slow_paths: set = set()
+
+
+def record_slow_request(path: str, duration: float) -> None:
+    """Count a slow request under its path."""
+
+    if path not in _slow_paths:
+
+        if len(_slow_paths) >= MAX_TRACKED_PATHS:
+            path = OTHER_PATH
+
+        else:
+            _slow_paths.add(path)
+
+    request_stats.incr(f"perf:slow:{path}:count")
+
+    request_stats.incr(f"perf:slow:{path}:total_ms", round(duration * 1000))
@@ -18,9 +18,16 @@ from apps.blog.models import BlogPost
 from apps.registry.registry import content_registry
 
 from .cache import cache_manager
+from .conditional import bump_content_version
 
 logger = logging.getLogger(__name__)
 
+# Content versions (ETags of public endpoints) that depend on each model
+
+CONTENT_VERSION_SCOPES = {
+    "cms.blocktype": ("block_types",),
+}
+
 
 @receiver(post_save)
 def invalidate_cache_on_save(sender, instance, created, **kwargs):
@@ -58,6 +65,8 @@ def invalidate_cache_on_save(sender, instance, created, **kwargs):
 
             invalidate_content_cache(instance, model_label)
 
+        bump_content_version(*CONTENT_VERSION_SCOPES.get(model_label, ()))
+
         # Always invalidate search cache when content changes
 
         cache_manager.invalidate_search()
@@ -97,6 +106,8 @@ def invalidate_cache_on_delete(sender, instance, **kwargs):
 
             invalidate_content_cache(instance, model_label)
 
+        bump_content_version(*CONTENT_VERSION_SCOPES.get(model_label, ()))
+
         # Invalidate search and sitemap cache
 
         cache_manager.invalidate_search()
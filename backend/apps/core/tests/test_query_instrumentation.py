@@ -0,0 +1,142 @@
+"""Tests for execute_wrapper based query instrumentation."""
+
+import os
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.core.middleware_performance import (
+    PerformanceMonitoringMiddleware,
+    QueryCountLimitMiddleware,
+)
+from apps.core.query_instrumentation import QueryRecorder, fingerprint, query_metrics
+from apps.ops.metrics import prometheus_metrics
+
+User = get_user_model()
+
+
+class FingerprintTest(TestCase):
+    def test_in_lists_are_folded(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s,  %s)'),
+            'SELECT * FROM "t" WHERE "id" IN (...)',
+        )
+
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s)'),
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s)'),
+        )
+
+
+class QueryRecorderTest(TestCase):
+    def test_records_queries_without_debug(self):
+        recorder = QueryRecorder()
+
+        recorder.install()
+
+        try:
+            with override_settings(DEBUG=False):
+                for i in range(6):
+                    User.objects.filter(pk=i).exists()
+
+                User.objects.count()
+        finally:
+            recorder.uninstall()
+
+        self.assertEqual(recorder.count, 7)
+
+        self.assertGreater(recorder.duration, 0)
+
+        duplicates = recorder.duplicates(threshold=5)
+
+        self.assertEqual(len(duplicates), 1)
+
+        self.assertEqual(duplicates[0][1], 6)
+
+        self.assertNotIn(recorder, connection.execute_wrappers)
+
+
+class QueryCountLimitTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def n_plus_one_view(self, request):
+        for i in range(20):
+            User.objects.filter(pk=i).exists()
+
+        return HttpResponse("OK")
+
+    @override_settings(DEBUG=True)
+    def test_guard_reports_duplicates(self):
+        middleware = QueryCountLimitMiddleware(self.n_plus_one_view)
+
+        response = middleware(self.factory.get("/list/"))
+
+        self.assertEqual(response.status_code, 500)
+
+        self.assertIn(b'"count": 20', response.content)
+
+    def test_guard_fires_in_production(self):
+        middleware = QueryCountLimitMiddleware(self.n_plus_one_view)
+
+        with (
+            override_settings(DEBUG=False),
+            self.assertLogs("performance", level="ERROR") as logs,
+        ):
+            response = middleware(self.factory.get("/list/"))
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertIn("executed 20 queries", logs.output[0])
+
+    def test_nested_middlewares_share_one_recorder(self):
+        inner = QueryCountLimitMiddleware(self.n_plus_one_view)
+
+        outer = PerformanceMonitoringMiddleware(inner)
+
+        wrappers_before = list(connection.execute_wrappers)
+
+        response = outer(self.factory.get("/list/"))
+
+        self.assertEqual(response["X-Database-Queries"], "20")
+
+        self.assertEqual(connection.execute_wrappers, wrappers_before)
+
+
+class QueryMetricsExportTest(TestCase):
+    def setUp(self):
+        query_metrics.reset()
+
+    def tearDown(self):
+        query_metrics.reset()
+
+    def test_histograms_exported_to_prometheus(self):
+        for count in (1, 3, 30):
+            recorder = QueryRecorder()
+            recorder.count = count
+            recorder.duration = 0.002 * count
+            query_metrics.observe("pages-list", recorder)
+
+        response = prometheus_metrics(RequestFactory().get("/metrics/"))
+
+        body = response.content.decode()
+
+        self.assertIn("# TYPE django_view_db_queries histogram", body)
+        self.assertIn('django_view_db_queries_bucket{view="pages-list",le="1"} 1', body)
+        self.assertIn('django_view_db_queries_bucket{view="pages-list",le="5"} 2', body)
+        self.assertIn(
+            'django_view_db_queries_bucket{view="pages-list",le="+Inf"} 3', body
+        )
+        self.assertIn('django_view_db_queries_sum{view="pages-list"} 34', body)
+        self.assertIn('django_view_db_time_seconds_count{view="pages-list"} 3', body)
+        self.assertIn('django_view_n_plus_one_total{view="pages-list"} 0', body)
@@ -0,0 +1,113 @@
+"""Tests for the shared sliding-window rate limiter."""
+
+import os
+import threading
+from unittest.mock import patch
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from apps.core.rate_limiting import SlidingWindowRateLimiter, reset_rate_limiters
+from apps.core.throttling import AnonRateThrottle
+
+
+class SlidingWindowRateLimiterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_previous_window_is_weighted(self):
+        limiter = SlidingWindowRateLimiter(10, 60, prefix="test-weighted")
+
+        for _ in range(10):
+            self.assertTrue(limiter.hit("client", now=30.0).allowed)
+
+        result = limiter.hit("client", now=30.0)
+
+        self.assertFalse(result.allowed)
+
+        self.assertEqual(result.remaining, 0)
+
+        self.assertGreater(result.retry_after, 30)
+
+        # Halfway through the next window half the previous hits still count
+        allowed = [limiter.hit("client", now=90.0).allowed for _ in range(6)]
+
+        self.assertEqual(allowed, [True] * 5 + [False])
+
+        self.assertEqual(limiter.hit("other", now=90.0).count, 1)
+
+    def test_rejected_hits_are_not_counted(self):
+        limiter = SlidingWindowRateLimiter(3, 60, prefix="test-rejected")
+
+        for _ in range(10):
+            limiter.hit("client", now=0.0)
+
+        self.assertEqual(cache.get(limiter.bucket_key("client", 0)), 3)
+
+    def test_under_limit_hits_are_shared_in_batches(self):
+        limiter = SlidingWindowRateLimiter(1000, 60, prefix="test-batched")
+
+        with patch("apps.core.rate_limiting.cache.incr", wraps=cache.incr) as incr:
+            for _ in range(100):
+                self.assertTrue(limiter.hit("client", now=0.0).allowed)
+
+        self.assertLessEqual(incr.call_count, 4)
+
+        self.assertEqual(limiter.status("client", now=0.0).count, 100)
+
+    def test_concurrent_hits_never_exceed_the_limit(self):
+        limiter = SlidingWindowRateLimiter(20, 60, prefix="test-concurrent")
+
+        allowed = []
+
+        def client():
+            for _ in range(25):
+                allowed.append(limiter.hit("client", now=0.0).allowed)
+
+        threads = [threading.Thread(target=client) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(allowed.count(True), 20)
+
+
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        reset_rate_limiters()
+
+    def test_drf_throttle_uses_the_limiter(self):
+        class TwoPerMinute(AnonRateThrottle):
+            rate = "2/min"
+
+        request = RequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+
+        request.user = AnonymousUser()
+
+        results = []
+
+        for _ in range(3):
+            throttle = TwoPerMinute()
+
+            results.append(throttle.allow_request(request, None))
+
+        self.assertEqual(results, [True, True, False])
+
+        self.assertGreater(throttle.wait(), 0)
+
+        # No timestamp history is stored
+        self.assertIsNone(cache.get(throttle.key))
@@ -0,0 +1,147 @@
+"""Tests for the sharded request statistics collector."""
+
+import os
+from unittest.mock import patch
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.core.request_stats import (
+    REQUEST_DURATION_BUCKETS,
+    StatsCollector,
+    record_slow_request,
+    request_stats,
+)
+
+
+class StatsCollectorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_processes_flush_to_their_own_shards(self):
+        first, second = StatsCollector(), StatsCollector()
+
+        first.incr("cache:hits", 3)
+
+        second.incr("cache:hits", 2)
+
+        second.incr("cache:misses")
+
+        with patch.object(StatsCollector, "shard", return_value=1):
+            first.flush()
+
+        with patch.object(StatsCollector, "shard", return_value=2):
+            second.flush()
+
+        self.assertEqual(cache.get("stats:1:cache:hits"), 3)
+
+        self.assertEqual(cache.get("stats:2:cache:hits"), 2)
+
+        # Counts not flushed yet are included for the reading process
+        first.incr("cache:misses")
+
+        self.assertEqual(
+            first.cache_hit_stats(), {"hits": 5, "misses": 2, "hit_rate": 5 / 7}
+        )
+
+    def test_flush_uses_atomic_increments(self):
+        collector = StatsCollector()
+
+        collector.incr("cache:hits")
+
+        collector.flush()
+
+        collector.incr("cache:hits", 4)
+
+        with patch("apps.core.request_stats.cache.set") as cache_set:
+            collector.flush()
+
+        cache_set.assert_not_called()
+
+        self.assertEqual(collector.read("cache:"), {"cache:hits": 5})
+
+    def test_flush_restores_an_overwritten_index(self):
+        first, second = StatsCollector(), StatsCollector()
+
+        with patch.object(StatsCollector, "shard", return_value=0):
+
+            first.incr("cache:hits")
+
+            first.flush()
+
+            # Another process on the shard replaces the index concurrently
+            cache.set("stats:index:0", {"cache:misses"})
+
+            second.incr("cache:misses")
+
+            second.flush()
+
+            first.incr("cache:hits")
+
+            first.flush()
+
+        self.assertEqual(
+            StatsCollector().read("cache:"), {"cache:hits": 2, "cache:misses": 1}
+        )
+
+    @override_settings(PERFORMANCE_STATS_FLUSH_INTERVAL=60)
+    def test_maybe_flush_waits_for_the_interval(self):
+        collector = StatsCollector()
+
+        collector.incr("cache:hits")
+
+        collector.maybe_flush()
+
+        self.assertIsNone(cache.get(f"stats:{collector.shard()}:cache:hits"))
+
+        with override_settings(PERFORMANCE_STATS_FLUSH_INTERVAL=0):
+            collector.maybe_flush()
+
+        self.assertEqual(cache.get(f"stats:{collector.shard()}:cache:hits"), 1)
+
+    def test_histogram_buckets_are_cumulative(self):
+        collector = StatsCollector()
+
+        for duration in (0.05, 0.3, 0.3, 12.0):
+            collector.observe("request_duration", duration, REQUEST_DURATION_BUCKETS)
+
+        collector.flush()
+
+        histogram = collector.histogram("request_duration")
+
+        buckets = dict(histogram["buckets"])
+
+        self.assertEqual(buckets[0.1], 1)
+
+        self.assertEqual(buckets[0.5], 3)
+
+        self.assertEqual(buckets[10.0], 3)
+
+        self.assertEqual(buckets["inf"], 4)
+
+        self.assertEqual(histogram["count"], 4)
+
+        self.assertAlmostEqual(histogram["sum"], 12.65)
+
+        self.assertIn(
+            'django_request_duration_seconds_bucket{le="+Inf"} 4',
+            collector.render_prometheus(),
+        )
+
+    def test_slow_request_paths_are_escaped(self):
+        record_slow_request('/search/"quoted"\\path', 0.8)
+
+        request_stats.flush()
+
+        self.assertIn(
+            'django_slow_requests_total{path="/search/\\"quoted\\"\\\\path"} 1',
+            request_stats.render_prometheus(),
+        )
@@ -1,15 +1,64 @@
 import logging
 import time
 
-from django.core.cache import cache
+from rest_framework import throttling
 
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+from .rate_limiting import get_rate_limiter
 
 """
 Custom throttling classes for enhanced API security.
 """
 
 
+class SlidingWindowThrottleMixin:
+    """
+    Count requests with the shared sliding-window rate limiter.
+
+    Replaces DRF's list of request timestamps per client, which grows with
+    the limit and is read and rewritten without locking, with atomic
+    counters of constant size.
+    """
+
+    result = None
+
+    def get_limiter(self):
+        """Limiter shared by throttles with the same rate."""
+
+        return get_rate_limiter(self.num_requests, self.duration, prefix="throttle")
+
+    def allow_request(self, request, view):
+
+        if self.rate is None:
+
+            return True
+
+        self.key = self.get_cache_key(request, view)
+
+        if self.key is None:
+
+            return True
+
+        self.result = self.get_limiter().hit(self.key)
+
+        return self.result.allowed
+
+    def wait(self):
+
+        if self.result is None or self.result.allowed:
+
+            return None
+
+        return self.result.retry_after
+
+
+class AnonRateThrottle(SlidingWindowThrottleMixin, throttling.AnonRateThrottle):
+    """Anonymous request throttle on the shared rate limiter."""
+
+
+class UserRateThrottle(SlidingWindowThrottleMixin, throttling.UserRateThrottle):
+    """Per-user request throttle on the shared rate limiter."""
+
+
 class WriteOperationThrottle(UserRateThrottle):
     """
     Throttle class specifically for write operations (POST, PUT, PATCH, DELETE).
@@ -277,6 +326,9 @@ def get_rate_limit_status(request, throttle_classes=None):
 
         throttle = throttle_class()
 
+        if throttle.rate is None:
+            continue
+
         # Get the cache key for this throttle
 
         cache_key = throttle.get_cache_key(request, None)
@@ -284,27 +336,13 @@ def get_rate_limit_status(request, throttle_classes=None):
         if not cache_key:
             continue
 
-        # Get current request history
-
-        history = cache.get(cache_key, [])
-
-        # Calculate remaining requests
-
-        now = time.time()
-
-        # Remove old entries
-
-        history = [
-            timestamp for timestamp in history if timestamp > now - throttle.duration
-        ]
-
-        remaining = throttle.num_requests - len(history)
+        result = throttle.get_limiter().status(cache_key)
 
         status[throttle_class.__name__] = {
             "scope": getattr(throttle, "scope", "unknown"),
             "limit": throttle.num_requests,
-            "remaining": max(0, remaining),
-            "reset_time": now + throttle.duration,
+            "remaining": result.remaining,
+            "reset_time": time.time() + result.retry_after,
             "duration": throttle.duration,
         }
 
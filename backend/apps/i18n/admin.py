@@ -6,6 +6,7 @@ from .models import (
     Locale,
     TranslationGlossary,
     TranslationHistory,
+    TranslationMemory,
     TranslationQueue,
     TranslationUnit,
     UiMessage,
@@ -359,3 +360,23 @@ class UiMessageTranslationAdmin(admin.ModelAdmin):
         obj.updated_by = request.user
 
         super().save_model(request, obj, form, change)
+
+
+@admin.register(TranslationMemory)
+class TranslationMemoryAdmin(admin.ModelAdmin):
+    """Admin interface for TranslationMemory model."""
+
+    list_display = [
+        "source_text",
+        "translated_text",
+        "source_lang",
+        "target_lang",
+        "provider",
+        "created_at",
+    ]
+
+    list_filter = ["source_lang", "target_lang", "provider"]
+
+    search_fields = ["source_text", "translated_text"]
+
+    readonly_fields = ["source_hash", "created_at"]
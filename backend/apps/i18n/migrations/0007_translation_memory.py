@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("i18n", "0006_alter_locale_native_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationMemory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source_hash",
+                    models.CharField(
+                        help_text="SHA-256 of the source text", max_length=64
+                    ),
+                ),
+                (
+                    "source_lang",
+                    models.CharField(help_text="Source language code", max_length=10),
+                ),
+                (
+                    "target_lang",
+                    models.CharField(help_text="Target language code", max_length=10),
+                ),
+                ("source_text", models.TextField(help_text="Original text")),
+                ("translated_text", models.TextField(help_text="Machine translation")),
+                (
+                    "provider",
+                    models.CharField(
+                        default="deepl",
+                        help_text="Service that produced it",
+                        max_length=50,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name_plural": "Translation memory",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="translationmemory",
+            constraint=models.UniqueConstraint(
+                fields=("source_hash", "source_lang", "target_lang"),
+                name="unique_translation_memory",
+            ),
+        ),
+    ]
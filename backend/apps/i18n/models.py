@@ -741,3 +741,48 @@ class TranslationHistory(models.Model):
     def __str__(self):  # noqa: C901
 
         return f"{self.translation_unit} - {self.action} by {self.performed_by}"
+
+
+class TranslationMemory(models.Model):
+    """Machine translations of source strings, reused for identical strings.
+
+    Entries are keyed on a hash of the source text so lookups use a short,
+    fixed-length index whatever the length of the text.
+    """
+
+    source_hash: CharField = models.CharField(
+        max_length=64, help_text="SHA-256 of the source text"
+    )
+
+    source_lang: CharField = models.CharField(
+        max_length=10, help_text="Source language code"
+    )
+
+    target_lang: CharField = models.CharField(
+        max_length=10, help_text="Target language code"
+    )
+
+    source_text: TextField = models.TextField(help_text="Original text")
+
+    translated_text: TextField = models.TextField(help_text="Machine translation")
+
+    provider: CharField = models.CharField(
+        max_length=50, default="deepl", help_text="Service that produced it"
+    )
+
+    created_at: DateTimeField = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_hash", "source_lang", "target_lang"],
+                name="unique_translation_memory",
+            )
+        ]
+
+        verbose_name_plural = "Translation memory"
+
+    def __str__(self):  # noqa: C901
+
+        return f"{self.source_text[:50]} ({self.source_lang} → {self.target_lang})"
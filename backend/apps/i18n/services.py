@@ -1,4 +1,8 @@
+import hashlib
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
 
@@ -9,12 +13,96 @@ import requests
 
 logger = logging.getLogger(__name__)
 
+# Map common locale codes to DeepL language codes
+
+DEEPL_LANGUAGE_CODES = {
+    "en": "EN",
+    "es": "ES",
+    "fr": "FR",
+    "de": "DE",
+    "it": "IT",
+    "pt": "PT",
+    "ru": "RU",
+    "ja": "JA",
+    "zh": "ZH",
+    "ko": "KO",
+    "nl": "NL",
+    "pl": "PL",
+    "sv": "SV",
+    "da": "DA",
+    "fi": "FI",
+    "no": "NB",  # Norwegian
+    "cs": "CS",  # Czech
+    "hu": "HU",  # Hungarian
+    "et": "ET",  # Estonian
+    "lv": "LV",  # Latvian
+    "lt": "LT",  # Lithuanian
+    "sk": "SK",  # Slovak
+    "sl": "SL",  # Slovenian
+    "bg": "BG",  # Bulgarian
+    "ro": "RO",  # Romanian
+    "el": "EL",  # Greek
+    "tr": "TR",  # Turkish
+    "uk": "UK",  # Ukrainian
+}
+
+# Translation memory hashes looked up per query
+
+MEMORY_LOOKUP_BATCH_SIZE = 500
+
+
+def deepl_language_code(locale_code):
+    """DeepL language code of a locale code (``"no"`` -> ``"NB"``)."""
+
+    return DEEPL_LANGUAGE_CODES.get(locale_code.lower(), locale_code.upper())
+
+
+def source_hash(text):
+    """Translation memory key of a source text."""
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart, across threads."""
+
+    def __init__(self, rate):
+
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+
+        self._lock = threading.Lock()
+
+        self._next_call = 0.0
+
+    def wait(self):
+        """Block until the next call is allowed."""
+
+        with self._lock:
+
+            now = time.monotonic()
+
+            call_at = max(now, self._next_call)
+
+            self._next_call = call_at + self.interval
+
+        if call_at > now:
+
+            time.sleep(call_at - now)
+
 
 class DeepLTranslationService:
     """DeepL API integration for machine translation suggestions."""
 
     """Provides simple, high-quality translation suggestions using DeepL API."""
 
+    MAX_ATTEMPTS = 3
+
+    # Seconds before retrying a throttled request, unless Retry-After says
+
+    RETRY_DELAY = 1.0
+
+    MAX_RETRY_DELAY = 30.0
+
     def __init__(self):
 
         self.api_key = getattr(settings, "DEEPL_API_KEY", None)
@@ -29,13 +117,29 @@ class DeepLTranslationService:
 
             logger.info(f"DEEPL_API_KEY configured: {self.api_key[:10]}...")
 
-        # Always use free API endpoint for now
-
         # The endpoint detection based on key suffix isn't reliable
 
-        self.base_url = "https://api-free.deepl.com/v2"
+        self.base_url = getattr(
+            settings, "DEEPL_API_URL", "https://api-free.deepl.com/v2"
+        ).rstrip("/")
+
+        logger.info(f"Using DeepL API at {self.base_url}")
+
+        # Request batching and throttling
+
+        self.batch_size = getattr(settings, "DEEPL_BATCH_SIZE", 50)
+
+        self.max_request_bytes = getattr(
+            settings, "DEEPL_MAX_REQUEST_BYTES", 120 * 1024
+        )
+
+        self.max_concurrent_requests = getattr(
+            settings, "DEEPL_MAX_CONCURRENT_REQUESTS", 4
+        )
 
-        logger.info("Using DeepL Free API")
+        self.rate_limiter = RateLimiter(
+            getattr(settings, "DEEPL_REQUESTS_PER_SECOND", 5.0)
+        )
 
     def translate(self, text, source_lang, target_lang):
         """Translate text from source language to target language.
@@ -53,108 +157,226 @@ class DeepLTranslationService:
 
             return None
 
+        return self.translate_many([text], source_lang, target_lang)[0]
+
+    def translate_many(self, texts, source_lang, target_lang):
+        """Translate many texts between one pair of languages.
+
+        Texts already in the translation memory are not sent again; the
+        others are deduplicated, packed into as few requests as the API
+        limits allow and sent concurrently, and their translations are
+        stored in the memory.
+
+        Args:
+            texts (list[str]): Texts to translate
+            source_lang (str): Source language code (e.g., 'en', 'es')
+            target_lang (str): Target language code (e.g., 'es', 'fr')
+
+        Returns:
+            list: Translated text, or None where translation failed, per text
+        """
+
+        from .models import TranslationMemory
+
+        unique_texts = {text for text in texts if text and text.strip()}
+
+        if not unique_texts:
+
+            return [None] * len(texts)
+
         # If no API key, use simple fallback translations
 
         if not self.api_key:
 
-            return self._fallback_translate(text, source_lang, target_lang)
-
-        # Map common locale codes to DeepL language codes
-
-        lang_mapping = {
-            "en": "EN",
-            "es": "ES",
-            "fr": "FR",
-            "de": "DE",
-            "it": "IT",
-            "pt": "PT",
-            "ru": "RU",
-            "ja": "JA",
-            "zh": "ZH",
-            "ko": "KO",
-            "nl": "NL",
-            "pl": "PL",
-            "sv": "SV",
-            "da": "DA",
-            "fi": "FI",
-            "no": "NB",  # Norwegian
-            "cs": "CS",  # Czech
-            "hu": "HU",  # Hungarian
-            "et": "ET",  # Estonian
-            "lv": "LV",  # Latvian
-            "lt": "LT",  # Lithuanian
-            "sk": "SK",  # Slovak
-            "sl": "SL",  # Slovenian
-            "bg": "BG",  # Bulgarian
-            "ro": "RO",  # Romanian
-            "el": "EL",  # Greek
-            "tr": "TR",  # Turkish
-            "uk": "UK",  # Ukrainian
-        }
+            return [
+                (
+                    self._fallback_translate(text, source_lang, target_lang)
+                    if text in unique_texts
+                    else None
+                )
+                for text in texts
+            ]
 
-        source_code = lang_mapping.get(source_lang.lower(), source_lang.upper())
+        source_code = deepl_language_code(source_lang)
 
-        target_code = lang_mapping.get(target_lang.lower(), target_lang.upper())
+        target_code = deepl_language_code(target_lang)
 
-        logger.info(
-            f"DeepL translate request: '{text}' from {source_lang}({source_code}) to {target_lang}({target_code})"
-        )
+        hashes = {source_hash(text): text for text in unique_texts}
 
-        try:
+        translations = {}
 
-            logger.info(f"Making DeepL API request to: {self.base_url}/translate")
+        hash_list = list(hashes)
+
+        for i in range(0, len(hash_list), MEMORY_LOOKUP_BATCH_SIZE):
+
+            translations.update(
+                (hashes[digest], translated_text)
+                for digest, translated_text in TranslationMemory.objects.filter(
+                    source_hash__in=hash_list[i : i + MEMORY_LOOKUP_BATCH_SIZE],
+                    source_lang=source_code,
+                    target_lang=target_code,
+                ).values_list("source_hash", "translated_text")
+            )
+
+        missing = [text for text in hashes.values() if text not in translations]
+
+        if missing:
 
             logger.info(
-                f"Request data: text='{text}', source_lang={source_code}, target_lang={target_code}"
+                "DeepL translating %d texts (%d from memory) %s->%s",
+                len(missing),
+                len(translations),
+                source_code,
+                target_code,
             )
 
-            response = requests.post(
-                f"{self.base_url}/translate",
-                headers={"Authorization": f"DeepL-Auth-Key {self.api_key}"},
-                data={
-                    "text": text,
-                    "source_lang": source_code,
-                    "target_lang": target_code,
-                    "preserve_formatting": "1",
-                },
-                timeout=10,
+            translated = dict(
+                zip(missing, self._request_batches(missing, source_code, target_code))
+            )
+
+            TranslationMemory.objects.bulk_create(
+                [
+                    TranslationMemory(
+                        source_hash=source_hash(text),
+                        source_lang=source_code,
+                        target_lang=target_code,
+                        source_text=text,
+                        translated_text=translated_text,
+                    )
+                    for text, translated_text in translated.items()
+                    if translated_text
+                ],
+                ignore_conflicts=True,
             )
 
+            translations.update(translated)
+
+        return [translations.get(text) for text in texts]
+
+    def _batches(self, texts):
+        """Split texts into requests within the API's text and size limits."""
+
+        batch = []
+
+        batch_bytes = 0
+
+        for text in texts:
+
+            text_bytes = len(text.encode("utf-8"))
+
+            if batch and (
+                len(batch) >= self.batch_size
+                or batch_bytes + text_bytes > self.max_request_bytes
+            ):
+
+                yield batch
+
+                batch = []
+
+                batch_bytes = 0
+
+            batch.append(text)
+
+            batch_bytes += text_bytes
+
+        if batch:
+
+            yield batch
+
+    def _request_batches(self, texts, source_code, target_code):
+        """Translate texts with concurrent batched requests, keeping order."""
+
+        batches = list(self._batches(texts))
+
+        if len(batches) == 1:
+
+            return self._request(batches[0], source_code, target_code)
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrent_requests, len(batches))
+        ) as executor:
+
+            results = executor.map(
+                lambda batch: self._request(batch, source_code, target_code), batches
+            )
+
+            return [text for batch_result in results for text in batch_result]
+
+    def _request(self, batch, source_code, target_code):
+        """Translate one batch of texts, retrying throttled requests."""
+
+        data = [("text", text) for text in batch] + [
+            ("source_lang", source_code),
+            ("target_lang", target_code),
+            ("preserve_formatting", "1"),
+        ]
+
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+
+            self.rate_limiter.wait()
+
+            try:
+
+                response = requests.post(
+                    f"{self.base_url}/translate",
+                    headers={"Authorization": f"DeepL-Auth-Key {self.api_key}"},
+                    data=data,
+                    timeout=10,
+                )
+
+            except requests.RequestException as e:
+
+                logger.error(f"DeepL API request failed: {e}")
+
+                break
+
             if response.status_code == 200:
 
-                result = response.json()
+                try:
 
-                if result.get("translations"):
+                    translations = response.json().get("translations") or []
 
-                    translated_text = result["translations"][0]["text"]
+                    texts = [item.get("text") for item in translations]
 
-                    logger.info(
-                        f"DeepL translation successful: '{text}' -> '{translated_text}' ({source_lang}->{target_lang})"
-                    )
+                except (ValueError, AttributeError, TypeError) as e:
 
-                    return translated_text
+                    logger.error(f"DeepL API returned an invalid response: {e}")
 
-                else:
+                    break
 
-                    logger.warning("DeepL response missing translations array")
+                if len(texts) == len(batch):
 
-            else:
+                    return texts
 
-                logger.error(f"DeepL API error {response.status_code}: {response.text}")
+                logger.warning(
+                    "DeepL returned %d translations for %d texts",
+                    len(texts),
+                    len(batch),
+                )
 
-        except requests.RequestException as e:
+                break
 
-            logger.error(f"DeepL API request failed: {e}")
+            # Too many requests or temporarily unavailable
 
-        except Exception as e:
+            if response.status_code in (429, 503) and attempt < self.MAX_ATTEMPTS:
 
-            logger.error(f"DeepL translation error: {e}")
+                try:
 
-        logger.warning(
-            f"DeepL translation returned None for: '{text}' ({source_lang}->{target_lang})"
-        )
+                    delay = float(response.headers.get("Retry-After", ""))
 
-        return None
+                except ValueError:
+
+                    delay = self.RETRY_DELAY * attempt
+
+                time.sleep(min(delay, self.MAX_RETRY_DELAY))
+
+                continue
+
+            logger.error(f"DeepL API error {response.status_code}: {response.text}")
+
+            break
+
+        return [None] * len(batch)
 
     def get_supported_languages(self):
         """Get list of supported languages from DeepL API.
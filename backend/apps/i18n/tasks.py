@@ -1,9 +1,11 @@
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
 
 from celery import shared_task
 
@@ -18,12 +20,21 @@ from .models import (
     UiMessageTranslation,
 )
 from .services import DeepLTranslationService
+from .translation import TranslationManager
 
 """Background tasks for internationalization and localization."""
 
 
 logger = logging.getLogger(__name__)
 
+# Source objects seeded per transaction
+
+SEED_BATCH_SIZE = 500
+
+# UI messages translated and saved together
+
+UI_TRANSLATION_BATCH_SIZE = 500
+
 
 class TranslationService:
     """Mock translation service for testing."""
@@ -101,9 +112,29 @@ def seed_locale_translation_units(
 
         current_progress: float = 0
 
+        def batch_progress(label: str) -> Callable[[int, int], None]:
+            """Report progress within the current model's share."""
+
+            start = current_progress
+
+            def report(processed: int, total: int) -> None:
+
+                self.update_state(
+                    state="PROGRESS",
+                    meta={
+                        "current": start + progress_step * processed / max(total, 1),
+                        "total": 100,
+                        "status": f"Seeding {label}: {processed}/{total} objects",
+                    },
+                )
+
+            return report
+
         # Process Pages first
 
-        page_results = _seed_page_translation_units(locale, force_reseed)
+        page_results = _seed_page_translation_units(
+            locale, force_reseed, batch_progress("cms.Page")
+        )
 
         results["models_processed"].append(
             {
@@ -135,7 +166,11 @@ def seed_locale_translation_units(
             try:
 
                 model_results = _seed_model_translation_units(
-                    config.model, config.translatable_fields or [], locale, force_reseed
+                    config.model,
+                    config.translatable_fields or [],
+                    locale,
+                    force_reseed,
+                    batch_progress(config_label),
                 )
 
                 results["models_processed"].append(
@@ -198,155 +233,162 @@ def seed_locale_translation_units(
 
 
 def _seed_page_translation_units(
-    locale: Locale, force_reseed: bool = False
+    locale: Locale,
+    force_reseed: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
 ) -> dict[str, int]:
     """Seed translation units for pages."""
 
-    created_count = 0
-
-    skipped_count = 0
-
     # Define translatable fields for pages
 
     translatable_fields = ["title", "blocks", "seo"]
 
-    # Get all pages that have content in other locales
+    return _seed_model_translation_units(
+        Page, translatable_fields, locale, force_reseed, progress
+    )
 
-    source_pages = Page.objects.exclude(locale=locale)
 
-    with transaction.atomic():
+def _seed_model_translation_units(
+    model_class,
+    translatable_fields: list[str],
+    locale: Locale,
+    force_reseed: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> dict[str, int]:
+    """Seed translation units for a registered model.
+
+    Units are seeded for objects in other locales whose translation group
+    (``group_id``) exists in ``locale``. Sources are selected with one
+    ``EXISTS`` join per batch, units already present are subtracted with one
+    query per batch and the rest are bulk created, each batch in its own
+    transaction. With ``force_reseed`` existing units are reset to
+    ``missing`` in place and counted as created. ``progress`` is called with ``(processed, total)`` after
+    every batch.
+    """
 
-        for source_page in source_pages:
+    created_count = 0
 
-            # Try to find corresponding page in target locale by group_id
+    skipped_count = 0
 
-            target_page = Page.objects.filter(
-                group_id=source_page.group_id, locale=locale
-            ).first()
+    if not translatable_fields:
 
-            if not target_page:
-                # No corresponding page in target locale, skip
-                continue
+        return {"created": 0, "skipped": 0}
 
-            for field_name in translatable_fields:
+    # Only models with locale and translation group fields can be seeded
 
-                # Create or get translation unit
+    if not (hasattr(model_class, "locale") and hasattr(model_class, "group_id")):
 
-                unit, created = TranslationUnit.objects.get_or_create(
-                    content_type=ContentType.objects.get_for_model(Page),
-                    object_id=target_page.id,
-                    field_name=field_name,
-                    target_locale=locale,
-                    defaults={
-                        "source_locale": source_page.locale,
-                        "object_id": source_page.id,
-                        "status": "missing",
-                    },
-                )
+        return {"created": 0, "skipped": 0}
 
-                if created or force_reseed:
+    content_type = ContentType.objects.get_for_model(model_class)
 
-                    if not created and force_reseed:
+    source_objects = (
+        model_class.objects.exclude(locale=locale)
+        .filter(
+            Exists(
+                model_class.objects.filter(group_id=OuterRef("group_id"), locale=locale)
+            )
+        )
+        .order_by("pk")
+    )
 
-                        # Update existing unit
+    total = source_objects.count()
 
-                        unit.source_locale = source_page.locale
+    processed = 0
 
-                        unit.object_id = source_page.id
+    last_pk = None
 
-                        unit.status = "missing"
+    while True:
 
-                        unit.save()
+        batch_objects = source_objects
 
-                    created_count += 1
+        if last_pk is not None:
 
-                else:
+            batch_objects = batch_objects.filter(pk__gt=last_pk)
 
-                    skipped_count += 1
+        batch = list(batch_objects[:SEED_BATCH_SIZE])
 
-    return {"created": created_count, "skipped": skipped_count}
+        if not batch:
+            break
 
+        last_pk = batch[-1].pk
 
-def _seed_model_translation_units(
-    model_class,
-    translatable_fields: list[str],
-    locale: Locale,
-    force_reseed: bool = False,
-) -> dict[str, int]:
-    """Seed translation units for a registered model."""
+        with transaction.atomic():
 
-    created_count = 0
+            existing_units = TranslationUnit.objects.filter(
+                content_type=content_type,
+                object_id__in=[obj.pk for obj in batch],
+                field__in=translatable_fields,
+                target_locale=locale,
+            )
 
-    skipped_count = 0
+            existing = set(existing_units.order_by().values_list("object_id", "field"))
 
-    if not translatable_fields:
+            if force_reseed and existing:
 
-        return {"created": 0, "skipped": 0}
+                # Reset existing units in place, keeping their translations
+                # and the history and queue rows pointing at them
 
-    # Get all objects that have content in other locales
+                by_locale: Dict[int, List[int]] = {}
 
-    if hasattr(model_class, "locale"):
+                for obj in batch:
+                    by_locale.setdefault(obj.locale_id, []).append(obj.pk)
 
-        source_objects = model_class.objects.exclude(locale=locale)
+                for source_locale_id, object_ids in by_locale.items():
 
-    else:
+                    created_count += existing_units.filter(
+                        object_id__in=object_ids
+                    ).update(status="missing", source_locale_id=source_locale_id)
 
-        # Model doesn't have locale field, skip
+            units = []
 
-        return {"created": 0, "skipped": 0}
+            for obj in batch:
 
-    with transaction.atomic():
+                for field_name in translatable_fields:
 
-        for source_obj in source_objects:
+                    if (obj.pk, field_name) in existing:
 
-            # Try to find corresponding object in target locale by group_id
+                        if not force_reseed:
+                            skipped_count += 1
 
-            target_obj = None
+                        continue
 
-            if hasattr(model_class, "group_id"):
+                    units.append(
+                        TranslationUnit(
+                            content_type=content_type,
+                            object_id=obj.pk,
+                            field=field_name,
+                            source_locale_id=obj.locale_id,
+                            target_locale=locale,
+                            source_text=TranslationManager._extract_field_text(
+                                obj, field_name
+                            ),
+                            status="missing",
+                        )
+                    )
 
-                target_obj = model_class.objects.filter(
-                    group_id=source_obj.group_id, locale=locale
-                ).first()
+            if units:
 
-            if not target_obj:
-                continue
+                # Conflicts are units created concurrently since the lookup
 
-            for field_name in translatable_fields:
+                TranslationUnit.objects.bulk_create(units, ignore_conflicts=True)
 
-                # Create or get translation unit
+                # Count the units now present rather than the rows handed in
 
-                unit, created = TranslationUnit.objects.get_or_create(
-                    content_type=ContentType.objects.get_for_model(model_class),
-                    object_id=target_obj.id,
-                    field_name=field_name,
-                    target_locale=locale,
-                    defaults={
-                        "source_locale": source_obj.locale,
-                        "object_id": source_obj.id,
-                        "status": "missing",
-                    },
+                created = set(
+                    existing_units.order_by().values_list("object_id", "field")
                 )
 
-                if created or force_reseed:
-
-                    if not created and force_reseed:
-
-                        # Update existing unit
-
-                        unit.source_locale = source_obj.locale
+                created_count += len(created - existing)
 
-                        unit.object_id = source_obj.id
+        processed += len(batch)
 
-                        unit.status = "missing"
+        if progress:
 
-                        unit.save()
+            progress(processed, total)
 
-                    created_count += 1
-
-                else:
-
-                    skipped_count += 1
+        if len(batch) < SEED_BATCH_SIZE:
+            break
 
     return {"created": created_count, "skipped": skipped_count}
 
@@ -540,7 +582,7 @@ def auto_translate_content(
 
             # Check if locale exists
 
-            Locale.objects.get(code=target_locale_code)
+            target_locale = Locale.objects.get(code=target_locale_code)
 
         except (ContentType.DoesNotExist, Locale.DoesNotExist) as e:
 
@@ -558,9 +600,53 @@ def auto_translate_content(
 
             return {"status": "error", "error": error_msg, "translated_fields": 0}
 
-        results = {"translated_fields": 1, "status": "completed"}
+        # Untranslated units of the field, translated per source locale
 
-        # Mock implementation
+        units = list(
+            TranslationUnit.objects.filter(
+                content_type=content_type,
+                object_id=object_id,
+                field=field,
+                target_locale=target_locale,
+                target_text="",
+            ).select_related("source_locale")
+        )
+
+        units_by_source: Dict[str, List[TranslationUnit]] = {}
+
+        for unit in units:
+
+            units_by_source.setdefault(unit.source_locale.code, []).append(unit)
+
+        deepl_service = DeepLTranslationService()
+
+        translated_units = []
+
+        for source_code, source_units in units_by_source.items():
+
+            translated_texts = deepl_service.translate_many(
+                [unit.source_text for unit in source_units],
+                source_lang=source_code,
+                target_lang=target_locale.code,
+            )
+
+            for unit, translated_text in zip(source_units, translated_texts):
+
+                if translated_text:
+
+                    unit.target_text = translated_text
+
+                    unit.status = "draft"
+
+                    unit.updated_at = timezone.now()
+
+                    translated_units.append(unit)
+
+        TranslationUnit.objects.bulk_update(
+            translated_units, ["target_text", "status", "updated_at"]
+        )
+
+        results = {"translated_fields": len(translated_units), "status": "completed"}
 
         logger.info(
             "Auto translation completed for object %s:%s to %s",
@@ -780,21 +866,18 @@ def bulk_auto_translate_ui_messages(
 
             messages_query = messages_query.filter(namespace=namespace)
 
-        # Get total count for progress tracking
-
-        total_messages = messages_query.count()
+        # Ids are fetched up front: the query excludes translated messages,
+        # so slicing it again after each batch would skip messages
 
-        # Limit number of messages if specified
+        message_ids = list(messages_query.order_by("pk").values_list("pk", flat=True))
 
         if max_translations and max_translations > 0:
 
-            messages_to_translate = messages_query[:max_translations]
+            # Limit number of messages if specified
 
-            total_messages = min(total_messages, max_translations)
+            message_ids = message_ids[:max_translations]
 
-        else:
-
-            messages_to_translate = messages_query
+        total_messages = len(message_ids)
 
         if total_messages == 0:
 
@@ -834,54 +917,58 @@ def bulk_auto_translate_ui_messages(
 
         errors: List[Dict[str, Any]] = []
 
-        # Process messages in batches for better memory management
+        # Process messages in batches, each translated with batched requests
 
-        batch_size = 50
+        batch_size = UI_TRANSLATION_BATCH_SIZE
 
         current_processed = 0
 
         for i in range(0, total_messages, batch_size):
 
-            batch_messages = list(messages_to_translate[i : i + batch_size])
+            batch_messages = list(
+                UiMessage.objects.filter(pk__in=message_ids[i : i + batch_size])
+            )
+
+            to_translate = []
 
             for message in batch_messages:
 
-                try:
+                # Use default_value as source text
 
-                    # Use default_value as source text
+                if not message.default_value or not message.default_value.strip():
 
-                    source_text = message.default_value
+                    logger.info(f"Skipping {message.key}: empty default_value")
 
-                    if not source_text or not source_text.strip():
+                    skipped_count += 1
 
-                        logger.info(f"Skipping {message.key}: empty default_value")
+                    continue
 
-                        skipped_count += 1
+                to_translate.append(message)
 
-                        current_processed += 1
+            try:
 
-                    # Translate using DeepL
+                translated_texts = deepl_service.translate_many(
+                    [message.default_value for message in to_translate],
+                    source_lang=source_locale.code,
+                    target_lang=target_locale.code,
+                )
 
-                    translated_text = deepl_service.translate(
-                        text=source_text,
-                        source_lang=source_locale.code,
-                        target_lang=target_locale.code,
-                    )
+                new_translations = []
 
-                    if translated_text and translated_text.strip():
+                for message, translated_text in zip(to_translate, translated_texts):
 
-                        # Create translation
+                    if translated_text and translated_text.strip():
 
-                        UiMessageTranslation.objects.create(
-                            message=message,
-                            locale=target_locale,
-                            value=translated_text,
-                            status="draft",  # Auto-translations start as draft
-                            updated_by=None,  # Background task, no user
+                        new_translations.append(
+                            UiMessageTranslation(
+                                message=message,
+                                locale=target_locale,
+                                value=translated_text,
+                                status="draft",  # Auto-translations start as draft
+                                updated_by=None,  # Background task, no user
+                            )
                         )
 
-                        translated_count += 1
-
                     else:
 
                         skipped_count += 1
@@ -897,35 +984,41 @@ def bulk_auto_translate_ui_messages(
                             f"Skipped {message.key}: no translation returned"
                         )
 
-                except Exception as e:
+                UiMessageTranslation.objects.bulk_create(
+                    new_translations, ignore_conflicts=True
+                )
 
-                    error_count += 1
+                translated_count += len(new_translations)
 
-                    error_msg = f"Error translating {message.key}: {str(e)}"
+            except Exception as e:
 
-                    errors.append({"message": error_msg, "key": message.key})
+                error_count += len(to_translate)
 
-                    logger.error(f"Auto-translation error for {message.key}: {str(e)}")
+                error_msg = f"Error translating batch {i // batch_size + 1}: {str(e)}"
 
-                current_processed += 1
+                errors.append({"message": error_msg, "key": None})
 
-                # Update progress every 10 messages (only if running as Celery task)
+                logger.error(f"Auto-translation error: {error_msg}")
 
-                if self and current_processed % 10 == 0:
+            current_processed += len(batch_messages)
 
-                    progress_percentage = (current_processed / total_messages) * 100
+            # Update progress after every batch (only if running as Celery task)
 
-                    self.update_state(
-                        state="PROGRESS",
-                        meta={
-                            "current": current_processed,
-                            "total": total_messages,
-                            "translated": translated_count,
-                            "errors": error_count,
-                            "skipped": skipped_count,
-                            "status": f"Translated {translated_count} of {current_processed} messages ({progress_percentage:.1f}%)",
-                        },
-                    )
+            if self:
+
+                progress_percentage = (current_processed / total_messages) * 100
+
+                self.update_state(
+                    state="PROGRESS",
+                    meta={
+                        "current": current_processed,
+                        "total": total_messages,
+                        "translated": translated_count,
+                        "errors": error_count,
+                        "skipped": skipped_count,
+                        "status": f"Translated {translated_count} of {current_processed} messages ({progress_percentage:.1f}%)",
+                    },
+                )
 
         # Final result
 
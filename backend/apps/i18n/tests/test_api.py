@@ -1207,6 +1207,33 @@ class UiMessageAPITestCase(I18nAPITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertIn("Locale xx not found", response.data["error"])
 
+    def test_message_bundle_conditional_get(self):
+        """Test that a current bundle is answered with 304 Not Modified."""
+        self.unauthenticate()
+
+        url = reverse("ui-messages-bundle", kwargs={"locale_code": "es"})
+        etag = self.client.get(url)["ETag"]
+
+        # Locale lookup and two aggregates; no messages are loaded
+        with self.assertNumQueries(3):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        UiMessageTranslation.objects.create(
+            message=UiMessage.objects.get(key="common.cancel"),
+            locale=self.locale_es,
+            value="Cancelar",
+            status="approved",
+        )
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["common.cancel"], "Cancelar")
+
 
 class UiMessageTranslationAPITestCase(I18nAPITestCase):
     """Test cases for UI Message Translation API endpoints."""
@@ -4,8 +4,10 @@ from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
 
+from apps.cms.models import Page
 from apps.i18n.models import Locale, TranslationQueue, TranslationUnit
 from apps.i18n.tasks import (
+    _seed_page_translation_units,
     auto_translate_content,
     cleanup_old_translations,
     generate_translation_report,
@@ -240,3 +242,109 @@ class I18nTasksTest(TestCase):
         self.assertTrue(callable(sync_locale_fallbacks))
 
         self.assertTrue(callable(cleanup_old_translations))
+
+
+class SeedPageTranslationUnitsTest(TestCase):
+    """Test set-based seeding of translation units for a new locale."""
+
+    def setUp(self):  # noqa: C901
+        """Set up pages in English, some already translated to Dutch."""
+
+        self.locale_en, _ = Locale.objects.get_or_create(
+            code="en",
+            defaults={"name": "English", "native_name": "English", "is_default": True},
+        )
+
+        self.sources = [
+            Page.objects.create(
+                title=f"Page {i}", slug=f"seed-page-{i}", locale=self.locale_en
+            )
+            for i in range(5)
+        ]
+
+        self.locale_nl, _ = Locale.objects.get_or_create(
+            code="nl", defaults={"name": "Dutch", "native_name": "Nederlands"}
+        )
+
+        for source in self.sources[:3]:
+            Page.objects.create(
+                title=f"{source.title} (nl)",
+                slug=f"{source.slug}-nl",
+                locale=self.locale_nl,
+                group_id=source.group_id,
+            )
+
+        self.content_type = ContentType.objects.get_for_model(Page)
+
+    def units(self):
+        return TranslationUnit.objects.filter(
+            content_type=self.content_type,
+            object_id__in=[source.pk for source in self.sources],
+            target_locale=self.locale_nl,
+        )
+
+    def test_seeds_translated_groups_only(self):  # noqa: C901
+        """Units are created for sources whose group exists in the locale."""
+
+        self.units().delete()
+
+        progress = []
+
+        with patch("apps.i18n.tasks.SEED_BATCH_SIZE", 2):
+            results = _seed_page_translation_units(
+                self.locale_nl, progress=lambda *args: progress.append(args)
+            )
+
+        self.assertEqual(
+            set(self.units().values_list("object_id", "field")),
+            {
+                (source.pk, field)
+                for source in self.sources[:3]
+                for field in ["title", "blocks", "seo"]
+            },
+        )
+
+        self.assertEqual(
+            self.units().get(object_id=self.sources[0].pk, field="title").source_text,
+            "Page 0",
+        )
+
+        self.assertEqual(results["created"], 9)
+
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+        self.assertGreaterEqual(len(progress), 2)
+
+    def test_existing_units_are_skipped_or_recreated(self):  # noqa: C901
+        """Existing units are kept unless reseeding is forced."""
+
+        self.units().delete()
+
+        _seed_page_translation_units(self.locale_nl)
+
+        unit = self.units().get(object_id=self.sources[0].pk, field="title")
+
+        unit.status = "approved"
+        unit.target_text = "Pagina 0"
+        unit.save()
+
+        with self.assertNumQueries(5):
+            results = _seed_page_translation_units(self.locale_nl)
+
+        self.assertEqual(results, {"created": 0, "skipped": 9})
+
+        unit.refresh_from_db()
+
+        self.assertEqual(unit.status, "approved")
+
+        results = _seed_page_translation_units(self.locale_nl, force_reseed=True)
+
+        self.assertEqual(results, {"created": 9, "skipped": 0})
+
+        reseeded = self.units().get(object_id=self.sources[0].pk, field="title")
+
+        self.assertEqual(reseeded.pk, unit.pk)
+
+        self.assertEqual(reseeded.status, "missing")
+
+        self.assertEqual(reseeded.target_text, "Pagina 0")
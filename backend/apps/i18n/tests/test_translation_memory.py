@@ -0,0 +1,197 @@
+"""Tests for batched machine translation and the translation memory."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+from django.test import TestCase, override_settings
+
+from apps.i18n.models import Locale, TranslationMemory, UiMessage, UiMessageTranslation
+from apps.i18n.services import DeepLTranslationService, source_hash
+from apps.i18n.tasks import bulk_auto_translate_ui_messages
+
+
+class StubDeepLServer:
+    """Local DeepL stand-in translating texts to upper case."""
+
+    def __init__(self):
+
+        self.requests = []
+
+        self.throttle = 0
+
+        # Raw body sent instead of the translations, for malformed responses
+
+        self.body = None
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):  # noqa: N802
+
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+
+                form = parse_qs(body.decode("utf-8"))
+
+                if stub.throttle:
+
+                    stub.throttle -= 1
+
+                    self.send_response(429)
+
+                    self.send_header("Retry-After", "0")
+
+                    self.end_headers()
+
+                    return
+
+                stub.requests.append(form)
+
+                payload = stub.body or json.dumps(
+                    {"translations": [{"text": text.upper()} for text in form["text"]]}
+                ).encode("utf-8")
+
+                self.send_response(200)
+
+                self.send_header("Content-Type", "application/json")
+
+                self.send_header("Content-Length", str(len(payload)))
+
+                self.end_headers()
+
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v2"
+
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+
+        self.server.shutdown()
+
+        self.server.server_close()
+
+
+class BatchedTranslationTest(TestCase):
+    """Test batched DeepL requests behind the translation memory."""
+
+    def setUp(self):  # noqa: C901
+        """Start the stub server and point the service at it."""
+
+        self.stub = StubDeepLServer()
+
+        self.addCleanup(self.stub.close)
+
+        settings_override = override_settings(
+            DEEPL_API_KEY="test-key",
+            DEEPL_API_URL=self.stub.url,
+            DEEPL_BATCH_SIZE=2,
+            DEEPL_REQUESTS_PER_SECOND=0,
+        )
+
+        settings_override.enable()
+
+        self.addCleanup(settings_override.disable)
+
+    def test_texts_are_batched_deduplicated_and_remembered(self):  # noqa: C901
+        """Repeated texts are sent once and remembered for later calls."""
+
+        service = DeepLTranslationService()
+
+        self.assertEqual(
+            service.translate_many(["home", "menu", "home", "", "search"], "en", "es"),
+            ["HOME", "MENU", "HOME", None, "SEARCH"],
+        )
+
+        self.assertEqual(
+            sorted(len(form["text"]) for form in self.stub.requests), [1, 2]
+        )
+
+        self.assertEqual(self.stub.requests[0]["target_lang"], ["ES"])
+
+        self.assertTrue(
+            TranslationMemory.objects.filter(
+                source_hash=source_hash("home"), source_lang="EN", target_lang="ES"
+            ).exists()
+        )
+
+        self.stub.requests.clear()
+
+        self.assertEqual(service.translate("search", "en", "es"), "SEARCH")
+
+        self.assertEqual(
+            service.translate_many(["menu", "login"], "en", "es"), ["MENU", "LOGIN"]
+        )
+
+        self.assertEqual([form["text"] for form in self.stub.requests], [["login"]])
+
+    def test_throttled_requests_are_retried(self):  # noqa: C901
+        """A 429 response is retried after its Retry-After delay."""
+
+        self.stub.throttle = 1
+
+        self.assertEqual(
+            DeepLTranslationService().translate("welcome", "en", "fr"), "WELCOME"
+        )
+
+    def test_malformed_responses_fail_the_batch(self):  # noqa: C901
+        """Undecodable or oddly shaped responses count as failed translations."""
+
+        service = DeepLTranslationService()
+
+        for body in (b"<html>", b"[]", b'{"translations": ["HOME"]}'):
+            with self.subTest(body=body):
+
+                self.stub.body = body
+
+                self.assertIsNone(service.translate("home", "en", "de"))
+
+                self.assertEqual(
+                    service.translate_many(["home", "menu"], "en", "de"), [None, None]
+                )
+
+        self.assertFalse(TranslationMemory.objects.filter(target_lang="DE").exists())
+
+    def test_bulk_ui_translation_uses_one_request_per_batch(self):  # noqa: C901
+        """UI messages are translated in batches and saved in bulk."""
+
+        Locale.objects.get_or_create(
+            code="en",
+            defaults={"name": "English", "native_name": "English", "is_default": True},
+        )
+
+        target_locale, _ = Locale.objects.get_or_create(
+            code="es", defaults={"name": "Spanish", "native_name": "Español"}
+        )
+
+        for i, value in enumerate(["Save", "Cancel", "Save", ""]):
+            UiMessage.objects.create(
+                key=f"memory.test.{i}", namespace="memory", default_value=value
+            )
+
+        with patch.object(bulk_auto_translate_ui_messages, "update_state"):
+            results = bulk_auto_translate_ui_messages(
+                locale_code="es", namespace="memory"
+            )
+
+        self.assertEqual(results["details"]["translated"], 3)
+
+        self.assertEqual(results["details"]["skipped"], 1)
+
+        self.assertEqual(len(self.stub.requests), 1)
+
+        self.assertEqual(
+            sorted(
+                UiMessageTranslation.objects.filter(
+                    locale=target_locale, message__namespace="memory"
+                ).values_list("value", flat=True)
+            ),
+            ["CANCEL", "SAVE", "SAVE"],
+        )
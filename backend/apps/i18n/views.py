@@ -15,6 +15,8 @@ from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.conditional import make_etag, not_modified
+
 from .models import (
     Locale,
     TranslationGlossary,
@@ -1228,6 +1230,32 @@ class UiMessageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+        # Validators from aggregates rather than version counters: message
+        # imports and syncs use bulk_create, which sends no signals
+
+        message_state = UiMessage.objects.aggregate(
+            count=models.Count("id"), updated=models.Max("updated_at")
+        )
+
+        translation_state = UiMessageTranslation.objects.filter(
+            locale=locale, status="approved"
+        ).aggregate(count=models.Count("id"), updated=models.Max("updated_at"))
+
+        etag = make_etag(
+            "ui_bundle",
+            locale.pk,
+            message_state["count"],
+            message_state["updated"],
+            translation_state["count"],
+            translation_state["updated"],
+        )
+
+        not_modified_response = not_modified(request, etag)
+
+        if not_modified_response is not None:
+
+            return not_modified_response
+
         # Get all messages with translations for this locale
 
         messages = {}
@@ -1250,7 +1278,11 @@ class UiMessageViewSet(viewsets.ModelViewSet):
 
                 messages[ui_message.key] = ui_message.default_value
 
-        return Response(messages)
+        response = Response(messages)
+
+        response["ETag"] = etag
+
+        return response
 
     @extend_schema(
         summary="Sync translation keys from frontend",
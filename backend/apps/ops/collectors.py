@@ -0,0 +1,149 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+"""Prometheus metric families with precomputed snapshots.
+
+Each family declares how often it needs recomputing. Families with an
+interval are computed by the ``refresh_metrics`` task and kept in the cache,
+so a scrape only reads their snapshots, whichever process serves it.
+Families without an interval (per-process state, host metrics) are rendered
+on every scrape.
+
+Snapshots expire after ``STALE_FACTOR`` intervals: if the refresher stops,
+the next scrape computes the family itself rather than serving old values.
+"""
+
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_PREFIX = "ops:metrics"
+
+STALE_FACTOR = 3
+
+
+def get_snapshot_cache():
+    return caches[getattr(settings, "OPS_METRICS_CACHE", "default")]
+
+
+@dataclass(frozen=True)
+class Collector:
+    """A metric family: ``collect`` returns its exposition lines, or None."""
+
+    name: str
+
+    collect: Callable[[], Optional[List[str]]]
+
+    interval: float = 0
+
+    @property
+    def is_live(self) -> bool:
+        return not self.interval
+
+
+class CollectorRegistry:
+    """Ordered metric families and their cached snapshots."""
+
+    def __init__(self, prefix: str = SNAPSHOT_PREFIX):
+
+        self.prefix = prefix
+
+        self._collectors: Dict[str, Collector] = {}
+
+    def register(self, name: str, interval: float = 0):
+        """Decorator registering a family recomputed every ``interval`` seconds."""
+
+        def decorator(func):
+
+            self._collectors[name] = Collector(name, func, interval)
+
+            return func
+
+        return decorator
+
+    def collect(self) -> List[str]:
+        """Exposition lines of all families, from snapshots where possible."""
+
+        snapshots = get_snapshot_cache().get_many(
+            [self._key(c.name) for c in self._collectors.values() if not c.is_live]
+        )
+
+        lines: List[str] = []
+
+        for collector in self._collectors.values():
+
+            snapshot = snapshots.get(self._key(collector.name))
+
+            if snapshot is not None:
+                lines.extend(snapshot["lines"])
+
+            else:
+                lines.extend(self._compute(collector) or [])
+
+        return lines
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """Recompute the snapshots that are due; returns their names."""
+
+        cached = [c for c in self._collectors.values() if not c.is_live]
+
+        snapshots = get_snapshot_cache().get_many([self._key(c.name) for c in cached])
+
+        now = time.time()
+
+        refreshed = []
+
+        for collector in cached:
+
+            snapshot = snapshots.get(self._key(collector.name))
+
+            if (
+                force
+                or snapshot is None
+                or now - snapshot["collected_at"] >= collector.interval
+            ):
+
+                try:
+                    lines = self._compute(collector)
+
+                except Exception as e:
+                    logger.warning(
+                        "Failed to refresh %s metrics: %s", collector.name, e
+                    )
+
+                    continue
+
+                if lines is not None:
+                    refreshed.append(collector.name)
+
+        return refreshed
+
+    def clear(self) -> None:
+        """Drop all snapshots."""
+
+        get_snapshot_cache().delete_many([self._key(name) for name in self._collectors])
+
+    def _compute(self, collector: Collector) -> Optional[List[str]]:
+
+        lines = collector.collect()
+
+        # Failed families are not cached, so the next scrape tries again
+        if lines is not None and not collector.is_live:
+            get_snapshot_cache().set(
+                self._key(collector.name),
+                {"lines": lines, "collected_at": time.time()},
+                collector.interval * STALE_FACTOR,
+            )
+
+        return lines
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+
+metrics_registry = CollectorRegistry()
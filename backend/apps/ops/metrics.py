@@ -3,6 +3,7 @@
 import logging
 import time
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db import connection
@@ -11,246 +12,326 @@ from django.http import HttpResponse
 import psutil
 
 from apps.api.models import Note
+from apps.core.query_instrumentation import query_metrics
+from apps.core.request_stats import request_stats
 from apps.emails.models import EmailMessageLog
 from apps.files.models import FileUpload
 
+from .collectors import metrics_registry
+
 logger = logging.getLogger(__name__)
 
 
 User = get_user_model()
 
 
-def prometheus_metrics(request):
-    """Prometheus metrics endpoint"""
+# Tables with more rows (by the planner's estimate) are not counted exactly
+
+EXACT_COUNT_LIMIT = 100_000
+
+
+def table_count(model) -> int:
+    """Row count of ``model``'s table, estimated for large PostgreSQL tables."""
+
+    if connection.vendor == "postgresql":
+
+        with connection.cursor() as cursor:
+
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [model._meta.db_table],
+            )
+
+            row = cursor.fetchone()
+
+        # reltuples is -1 for tables never analyzed
+        if row and row[0] >= getattr(
+            settings, "OPS_METRICS_EXACT_COUNT_LIMIT", EXACT_COUNT_LIMIT
+        ):
+            return int(row[0])
 
-    metrics = []
+    return model.objects.count()
 
-    # Add application metrics
+
+@metrics_registry.register("users", interval=60)
+def user_metrics():
+
+    # Not caught: a failure here means the database is unavailable
+
+    total_users = table_count(User)
+
+    active_users = User.objects.filter(is_active=True).count()
+
+    return [
+        "# HELP django_users_total Total number of users",
+        "# TYPE django_users_total counter",
+        f"django_users_total {total_users}",
+        "",
+        "# HELP django_users_active Number of active users",
+        "# TYPE django_users_active gauge",
+        f"django_users_active {active_users}",
+        "",
+    ]
+
+
+@metrics_registry.register("notes", interval=60)
+def note_metrics():
 
     try:
 
-        # User metrics
+        total_notes = table_count(Note)
+
+        public_notes = Note.objects.filter(is_public=True).count()
+
+    except Exception as e:
 
-        total_users = User.objects.count()
+        logger.warning("Failed to collect notes metrics: %s", e)
 
-        active_users = User.objects.filter(is_active=True).count()
+        return None
 
-        metrics.extend(
-            [
-                "# HELP django_users_total Total number of users",
-                "# TYPE django_users_total counter",
-                f"django_users_total {total_users}",
-                "",
-                "# HELP django_users_active Number of active users",
-                "# TYPE django_users_active gauge",
-                f"django_users_active {active_users}",
-                "",
-            ]
-        )
+    return [
+        "# HELP django_notes_total Total number of notes",
+        "# TYPE django_notes_total counter",
+        f"django_notes_total {total_notes}",
+        "",
+        "# HELP django_notes_public Number of public notes",
+        "# TYPE django_notes_public gauge",
+        f"django_notes_public {public_notes}",
+        "",
+    ]
 
-        # Note metrics
 
-        try:
+@metrics_registry.register("emails", interval=60)
+def email_metrics():
 
-            total_notes = Note.objects.count()
+    try:
 
-            public_notes = Note.objects.filter(is_public=True).count()
+        total_emails = table_count(EmailMessageLog)
 
-            metrics.extend(
-                [
-                    "# HELP django_notes_total Total number of notes",
-                    "# TYPE django_notes_total counter",
-                    f"django_notes_total {total_notes}",
-                    "",
-                    "# HELP django_notes_public Number of public notes",
-                    "# TYPE django_notes_public gauge",
-                    f"django_notes_public {public_notes}",
-                    "",
-                ]
-            )
+        sent_emails = EmailMessageLog.objects.filter(status="sent").count()
 
-        except Exception as e:
+        failed_emails = EmailMessageLog.objects.filter(status="failed").count()
 
-            logger.warning("Failed to collect notes metrics: %s", e)
+    except Exception as e:
 
-        # Email metrics
+        logger.warning("Failed to collect email metrics: %s", e)
 
-        try:
+        return None
 
-            total_emails = EmailMessageLog.objects.count()
+    return [
+        "# HELP django_emails_total Total number of emails",
+        "# TYPE django_emails_total counter",
+        f"django_emails_total {total_emails}",
+        "",
+        "# HELP django_emails_sent Number of sent emails",
+        "# TYPE django_emails_sent counter",
+        f"django_emails_sent {sent_emails}",
+        "",
+        "# HELP django_emails_failed Number of failed emails",
+        "# TYPE django_emails_failed counter",
+        f"django_emails_failed {failed_emails}",
+        "",
+    ]
 
-            sent_emails = EmailMessageLog.objects.filter(status="sent").count()
 
-            failed_emails = EmailMessageLog.objects.filter(status="failed").count()
+@metrics_registry.register("files", interval=300)
+def file_metrics():
 
-            metrics.extend(
-                [
-                    "# HELP django_emails_total Total number of emails",
-                    "# TYPE django_emails_total counter",
-                    f"django_emails_total {total_emails}",
-                    "",
-                    "# HELP django_emails_sent Number of sent emails",
-                    "# TYPE django_emails_sent counter",
-                    f"django_emails_sent {sent_emails}",
-                    "",
-                    "# HELP django_emails_failed Number of failed emails",
-                    "# TYPE django_emails_failed counter",
-                    f"django_emails_failed {failed_emails}",
-                    "",
-                ]
-            )
+    try:
 
-        except Exception as e:
+        total_files = table_count(FileUpload)
 
-            logger.warning("Failed to collect notes metrics: %s", e)
+        public_files = FileUpload.objects.filter(is_public=True).count()
 
-        # FileUpload metrics
+        image_files = FileUpload.objects.filter(file_type="IMAGE").count()
 
-        try:
+        document_files = FileUpload.objects.filter(file_type="DOCUMENT").count()
 
-            total_files = FileUpload.objects.count()
+    except Exception as e:
 
-            public_files = FileUpload.objects.filter(is_public=True).count()
+        logger.warning("Failed to collect file metrics: %s", e)
 
-            image_files = FileUpload.objects.filter(file_type="IMAGE").count()
+        return None
 
-            document_files = FileUpload.objects.filter(file_type="DOCUMENT").count()
+    return [
+        "# HELP django_files_total Total number of uploaded files",
+        "# TYPE django_files_total counter",
+        f"django_files_total {total_files}",
+        "",
+        "# HELP django_files_public Number of public files",
+        "# TYPE django_files_public gauge",
+        f"django_files_public {public_files}",
+        "",
+        "# HELP django_files_images Number of image files",
+        "# TYPE django_files_images gauge",
+        f"django_files_images {image_files}",
+        "",
+        "# HELP django_files_documents Number of document files",
+        "# TYPE django_files_documents gauge",
+        f"django_files_documents {document_files}",
+        "",
+    ]
 
-            metrics.extend(
-                [
-                    "# HELP django_files_total Total number of uploaded files",
-                    "# TYPE django_files_total counter",
-                    f"django_files_total {total_files}",
-                    "",
-                    "# HELP django_files_public Number of public files",
-                    "# TYPE django_files_public gauge",
-                    f"django_files_public {public_files}",
-                    "",
-                    "# HELP django_files_images Number of image files",
-                    "# TYPE django_files_images gauge",
-                    f"django_files_images {image_files}",
-                    "",
-                    "# HELP django_files_documents Number of document files",
-                    "# TYPE django_files_documents gauge",
-                    f"django_files_documents {document_files}",
-                    "",
-                ]
-            )
 
-        except Exception as e:
+@metrics_registry.register("database")
+def database_metrics():
 
-            logger.warning("Failed to collect file metrics: %s", e)
+    # Probed on every scrape: a cached latency would report stale values
 
-        # Database connection metrics
+    try:
 
-        try:
+        db_start = time.time()
 
-            db_start = time.time()
+        with connection.cursor() as cursor:
 
-            with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
 
-                cursor.execute("SELECT 1")
+        db_duration = time.time() - db_start
 
-            db_duration = time.time() - db_start
+    except Exception as e:
 
-            metrics.extend(
-                [
-                    "# HELP django_db_connection_duration_seconds Database connection duration",
-                    "# TYPE django_db_connection_duration_seconds histogram",
-                    f"django_db_connection_duration_seconds {db_duration:.6f}",
-                    "",
-                ]
-            )
+        logger.warning("Failed to collect database metrics: %s", e)
 
-        except Exception as e:
+        return None
 
-            logger.warning("Failed to collect notes metrics: %s", e)
+    return [
+        "# HELP django_db_connection_duration_seconds Database connection duration",
+        "# TYPE django_db_connection_duration_seconds histogram",
+        f"django_db_connection_duration_seconds {db_duration:.6f}",
+        "",
+    ]
 
-        # Cache metrics (if Redis/cache available)
 
-        try:
+@metrics_registry.register("cache")
+def cache_metrics():
 
-            cache_start = time.time()
+    # Probed on every scrape, like the database latency
 
-            cache.set("metrics_test", "test_value", 10)
+    try:
 
-            cache_result = cache.get("metrics_test")
+        cache_start = time.time()
 
-            cache_duration = time.time() - cache_start
+        cache.set("metrics_test", "test_value", 10)
 
-            cache_status = 1 if cache_result == "test_value" else 0
+        cache_result = cache.get("metrics_test")
 
-            metrics.extend(
-                [
-                    "# HELP django_cache_status Cache availability status",
-                    "# TYPE django_cache_status gauge",
-                    f"django_cache_status {cache_status}",
-                    "",
-                    "# HELP django_cache_duration_seconds Cache operation duration",
-                    "# TYPE django_cache_duration_seconds histogram",
-                    f"django_cache_duration_seconds {cache_duration:.6f}",
-                    "",
-                ]
-            )
+        cache_duration = time.time() - cache_start
 
-        except Exception as e:
+    except Exception as e:
 
-            logger.warning("Failed to collect notes metrics: %s", e)
+        logger.warning("Failed to collect cache metrics: %s", e)
 
-        # System uptime (approximate)
+        return None
 
-        try:
+    cache_status = 1 if cache_result == "test_value" else 0
 
-            boot_time = psutil.boot_time()
+    return [
+        "# HELP django_cache_status Cache availability status",
+        "# TYPE django_cache_status gauge",
+        f"django_cache_status {cache_status}",
+        "",
+        "# HELP django_cache_duration_seconds Cache operation duration",
+        "# TYPE django_cache_duration_seconds histogram",
+        f"django_cache_duration_seconds {cache_duration:.6f}",
+        "",
+    ]
+
+
+@metrics_registry.register("queries")
+def query_metrics_lines():
 
-            uptime = time.time() - boot_time
+    # Per-view query histograms recorded in this process
 
-            # Memory usage
+    try:
 
-            memory = psutil.virtual_memory()
+        return query_metrics.render_prometheus()
 
-            memory_percent = memory.percent
+    except Exception as e:
 
-            memory_available = memory.available
+        logger.warning("Failed to collect query metrics: %s", e)
 
-            memory_total = memory.total
+        return None
 
-            # CPU usage
 
-            cpu_percent = psutil.cpu_percent()
+@metrics_registry.register("requests")
+def request_stats_lines():
 
-            metrics.extend(
-                [
-                    "# HELP system_uptime_seconds System uptime in seconds",
-                    "# TYPE system_uptime_seconds counter",
-                    f"system_uptime_seconds {uptime:.0f}",
-                    "",
-                    "# HELP system_memory_usage_percent Memory usage percentage",
-                    "# TYPE system_memory_usage_percent gauge",
-                    f"system_memory_usage_percent {memory_percent}",
-                    "",
-                    "# HELP system_memory_available_bytes Available memory in bytes",
-                    "# TYPE system_memory_available_bytes gauge",
-                    f"system_memory_available_bytes {memory_available}",
-                    "",
-                    "# HELP system_memory_total_bytes Total memory in bytes",
-                    "# TYPE system_memory_total_bytes gauge",
-                    f"system_memory_total_bytes {memory_total}",
-                    "",
-                    "# HELP system_cpu_usage_percent CPU usage percentage",
-                    "# TYPE system_cpu_usage_percent gauge",
-                    f"system_cpu_usage_percent {cpu_percent}",
-                    "",
-                ]
-            )
+    # Request and response cache counters recorded by the middlewares
+
+    try:
+
+        return request_stats.render_prometheus()
+
+    except Exception as e:
+
+        logger.warning("Failed to collect request stats: %s", e)
+
+        return None
+
+
+@metrics_registry.register("system")
+def system_metrics():
+
+    # Host metrics of the process serving the scrape
+
+    try:
 
-        except ImportError:
-            # psutil not available
-            pass
+        boot_time = psutil.boot_time()
 
-        except Exception as e:
+        uptime = time.time() - boot_time
+
+        # Memory usage
+
+        memory = psutil.virtual_memory()
+
+        memory_percent = memory.percent
+
+        memory_available = memory.available
+
+        memory_total = memory.total
+
+        # CPU usage
+
+        cpu_percent = psutil.cpu_percent()
+
+    except Exception as e:
+
+        logger.warning("Failed to collect system metrics: %s", e)
+
+        return None
+
+    return [
+        "# HELP system_uptime_seconds System uptime in seconds",
+        "# TYPE system_uptime_seconds counter",
+        f"system_uptime_seconds {uptime:.0f}",
+        "",
+        "# HELP system_memory_usage_percent Memory usage percentage",
+        "# TYPE system_memory_usage_percent gauge",
+        f"system_memory_usage_percent {memory_percent}",
+        "",
+        "# HELP system_memory_available_bytes Available memory in bytes",
+        "# TYPE system_memory_available_bytes gauge",
+        f"system_memory_available_bytes {memory_available}",
+        "",
+        "# HELP system_memory_total_bytes Total memory in bytes",
+        "# TYPE system_memory_total_bytes gauge",
+        f"system_memory_total_bytes {memory_total}",
+        "",
+        "# HELP system_cpu_usage_percent CPU usage percentage",
+        "# TYPE system_cpu_usage_percent gauge",
+        f"system_cpu_usage_percent {cpu_percent}",
+        "",
+    ]
+
+
+def prometheus_metrics(request):
+    """Prometheus metrics endpoint"""
+
+    # Serializes the snapshots kept fresh by the refresh_metrics task
+
+    try:
 
-            logger.warning("Failed to collect notes metrics: %s", e)
+        metrics = metrics_registry.collect()
 
     except Exception as e:
 
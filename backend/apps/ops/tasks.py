@@ -306,3 +306,14 @@ def health_check_task():  # noqa: C901
         logger.error("Health check task failed: %s", str(e))
 
         return {"success": False, "error": str(e)}
+
+
+@shared_task(name="apps.ops.tasks.refresh_metrics")
+def refresh_metrics():
+    """Recompute the Prometheus metric snapshots that are due"""
+
+    from .metrics import metrics_registry
+
+    refreshed = metrics_registry.refresh()
+
+    return {"refreshed": refreshed}
@@ -0,0 +1,89 @@
+"""Tests for the cached Prometheus collector registry."""
+
+import os
+from unittest.mock import Mock
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from apps.ops.collectors import CollectorRegistry, metrics_registry
+from apps.ops.metrics import prometheus_metrics
+from apps.ops.tasks import refresh_metrics
+
+User = get_user_model()
+
+
+class CollectorRegistryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.registry = CollectorRegistry(prefix="test-metrics")
+
+        self.counted = Mock(return_value=["counted 1"])
+
+        self.live = Mock(return_value=["live 1"])
+
+        self.registry.register("counted", interval=60)(self.counted)
+
+        self.registry.register("live")(self.live)
+
+    def test_snapshots_are_served_until_due(self):
+        self.assertEqual(self.registry.collect(), ["counted 1", "live 1"])
+
+        self.counted.return_value = ["counted 2"]
+
+        self.assertEqual(self.registry.collect(), ["counted 1", "live 1"])
+
+        self.assertEqual(self.counted.call_count, 1)
+
+        self.assertEqual(self.live.call_count, 2)
+
+        self.assertEqual(self.registry.refresh(), [])
+
+        self.assertEqual(self.registry.refresh(force=True), ["counted"])
+
+        self.assertEqual(self.registry.collect(), ["counted 2", "live 1"])
+
+    def test_failed_families_are_not_cached(self):
+        self.counted.return_value = None
+
+        self.assertEqual(self.registry.collect(), ["live 1"])
+
+        self.assertEqual(self.registry.refresh(), [])
+
+        self.counted.return_value = ["counted 1"]
+
+        self.assertEqual(self.registry.refresh(), ["counted"])
+
+
+class PrometheusSnapshotTests(TestCase):
+    def setUp(self):
+        metrics_registry.clear()
+
+        User.objects.create_user(email="snapshot@example.com", password="pass")
+
+    def test_scrape_after_refresh_only_probes_the_database(self):
+        self.assertIn("users", refresh_metrics()["refreshed"])
+
+        # The latency probe is the only query
+        with self.assertNumQueries(1):
+            response = prometheus_metrics(RequestFactory().get("/metrics/"))
+
+        content = response.content.decode("utf-8")
+
+        self.assertIn("django_users_total 1", content)
+
+        self.assertIn("system_cpu_usage_percent", content)
+
+        self.assertIn("django_db_connection_duration_seconds", content)
+
+        self.assertNotIn("database", refresh_metrics()["refreshed"])
@@ -23,6 +23,7 @@ from django.test import RequestFactory, TestCase, override_settings
 from django.utils import timezone
 
 from apps.ops import tasks, views
+from apps.ops.collectors import metrics_registry
 from apps.ops.metrics import prometheus_metrics
 
 User = get_user_model()
@@ -139,6 +140,7 @@ class PrometheusMetricsTestCase(TestCase):
         self.user = User.objects.create_user(
             email="testuser@example.com", password="testpass123"
         )
+        metrics_registry.clear()
 
     @patch("apps.ops.metrics.User")
     def test_prometheus_metrics_user_metrics(self, mock_user_model):
@@ -272,11 +274,18 @@ class PrometheusMetricsTestCase(TestCase):
         self.assertTrue(len(help_lines) > 0)
         self.assertTrue(len(type_lines) > 0)
 
-        # Each metric should have both HELP and TYPE
+        # Each metric family should have both HELP and TYPE
+        histograms = {
+            line.split()[2] for line in type_lines if line.split()[-1] == "histogram"
+        }
         metrics = set()
         for line in lines:
             if not line.startswith("#") and line.strip():
-                metric_name = line.split()[0]
+                metric_name = line.split()[0].split("{")[0]
+                for suffix in ("_bucket", "_sum", "_count"):
+                    family = metric_name[: -len(suffix)]
+                    if metric_name.endswith(suffix) and family in histograms:
+                        metric_name = family
                 metrics.add(metric_name)
 
         for metric in metrics:
@@ -589,3 +598,4 @@ class ErrorHandlingTestCase(TestCase):
     def setUp(self):
         """Set up test data."""
         self.factory = RequestFactory()
+        metrics_registry.clear()
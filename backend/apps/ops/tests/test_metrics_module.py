@@ -11,6 +11,7 @@ from django.contrib.auth import get_user_model
 from django.http import HttpRequest, HttpResponse
 from django.test import RequestFactory, TestCase
 
+from apps.ops.collectors import metrics_registry
 from apps.ops.metrics import prometheus_metrics
 
 User = get_user_model()
@@ -22,6 +23,7 @@ class PrometheusMetricsTestCase(TestCase):
     def setUp(self):
         """Set up test data."""
         self.factory = RequestFactory()
+        metrics_registry.clear()
 
         # Create test users
         self.active_user = User.objects.create_user(
@@ -312,6 +314,7 @@ class MetricsIntegrationTestCase(TestCase):
     def setUp(self):
         """Set up integration test data."""
         self.factory = RequestFactory()
+        metrics_registry.clear()
 
     def test_metrics_endpoint_integration(self):
         """Test full metrics endpoint integration."""
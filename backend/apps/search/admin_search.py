@@ -0,0 +1,624 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When, Window
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
+
+from apps.blog.models import BlogPost
+from apps.blog.models import Category as BlogCategory
+from apps.blog.models import Tag as BlogTag
+from apps.cms.model_parts.category import Category, Collection
+from apps.cms.models import Page, Redirect
+from apps.files.models import FileUpload
+from apps.i18n.models import Locale, TranslationUnit
+
+from .models import AdminSearchDocument
+
+"""
+Unified search index for the dashboard search bar.
+
+Every searchable admin object has one ``AdminSearchDocument`` row holding
+its lower-cased searchable text and its pre-rendered result payload, kept in
+sync by signals. Substring matches are served by a ``pg_trgm`` GIN index on
+PostgreSQL and by per-type FTS5 trigram tables on SQLite, and a single
+windowed query returns the top-N results per type (on SQLite, ranked among
+each type's newest matches).
+
+Payloads showing related rows (a post's author, a page's locale, a
+collection's item count) are refreshed when those rows change, through each
+type's ``dependencies``.
+
+Rows changed with ``QuerySet.update()`` bypass the signals; run
+``manage.py search_index --rebuild-admin`` after such bulk changes.
+"""
+
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+@dataclass(frozen=True)
+class SearchDependency:
+    """A related model shown in the rendered results of a search type.
+
+    Saving a ``model`` row that changes one of ``fields``, or deleting it,
+    refreshes the documents reaching it through ``lookup``.
+    """
+
+    model: Any
+
+    lookup: str
+
+    fields: Sequence[str] = ()
+
+
+@dataclass(frozen=True)
+class AdminSearchType:
+    """A model searchable from the dashboard search bar."""
+
+    key: str
+
+    model: Any
+
+    fields: Sequence[str]
+
+    render: Callable[[Any], Dict[str, Any]]
+
+    select_related: Sequence[str] = ()
+
+    staff_only: bool = False
+
+    dependencies: Sequence[SearchDependency] = ()
+
+    def get_queryset(self):
+
+        queryset = self.model._default_manager.select_related(*self.select_related)
+
+        if self.model is Collection:
+            queryset = queryset.annotate(item_count=Count("categories"))
+
+        return queryset
+
+
+def render_page(page) -> Dict[str, Any]:
+    return {
+        "id": page.id,
+        "title": page.title,
+        "type": "page",
+        "icon": "📄",
+        "description": f"Path: {page.path}",
+        "url": f"/dashboard/pages/{page.id}/edit",
+        "status": page.status,
+        "locale": page.locale.code if page.locale else None,
+    }
+
+
+def render_blog_post(post) -> Dict[str, Any]:
+    return {
+        "id": post.id,
+        "title": post.title,
+        "type": "blog_post",
+        "icon": "📝",
+        "description": post.excerpt[:100] if post.excerpt else "",
+        "url": f"/dashboard/blog-posts/{post.id}/edit",
+        "status": post.status,
+        "author": post.author.get_full_name() if post.author else None,
+    }
+
+
+def render_media(file) -> Dict[str, Any]:
+    return {
+        "id": str(file.id),
+        "title": file.original_filename,
+        "type": "media",
+        "icon": "🖼️",
+        "description": f"Type: {file.file_type}, Size: {file.file_size} bytes",
+        "url": f"/dashboard/media?file={file.id}",
+        "file_type": file.file_type,
+        "is_public": file.is_public,
+    }
+
+
+def render_collection(collection) -> Dict[str, Any]:
+
+    item_count = getattr(collection, "item_count", None)
+
+    if item_count is None:
+        item_count = collection.categories.count()
+
+    return {
+        "id": collection.id,
+        "title": collection.name,
+        "type": "collection",
+        "icon": "📁",
+        "description": collection.description[:100] if collection.description else "",
+        "url": f"/dashboard/collections?id={collection.id}",
+        "status": collection.status,
+        "item_count": item_count,
+    }
+
+
+def render_category(category) -> Dict[str, Any]:
+    return {
+        "id": category.id,
+        "title": category.name,
+        "type": "category",
+        "icon": "🏷️",
+        "description": category.description[:100] if category.description else "",
+        "url": f"/dashboard/categories?id={category.id}",
+        "color": category.color,
+    }
+
+
+def render_tag(tag) -> Dict[str, Any]:
+    return {
+        "id": tag.id,
+        "title": tag.name,
+        "type": "tag",
+        "icon": "🔖",
+        "description": tag.description[:100] if tag.description else "",
+        "url": f"/dashboard/tags?id={tag.id}",
+        "color": tag.color,
+    }
+
+
+def render_translation(translation) -> Dict[str, Any]:
+    return {
+        "id": translation.id,
+        "title": translation.key,
+        "type": "translation",
+        "icon": "🌐",
+        "description": (
+            f"{translation.source_text[:50]}... → {translation.target_text[:50]}..."
+            if translation.target_text
+            else translation.source_text[:100]
+        ),
+        "url": f"/dashboard/translations/workspace?id={translation.id}",
+        "status": translation.status,
+        "locales": f"{translation.source_locale.code} → {translation.target_locale.code}",
+    }
+
+
+def render_redirect(redirect) -> Dict[str, Any]:
+    return {
+        "id": redirect.id,
+        "title": redirect.from_path,
+        "type": "redirect",
+        "icon": "↪️",
+        "description": f"→ {redirect.to_path}",
+        "url": f"/dashboard/seo/redirects?id={redirect.id}",
+        "status": redirect.status,
+    }
+
+
+def render_user(user) -> Dict[str, Any]:
+    return {
+        "id": user.id,
+        "title": user.get_full_name() or user.email,
+        "type": "user",
+        "icon": "👤",
+        "description": user.email,
+        "url": f"/dashboard/users-roles?user={user.id}",
+        "is_active": user.is_active,
+    }
+
+
+SEARCH_TYPES = [
+    AdminSearchType(
+        "pages",
+        Page,
+        ("title", "path", "slug"),
+        render_page,
+        ("locale",),
+        dependencies=(SearchDependency(Locale, "locale", ("code",)),),
+    ),
+    AdminSearchType(
+        "blog_posts",
+        BlogPost,
+        ("title", "excerpt", "content"),
+        render_blog_post,
+        ("author",),
+        dependencies=(SearchDependency(User, "author", ("first_name", "last_name")),),
+    ),
+    AdminSearchType(
+        "media", FileUpload, ("original_filename", "description"), render_media
+    ),
+    AdminSearchType(
+        "collections",
+        Collection,
+        ("name", "description"),
+        render_collection,
+        # Deleted categories drop out of the item count
+        dependencies=(SearchDependency(Category, "categories"),),
+    ),
+    AdminSearchType(
+        "categories", BlogCategory, ("name", "description"), render_category
+    ),
+    AdminSearchType("tags", BlogTag, ("name", "description"), render_tag),
+    AdminSearchType(
+        "translations",
+        TranslationUnit,
+        ("key", "source_text", "target_text"),
+        render_translation,
+        ("source_locale", "target_locale"),
+        dependencies=(
+            SearchDependency(Locale, "source_locale", ("code",)),
+            SearchDependency(Locale, "target_locale", ("code",)),
+        ),
+    ),
+    AdminSearchType("redirects", Redirect, ("from_path", "to_path"), render_redirect),
+    AdminSearchType(
+        "users",
+        User,
+        ("email", "first_name", "last_name"),
+        render_user,
+        staff_only=True,
+    ),
+]
+
+
+def get_types() -> List[AdminSearchType]:
+    return list(SEARCH_TYPES)
+
+
+def get_type_for_model(model) -> Optional[AdminSearchType]:
+
+    for search_type in SEARCH_TYPES:
+        if search_type.model is model:
+            return search_type
+
+    return None
+
+
+def get_dependencies(model) -> List[Tuple[AdminSearchType, SearchDependency]]:
+    """Search types whose rendered results show rows of ``model``."""
+
+    return [
+        (search_type, dependency)
+        for search_type in SEARCH_TYPES
+        for dependency in search_type.dependencies
+        if dependency.model is model
+    ]
+
+
+def dependent_ids(
+    search_type: AdminSearchType, dependency: SearchDependency, related_ids
+) -> List[Any]:
+    """Ids of the ``search_type`` objects related to ``related_ids``."""
+
+    return list(
+        search_type.model._default_manager.filter(
+            **{f"{dependency.lookup}__in": list(related_ids)}
+        )
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+
+
+def uses_trigram_index() -> bool:
+    """PostgreSQL serves substring matches from its ``pg_trgm`` GIN index."""
+
+    return connection.vendor == "postgresql"
+
+
+# SQLite: one external-content FTS5 trigram table per type, synced from the
+# documents table by triggers (so bulk upserts stay in sync too). Separate
+# tables let each type's lookup stop after its newest matches.
+
+FTS_TABLE_PREFIX = "search_adminsearch_fts_"
+
+# FTS5 trigram phrases need at least one full trigram
+
+MIN_INDEXED_QUERY = 3
+
+# On SQLite only the newest matches of each type are ranked, so common
+# queries stop early instead of sorting every match
+
+SQLITE_CANDIDATES_PER_TYPE = 25
+
+_sqlite_index_ready: Set[Tuple[str, str]] = set()
+
+
+def fts_table(doc_type: str) -> str:
+    return f"{FTS_TABLE_PREFIX}{doc_type}"
+
+
+def sqlite_index_sql(doc_type: str) -> List[str]:
+    """DDL creating and filling the FTS5 table of one search type."""
+
+    table = fts_table(doc_type)
+
+    documents = AdminSearchDocument._meta.db_table
+
+    condition = f"WHEN {{}}.doc_type = '{doc_type}'"
+
+    insert = (
+        f"INSERT INTO {table}(rowid, search_text) VALUES (new.id, new.search_text);"
+    )
+
+    delete = (
+        f"INSERT INTO {table}({table}, rowid, search_text) "
+        "VALUES ('delete', old.id, old.search_text);"
+    )
+
+    return [
+        f"CREATE VIRTUAL TABLE {table} USING fts5(search_text, "
+        f"content='{documents}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {table}_ai AFTER INSERT ON {documents} "
+        f"{condition.format('new')} BEGIN {insert} END",
+        f"CREATE TRIGGER {table}_ad AFTER DELETE ON {documents} "
+        f"{condition.format('old')} BEGIN {delete} END",
+        f"CREATE TRIGGER {table}_au AFTER UPDATE OF search_text ON {documents} "
+        f"{condition.format('new')} BEGIN {delete} {insert} END",
+        f"INSERT INTO {table}(rowid, search_text) SELECT id, search_text "
+        f"FROM {documents} WHERE doc_type = '{doc_type}'",
+    ]
+
+
+def install_sqlite_index(conn, types: Optional[Iterable[str]] = None) -> Set[str]:
+    """Create the missing SQLite FTS5 tables of ``types`` (all by default).
+
+    Returns the types whose table is available; SQLite builds without FTS5
+    or the trigram tokenizer (SQLite < 3.34) fall back to scanning.
+    """
+
+    if conn.vendor != "sqlite":
+        return set()
+
+    if types is None:
+        types = [search_type.key for search_type in SEARCH_TYPES]
+
+    ready = set()
+
+    for doc_type in types:
+
+        if (conn.alias, doc_type) in _sqlite_index_ready:
+            ready.add(doc_type)
+            continue
+
+        with conn.cursor() as cursor:
+
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [fts_table(doc_type)],
+            )
+
+            if cursor.fetchone() is None:
+
+                try:
+                    with transaction.atomic(using=conn.alias):
+                        for statement in sqlite_index_sql(doc_type):
+                            cursor.execute(statement)
+                except DatabaseError as e:
+                    logger.warning(f"SQLite trigram index unavailable: {e}")
+
+                    return ready
+
+        _sqlite_index_ready.add((conn.alias, doc_type))
+
+        ready.add(doc_type)
+
+    return ready
+
+
+def build_search_text(obj, fields: Iterable[str]) -> str:
+
+    parts = [str(getattr(obj, name, "") or "") for name in fields]
+
+    return "\n".join(part for part in parts if part).lower()
+
+
+def index_objects(objects: Iterable[Any]) -> int:
+    """Create or refresh the search documents of ``objects``.
+
+    Objects may be of mixed models; unregistered ones are ignored. Returns
+    the number of documents written.
+    """
+
+    by_type: Dict[str, List[AdminSearchDocument]] = {}
+
+    for obj in objects:
+
+        search_type = get_type_for_model(type(obj))
+
+        if search_type is None:
+            continue
+
+        by_type.setdefault(search_type.key, []).append(
+            AdminSearchDocument(
+                doc_type=search_type.key,
+                object_id=str(obj.pk),
+                search_text=build_search_text(obj, search_type.fields),
+                result=search_type.render(obj),
+            )
+        )
+
+    for documents in by_type.values():
+
+        AdminSearchDocument.objects.bulk_create(
+            documents,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["doc_type", "object_id"],
+            update_fields=["search_text", "result", "updated_at"],
+        )
+
+    return sum(len(documents) for documents in by_type.values())
+
+
+def remove_objects(model, object_ids: Iterable[Any]) -> None:
+
+    search_type = get_type_for_model(model)
+
+    if search_type is not None:
+
+        AdminSearchDocument.objects.filter(
+            doc_type=search_type.key, object_id__in=[str(pk) for pk in object_ids]
+        ).delete()
+
+
+def index_queryset(queryset, batch_size: int = 500) -> int:
+    """Refresh the documents of every object in ``queryset``, in batches."""
+
+    count = 0
+
+    batch: List[Any] = []
+
+    for obj in queryset.iterator(chunk_size=batch_size):
+
+        batch.append(obj)
+
+        if len(batch) >= batch_size:
+            count += index_objects(batch)
+            batch = []
+
+    return count + index_objects(batch)
+
+
+def refresh_objects(
+    search_type: AdminSearchType, object_ids: Iterable[Any], batch_size: int = 500
+) -> int:
+    """Refresh the documents of the given ``search_type`` objects."""
+
+    object_ids = list(object_ids)
+
+    if not object_ids:
+        return 0
+
+    queryset = search_type.get_queryset().filter(pk__in=object_ids)
+
+    return index_queryset(queryset, batch_size)
+
+
+def rebuild(types: Optional[Iterable[str]] = None, batch_size: int = 500) -> Dict:
+    """Re-create the documents of the given types (all by default)."""
+
+    counts = {}
+
+    for search_type in SEARCH_TYPES:
+
+        if types is not None and search_type.key not in types:
+            continue
+
+        AdminSearchDocument.objects.filter(doc_type=search_type.key).delete()
+
+        counts[search_type.key] = index_queryset(search_type.get_queryset(), batch_size)
+
+        logger.info(
+            "Rebuilt %s admin search documents for %s",
+            counts[search_type.key],
+            search_type.key,
+        )
+
+    return counts
+
+
+def _like_pattern(query: str) -> str:
+
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    return f"%{escaped}%"
+
+
+def sqlite_candidates(query: str, types: List[str]) -> RawSQL:
+    """Ids of the newest ``SQLITE_CANDIDATES_PER_TYPE`` matches of each type.
+
+    Each branch walks an index newest-first and stops at the cap: the type's
+    FTS5 trigram table for queries of three or more characters, the
+    ``(doc_type, updated_at)`` index otherwise.
+    """
+
+    indexed = set()
+
+    if len(query) >= MIN_INDEXED_QUERY:
+        indexed = install_sqlite_index(connection, types)
+
+    branches = []
+
+    params: List[Any] = []
+
+    for doc_type in types:
+
+        if doc_type in indexed:
+
+            table = fts_table(doc_type)
+
+            branches.append(
+                f"SELECT * FROM (SELECT rowid FROM {table} WHERE {table} MATCH %s "
+                "ORDER BY rowid DESC LIMIT %s)"
+            )
+
+            # A trigram phrase query is a substring match
+            params.extend(
+                ['"{}"'.format(query.replace('"', '""')), SQLITE_CANDIDATES_PER_TYPE]
+            )
+
+        else:
+
+            branches.append(
+                "SELECT * FROM (SELECT id FROM search_adminsearchdocument "
+                "WHERE doc_type = %s AND search_text LIKE %s ESCAPE '\\' "
+                "ORDER BY updated_at DESC LIMIT %s)"
+            )
+
+            params.extend([doc_type, _like_pattern(query), SQLITE_CANDIDATES_PER_TYPE])
+
+    return RawSQL(" UNION ALL ".join(branches), params)
+
+
+def match_filter(query: str, types: List[str]) -> Q:
+    """Filter documents of ``types`` whose text contains ``query``.
+
+    ``query`` must be lower-cased. On PostgreSQL the ``LIKE`` is served by
+    the trigram GIN index.
+    """
+
+    if connection.vendor == "sqlite":
+        return Q(pk__in=sqlite_candidates(query, types))
+
+    return Q(search_text__contains=query, doc_type__in=types)
+
+
+def search(query: str, types: Iterable[str], limit: int = 5) -> Dict[str, List]:
+    """Top ``limit`` results per type for ``query`` in one query."""
+
+    query = query.strip().lower()
+
+    types = list(types)
+
+    if len(query) < 2 or not types or limit < 1:
+        return {}
+
+    rows = (
+        AdminSearchDocument.objects.filter(match_filter(query, types))
+        .annotate(
+            rank=Case(
+                When(search_text__startswith=query, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+        .annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=[F("doc_type")],
+                order_by=[F("rank").desc(), F("updated_at").desc(), F("pk").desc()],
+            )
+        )
+        .filter(position__lte=limit)
+        .order_by("doc_type", "position")
+        .values_list("doc_type", "result")
+    )
+
+    grouped: Dict[str, List] = {}
+
+    for doc_type, result in rows:
+        grouped.setdefault(doc_type, []).append(result)
+
+    # Keep the requested type order
+    return {key: grouped[key] for key in types if key in grouped}
@@ -0,0 +1,371 @@
+"""Pluggable search backends for ``SearchService``.
+
+A backend matches and ranks ``SearchIndex`` entries for a text query.
+``SearchService`` applies the non-text filters (category, locale, tags,
+dates) and hands the filtered queryset to the backend; backends keeping an
+index of their own are told about entry changes through ``index`` and
+``remove``.
+
+The backend is chosen by the ``SEARCH_BACKEND`` setting (a dotted path);
+when it is empty PostgreSQL full-text search is used on PostgreSQL and the
+pure-Python BM25 engine everywhere else.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, Q
+from django.utils.module_loading import import_string
+
+from . import bm25
+
+# PostgreSQL search functionality (optional)
+
+try:
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    HAS_POSTGRES_SEARCH = True
+
+except ImportError:
+
+    HAS_POSTGRES_SEARCH = False
+    SearchQuery = None  # type: ignore[assignment,misc]
+    SearchRank = None  # type: ignore[assignment,misc]
+
+logger = logging.getLogger(__name__)
+
+
+def query_analyzers(locale: Optional[str]) -> Set[bm25.Analyzer]:
+    """Analyzers a query is analyzed with: the locale filter's, or all languages'."""
+
+    if locale:
+        return {bm25.get_analyzer(locale)}
+
+    # Entries of unknown languages are indexed unstemmed
+    return {bm25.get_analyzer(code) for code, _ in settings.LANGUAGES} | {
+        bm25.NEUTRAL_ANALYZER
+    }
+
+
+class SearchBackend:
+    """Base class of the search backends."""
+
+    def search(self, queryset, query: str, locale: Optional[str] = None):
+        """Entries of ``queryset`` matching ``query``, best first.
+
+        May return a queryset or any sliceable sequence with ``count()``.
+        """
+
+        raise NotImplementedError
+
+    def index(self, entries: Sequence[Any]) -> None:
+        """Called after ``entries`` were created or updated."""
+
+    def remove(self, entries) -> None:
+        """Called with a queryset of entries about to be deleted."""
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+        """Rebuild the backend's own index from all entries."""
+
+        return 0
+
+
+class DatabaseSearchBackend(SearchBackend):
+    """Unranked ``icontains`` matching on any database."""
+
+    def search(self, queryset, query: str, locale: Optional[str] = None):
+
+        q_objects = Q()
+
+        for term in query.split():
+
+            q_objects |= (
+                Q(title__icontains=term)
+                | Q(content__icontains=term)
+                | Q(excerpt__icontains=term)
+            )
+
+        return queryset.filter(q_objects).order_by("-search_weight", "-published_at")
+
+
+class PostgresSearchBackend(SearchBackend):
+    """PostgreSQL full-text search on ``search_vector``."""
+
+    def search(self, queryset, query: str, locale: Optional[str] = None):
+
+        search_query = SearchQuery(query)
+
+        return (
+            queryset.annotate(search_rank=SearchRank(F("search_vector"), search_query))
+            .filter(search_vector=search_query)
+            .order_by("-search_rank", "-search_weight", "-published_at")
+        )
+
+
+class RankedResults:
+    """Ranked entry ids, loading entries lazily per slice (e.g. per page).
+
+    ``matches`` is the queryset of the same entries, for aggregates such as
+    facet counts.
+    """
+
+    def __init__(self, matches, ids: List[Any]):
+
+        self.matches = matches
+
+        self.ids = ids
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, key):
+
+        if isinstance(key, int):
+            return self[key : key + 1 or None][0]
+
+        ids = self.ids[key]
+
+        entries = self.matches.model.objects.select_related("content_type").in_bulk(ids)
+
+        return [entries[pk] for pk in ids if pk in entries]
+
+    def __iter__(self):
+        return iter(self[:])
+
+
+class BM25SearchBackend(SearchBackend):
+    """BM25F ranking over an inverted index stored in ``SearchPosting`` rows.
+
+    Entries are analyzed with the analyzer of their locale. Queries are
+    analyzed with the locale filter's analyzer, or with those of all
+    configured languages, and terms are OR-ed. Collection statistics are
+    cached briefly and refreshed when entries change.
+    """
+
+    STATS_CACHE_KEY = "search:bm25:stats"
+
+    STATS_CACHE_TIMEOUT = 300
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, field_boosts: Optional[Dict[str, float]] = None):
+
+        field_boosts = field_boosts or getattr(settings, "SEARCH_BM25_FIELD_BOOSTS", {})
+
+        self.boosts = tuple(
+            field_boosts.get(name, default)
+            for name, default in zip(bm25.FIELDS, (3.0, 1.5, 1.0))
+        )
+
+    @property
+    def posting_model(self):
+        from .models import SearchPosting
+
+        return SearchPosting
+
+    @property
+    def stats_model(self):
+        from .models import SearchDocumentStats
+
+        return SearchDocumentStats
+
+    def index(self, entries: Sequence[Any]) -> None:
+
+        if not entries:
+            return
+
+        postings = []
+
+        stats = []
+
+        for entry in entries:
+
+            frequencies, lengths = bm25.field_terms(
+                {
+                    "title": entry.title,
+                    "excerpt": entry.excerpt,
+                    "content": entry.content,
+                },
+                bm25.get_analyzer(entry.locale_code),
+            )
+
+            postings.extend(
+                self.posting_model(
+                    entry_id=entry.pk,
+                    term=term,
+                    frequencies=bm25.pack_frequencies(counts),
+                )
+                for term, counts in frequencies.items()
+            )
+
+            stats.append(
+                self.stats_model(
+                    entry_id=entry.pk,
+                    title_length=lengths[0],
+                    excerpt_length=lengths[1],
+                    content_length=lengths[2],
+                )
+            )
+
+        with transaction.atomic():
+
+            self.posting_model.objects.filter(
+                entry__in=[entry.pk for entry in entries]
+            ).delete()
+
+            self.posting_model.objects.bulk_create(postings, batch_size=self.BATCH_SIZE)
+
+            self.stats_model.objects.bulk_create(
+                stats,
+                batch_size=self.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["entry"],
+                update_fields=["title_length", "excerpt_length", "content_length"],
+            )
+
+        cache.delete(self.STATS_CACHE_KEY)
+
+    def remove(self, entries) -> None:
+
+        # Postings and stats cascade with their entries
+        cache.delete(self.STATS_CACHE_KEY)
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+
+        from .models import SearchIndex
+
+        self.posting_model.objects.all().delete()
+
+        self.stats_model.objects.all().delete()
+
+        indexed = 0
+
+        batch = []
+
+        for entry in SearchIndex.objects.iterator(chunk_size=batch_size):
+
+            batch.append(entry)
+
+            if len(batch) >= batch_size:
+                self.index(batch)
+                indexed += len(batch)
+                batch = []
+
+        self.index(batch)
+
+        return indexed + len(batch)
+
+    def collection_stats(self) -> bm25.CollectionStats:
+
+        stats = cache.get(self.STATS_CACHE_KEY)
+
+        if stats is None:
+
+            totals = self.stats_model.objects.aggregate(
+                documents=Count("pk"),
+                title=Avg("title_length"),
+                excerpt=Avg("excerpt_length"),
+                content=Avg("content_length"),
+            )
+
+            stats = bm25.CollectionStats(
+                documents=totals["documents"],
+                average_lengths=tuple(
+                    float(totals[name] or 0.0) for name in bm25.FIELDS
+                ),
+            )
+
+            cache.set(self.STATS_CACHE_KEY, stats, self.STATS_CACHE_TIMEOUT)
+
+        return stats
+
+    def search(self, queryset, query: str, locale: Optional[str] = None):
+
+        variants = bm25.query_variants(query, query_analyzers(locale))
+
+        terms = set().union(*variants)
+
+        if not terms:
+            return queryset.none()
+
+        scorer = bm25.BM25Scorer(
+            stats=self.collection_stats(),
+            document_frequencies=dict(
+                self.posting_model.objects.filter(term__in=terms)
+                .values_list("term")
+                .annotate(Count("pk"))
+                .order_by()
+            ),
+            boosts=self.boosts,
+        )
+
+        # Joined from the postings side so the term index drives the query
+        rows = (
+            queryset.filter(postings__term__in=terms)
+            .order_by()
+            .values_list(
+                "pk",
+                "postings__term",
+                "postings__frequencies",
+                "bm25_stats__title_length",
+                "bm25_stats__excerpt_length",
+                "bm25_stats__content_length",
+                "search_weight",
+                "published_at",
+            )
+        )
+
+        documents: Dict[Any, List[Any]] = {}
+
+        for entry_id, term, frequencies, *lengths, weight, published_at in rows:
+
+            document = documents.get(entry_id)
+
+            if document is None:
+                document = documents[entry_id] = [{}, lengths, weight, published_at]
+
+            document[0][term] = frequencies
+
+        ranked = []
+
+        for entry_id, (postings, lengths, weight, published_at) in documents.items():
+
+            score = scorer.score(
+                variants, postings, [length or 0 for length in lengths]
+            )
+
+            ranked.append(
+                (
+                    score * weight,
+                    published_at.timestamp() if published_at else 0.0,
+                    entry_id,
+                )
+            )
+
+        ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+
+        matches = queryset.filter(
+            pk__in=self.posting_model.objects.filter(term__in=terms).values("entry")
+        )
+
+        return RankedResults(matches, [entry_id for _, _, entry_id in ranked])
+
+
+def get_search_backend() -> SearchBackend:
+    """Instantiate the configured search backend."""
+
+    backend_path = getattr(settings, "SEARCH_BACKEND", "")
+
+    if backend_path:
+        return import_string(backend_path)()
+
+    if HAS_POSTGRES_SEARCH and connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+
+    return BM25SearchBackend()
@@ -0,0 +1,416 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+"""Pure-Python BM25 text analysis and scoring.
+
+The storage-independent half of the BM25 search backend (see ``backends``):
+
+* ``Analyzer`` turns text into terms - tokenization, accent folding,
+  per-language stopwords and a light suffix-stripping stemmer.
+* ``pack_frequencies`` / ``unpack_frequencies`` store the per-field term
+  frequencies of one posting in a single integer.
+* ``BM25Scorer`` scores documents with BM25F: field frequencies are
+  length-normalized per field, weighted by the field boost and summed before
+  BM25 saturation.
+"""
+
+
+FIELDS = ("title", "excerpt", "content")
+
+MAX_TERM_LENGTH = 64
+
+# Field frequencies are packed into one integer, 10 bits per field
+
+FREQUENCY_BITS = 10
+
+MAX_FREQUENCY = (1 << FREQUENCY_BITS) - 1
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def fold(text: str) -> str:
+    """Lower-case ``text`` and strip diacritics (``Café`` -> ``cafe``)."""
+
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Split folded ``text`` into word tokens, dropping single letters."""
+
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_PATTERN.findall(fold(text))
+        if len(token) > 1 or token.isdigit()
+    ]
+
+
+@dataclass(frozen=True)
+class Analyzer:
+    """Tokenizer, stopword list and stemming rules of one language.
+
+    ``suffixes`` are ``(suffix, replacement)`` rules tried in order; the first
+    one leaving a stem of at least ``min_stem`` characters is applied, then
+    one trailing ``strip_final`` character is dropped and a doubled final
+    consonant reduced (``running`` -> ``runn`` -> ``run``).
+    """
+
+    language: str
+
+    stopwords: frozenset = frozenset()
+
+    suffixes: Tuple[Tuple[str, str], ...] = ()
+
+    min_stem: int = 3
+
+    undouble: bool = True
+
+    keep_after_s: str = ""
+
+    strip_final: str = ""
+
+    def stem(self, token: str) -> str:
+
+        if token.isdigit():
+            return token
+
+        for suffix, replacement in self.suffixes:
+
+            if not token.endswith(suffix):
+                continue
+
+            stem = token[: -len(suffix)]
+
+            if len(stem) < self.min_stem:
+                continue
+
+            # "class", "status", "analysis" keep their final s
+            if suffix == "s" and stem[-1] in self.keep_after_s:
+                continue
+
+            token = stem + replacement
+
+            break
+
+        if token[-1] in self.strip_final and len(token) > self.min_stem:
+            token = token[:-1]
+
+        if (
+            self.undouble
+            and len(token) > self.min_stem
+            and token[-1] == token[-2]
+            and token[-1] not in "aeiouy"
+        ):
+            token = token[:-1]
+
+        return token
+
+    def analyze(self, text: str) -> List[str]:
+        """Terms of ``text``, stopwords removed, in document order."""
+
+        return [
+            self.stem(token) for token in tokenize(text) if token not in self.stopwords
+        ]
+
+
+# Light stemmers: only inflectional suffixes are stripped, so recall improves
+# ("launches" finds "launch") without the over-stemming of aggressive rules.
+
+ANALYZERS: Dict[str, Analyzer] = {
+    "en": Analyzer(
+        language="en",
+        stopwords=frozenset(
+            "a an and are as at be but by for from has have how in into is it its "
+            "of on or our that the their there this to was we were what when where "
+            "which who will with you your".split()
+        ),
+        suffixes=(
+            ("ational", "ate"),
+            ("ization", "ize"),
+            ("fulness", "ful"),
+            ("ousness", "ous"),
+            ("iveness", "ive"),
+            ("ments", ""),
+            ("ment", ""),
+            ("ness", ""),
+            ("ingly", ""),
+            ("edly", ""),
+            ("ies", "y"),
+            ("ied", "y"),
+            ("ing", ""),
+            ("ches", "ch"),
+            ("shes", "sh"),
+            ("sses", "ss"),
+            ("xes", "x"),
+            ("ed", ""),
+            ("ly", ""),
+            ("es", ""),
+            ("s", ""),
+        ),
+        keep_after_s="siu",
+        strip_final="e",
+    ),
+    "nl": Analyzer(
+        language="nl",
+        stopwords=frozenset(
+            "aan al als bij dat de den der des deze die dit door een en er het "
+            "hier hij hoe in is je met na naar niet nog of om onder ook op over "
+            "te tot uit van voor wat we wel werd wie zijn zo".split()
+        ),
+        suffixes=(
+            ("heden", "heid"),
+            ("ingen", "ing"),
+            ("tjes", ""),
+            ("tje", ""),
+            ("jes", ""),
+            ("je", ""),
+            ("ens", ""),
+            ("en", ""),
+            ("es", ""),
+            ("s", ""),
+            ("e", ""),
+        ),
+        keep_after_s="s",
+    ),
+    "de": Analyzer(
+        language="de",
+        stopwords=frozenset(
+            "aber als am an auch auf aus bei bin bis das dass dem den der des die "
+            "durch ein eine einem einen einer eines es fur hat im in ist ja mit "
+            "nach nicht noch oder sie sind so uber um und vom von vor war wie "
+            "wir zu zum zur".split()
+        ),
+        suffixes=(
+            ("ungen", "ung"),
+            ("heiten", "heit"),
+            ("keiten", "keit"),
+            ("ern", ""),
+            ("em", ""),
+            ("en", ""),
+            ("er", ""),
+            ("es", ""),
+            ("e", ""),
+            ("s", ""),
+            ("n", ""),
+        ),
+        keep_after_s="s",
+    ),
+    "fr": Analyzer(
+        language="fr",
+        stopwords=frozenset(
+            "au aux avec ce ces dans de des du elle en est et il ils je la le les "
+            "leur lui mais me meme mes nous on ou par pas pour qu que qui sa se "
+            "ses son sur ta te un une vos votre vous".split()
+        ),
+        suffixes=(
+            ("issements", ""),
+            ("issement", ""),
+            ("ements", ""),
+            ("ement", ""),
+            ("ations", ""),
+            ("ation", ""),
+            ("euses", ""),
+            ("euse", ""),
+            ("eux", ""),
+            ("aux", "al"),
+            ("es", ""),
+            ("s", ""),
+            ("e", ""),
+            ("x", ""),
+        ),
+        keep_after_s="s",
+    ),
+    "es": Analyzer(
+        language="es",
+        stopwords=frozenset(
+            "al con como de del el en es esta este la las lo los mas no o para "
+            "pero por que se sin sobre su sus un una y ya".split()
+        ),
+        suffixes=(
+            ("aciones", "acion"),
+            ("amientos", ""),
+            ("amiento", ""),
+            ("mente", ""),
+            ("ces", "z"),
+            ("es", ""),
+            ("os", ""),
+            ("as", ""),
+            ("o", ""),
+            ("a", ""),
+            ("s", ""),
+            ("e", ""),
+        ),
+        keep_after_s="s",
+    ),
+}
+
+# Unknown languages are tokenized and folded but neither stemmed nor filtered
+
+NEUTRAL_ANALYZER = Analyzer(language="", undouble=False)
+
+
+def get_analyzer(locale_code: Optional[str]) -> Analyzer:
+    """Analyzer for a locale code such as ``en``, ``en-US`` or ``pt_BR``."""
+
+    language = re.split(r"[-_]", locale_code or "")[0].lower()
+
+    return ANALYZERS.get(language, NEUTRAL_ANALYZER)
+
+
+def query_variants(query: str, analyzers: Iterable[Analyzer]) -> List[Set[str]]:
+    """Candidate terms of each query token under each of ``analyzers``.
+
+    Documents are indexed with the analyzer of their own locale, so a query
+    searched across locales matches any language's form of a token. Tokens
+    that are stopwords in every analyzer are dropped.
+    """
+
+    analyzers = list(analyzers)
+
+    variants = []
+
+    for token in tokenize(query):
+
+        terms = {
+            analyzer.stem(token)
+            for analyzer in analyzers
+            if token not in analyzer.stopwords
+        }
+
+        if terms:
+            variants.append(terms)
+
+    return variants
+
+
+def field_terms(
+    fields: Dict[str, str], analyzer: Analyzer
+) -> Tuple[Dict[str, List[int]], List[int]]:
+    """Per-term field frequencies and the field lengths of one document."""
+
+    frequencies: Dict[str, List[int]] = {}
+
+    lengths = []
+
+    for position, name in enumerate(FIELDS):
+
+        terms = analyzer.analyze(fields.get(name) or "")
+
+        lengths.append(len(terms))
+
+        for term, count in Counter(terms).items():
+            frequencies.setdefault(term, [0] * len(FIELDS))[position] = count
+
+    return frequencies, lengths
+
+
+def pack_frequencies(frequencies: Sequence[int]) -> int:
+
+    packed = 0
+
+    for position, count in enumerate(frequencies):
+        packed |= min(count, MAX_FREQUENCY) << (position * FREQUENCY_BITS)
+
+    return packed
+
+
+def unpack_frequencies(packed: int) -> Tuple[int, ...]:
+    return tuple(
+        (packed >> (position * FREQUENCY_BITS)) & MAX_FREQUENCY
+        for position in range(len(FIELDS))
+    )
+
+
+@dataclass
+class CollectionStats:
+    """Document count and average field lengths of the indexed collection."""
+
+    documents: int = 0
+
+    average_lengths: Tuple[float, ...] = (0.0,) * len(FIELDS)
+
+
+@dataclass
+class BM25Scorer:
+    """BM25F scoring with per-field boosts and length normalization."""
+
+    stats: CollectionStats
+
+    document_frequencies: Dict[str, int]
+
+    boosts: Sequence[float] = (3.0, 1.5, 1.0)
+
+    k1: float = 1.2
+
+    b: float = 0.75
+
+    _idf: Dict[str, float] = field(default_factory=dict, init=False)
+
+    def idf(self, term: str) -> float:
+
+        idf = self._idf.get(term)
+
+        if idf is None:
+
+            df = self.document_frequencies.get(term, 0)
+
+            documents = max(self.stats.documents, df)
+
+            idf = self._idf[term] = math.log(1 + (documents - df + 0.5) / (df + 0.5))
+
+        return idf
+
+    def term_score(
+        self, term: str, packed_frequencies: int, lengths: Sequence[int]
+    ) -> float:
+
+        weighted = 0.0
+
+        frequencies = unpack_frequencies(packed_frequencies)
+
+        for frequency, length, average, boost in zip(
+            frequencies, lengths, self.stats.average_lengths, self.boosts
+        ):
+
+            if not frequency:
+                continue
+
+            norm = 1 - self.b + self.b * (length / average if average else 1)
+
+            weighted += boost * frequency / norm
+
+        return self.idf(term) * weighted / (self.k1 + weighted)
+
+    def score(
+        self,
+        variants: Sequence[Set[str]],
+        postings: Dict[str, int],
+        lengths: Sequence[int],
+    ) -> float:
+        """Score one document from its ``term -> packed frequencies`` postings.
+
+        Each query token contributes its best-scoring variant only, so a
+        token matching in several languages is not counted twice.
+        """
+
+        score = 0.0
+
+        for terms in variants:
+
+            best = 0.0
+
+            for term in terms:
+
+                packed = postings.get(term)
+
+                if packed:
+                    best = max(best, self.term_score(term, packed, lengths))
+
+            score += best
+
+        return score
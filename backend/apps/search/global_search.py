@@ -1,10 +1,6 @@
 """Global search functionality for the dashboard search bar."""
 
 import logging
-from typing import Any, Dict, List
-
-from django.contrib.auth import get_user_model
-from django.db.models import Count, Q
 
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.decorators import api_view, permission_classes
@@ -12,224 +8,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.blog.models import BlogPost
-from apps.blog.models import Category as BlogCategory
-from apps.blog.models import Tag as BlogTag
-from apps.cms.model_parts.category import Collection
-from apps.cms.models import Page, Redirect
-from apps.files.models import FileUpload
-from apps.i18n.models import TranslationUnit
+from apps.cms.models import Page
+from apps.search import admin_search
 from apps.search.models import SearchQuery
 
-User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
-def search_pages(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Search CMS pages"""
-
-    pages = Page.objects.filter(
-        Q(title__icontains=query) | Q(path__icontains=query) | Q(slug__icontains=query)
-    ).select_related("locale")[:limit]
-
-    return [
-        {
-            "id": page.id,
-            "title": page.title,
-            "type": "page",
-            "icon": "📄",
-            "description": f"Path: {page.path}",
-            "url": f"/dashboard/pages/{page.id}/edit",
-            "status": page.status,
-            "locale": page.locale.code if page.locale else None,
-        }
-        for page in pages
-    ]
-
-
-def search_blog_posts(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Search blog posts"""
-
-    posts = BlogPost.objects.filter(
-        Q(title__icontains=query)
-        | Q(content__icontains=query)
-        | Q(excerpt__icontains=query)
-    ).select_related("author", "category")[:limit]
-
-    return [
-        {
-            "id": post.id,
-            "title": post.title,
-            "type": "blog_post",
-            "icon": "📝",
-            "description": post.excerpt[:100] if post.excerpt else "",
-            "url": f"/dashboard/blog-posts/{post.id}/edit",
-            "status": post.status,
-            "author": post.author.get_full_name() if post.author else None,
-        }
-        for post in posts
-    ]
-
-
-def search_media(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Search media files"""
-
-    files = FileUpload.objects.filter(
-        Q(original_filename__icontains=query) | Q(description__icontains=query)
-    )[:limit]
-
-    return [
-        {
-            "id": str(file.id),
-            "title": file.original_filename,
-            "type": "media",
-            "icon": "🖼️",
-            "description": f"Type: {file.file_type}, Size: {file.file_size} bytes",
-            "url": f"/dashboard/media?file={file.id}",
-            "file_type": file.file_type,
-            "is_public": file.is_public,
-        }
-        for file in files
-    ]
-
-
-def search_collections(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Search collections"""
-
-    collections = Collection.objects.filter(
-        Q(name__icontains=query) | Q(description__icontains=query)
-    ).annotate(item_count=Count("categories"))[:limit]
-
-    return [
-        {
-            "id": collection.id,
-            "title": collection.name,
-            "type": "collection",
-            "icon": "📁",
-            "description": (
-                collection.description[:100] if collection.description else ""
-            ),
-            "url": f"/dashboard/collections?id={collection.id}",
-            "status": collection.status,
-            "item_count": collection.item_count,
-        }
-        for collection in collections
-    ]
-
-
-def search_categories(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Search categories"""
-
-    categories = BlogCategory.objects.filter(
-        Q(name__icontains=query) | Q(description__icontains=query)
-    )[:limit]
-
-    return [
-        {
-            "id": category.id,
-            "title": category.name,
-            "type": "category",
-            "icon": "🏷️",
-            "description": category.description[:100] if category.description else "",
-            "url": f"/dashboard/categories?id={category.id}",
-            "color": category.color,
-        }
-        for category in categories
-    ]
-
-
-def search_tags(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Search tags"""
-
-    tags = BlogTag.objects.filter(
-        Q(name__icontains=query) | Q(description__icontains=query)
-    )[:limit]
-
-    return [
-        {
-            "id": tag.id,
-            "title": tag.name,
-            "type": "tag",
-            "icon": "🔖",
-            "description": tag.description[:100] if tag.description else "",
-            "url": f"/dashboard/tags?id={tag.id}",
-            "color": tag.color,
-        }
-        for tag in tags
-    ]
-
-
-def search_translations(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Search translations"""
-
-    translations = TranslationUnit.objects.filter(
-        Q(key__icontains=query)
-        | Q(source_text__icontains=query)
-        | Q(target_text__icontains=query)
-    ).select_related("source_locale", "target_locale")[:limit]
-
-    return [
-        {
-            "id": translation.id,
-            "title": translation.key,
-            "type": "translation",
-            "icon": "🌐",
-            "description": (
-                f"{translation.source_text[:50]}... → {translation.target_text[:50]}..."
-                if translation.target_text
-                else translation.source_text[:100]
-            ),
-            "url": f"/dashboard/translations/workspace?id={translation.id}",
-            "status": translation.status,
-            "locales": f"{translation.source_locale.code} → {translation.target_locale.code}",
-        }
-        for translation in translations
-    ]
-
-
-def search_users(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Search users (admin only)"""
-
-    users = User.objects.filter(
-        Q(email__icontains=query)
-        | Q(first_name__icontains=query)
-        | Q(last_name__icontains=query)
-    )[:limit]
-
-    return [
-        {
-            "id": user.id,
-            "title": user.get_full_name() or user.email,
-            "type": "user",
-            "icon": "👤",
-            "description": user.email,
-            "url": f"/dashboard/users-roles?user={user.id}",
-            "is_active": user.is_active,
-        }
-        for user in users
-    ]
-
-
-def search_redirects(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Search redirects"""
-
-    redirects = Redirect.objects.filter(
-        Q(from_path__icontains=query) | Q(to_path__icontains=query)
-    )[:limit]
-
-    return [
-        {
-            "id": redirect.id,
-            "title": redirect.from_path,
-            "type": "redirect",
-            "icon": "↪️",
-            "description": f"→ {redirect.to_path}",
-            "url": f"/dashboard/seo/redirects?id={redirect.id}",
-            "status": redirect.status,
-        }
-        for redirect in redirects
-    ]
-
-
 @extend_schema(
     summary="Global dashboard search",
     description="Search across all content types in the CMS",
@@ -264,7 +49,8 @@ def global_search(request):
     """
     Global search endpoint for dashboard search bar.
 
-    Searches across multiple content types and returns grouped results.
+    Searches across multiple content types and returns grouped results,
+    served from the unified admin search documents.
     """
 
     query = request.query_params.get("q", "").strip()
@@ -283,53 +69,33 @@ def global_search(request):
 
     limit = int(request.query_params.get("limit", 5))
 
-    # Define search types and their functions
-
-    search_functions = {
-        "pages": search_pages,
-        "blog_posts": search_blog_posts,
-        "media": search_media,
-        "collections": search_collections,
-        "categories": search_categories,
-        "tags": search_tags,
-        "translations": search_translations,
-        "redirects": search_redirects,
-    }
-
-    # Add user search for admin users
+    # Searchable types; users are only visible to staff
 
-    if request.user.is_staff:
-
-        search_functions["users"] = search_users
+    search_types = [
+        search_type.key
+        for search_type in admin_search.get_types()
+        if request.user.is_staff or not search_type.staff_only
+    ]
 
     # Filter search types if specified
 
     if types:
 
-        search_functions = {k: v for k, v in search_functions.items() if k in types}
-
-    # Perform searches
-
-    results = {}
-
-    total = 0
-
-    for search_type, search_func in search_functions.items():
+        search_types = [key for key in search_types if key in types]
 
-        try:
+    # One grouped query over the admin search documents
 
-            type_results = search_func(query, limit)
+    try:
 
-            if type_results:
+        results = admin_search.search(query, search_types, limit)
 
-                results[search_type] = type_results
+    except Exception as e:
 
-                total += len(type_results)
+        logger.warning(f"Global search failed: {e}")
 
-        except Exception as e:
+        results = {}
 
-            # Log error but continue with other searches
-            logger.warning(f"Search failed for type {search_type}: {e}")
+    total = sum(len(type_results) for type_results in results.values())
 
     # Format response
 
@@ -0,0 +1,153 @@
+from html import escape
+from typing import Iterable, List, Optional, Tuple
+
+from . import bm25
+
+"""Query-aware snippets with highlighted matches.
+
+The highlighter tokenizes the stored text once with the BM25 tokenizer,
+keeping character offsets, so matches are found with the same folding and
+stemming as the search itself (``launches`` highlights ``Launched``). The
+snippet is the window containing the most distinct query terms; only its
+text is escaped and marked up.
+"""
+
+
+SNIPPET_LENGTH = 200
+
+# Context kept before the first match of a window
+
+LEAD_CONTEXT = 40
+
+# Longer texts are highlighted within their beginning only
+
+MAX_SCANNED_CHARACTERS = 20_000
+
+ELLIPSIS = "…"
+
+Match = Tuple[int, int, str]
+
+
+class Highlighter:
+    """Highlights the terms of one query in result titles and snippets."""
+
+    def __init__(self, query: str, analyzers: Iterable[bm25.Analyzer]):
+
+        self.terms = set().union(*bm25.query_variants(query, analyzers))
+
+        # Stems keep at least the first three characters of a token, so
+        # tokens not sharing a prefix with a query term are never stemmed
+        self.prefixes = {term[:3] for term in self.terms}
+
+    def matches(self, text: str, locale_code: Optional[str] = None) -> List[Match]:
+        """``(start, end, term)`` of every token of ``text`` matching the query."""
+
+        if not self.terms or not text:
+            return []
+
+        analyzer = bm25.get_analyzer(locale_code)
+
+        matches = []
+
+        for match in bm25.TOKEN_PATTERN.finditer(text, 0, MAX_SCANNED_CHARACTERS):
+
+            token = bm25.fold(match.group())
+
+            if token[:3] not in self.prefixes:
+                continue
+
+            term = token if token in self.terms else analyzer.stem(token)
+
+            if term in self.terms:
+                matches.append((match.start(), match.end(), term))
+
+        return matches
+
+    def highlight(self, text: str, locale_code: Optional[str] = None) -> str:
+        """The whole of ``text``, escaped, with matches in ``<mark>``."""
+
+        return self._render(text, 0, len(text), self.matches(text, locale_code))
+
+    def snippet(
+        self,
+        text: str,
+        locale_code: Optional[str] = None,
+        length: int = SNIPPET_LENGTH,
+    ) -> str:
+        """The ``length``-character window of ``text`` matching best."""
+
+        text = text or ""
+
+        matches = self.matches(text, locale_code)
+
+        start = self._best_window(matches, length)
+
+        start = max(0, start - LEAD_CONTEXT) if matches else 0
+
+        # Snap to word boundaries
+        if start:
+            space = text.rfind(" ", 0, start)
+            start = space + 1 if space != -1 else 0
+
+        end = min(len(text), start + length)
+
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            end = space if space > start else end
+
+        snippet = self._render(text, start, end, matches)
+
+        return (
+            (ELLIPSIS if start else "")
+            + snippet
+            + (ELLIPSIS if end < len(text) else "")
+        )
+
+    def _best_window(self, matches: List[Match], length: int) -> int:
+        """Start offset of the window with the most distinct, then total, matches."""
+
+        if not matches:
+            return 0
+
+        best_start, best_key = matches[0][0], (0, 0)
+
+        last = 0
+
+        for first, (start, _, _) in enumerate(matches):
+
+            # Windows start at a match and end ``length`` - context later
+            while (
+                last < len(matches)
+                and matches[last][1] <= start + length - LEAD_CONTEXT
+            ):
+                last += 1
+
+            window = matches[first:last]
+
+            key = (len({term for _, _, term in window}), len(window))
+
+            if key > best_key:
+                best_start, best_key = start, key
+
+        return best_start
+
+    def _render(self, text: str, start: int, end: int, matches: List[Match]) -> str:
+
+        parts = []
+
+        position = start
+
+        for match_start, match_end, _ in matches:
+
+            if match_start < start or match_end > end:
+                continue
+
+            parts.append(escape(text[position:match_start]))
+
+            parts.append(f"<mark>{escape(text[match_start:match_end])}</mark>")
+
+            position = match_end
+
+        parts.append(escape(text[position:end]))
+
+        return "".join(parts)
@@ -0,0 +1,180 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.search import admin_search
+from apps.search.models import AdminSearchDocument
+
+"""Latency benchmark for the dashboard (admin) search documents.
+
+Seeds synthetic documents for every search type, then compares the grouped
+indexed query with the per-type ``icontains`` scans the dashboard search bar
+used to run. Seeded rows are rolled back unless ``--keep`` is given.
+
+Usage:
+    python manage.py benchmark_admin_search
+    python manage.py benchmark_admin_search --rows 10000 --repeat 50
+"""
+
+
+WORDS = (
+    "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda sigma "
+    "pricing roadmap launch careers team guide release archive product press "
+    "summer winter update report policy support contact partner event media"
+).split()
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded benchmark rows."""
+
+
+class Command(BaseCommand):
+
+    help = "Benchmark the dashboard search index against per-type scans"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100_000,
+            help="Documents to seed per search type (default: 100000)",
+        )
+
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Timed runs per query (default: 20)",
+        )
+
+        parser.add_argument(
+            "--limit", type=int, default=5, help="Results per type (default: 5)"
+        )
+
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="queries",
+            help="Query to time (repeatable; default: a rare, a common and a "
+            "two-character query)",
+        )
+
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the seeded documents"
+        )
+
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+
+        self.random = random.Random(options["seed"])
+
+        queries = options["queries"] or ["roadmap 4217", "launch", "ze"]
+
+        types = [search_type.key for search_type in admin_search.get_types()]
+
+        try:
+            with transaction.atomic():
+
+                self.seed(types, options["rows"])
+
+                for query in queries:
+                    self.compare(query, types, options["limit"], options["repeat"])
+
+                if not options["keep"]:
+                    raise Rollback()
+        except Rollback:
+            self.stdout.write("Seeded documents rolled back.")
+
+    def seed(self, types, rows, batch_size=2000):
+
+        self.stdout.write(
+            f"Seeding {rows} documents for each of {len(types)} types "
+            f"({connection.vendor})..."
+        )
+
+        start = time.perf_counter()
+
+        for doc_type in types:
+
+            for offset in range(0, rows, batch_size):
+
+                AdminSearchDocument.objects.bulk_create(
+                    [
+                        AdminSearchDocument(
+                            doc_type=doc_type,
+                            object_id=f"bench-{i}",
+                            search_text=self.text(i),
+                            result={"id": i, "title": f"{doc_type} {i}"},
+                        )
+                        for i in range(offset, min(offset + batch_size, rows))
+                    ]
+                )
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE search_adminsearchdocument")
+
+        self.stdout.write(f"  seeded in {time.perf_counter() - start:.1f}s")
+
+    def text(self, i):
+
+        words = self.random.sample(WORDS, 6)
+
+        return f"{' '.join(words[:3])} {i}\n{' '.join(words[3:])}"
+
+    def time_runs(self, func, repeat):
+
+        timings = []
+
+        for _ in range(repeat):
+
+            start = time.perf_counter()
+
+            func()
+
+            timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+
+        return {
+            "median": statistics.median(timings),
+            "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        }
+
+    def compare(self, query, types, limit, repeat):
+
+        def indexed():
+            return admin_search.search(query, types, limit)
+
+        def scans():
+            # The previous implementation: one leading-wildcard scan per type
+            return {
+                doc_type: list(
+                    AdminSearchDocument.objects.filter(
+                        doc_type=doc_type, search_text__icontains=query
+                    ).values_list("result", flat=True)[:limit]
+                )
+                for doc_type in types
+            }
+
+        indexed_stats = self.time_runs(indexed, repeat)
+
+        scan_stats = self.time_runs(scans, repeat)
+
+        self.stdout.write(f"\nQuery {query!r}:")
+
+        for label, stats in (("indexed", indexed_stats), ("scans", scan_stats)):
+
+            self.stdout.write(
+                f"  {label:<8} median {stats['median']:8.2f} ms   "
+                f"p95 {stats['p95']:8.2f} ms"
+            )
+
+        speedup = scan_stats["median"] / max(indexed_stats["median"], 1e-6)
+
+        self.stdout.write(self.style.SUCCESS(f"  speedup  {speedup:.1f}x"))
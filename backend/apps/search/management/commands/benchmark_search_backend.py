@@ -0,0 +1,211 @@
+import random
+import statistics
+import time
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.search.backends import BM25SearchBackend, DatabaseSearchBackend
+from apps.search.models import SearchIndex
+
+"""Relevance and latency benchmark for the BM25 search backend.
+
+Seeds a synthetic corpus where every entry is about one topic (in its title
+and, inflected, throughout its content) and mentions a few others in
+passing, then searches each topic with the BM25 backend and with the
+``icontains`` fallback. An entry is relevant when it is about the query's
+topic; precision@10 and MRR measure ranking, latency covers a count plus the
+first page. Seeded rows are rolled back unless ``--keep`` is given.
+
+Usage:
+    python manage.py benchmark_search_backend
+    python manage.py benchmark_search_backend --rows 50000 --repeat 5
+"""
+
+
+TOPICS = (
+    "launch pricing roadmap career release security privacy invoice partner "
+    "webinar design dashboard migration upgrade integration report workshop "
+    "support feature campaign"
+).split()
+
+FILLER = (
+    "team customer product update plan week month year market growth budget "
+    "service platform content page story video guide event office project "
+    "quality process result goal idea study value data cloud mobile network "
+    "email account order brand price offer review policy question answer"
+).split()
+
+
+def inflect(word):
+    return word + ("es" if word.endswith(("ch", "sh", "s", "x")) else "s")
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded benchmark rows."""
+
+
+class Command(BaseCommand):
+
+    help = "Benchmark BM25 search relevance and latency against icontains"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=20_000,
+            help="Index entries to seed (default: 20000)",
+        )
+
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Timed runs per query (default: 3)",
+        )
+
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the seeded entries"
+        )
+
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+
+        self.random = random.Random(options["seed"])
+
+        backends = {
+            "bm25": BM25SearchBackend(),
+            "icontains": DatabaseSearchBackend(),
+        }
+
+        try:
+            with transaction.atomic():
+
+                topics = self.seed(options["rows"], backends["bm25"])
+
+                queries = [(topic, topic) for topic in TOPICS] + [
+                    (inflect(topic), topic) for topic in TOPICS
+                ]
+
+                for name, backend in backends.items():
+                    self.report(name, backend, queries, topics, options["repeat"])
+
+                if not options["keep"]:
+                    raise Rollback()
+        except Rollback:
+            self.stdout.write("Seeded entries rolled back.")
+
+    def seed(self, rows, backend, batch_size=1000):
+
+        self.stdout.write(f"Seeding {rows} index entries ({connection.vendor})...")
+
+        content_type = ContentType.objects.get_for_model(SearchIndex)
+
+        topics = {}
+
+        index_time = 0.0
+
+        start = time.perf_counter()
+
+        for offset in range(0, rows, batch_size):
+
+            batch = []
+
+            for i in range(offset, min(offset + batch_size, rows)):
+
+                topic = self.random.choice(TOPICS)
+
+                batch.append(
+                    SearchIndex(
+                        content_type=content_type,
+                        object_id=i,
+                        title=f"{topic.title()} {' '.join(self.words(2))}",
+                        content=self.content(topic),
+                        locale_code="en",
+                        search_category="page",
+                        is_published=True,
+                    )
+                )
+
+                topics[batch[-1].pk] = topic
+
+            # bulk_create sends no signals; index explicitly to time it
+            SearchIndex.objects.bulk_create(batch)
+
+            index_start = time.perf_counter()
+
+            backend.index(batch)
+
+            index_time += time.perf_counter() - index_start
+
+        self.stdout.write(
+            f"  seeded in {time.perf_counter() - start:.1f}s, "
+            f"BM25 indexing {rows / max(index_time, 1e-6):.0f} entries/s"
+        )
+
+        return topics
+
+    def words(self, count):
+        return self.random.sample(FILLER, count)
+
+    def content(self, topic):
+
+        words = self.words(20) + self.words(20)
+
+        for form in (topic, inflect(topic), topic):
+            words.insert(self.random.randrange(len(words)), form)
+
+        # Passing mentions of other topics
+        for other in self.random.sample(TOPICS, 2):
+            words.insert(self.random.randrange(len(words)), other)
+
+        return " ".join(words)
+
+    def report(self, name, backend, queries, topics, repeat):
+
+        queryset = SearchIndex.objects.filter(is_published=True)
+
+        timings = []
+
+        precision = []
+
+        reciprocal_ranks = []
+
+        for query, topic in queries:
+
+            for _ in range(repeat):
+
+                start = time.perf_counter()
+
+                results = backend.search(queryset, query)
+
+                results.count()
+
+                page = list(results[:10])
+
+                timings.append((time.perf_counter() - start) * 1000)
+
+            relevant = [topics.get(entry.pk) == topic for entry in page]
+
+            precision.append(sum(relevant) / 10)
+
+            reciprocal_ranks.append(
+                1 / (relevant.index(True) + 1) if True in relevant else 0.0
+            )
+
+        timings.sort()
+
+        self.stdout.write(f"\n{name}:")
+
+        self.stdout.write(
+            f"  precision@10 {statistics.mean(precision):.2f}   "
+            f"MRR {statistics.mean(reciprocal_ranks):.2f}"
+        )
+
+        self.stdout.write(
+            f"  latency median {statistics.median(timings):.1f} ms   "
+            f"p95 {timings[min(len(timings) - 1, int(len(timings) * 0.95))]:.1f} ms"
+        )
@@ -3,6 +3,7 @@ from django.db import models, transaction
 from django.db.models import Count
 
 from apps.registry.registry import content_registry
+from apps.search import admin_search
 from apps.search.models import SearchIndex
 from apps.search.services import get_search_service
 
@@ -12,6 +13,8 @@ Usage:
     python manage.py search_index --reindex-all
     python manage.py search_index --model blog.blogpost
     python manage.py search_index --clear
+    python manage.py search_index --rebuild-admin
+    python manage.py search_index --rebuild-backend
 """
 
 
@@ -41,6 +44,18 @@ class Command(BaseCommand):
             "--stats", action="store_true", help="Show search index statistics"
         )
 
+        parser.add_argument(
+            "--rebuild-admin",
+            action="store_true",
+            help="Rebuild the dashboard search documents",
+        )
+
+        parser.add_argument(
+            "--rebuild-backend",
+            action="store_true",
+            help="Rebuild the search backend's own index (e.g. BM25 postings)",
+        )
+
         parser.add_argument(
             "--batch-size",
             type=int,
@@ -67,6 +82,14 @@ class Command(BaseCommand):
 
             self.show_stats()
 
+        elif options["rebuild_admin"]:
+
+            self.rebuild_admin(options["batch_size"])
+
+        elif options["rebuild_backend"]:
+
+            self.rebuild_backend(options["batch_size"])
+
         elif options["reindex_all"]:
 
             self.reindex_all(options["batch_size"])
@@ -96,6 +119,10 @@ class Command(BaseCommand):
 
         self.stdout.write("  --stats           Show index statistics")
 
+        self.stdout.write("  --rebuild-admin   Rebuild dashboard search documents")
+
+        self.stdout.write("  --rebuild-backend Rebuild the search backend index")
+
         self.stdout.write("")
 
         self.stdout.write("Examples:")
@@ -235,6 +262,36 @@ class Command(BaseCommand):
             self.style.SUCCESS(f"Successfully indexed {total_indexed} objects total.")
         )
 
+    def rebuild_admin(self, batch_size):
+        """Rebuild the dashboard (admin) search documents."""
+
+        self.stdout.write(self.style.SUCCESS("Rebuilding admin search documents..."))
+
+        counts = admin_search.rebuild(batch_size=batch_size)
+
+        for doc_type, count in counts.items():
+
+            self.stdout.write(f"  {doc_type}: {count} documents")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully rebuilt {sum(counts.values())} admin search documents."
+            )
+        )
+
+    def rebuild_backend(self, batch_size):
+        """Rebuild the search backend's own index from the index entries."""
+
+        backend = get_search_service().backend
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilding {type(backend).__name__} index...")
+        )
+
+        count = backend.rebuild(batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully indexed {count} entries."))
+
     def reindex_model(self, model_label, batch_size):
         """Reindex a specific model."""
 
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.24 on 2025-10-18 21:49
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0003_merge_20250915"),
+    ]
+
+    operations = [
+        # No-op on databases other than PostgreSQL
+        TrigramExtension(),
+        migrations.CreateModel(
+            name="AdminSearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("doc_type", models.CharField(max_length=32)),
+                ("object_id", models.CharField(max_length=64)),
+                (
+                    "search_text",
+                    models.TextField(
+                        help_text="Lower-cased searchable fields, title first"
+                    ),
+                ),
+                (
+                    "result",
+                    models.JSONField(
+                        default=dict, help_text="Pre-rendered search result payload"
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Admin Search Document",
+                "verbose_name_plural": "Admin Search Documents",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="adminsearchdocument",
+            index=models.Index(
+                fields=["doc_type", "-updated_at"],
+                name="search_admi_doc_typ_7774d7_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="adminsearchdocument",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_text"],
+                name="search_admindoc_text_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="adminsearchdocument",
+            constraint=models.UniqueConstraint(
+                fields=("doc_type", "object_id"), name="unique_admin_search_document"
+            ),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0004_admin_search_documents"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocumentStats",
+            fields=[
+                (
+                    "entry",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="bm25_stats",
+                        serialize=False,
+                        to="search.searchindex",
+                    ),
+                ),
+                ("title_length", models.PositiveIntegerField(default=0)),
+                ("excerpt_length", models.PositiveIntegerField(default=0)),
+                ("content_length", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Search Document Stats",
+                "verbose_name_plural": "Search Document Stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="SearchPosting",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64)),
+                (
+                    "frequencies",
+                    models.PositiveIntegerField(
+                        help_text="Packed per-field term frequencies"
+                    ),
+                ),
+                (
+                    "entry",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="postings",
+                        to="search.searchindex",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Posting",
+                "verbose_name_plural": "Search Postings",
+                "indexes": [
+                    models.Index(
+                        fields=["term", "entry"], name="search_sear_term_77f97e_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="searchposting",
+            constraint=models.UniqueConstraint(
+                fields=("entry", "term"), name="unique_search_posting"
+            ),
+        ),
+    ]
@@ -501,3 +501,125 @@ class SearchSuggestion(models.Model):
                 self.result_count = int((self.result_count + result_count) / 2)
 
         self.save(update_fields=["search_count", "last_searched_at", "result_count"])
+
+
+class AdminSearchDocument(models.Model):
+    """
+    Denormalized search document backing the dashboard search bar.
+
+    One row per searchable admin object (pages, posts, media, users, ...),
+    maintained by signals. ``search_text`` holds the lower-cased searchable
+    fields, title first, and is served by a trigram GIN index on PostgreSQL
+    or by per-type FTS5 trigram tables on SQLite (see ``admin_search``).
+    """
+
+    doc_type: CharField = models.CharField(max_length=32)
+
+    object_id: CharField = models.CharField(max_length=64)
+
+    search_text: TextField = models.TextField(
+        help_text="Lower-cased searchable fields, title first"
+    )
+
+    result = models.JSONField(
+        default=dict, help_text="Pre-rendered search result payload"
+    )
+
+    updated_at: DateTimeField = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "search"
+
+        verbose_name = "Admin Search Document"
+
+        verbose_name_plural = "Admin Search Documents"
+
+        indexes = [models.Index(fields=["doc_type", "-updated_at"])] + (
+            # Trigram index serving substring matches (PostgreSQL only)
+            [
+                GinIndex(
+                    fields=["search_text"],
+                    name="search_admindoc_text_trgm",
+                    opclasses=["gin_trgm_ops"],
+                )
+            ]
+            if GinIndex is not None
+            else []
+        )
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["doc_type", "object_id"],
+                name="unique_admin_search_document",
+            ),
+        ]
+
+    def __str__(self):
+
+        return f"{self.result.get('title', self.object_id)} ({self.doc_type})"
+
+
+class SearchPosting(models.Model):
+    """
+    Inverted index of the BM25 search backend.
+
+    One row per (term, index entry); the term's title, excerpt and content
+    frequencies are packed into ``frequencies`` (see ``bm25``).
+    """
+
+    term: CharField = models.CharField(max_length=64)
+
+    entry: ForeignKey = models.ForeignKey(
+        SearchIndex, on_delete=models.CASCADE, related_name="postings"
+    )
+
+    frequencies: PositiveIntegerField = models.PositiveIntegerField(
+        help_text="Packed per-field term frequencies"
+    )
+
+    class Meta:
+        app_label = "search"
+
+        verbose_name = "Search Posting"
+
+        verbose_name_plural = "Search Postings"
+
+        indexes = [models.Index(fields=["term", "entry"])]
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["entry", "term"], name="unique_search_posting"
+            ),
+        ]
+
+    def __str__(self):
+
+        return f"{self.term} -> {self.entry_id}"
+
+
+class SearchDocumentStats(models.Model):
+    """Analyzed field lengths of an index entry, for BM25 length normalization."""
+
+    entry: models.OneToOneField = models.OneToOneField(
+        SearchIndex,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="bm25_stats",
+    )
+
+    title_length: PositiveIntegerField = models.PositiveIntegerField(default=0)
+
+    excerpt_length: PositiveIntegerField = models.PositiveIntegerField(default=0)
+
+    content_length: PositiveIntegerField = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        app_label = "search"
+
+        verbose_name = "Search Document Stats"
+
+        verbose_name_plural = "Search Document Stats"
+
+    def __str__(self):
+
+        return f"Stats for {self.entry_id}"
@@ -32,6 +32,12 @@ class SearchResultSerializer(serializers.Serializer):
 
     object_id = serializers.IntegerField()
 
+    highlight = serializers.DictField(
+        child=serializers.CharField(allow_blank=True, trim_whitespace=False),
+        required=False,
+        help_text="Title and snippet with query matches in <mark> tags",
+    )
+
 
 class SearchRequestSerializer(serializers.Serializer):
     """
@@ -66,6 +72,12 @@ class SearchResponseSerializer(serializers.Serializer):
 
     pagination = serializers.DictField()
 
+    facets = serializers.DictField(
+        child=serializers.ListField(child=serializers.DictField()),
+        required=False,
+        help_text="Category, locale and tag counts over all matches",
+    )
+
     query = serializers.CharField()
 
     filters = serializers.DictField()
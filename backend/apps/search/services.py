@@ -4,17 +4,22 @@ Provides search functionality including indexing, querying, and analytics.
 """
 
 import logging
+import math
 import time
+from collections import Counter
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from django.contrib.contenttypes.models import ContentType
-from django.core.paginator import Paginator
-from django.db.models import Avg, Count, F, Q
+from django.db import connections
+from django.db.models import Avg, Count, QuerySet
 from django.utils import timezone
 
 from apps.registry.registry import content_registry
 
+from .backends import get_search_backend, query_analyzers
+from .highlighting import Highlighter
+
 # PostgreSQL search functionality (optional)
 
 try:
@@ -31,6 +36,10 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Values returned per facet
+
+FACET_LIMIT = 20
+
 
 class SearchService:
     """Core search service for CMS content.
@@ -42,6 +51,7 @@ class SearchService:
         self._index_model = None
         self._query_log_model = None
         self._suggestion_model = None
+        self._backend = None
 
     @property
     def index_model(self):
@@ -67,6 +77,12 @@ class SearchService:
             self._suggestion_model = SearchSuggestion
         return self._suggestion_model
 
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = get_search_backend()
+        return self._backend
+
     def search(
         self,
         query: str,
@@ -98,15 +114,19 @@ class SearchService:
 
         queryset = self._build_search_queryset(query, filters)
 
-        # Get total count before pagination
+        # Total and facets from one grouped query over the matches
+
+        total_results, facets = self._facet_counts(queryset)
 
-        total_results = queryset.count()
+        # Apply pagination (out of range pages show the last page)
 
-        # Apply pagination
+        total_pages = max(1, math.ceil(total_results / page_size))
 
-        paginator = Paginator(queryset, page_size)
+        page_number = min(max(page, 1), total_pages)
 
-        page_obj = paginator.get_page(page)
+        offset = (page_number - 1) * page_size
+
+        object_list = queryset[offset : offset + page_size]
 
         # Calculate execution time
 
@@ -127,18 +147,26 @@ class SearchService:
 
         self._update_suggestions(query, total_results)
 
+        highlighter = (
+            Highlighter(query, query_analyzers(filters.get("locale")))
+            if query
+            else None
+        )
+
         return {
             "results": [
-                self._serialize_search_result(result) for result in page_obj.object_list
+                self._serialize_search_result(result, highlighter)
+                for result in object_list
             ],
             "pagination": {
-                "page": page,
+                "page": page_number,
                 "page_size": page_size,
-                "total_pages": paginator.num_pages,
+                "total_pages": total_pages,
                 "total_results": total_results,
-                "has_next": page_obj.has_next(),
-                "has_previous": page_obj.has_previous(),
+                "has_next": page_number < total_pages,
+                "has_previous": page_number > 1,
             },
+            "facets": facets,
             "query": query,
             "filters": filters,
             "execution_time_ms": execution_time,
@@ -149,57 +177,6 @@ class SearchService:
         """Build search queryset with query and filters."""
         queryset = self.index_model.objects.filter(is_published=True)
 
-        # Apply text search
-
-        if query:
-
-            # Check if we're actually using PostgreSQL database
-            from django.conf import settings
-
-            is_postgres = "postgresql" in settings.DATABASES.get("default", {}).get(
-                "ENGINE", ""
-            )
-
-            if HAS_POSTGRES_SEARCH and is_postgres:
-
-                # Use PostgreSQL full-text search
-
-                search_query = SearchQuery(query)
-
-                queryset = (
-                    queryset.annotate(
-                        search_rank=SearchRank(F("search_vector"), search_query)
-                    )
-                    .filter(search_vector=search_query)
-                    .order_by("-search_rank", "-search_weight", "-published_at")
-                )
-
-            else:
-
-                # Fallback to basic text search
-
-                search_terms = query.split()
-
-                q_objects = Q()
-
-                for term in search_terms:
-
-                    q_objects |= (
-                        Q(title__icontains=term)
-                        | Q(content__icontains=term)
-                        | Q(excerpt__icontains=term)
-                    )
-
-                queryset = queryset.filter(q_objects).order_by(
-                    "-search_weight", "-published_at"
-                )
-
-        else:
-
-            # No query, just order by relevance
-
-            queryset = queryset.order_by("-search_weight", "-published_at")
-
         # Apply filters
 
         if "category" in filters and filters["category"]:
@@ -236,9 +213,117 @@ class SearchService:
 
             queryset = queryset.filter(published_at__lte=filters["date_to"])
 
-        return queryset
+        # Apply text search
+
+        if query:
+
+            return self.backend.search(queryset, query, locale=filters.get("locale"))
+
+        # No query, just order by relevance
+
+        return queryset.order_by("-search_weight", "-published_at")
+
+    def _facet_counts(self, results) -> Tuple[int, Dict[str, List[Dict[str, Any]]]]:
+        """Count the matches and their categories, locales and tags.
+
+        One query grouped by (category, locale) yields those facets and the
+        total; tags come from a second grouped query (see ``_tag_counts``).
+        Backends returning plain sequences get no facets.
+        """
+
+        matches = getattr(results, "matches", results)
+
+        if not isinstance(matches, QuerySet):
+            return results.count(), {}
+
+        categories: Counter = Counter()
+
+        locales: Counter = Counter()
+
+        tags: Counter = Counter()
+
+        total = 0
+
+        groups = (
+            matches.order_by()
+            .values_list("search_category", "locale_code")
+            .annotate(count=Count("pk"))
+        )
+
+        for category, locale_code, count in groups:
+
+            total += count
+
+            categories[category] += count
+
+            locales[locale_code] += count
+
+        if total:
 
-    def _serialize_search_result(self, result) -> Dict[str, Any]:
+            tags = self._tag_counts(matches)
+
+        return total, {
+            "categories": self._facet(categories),
+            "locales": self._facet(locales),
+            "tags": self._facet(tags),
+        }
+
+    def _tag_counts(self, matches: QuerySet) -> Counter:
+        """Count the matches carrying each tag.
+
+        PostgreSQL unnests the tag arrays and groups them in the database, so
+        only the top tags are returned. Other databases fall back to one pass
+        over the matching tag lists.
+        """
+
+        db = connections[matches.db]
+
+        if db.vendor != "postgresql":
+
+            tags: Counter = Counter()
+
+            tag_lists = matches.order_by().values_list("search_tags", flat=True)
+
+            for entry_tags in tag_lists.iterator():
+                tags.update(set(entry_tags or []))
+
+            return tags
+
+        ids_sql, params = matches.order_by().values("pk").query.sql_with_params()
+
+        meta = matches.model._meta
+
+        qn = db.ops.quote_name
+
+        tags_column = qn(meta.get_field("search_tags").column)
+
+        sql = (
+            f"SELECT tag.value, COUNT(DISTINCT entry.{qn(meta.pk.column)}) "
+            f"FROM {qn(meta.db_table)} entry "
+            "CROSS JOIN LATERAL jsonb_array_elements_text("
+            f"CASE WHEN jsonb_typeof(entry.{tags_column}) = 'array' "
+            f"THEN entry.{tags_column} ELSE '[]'::jsonb END"
+            ") AS tag(value) "
+            f"WHERE entry.{qn(meta.pk.column)} IN ({ids_sql}) "
+            "AND tag.value <> '' "
+            "GROUP BY tag.value "
+            "ORDER BY 2 DESC, tag.value "
+            "LIMIT %s"
+        )
+
+        with db.cursor() as cursor:
+            cursor.execute(sql, (*params, FACET_LIMIT))
+
+            return Counter(dict(cursor.fetchall()))
+
+    def _facet(self, counts: Counter) -> List[Dict[str, Any]]:
+        return [
+            {"value": value, "count": count}
+            for value, count in counts.most_common(FACET_LIMIT)
+            if value
+        ]
+
+    def _serialize_search_result(self, result, highlighter=None) -> Dict[str, Any]:
         """Serialize a search result for API response."""
         # Get content type info safely
 
@@ -248,7 +333,7 @@ class SearchService:
 
             object_type = f"{result.content_type.app_label}.{result.content_type.model}"
 
-        return {
+        data = {
             "id": str(result.id),
             "title": result.title,
             "excerpt": result.excerpt or result.content[:200] + "...",
@@ -263,6 +348,17 @@ class SearchService:
             "object_id": result.object_id,
         }
 
+        if highlighter:
+
+            data["highlight"] = {
+                "title": highlighter.highlight(result.title, result.locale_code),
+                "snippet": highlighter.snippet(
+                    result.content or result.excerpt, result.locale_code
+                ),
+            }
+
+        return data
+
     def _log_search_query(
         self,
         query: str,
@@ -363,10 +459,103 @@ class SearchService:
 
         search_index.update_from_object(obj)
 
+        # The backend's own index follows through the post_save signal
         search_index.save()
 
         return search_index
 
+    def index_objects(self, objects, content_type=None) -> int:
+        """Index or re-index many objects of one model with bulk operations.
+
+        Args:
+            objects: Model instances of a single model
+            content_type: Optional ContentType of the model, looked up if omitted
+
+        Returns:
+            Number of objects indexed
+        """
+        from django.db import transaction
+
+        if not objects:
+            return 0
+
+        if content_type is None:
+            content_type = ContentType.objects.get_for_model(objects[0])
+
+        # Prefetch existing search indexes for this batch
+        existing_indexes = {
+            idx.object_id: idx
+            for idx in self.index_model.objects.filter(
+                content_type=content_type, object_id__in=[obj.pk for obj in objects]
+            )
+        }
+
+        search_indexes_to_create = []
+        search_indexes_to_update = []
+
+        indexed_count = 0
+
+        # Prepare bulk operations
+        for obj in objects:
+            try:
+                if obj.pk in existing_indexes:
+                    # Update existing index
+                    search_index = existing_indexes[obj.pk]
+                    search_index.update_from_object(obj)
+                    search_indexes_to_update.append(search_index)
+                else:
+                    # Create new index
+                    search_index = self.index_model(
+                        content_type=content_type,
+                        object_id=obj.pk,
+                        title=str(obj),
+                    )
+                    search_index.update_from_object(obj)
+                    search_indexes_to_create.append(search_index)
+
+                indexed_count += 1
+            except Exception as e:
+                logger.warning(f"Failed to prepare index for object {obj}: {e}")
+
+        # Perform bulk operations in a transaction
+        with transaction.atomic():
+            if search_indexes_to_create:
+                self.index_model.objects.bulk_create(search_indexes_to_create)
+
+            if search_indexes_to_update:
+                # Bulk update - update all fields that might have changed
+                self.index_model.objects.bulk_update(
+                    search_indexes_to_update,
+                    fields=[
+                        "title",
+                        "content",
+                        "excerpt",
+                        "url",
+                        "image_url",
+                        "search_category",
+                        "search_tags",
+                        "search_weight",
+                        "locale_code",
+                        "is_published",
+                        "published_at",
+                    ],
+                )
+
+            # Bulk operations send no signals
+            self.update_backend(search_indexes_to_create + search_indexes_to_update)
+
+        return indexed_count
+
+    def update_backend(self, entries) -> None:
+        """Pass created or updated entries to the search backend's own index."""
+        try:
+            self.backend.index(entries)
+        except Exception as e:
+            # The entries themselves are saved; a reindex repairs the backend
+            logger.warning(
+                f"Search backend failed to index {len(entries)} entries: {e}"
+            )
+
     def remove_from_index(self, obj):
         """Remove an object from the search index.
 
@@ -375,9 +564,13 @@ class SearchService:
         """
         content_type = ContentType.objects.get_for_model(obj)
 
-        self.index_model.objects.filter(
+        entries = self.index_model.objects.filter(
             content_type=content_type, object_id=obj.pk
-        ).delete()
+        )
+
+        self.backend.remove(entries)
+
+        entries.delete()
 
     def reindex_all(self, model_label: Optional[str] = None, batch_size: int = 1000):
         """Re-index all registered content types or a specific model with bulk operations.
@@ -386,8 +579,6 @@ class SearchService:
             model_label: Optional model label to index (e.g., 'blog.blogpost')
             batch_size: Number of objects to process in each batch for memory efficiency
         """
-        from django.db import transaction
-
         configs = content_registry.get_all_configs()
 
         if model_label:
@@ -419,63 +610,10 @@ class SearchService:
             # Process in batches for better memory usage
             for offset in range(0, total_objects, batch_size):
                 batch_queryset = queryset[offset : offset + batch_size]
-                search_indexes_to_create = []
-                search_indexes_to_update = []
-
-                # Prefetch existing search indexes for this batch
-                object_ids = list(batch_queryset.values_list("pk", flat=True))
-                existing_indexes = {
-                    idx.object_id: idx
-                    for idx in self.index_model.objects.filter(
-                        content_type=content_type, object_id__in=object_ids
-                    )
-                }
-
-                # Prepare bulk operations
-                for obj in batch_queryset:
-                    try:
-                        if obj.pk in existing_indexes:
-                            # Update existing index
-                            search_index = existing_indexes[obj.pk]
-                            search_index.update_from_object(obj)
-                            search_indexes_to_update.append(search_index)
-                        else:
-                            # Create new index
-                            search_index = self.index_model(
-                                content_type=content_type,
-                                object_id=obj.pk,
-                                title=str(obj),
-                            )
-                            search_index.update_from_object(obj)
-                            search_indexes_to_create.append(search_index)
-
-                        indexed_count += 1
-                    except Exception as e:
-                        logger.warning(f"Failed to prepare index for object {obj}: {e}")
-
-                # Perform bulk operations in a transaction
-                with transaction.atomic():
-                    if search_indexes_to_create:
-                        self.index_model.objects.bulk_create(search_indexes_to_create)
-
-                    if search_indexes_to_update:
-                        # Bulk update - update all fields that might have changed
-                        self.index_model.objects.bulk_update(
-                            search_indexes_to_update,
-                            fields=[
-                                "title",
-                                "content",
-                                "excerpt",
-                                "url",
-                                "image_url",
-                                "search_category",
-                                "search_tags",
-                                "search_weight",
-                                "locale_code",
-                                "is_published",
-                                "published_at",
-                            ],
-                        )
+
+                indexed_count += self.index_objects(
+                    list(batch_queryset), content_type=content_type
+                )
 
                 logger.info(
                     f"Processed batch {offset//batch_size + 1}/{(total_objects-1)//batch_size + 1} for {model.__name__}"
@@ -6,11 +6,22 @@ Automatically indexes content when it's created, updated, or deleted.
 
 import logging
 
-from django.db.models.signals import post_delete, post_save
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 
+from apps.cms.model_parts.category import Collection
 from apps.registry.registry import content_registry
 
+from . import admin_search
+from .models import SearchIndex
 from .services import get_search_service
 
 logger = logging.getLogger(__name__)
@@ -69,3 +80,206 @@ def auto_remove_from_index(sender, instance, **kwargs):
         logger.error(
             f"Failed to remove {sender.__name__} instance {instance.pk} from index: {e}"
         )
+
+
+@receiver(post_save, sender=SearchIndex)
+def update_search_backend(sender, instance, raw=False, **kwargs):
+    """Pass saved index entries to the search backend's own index."""
+    if raw:
+        return
+
+    get_search_service().update_backend([instance])
+
+
+@receiver(post_migrate)
+def install_admin_search_index(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Create the SQLite trigram table backing the dashboard search."""
+
+    if sender.name == "apps.search":
+        admin_search.install_sqlite_index(connections[using])
+
+
+def update_admin_search_document(sender, instance, raw=False, **kwargs):
+    """Refresh the dashboard search document of a saved object."""
+
+    if raw:
+        return
+
+    try:
+        admin_search.index_objects([instance])
+    except Exception as e:
+        logger.error(
+            f"Failed to update admin search document for {sender.__name__} "
+            f"instance {instance.pk}: {e}"
+        )
+
+
+def remove_admin_search_document(sender, instance, **kwargs):
+    """Drop the dashboard search document of a deleted object."""
+
+    try:
+        admin_search.remove_objects(sender, [instance.pk])
+    except Exception as e:
+        logger.error(
+            f"Failed to remove admin search document for {sender.__name__} "
+            f"instance {instance.pk}: {e}"
+        )
+
+
+def refresh_admin_search_objects(search_type, object_ids):
+    """Refresh the dashboard search documents of related objects."""
+
+    try:
+        admin_search.refresh_objects(search_type, object_ids)
+    except Exception as e:
+        logger.error(
+            f"Failed to refresh admin search documents for {search_type.key}: {e}"
+        )
+
+
+def store_changed_dependencies(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    """Note which rendered search results a pending save will change."""
+
+    instance._admin_search_changes = []
+
+    if raw or instance.pk is None:
+        return
+
+    dependencies = [
+        (search_type, dependency)
+        for search_type, dependency in admin_search.get_dependencies(sender)
+        if dependency.fields
+        and (update_fields is None or set(dependency.fields) & set(update_fields))
+    ]
+
+    if not dependencies:
+        return
+
+    fields = {name for _, dependency in dependencies for name in dependency.fields}
+
+    old = sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+
+    if old is None:
+        return
+
+    instance._admin_search_changes = [
+        (search_type, dependency)
+        for search_type, dependency in dependencies
+        if any(old[name] != getattr(instance, name) for name in dependency.fields)
+    ]
+
+
+def refresh_dependent_documents(sender, instance, raw=False, **kwargs):
+    """Re-render the search results showing a changed related row."""
+
+    changes = getattr(instance, "_admin_search_changes", [])
+
+    instance._admin_search_changes = []
+
+    for search_type, dependency in changes:
+        refresh_admin_search_objects(
+            search_type,
+            admin_search.dependent_ids(search_type, dependency, [instance.pk]),
+        )
+
+
+def store_deleted_dependents(sender, instance, **kwargs):
+    """Remember the search results showing a row that is being deleted."""
+
+    instance._admin_search_dependents = [
+        (
+            search_type,
+            admin_search.dependent_ids(search_type, dependency, [instance.pk]),
+        )
+        for search_type, dependency in admin_search.get_dependencies(sender)
+    ]
+
+
+def refresh_deleted_dependents(sender, instance, **kwargs):
+    """Re-render the search results that showed a deleted row."""
+
+    for search_type, object_ids in getattr(instance, "_admin_search_dependents", []):
+        refresh_admin_search_objects(search_type, object_ids)
+
+
+def refresh_collection_document(sender, instance, action, pk_set=None, **kwargs):
+    """Keep collection item counts current when their categories change."""
+
+    if isinstance(instance, Collection):
+
+        if action in ("post_add", "post_remove", "post_clear"):
+            update_admin_search_document(type(instance), instance)
+
+        return
+
+    # Collections changed from the category side
+
+    collections = admin_search.get_type_for_model(Collection)
+
+    if action == "pre_clear":
+        instance._admin_search_collections = list(
+            instance.collections.values_list("pk", flat=True)
+        )
+
+    elif action in ("post_add", "post_remove"):
+        refresh_admin_search_objects(collections, pk_set or ())
+
+    elif action == "post_clear":
+        refresh_admin_search_objects(
+            collections, getattr(instance, "_admin_search_collections", [])
+        )
+
+
+for search_type in admin_search.get_types():
+
+    post_save.connect(
+        update_admin_search_document,
+        sender=search_type.model,
+        dispatch_uid=f"admin_search_update_{search_type.key}",
+    )
+
+    post_delete.connect(
+        remove_admin_search_document,
+        sender=search_type.model,
+        dispatch_uid=f"admin_search_remove_{search_type.key}",
+    )
+
+for dependency_model in {
+    dependency.model
+    for search_type in admin_search.get_types()
+    for dependency in search_type.dependencies
+}:
+
+    uid = f"admin_search_{dependency_model._meta.label_lower}"
+
+    pre_save.connect(
+        store_changed_dependencies,
+        sender=dependency_model,
+        dispatch_uid=f"{uid}_changes",
+    )
+
+    post_save.connect(
+        refresh_dependent_documents,
+        sender=dependency_model,
+        dispatch_uid=f"{uid}_refresh",
+    )
+
+    pre_delete.connect(
+        store_deleted_dependents,
+        sender=dependency_model,
+        dispatch_uid=f"{uid}_dependents",
+    )
+
+    post_delete.connect(
+        refresh_deleted_dependents,
+        sender=dependency_model,
+        dispatch_uid=f"{uid}_deleted",
+    )
+
+m2m_changed.connect(
+    refresh_collection_document,
+    sender=Collection.categories.through,
+    dispatch_uid="admin_search_collection_categories",
+)
@@ -0,0 +1,251 @@
+"""Tests for the unified dashboard search documents."""
+
+import os
+from io import StringIO
+from unittest import skipUnless
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.blog import versioning as blog_versioning  # noqa: F401 - registers models
+from apps.blog.models import BlogPost
+from apps.cms.model_parts.category import Category, Collection
+from apps.cms.models import Page, Redirect
+from apps.i18n.models import Locale
+from apps.search import admin_search
+from apps.search.global_search import global_search
+from apps.search.models import AdminSearchDocument
+
+User = get_user_model()
+
+
+class AdminSearchTestMixin:
+    def setUp(self):
+        super().setUp()
+
+        self.locale, _ = Locale.objects.get_or_create(
+            code="en", defaults={"name": "English", "native_name": "English"}
+        )
+
+    def create_page(self, title, slug):
+        return Page.objects.create(
+            title=title, slug=slug, locale=self.locale, status="draft"
+        )
+
+
+class AdminSearchDocumentTest(AdminSearchTestMixin, TestCase):
+    def test_documents_follow_saves_and_deletes(self):
+        page = self.create_page("Pricing Plans", "pricing")
+
+        document = AdminSearchDocument.objects.get(
+            doc_type="pages", object_id=str(page.pk)
+        )
+
+        self.assertTrue(document.search_text.startswith("pricing plans"))
+
+        self.assertEqual(document.result["url"], f"/dashboard/pages/{page.pk}/edit")
+
+        page.title = "Enterprise Plans"
+        page.save()
+
+        self.assertEqual(
+            admin_search.search("enterprise", ["pages"])["pages"][0]["id"], page.pk
+        )
+
+        self.assertEqual(admin_search.search("pricing p", ["pages"]), {})
+
+        redirect = Redirect.objects.create(from_path="/old-pricing/", to_path="/")
+
+        self.assertEqual(len(admin_search.search("old-pricing", ["redirects"])), 1)
+
+        redirect.delete()
+
+        self.assertFalse(
+            AdminSearchDocument.objects.filter(
+                doc_type="redirects", object_id=str(redirect.pk)
+            ).exists()
+        )
+
+    def test_substring_matching(self):
+        self.create_page("Quarterly Roadmap", "roadmap")
+
+        self.create_page("Road Map Archive", "archive")
+
+        self.assertEqual(
+            [r["title"] for r in admin_search.search("ROADMAP", ["pages"])["pages"]],
+            ["Quarterly Roadmap"],
+        )
+
+        # Too short for a trigram; falls back to scanning
+        self.assertEqual(
+            len(admin_search.search("ap", ["pages"])["pages"]),
+            2,
+        )
+
+        # Trigrams present but not contiguous
+        self.assertEqual(admin_search.search("oadmar", ["pages"]), {})
+
+        self.assertEqual(admin_search.search('road "map', ["pages"]), {})
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite trigram table")
+    def test_sqlite_uses_trigram_table(self):
+        self.create_page("Quarterly Roadmap", "roadmap")
+
+        with CaptureQueriesContext(connection) as queries:
+            results = admin_search.search("roadmap", ["pages"])
+
+        self.assertEqual(len(results["pages"]), 1)
+
+        self.assertIn(
+            admin_search.fts_table("pages"), queries.captured_queries[0]["sql"]
+        )
+
+    def test_grouped_top_n_in_one_query(self):
+        for i in range(4):
+            self.create_page(f"Launch {i}", f"launch-{i}")
+            Redirect.objects.create(
+                from_path=f"/old-launch-{i}/", to_path=f"/launch-{i}/"
+            )
+
+        with self.assertNumQueries(1):
+            results = admin_search.search("launch", ["pages", "redirects"], limit=3)
+
+        self.assertEqual(list(results), ["pages", "redirects"])
+
+        self.assertEqual(len(results["pages"]), 3)
+
+        self.assertEqual(len(results["redirects"]), 3)
+
+    def test_title_prefix_ranks_first(self):
+        self.create_page("About the team", "team")
+
+        self.create_page("Team", "team-page")
+
+        results = admin_search.search("team", ["pages"])["pages"]
+
+        self.assertEqual(results[0]["title"], "Team")
+
+    def test_collection_item_count_follows_categories(self):
+        collection = Collection.objects.create(name="Guides", slug="guides")
+
+        category = Category.objects.create(name="Setup", slug="setup")
+
+        collection.categories.add(category)
+
+        result = admin_search.search("guides", ["collections"])["collections"][0]
+
+        self.assertEqual(result["item_count"], 1)
+
+    def test_long_text_is_indexed_in_full(self):
+        post = BlogPost.objects.create(
+            title="Release notes",
+            content="filler text " * 1000 + "zeppelin",
+            author=User.objects.create_user(email="writer@example.com"),
+            locale=self.locale,
+        )
+
+        result = admin_search.search("zeppelin", ["blog_posts"])["blog_posts"][0]
+
+        self.assertEqual(result["id"], post.pk)
+
+    def test_related_changes_refresh_results(self):
+        author = User.objects.create_user(
+            email="writer@example.com", first_name="Ada", last_name="Byron"
+        )
+
+        BlogPost.objects.create(
+            title="Engines", author=author, locale=self.locale, content="Notes"
+        )
+
+        author.last_name = "Lovelace"
+        author.save()
+
+        result = admin_search.search("engines", ["blog_posts"])["blog_posts"][0]
+
+        self.assertEqual(result["author"], "Ada Lovelace")
+
+        collection = Collection.objects.create(name="Guides", slug="guides")
+
+        category = Category.objects.create(name="Setup", slug="setup")
+
+        category.collections.add(collection)
+
+        result = admin_search.search("guides", ["collections"])["collections"][0]
+
+        self.assertEqual(result["item_count"], 1)
+
+        category.delete()
+
+        result = admin_search.search("guides", ["collections"])["collections"][0]
+
+        self.assertEqual(result["item_count"], 0)
+
+    def test_rebuild_command(self):
+        page = self.create_page("Careers", "careers")
+
+        AdminSearchDocument.objects.all().delete()
+
+        out = StringIO()
+
+        call_command("search_index", "--rebuild-admin", stdout=out)
+
+        self.assertIn(f"pages: {Page.objects.count()} documents", out.getvalue())
+
+        self.assertEqual(
+            admin_search.search("careers", ["pages"])["pages"][0]["id"], page.pk
+        )
+
+
+class GlobalSearchViewTest(AdminSearchTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.factory = APIRequestFactory()
+
+        self.editor = User.objects.create_user(email="editor@example.com")
+
+        self.admin = User.objects.create_user(email="admin@example.com", is_staff=True)
+
+        self.create_page("Example page", "example")
+
+    def get(self, user, **params):
+
+        request = self.factory.get("/api/v1/search/global/", params)
+
+        force_authenticate(request, user=user)
+
+        return global_search(request)
+
+    def test_grouped_response(self):
+        response = self.get(self.admin, q="example", limit=5)
+
+        self.assertTrue(response.data["grouped"])
+
+        self.assertEqual(set(response.data["results"]), {"pages", "users"})
+
+        self.assertEqual(response.data["total"], 3)
+
+    def test_users_are_staff_only(self):
+        response = self.get(self.editor, q="example")
+
+        self.assertEqual(list(response.data["results"]), ["pages"])
+
+    def test_types_filter(self):
+        response = self.get(self.admin, q="example", types="users")
+
+        self.assertEqual(list(response.data["results"]), ["users"])
+
+        self.assertEqual(response.data["total"], 2)
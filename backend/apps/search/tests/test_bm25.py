@@ -0,0 +1,244 @@
+"""Tests for the BM25 search backend."""
+
+import os
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.blog import versioning as blog_versioning  # noqa: F401 - registers models
+from apps.cms.models import Page
+from apps.i18n.models import Locale
+from apps.search import bm25
+from apps.search.backends import (
+    BM25SearchBackend,
+    DatabaseSearchBackend,
+    RankedResults,
+    get_search_backend,
+)
+from apps.search.models import SearchDocumentStats, SearchIndex, SearchPosting
+from apps.search.services import SearchService
+
+User = get_user_model()
+
+
+class AnalyzerTest(SimpleTestCase):
+    def test_inflections_share_a_stem(self):
+        english = bm25.get_analyzer("en-US")
+
+        self.assertEqual(
+            {english.stem(word) for word in ["launch", "launches", "launched"]},
+            {"launch"},
+        )
+
+        self.assertEqual(english.stem("running"), english.stem("runs"))
+
+        self.assertEqual(english.stem("status"), "status")
+
+    def test_stopwords_and_accents(self):
+        self.assertEqual(
+            bm25.get_analyzer("en").analyze("The Café of Ideas"), ["caf", "idea"]
+        )
+
+        self.assertEqual(bm25.get_analyzer("nl").analyze("de katten"), ["kat"])
+
+    def test_unknown_language_is_not_stemmed(self):
+        analyzer = bm25.get_analyzer("pt_BR")
+
+        self.assertIs(analyzer, bm25.NEUTRAL_ANALYZER)
+
+        self.assertEqual(analyzer.analyze("Lançamentos"), ["lancamentos"])
+
+    def test_frequencies_pack_into_one_integer(self):
+        packed = bm25.pack_frequencies([2, 0, 5000])
+
+        self.assertEqual(bm25.unpack_frequencies(packed), (2, 0, bm25.MAX_FREQUENCY))
+
+    def test_query_variants_cover_each_language(self):
+        variants = bm25.query_variants(
+            "the launches", [bm25.get_analyzer("en"), bm25.NEUTRAL_ANALYZER]
+        )
+
+        self.assertEqual(variants, [{"the"}, {"launch", "launches"}])
+
+
+class BM25BackendTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.backend = BM25SearchBackend()
+
+        self.content_type = ContentType.objects.get_for_model(User)
+
+        self.next_id = 1
+
+    def create_entry(self, title, content="", **fields):
+        fields.setdefault("locale_code", "en")
+
+        fields.setdefault("search_category", "page")
+
+        entry = SearchIndex.objects.create(
+            content_type=self.content_type,
+            object_id=self.next_id,
+            title=title,
+            content=content,
+            **fields,
+        )
+
+        self.next_id += 1
+
+        return entry
+
+    def search(self, query, queryset=None, locale=None):
+        if queryset is None:
+            queryset = SearchIndex.objects.filter(is_published=True)
+
+        return [entry.title for entry in self.backend.search(queryset, query, locale)]
+
+    def test_saved_entries_are_indexed(self):
+        entry = self.create_entry("Launch Roadmap", "Plans for the summer launches")
+
+        self.assertEqual(
+            dict(
+                SearchPosting.objects.filter(entry=entry).values_list(
+                    "term", "frequencies"
+                )
+            ),
+            {
+                "launch": bm25.pack_frequencies([1, 0, 1]),
+                "roadmap": bm25.pack_frequencies([1, 0, 0]),
+                "plan": bm25.pack_frequencies([0, 0, 1]),
+                "summer": bm25.pack_frequencies([0, 0, 1]),
+            },
+        )
+
+        self.assertEqual(SearchDocumentStats.objects.get(entry=entry).content_length, 3)
+
+    def test_title_matches_rank_first(self):
+        self.create_entry(
+            "Company news", "A long update that mentions the launch once among " * 5
+        )
+
+        self.create_entry("Product launch", "Details")
+
+        self.create_entry("Careers", "Join the team")
+
+        self.assertEqual(self.search("launches"), ["Product launch", "Company news"])
+
+    def test_rare_terms_outweigh_common_ones(self):
+        for i in range(5):
+            self.create_entry(f"Guide {i}", "guide")
+
+        self.create_entry("Pricing guide", "pricing")
+
+        self.assertEqual(self.search("pricing guide")[0], "Pricing guide")
+
+    def test_updates_and_deletes_are_incremental(self):
+        entry = self.create_entry("Winter sale")
+
+        entry.title = "Summer sale"
+        entry.save()
+
+        self.assertEqual(self.search("winter"), [])
+
+        self.assertEqual(self.search("summer"), ["Summer sale"])
+
+        entry.delete()
+
+        self.assertEqual(self.search("summer"), [])
+
+        self.assertFalse(SearchPosting.objects.exists())
+
+    def test_filters_restrict_candidates(self):
+        self.create_entry("Launch notes", search_category="blog")
+
+        self.create_entry("Launch page", search_category="page")
+
+        self.create_entry("Launch draft", is_published=False)
+
+        self.assertEqual(
+            self.search("launch", SearchIndex.objects.filter(search_category="blog")),
+            ["Launch notes"],
+        )
+
+        self.assertEqual(len(self.search("launch")), 2)
+
+    def test_locale_query_uses_its_stemmer(self):
+        self.create_entry("Nieuwe huizen", locale_code="nl")
+
+        self.assertEqual(self.search("huizen", locale="nl"), ["Nieuwe huizen"])
+
+        self.assertEqual(self.search("de"), [])
+
+    def test_rebuild(self):
+        self.create_entry("Careers")
+
+        SearchPosting.objects.all().delete()
+
+        self.assertEqual(self.search("careers"), [])
+
+        self.assertEqual(self.backend.rebuild(), 1)
+
+        self.assertEqual(self.search("careers"), ["Careers"])
+
+    def test_ranked_results_load_one_slice(self):
+        for i in range(3):
+            self.create_entry(f"Launch {i}")
+
+        results = self.backend.search(SearchIndex.objects.all(), "launch")
+
+        self.assertIsInstance(results, RankedResults)
+
+        self.assertEqual(results.count(), 3)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(len(results[1:3]), 2)
+
+
+class SearchServiceBackendTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.locale, _ = Locale.objects.get_or_create(
+            code="en", defaults={"name": "English", "native_name": "English"}
+        )
+
+    def test_default_backend(self):
+        self.assertIsInstance(get_search_backend(), BM25SearchBackend)
+
+        with override_settings(
+            SEARCH_BACKEND="apps.search.backends.DatabaseSearchBackend"
+        ):
+            self.assertIsInstance(get_search_backend(), DatabaseSearchBackend)
+
+    def test_indexed_content_is_searchable(self):
+        service = SearchService()
+
+        content_type = ContentType.objects.get_for_model(Page)
+
+        for i in range(3):
+            # Saving an entry updates the backend's index
+            SearchIndex.objects.create(
+                content_type=content_type,
+                object_id=i,
+                title=f"Launch Roadmap {i}",
+                locale_code=self.locale.code,
+                search_category="page",
+            )
+
+        results = service.search("roadmaps", page_size=2)
+
+        self.assertEqual(results["pagination"]["total_results"], 3)
+
+        self.assertEqual(len(results["results"]), 2)
+
+        self.assertTrue(results["pagination"]["has_next"])
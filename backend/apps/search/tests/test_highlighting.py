@@ -0,0 +1,155 @@
+"""Tests for search snippets, highlighting and facets."""
+
+import os
+
+import django
+from django.conf import settings
+
+# Configure Django settings if not already configured
+if not settings.configured:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.config.settings.test")
+    django.setup()
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.search import bm25
+from apps.search.highlighting import ELLIPSIS, Highlighter
+from apps.search.models import SearchIndex
+from apps.search.serializers import SearchResponseSerializer
+from apps.search.services import SearchService
+
+User = get_user_model()
+
+
+class HighlighterTest(SimpleTestCase):
+    def setUp(self):
+        self.highlighter = Highlighter(
+            "launches roadmap", [bm25.get_analyzer("en"), bm25.NEUTRAL_ANALYZER]
+        )
+
+    def test_highlight_matches_inflections(self):
+        self.assertEqual(
+            self.highlighter.highlight("Launched: the <new> Roadmap", "en"),
+            "<mark>Launched</mark>: the &lt;new&gt; <mark>Roadmap</mark>",
+        )
+
+    def test_snippet_picks_the_densest_window(self):
+        text = (
+            "launch " + "filler " * 60 + "the roadmap for this launch " + "tail " * 60
+        )
+
+        snippet = self.highlighter.snippet(text, "en", length=80)
+
+        self.assertTrue(snippet.startswith(ELLIPSIS))
+
+        self.assertTrue(snippet.endswith(ELLIPSIS))
+
+        self.assertIn("<mark>roadmap</mark> for this <mark>launch</mark>", snippet)
+
+        self.assertLessEqual(len(snippet), 80 + 2 * len("<mark></mark>") + 2)
+
+    def test_snippet_without_matches_is_the_beginning(self):
+        self.assertEqual(
+            self.highlighter.snippet("Quarterly careers update " * 20, "en", 30),
+            "Quarterly careers update" + ELLIPSIS,
+        )
+
+    def test_stopword_only_query_highlights_nothing(self):
+        highlighter = Highlighter("the", [bm25.get_analyzer("en")])
+
+        self.assertEqual(highlighter.highlight("the team", "en"), "the team")
+
+
+class SearchFacetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        content_type = ContentType.objects.get_for_model(User)
+
+        entries = [
+            ("Launch notes", "blog", "en", ["product", "news"]),
+            ("Launch page", "page", "en", ["product"]),
+            ("Lancement launch", "page", "fr", []),
+            ("Careers", "page", "en", ["jobs"]),
+        ]
+
+        for i, (title, category, locale_code, tags) in enumerate(entries):
+            SearchIndex.objects.create(
+                content_type=content_type,
+                object_id=i,
+                title=title,
+                content=f"{title} content",
+                search_category=category,
+                locale_code=locale_code,
+                search_tags=tags,
+            )
+
+    def test_facets_cover_all_matches(self):
+        results = SearchService().search("launch", page_size=1)
+
+        self.assertEqual(results["pagination"]["total_results"], 3)
+
+        self.assertEqual(results["pagination"]["total_pages"], 3)
+
+        self.assertEqual(len(results["results"]), 1)
+
+        self.assertEqual(
+            results["facets"],
+            {
+                "categories": [
+                    {"value": "page", "count": 2},
+                    {"value": "blog", "count": 1},
+                ],
+                "locales": [{"value": "en", "count": 2}, {"value": "fr", "count": 1}],
+                "tags": [
+                    {"value": "product", "count": 2},
+                    {"value": "news", "count": 1},
+                ],
+            },
+        )
+
+        self.assertIn("<mark>", results["results"][0]["highlight"]["title"])
+
+        serializer = SearchResponseSerializer(data=results)
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        self.assertEqual(serializer.data["facets"], results["facets"])
+
+        self.assertEqual(
+            serializer.data["results"][0]["highlight"],
+            results["results"][0]["highlight"],
+        )
+
+    @override_settings(SEARCH_BACKEND="apps.search.backends.DatabaseSearchBackend")
+    def test_count_comes_from_the_facet_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            results = SearchService().search("launch", filters={"locale": "en"})
+
+        self.assertEqual(results["pagination"]["total_results"], 2)
+
+        counts = [
+            q["sql"]
+            for q in queries.captured_queries
+            if 'FROM "search_searchindex"' in q["sql"] and "COUNT(" in q["sql"]
+        ]
+
+        self.assertEqual(len(counts), 1)
+
+        self.assertIn("GROUP BY", counts[0])
+
+    def test_out_of_range_page_shows_the_last_page(self):
+        results = SearchService().search("launch", page=9, page_size=2)
+
+        self.assertEqual(len(results["results"]), 1)
+
+        self.assertEqual(results["pagination"]["page"], 2)
+
+        self.assertFalse(results["pagination"]["has_next"])
+
+        self.assertTrue(results["pagination"]["has_previous"])
@@ -2,9 +2,9 @@ from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
 from apps.core.decorators import cache_response
+from apps.core.throttling import AnonRateThrottle, UserRateThrottle
 
 from . import services
 from .models import SearchIndex, SearchQuery, SearchSuggestion
@@ -116,6 +116,28 @@ def celery_eager(settings):
     settings.CELERY_TASK_EAGER_PROPAGATES = True
 
 
+@pytest.fixture(autouse=True)
+def discard_autosave_drafts():
+    """Drop buffered autosaves, which would outlive the test's pages"""
+    yield
+
+    from django.core.cache import cache
+
+    from apps.cms.autosave import AUTOSAVE_INDEX_KEY
+
+    cache.delete_many([*cache.get(AUTOSAVE_INDEX_KEY, ()), AUTOSAVE_INDEX_KEY])
+
+
+@pytest.fixture(autouse=True)
+def reset_block_type_registry():
+    """Forget block types loaded in the test, whose rollback bumps no version"""
+    yield
+
+    from apps.cms.blocks.registry import block_type_registry
+
+    block_type_registry.clear()
+
+
 @pytest.fixture
 def mailpit(settings):
     """Configure mailpit for email testing"""
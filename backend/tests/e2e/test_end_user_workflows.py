@@ -315,10 +315,10 @@ class EndUserWorkflowTests(
             content_type = sitemap_response.headers["content-type"].lower()
             self.assertIn("xml", content_type)
 
-            # Should contain sitemap elements
-            content = sitemap_response.content.decode("utf-8")
-            self.assertIn("<urlset", content)
-            self.assertIn("<url>", content)
+            # Should be a sitemap index pointing at the per-locale shards
+            content = sitemap_response.getvalue().decode("utf-8")
+            self.assertIn("<sitemapindex", content)
+            self.assertIn("<sitemap>", content)
             self.assertIn("<loc>", content)
 
         # Test robots.txt
@@ -702,7 +702,7 @@ class SitemapViewTestCase(APITestCase):
 
         # Verify XML structure
 
-        content = response.content.decode()
+        content = response.getvalue().decode()
 
         self.assertIn('<?xml version="1.0"', content)
 